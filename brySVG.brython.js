@@ -1,3 +1,3 @@
 __BRYTHON__.use_VFS = true;
-var scripts = {"$timestamp": 1623063053217, "brySVG.drawcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n\n\n\n\n\nfrom brySVG.dragcanvas import *\n\nclass NonBezierMixin(object):\n ''\n def setPoint(self,i,point):\n  self.pointList[i]=point\n  self._update()\n  self._updatehittarget()\n ''\n\n\n\n\n \n def _movePoint(self,coords):\n  self.setPoint(-1,coords)\n  \nclass PolyshapeMixin(object):\n ''\n def _appendPoint(self,point):\n  self.pointList.append(point)\n  self._update()\n  \n def insertPoint(self,index,point):\n  self.pointList.insert(index,point)\n  self._update()\n  self._updatehittarget()\n  \n def deletePoint(self,index):\n  self.deletePoints(index,index+1)\n  \n def deletePoints(self,start,end):\n  del self.pointList[slice(start,end)]\n  self._update()\n  self._updatehittarget()\n  \nclass BezierMixin(object):\n ''\n def setPointset(self,i,pointset):\n  self.pointList[i]=pointset[1]\n  self.pointsetList[i]=pointset\n  self._update()\n  self._updatehittarget()\n  \n def setPointsetList(self,pointsetlist):\n  self.pointList=[pointset[1]for pointset in pointsetlist]\n  self.pointsetList=pointsetlist\n  self._update()\n  self._updatehittarget()\n  \n def setPoint(self,i,point):\n  self.pointList[i]=point\n  self.pointsetList=self._getpointsetlist(self.pointList)\n  self._update()\n  self._updatehittarget()\n ''\n\n\n\n\n\n \n def _appendPoint(self,point):\n  self.pointList.append(point)\n  self.pointsetList=self._getpointsetlist(self.pointList)\n  self._update()\n  \n def deletePoints(self,start,end):\n  del self.pointList[slice(start,end)]\n  self.pointsetList=self._getpointsetlist(self.pointList)\n  self._update()\n  self._updatehittarget()\n  \n def insertPoint(self,index,point):\n  self.pointList.insert(index,point)\n  if isinstance(self,SmoothBezierMixin):\n   self.pointsetList=self._getpointsetlist(self.pointList)\n  else :\n   L=len(self.pointList)\n   triple=[self.pointList[index -1],point,self.pointList[(index+1)%L]]\n   cpoint1,cpoint2=SmoothBezierMixin._calculatecontrolpoints(self,triple)\n   \n   self.pointsetList.insert(index,[cpoint1,point,cpoint2])\n   self.pointsetList[index -1][2]=cpoint1\n   self.pointsetList[(index+1)%L][0]=cpoint2\n  self._update()\n  self._updatehittarget()\n  \n def deletePoint(self,index):\n  point=self.pointList[index]\n  del self.pointList[index]\n  if isinstance(self,SmoothBezierMixin):\n   self.pointsetList=self._getpointsetlist(self.pointList)\n  else :\n   L=len(self.pointsetList)\n   \n   \n   \n   \n   if index ==0 and self.pointsetList[index][0]is None :\n    self.pointsetList[index+1][0]=None\n   elif index ==L -1 and self.pointsetList[index][2]is None :\n    self.pointsetList[index -1][2]=None\n   else :\n    self.pointsetList[(index -1)%L][2]=point\n    self.pointsetList[(index+1)%L][0]=point\n   del self.pointsetList[index]\n  self._update()\n  self._updatehittarget()\n  \n def _movePoint(self,point):\n  self.pointList[-1]=point\n  self._updatepointsetlist()\n  if len(self.pointList)==2:\n   self._update()\n  elif isinstance(self,(ClosedBezierObject,SmoothClosedBezierObject)):\n   ((x1,x2),(x3,x4),(x5,x6))=self.pointsetList[-2]\n   ((x7,x8),(x9,x10),(x11,x12))=self.pointsetList[-1]\n   ((x13,x14),(x15,x16),(x17,x18))=self.pointsetList[0]\n   self.plist=self.plist[:-16]+[x1,x2,x3,x4,x5,x6,x7,x8,x9,x10,x11,x12,x13,x14,x15,x16]\n   self.plist[4:6]=[x17,x18]\n   self.attrs[\"d\"]=\" \".join(str(x)for x in self.plist)\n  else :\n   ((x1,x2),(x3,x4),(x5,x6))=self.pointsetList[-2]\n   ((x7,x8),(x9,x10),dummy)=self.pointsetList[-1]\n   self.plist=self.plist[:-10]+[x1,x2,x3,x4,x5,x6,x7,x8,x9,x10]\n   self.attrs[\"d\"]=\" \".join(str(x)for x in self.plist)\n   \nclass DrawCanvasMixin(object):\n def setTool(self,tool):\n  if self.mouseMode ==MouseMode.DRAW:self._endDraw()\n  self.tool=tool\n  self.mouseMode=MouseMode.EDIT if tool in {\"select\",\"insertpoint\",\"deletepoint\"}else MouseMode.DRAW\n  \n def _createObject(self,coords):\n  colour=\"none\"if self.tool in [\"polyline\",\"bezier\",\"smoothbezier\"]else self.fillColour\n  self.mouseOwner=shapetypes[self.tool](pointlist=[coords,coords],linecolour=self.penColour,linewidth=self.penWidth,fillcolour=colour)\n  self.addObject(self.mouseOwner)\n  self.mouseOwner.shapeType=self.tool\n  \n def _drawPoint(self,event):\n  if self.tool ==\"select\":return\n  if self.mouseOwner:\n   if isinstance(self.mouseOwner,(PolyshapeMixin,BezierMixin)):\n    coords=self.getSVGcoords(event)\n    self.mouseOwner._appendPoint(coords)\n  else :\n   self.startx=self.currentx=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n   self.starty=self.currenty=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n   coords=self.getSVGcoords(event)\n   self._createObject(coords)\n   \n def _endDraw(self,event=None ):\n  if not self.mouseOwner:return\n  svgobj=self.mouseOwner\n  if isinstance(svgobj,(PolyshapeMixin,BezierMixin)):\n   evtype=getattr(event,\"type\",None )\n   if evtype ==\"dblclick\":\n    svgobj.deletePoints(-2,None )\n    \n   elif self.mouseDetected:\n    svgobj.deletePoints(-1,None )\n    \n   elif svgobj.pointList[0]==svgobj.pointList[1]:\n    svgobj.deletePoints(None ,1)\n    \n   while len(svgobj.pointList)>1 and svgobj.pointList[-1]==svgobj.pointList[-2]:\n    svgobj.deletePoints(-1,None )\n   if len(svgobj.pointList)==1:self.deleteObject(svgobj)\n   if isinstance(svgobj,SectorObject):svgobj.pointList=svgobj.pointList[:2]+svgobj.pointList[-1:]\n  elif isinstance(svgobj,NonBezierMixin):\n   if svgobj.pointList[0]==svgobj.pointList[1]:self.deleteObject(svgobj)\n  self.mouseOwner=None\n  self.mouseMode=MouseMode.EDIT\n  return svgobj\n  \n def _createEditHitTargets(self):\n  objlist=list(self.objectDict.values())\n  for obj in objlist:\n   if isinstance(obj,GroupObject):continue\n   if hasattr(obj,\"hitTarget\"):continue\n   if hasattr(obj,\"reference\"):continue\n   if isinstance(obj,UseObject):\n    newobj=RectangleObject(obj.pointList,obj.angle)\n   elif obj.fixed:\n    continue\n   elif isinstance(obj,(PolyshapeMixin,BezierMixin)):\n    newobj=HitTarget(obj,self)\n   else :\n    if obj.style.fill !=\"none\":continue\n    newobj=obj.cloneObject()\n    newobj.style.strokeWidth=10 *self.scaleFactor if self.mouseDetected else 25 *self.scaleFactor\n   newobj.reference=obj\n   newobj.style.opacity=0\n   if not isinstance(newobj,HitTarget):\n    for event in MOUSEEVENTS:newobj.bind(event,self._onHitTargetMouseEvent)\n    for event in TOUCHEVENTS:newobj.bind(event,self._onHitTargetTouchEvent)\n   obj.hitTarget=newobj\n   self.hittargets.append(newobj)\n   self.addObject(newobj)\n   \n def _prepareEdit(self,event):\n  if self.selectedObject:self.deselectObject()\n  svgobject=self.getSelectedObject(event.target.id,getGroup=False )\n  if not svgobject or svgobject.fixed:return\n  self.selectedObject=svgobject\n  self.createHandles(svgobject)\n  if self.tool ==\"insertpoint\":\n   index,point=self._insertPoint(event)\n   \n def createHandles(self,svgobject):\n  if isinstance(svgobject,UseObject):return\n  if isinstance(svgobject,BezierMixin):\n   handles=[]\n   for i,(point0,point1,point2)in enumerate(svgobject.pointsetList):\n    handle=Handle(svgobject,i,point1,\"red\",self)\n    handle.controlHandles=[]\n    ch0=None if point0 is None else ControlHandle(svgobject,i,0,point0,\"green\",self)\n    ch2=None if point2 is None else ControlHandle(svgobject,i,2,point2,\"green\",self)\n    if ch0:\n     ch0.linkedHandle=ch2 if isinstance(svgobject,SmoothBezierMixin)else None\n     handle.controlHandles.append(ch0)\n    if ch2:\n     ch2.linkedHandle=ch0 if isinstance(svgobject,SmoothBezierMixin)else None\n     handle.controlHandles.append(ch2)\n    handles.append(handle)\n   self.handles=GroupObject(handles)\n   self <=self.handles\n   self.controlhandles=GroupObject([ch for handle in handles for ch in handle.controlHandles])\n   self <=self.controlhandles\n  else :\n   self.handles=GroupObject([Handle(svgobject,i,coords,\"red\",self)for i,coords in enumerate(svgobject.pointList)])\n   self <=self.handles\n   \n def _movePoint(self,event):\n  x=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  y=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  dx,dy=x -self.currentx,y -self.currenty\n  if \"touch\"in event.type and abs(dx)<5 and abs(dy)<5:return\n  self.currentx,self.currenty=x,y\n  if self.mouseMode ==MouseMode.DRAW:\n   coords=self.getSVGcoords(event)\n   self.mouseOwner._movePoint(coords)\n  else :\n   if self.mouseMode ==MouseMode.TRANSFORM:dx,dy=x -self.startx,y -self.starty\n   dx,dy=dx *self.scaleFactor,dy *self.scaleFactor\n   self.mouseOwner._movePoint((dx,dy))\n   \n def _insertPoint(self,event):\n  if not self.selectedObject:return None ,None\n  try :\n   index=self.objectDict[event.target.id].segmentindex\n  except (KeyError,AttributeError):\n   return None ,None\n  self.deleteObject(self.handles)\n  self.deleteObject(self.controlhandles)\n  clickpoint=self.getSVGcoords(event)\n  svgobject=self.selectedObject\n  svgobject.insertPoint(index,clickpoint)\n  self.createHandles(svgobject)\n  return index,clickpoint\n  \n def _deletePoint(self,index):\n  if not self.selectedObject:return None\n  if not isinstance(self.selectedObject,(PolyshapeMixin,BezierObject)):return None\n  svgobject=self.selectedObject\n  if len(svgobject.pointList)<=2:\n   self.deleteSelection()\n   return None\n  self.deleteObject(self.handles)\n  self.deleteObject(self.controlhandles)\n  svgobject.deletePoint(index)\n  self.createHandles(svgobject)\n  return index\n  \n def _endEdit(self,event):\n  if self.selectedObject:\n   self.selectedObject._updatehittarget()\n   if self.handles:self <=self.handles\n   if self.controlhandles:self <=self.controlhandles\n  self.mouseOwner=None\n  \n def deselectObject(self):\n  if not self.selectedObject:return\n  self.deleteHandles()\n  self.mouseOwner=self.selectedObject=self.selectedhandle=None\n  \n def deleteHandles(self):\n  self.deleteObject(self.handles)\n  self.handles=None\n  if isinstance(self.selectedObject,BezierMixin):\n   self.deleteObject(self.controlhandles)\n   self.controlhandles=None\n   \nclass HitTargetSegment(LineObject):\n def __init__(self,pointlist,width,reference,index):\n  LineObject.__init__(self,pointlist,linewidth=width)\n  self.reference=reference\n  self.segmentindex=index\n  self.style.opacity=0\n  \nclass BezierHitTargetSegment(BezierObject):\n def __init__(self,pointsetlist,width,reference,index):\n  BezierObject.__init__(self,pointsetlist,linewidth=width)\n  self.reference=reference\n  self.segmentindex=index\n  self.style.opacity=0\n  \nclass HitTarget(GroupObject):\n def __init__(self,reference,canvas):\n  GroupObject.__init__(self)\n  self.reference=reference\n  self.style.cursor=reference.style.cursor\n  self.canvas=canvas\n  self._update()\n  \n def _update(self):\n  self.deleteAll()\n  width=10 *self.canvas.scaleFactor if self.canvas.mouseDetected else 25 *self.canvas.scaleFactor\n  if isinstance(self.reference,PolyshapeMixin):\n   pointlist=self.reference.pointList[:]\n   if isinstance(self.reference,PolygonObject):pointlist.append(pointlist[0])\n   for i in range(len(pointlist)-1):\n    segment=HitTargetSegment(pointlist[i:i+2],width,self.reference,i+1)\n    self.addObject(segment)\n  else :\n   pointsetlist=self.reference.pointsetList[:]\n   if isinstance(self.reference,(ClosedBezierObject,SmoothClosedBezierObject)):pointsetlist.append(pointsetlist[0])\n   for i in range(len(pointsetlist)-1):\n    ps0=[None ]+pointsetlist[i][1:]\n    ps1=pointsetlist[i+1][:-1]+[None ]\n    segment=BezierHitTargetSegment([ps0,ps1],width,self.reference,i+1)\n    self.addObject(segment)\n  self.canvas.deleteObject(self)\n  self.canvas.addObject(self)\n  \nclass Handle(PointObject):\n def __init__(self,owner,index,coords,colour,canvas):\n  pointsize=7 if canvas.mouseDetected else 15\n  opacity=0.4\n  strokewidth=3\n  PointObject.__init__(self,coords,colour,pointsize,canvas)\n  self.style.strokeWidth=strokewidth\n  self.style.fillOpacity=opacity\n  self.owner=owner\n  self.pointIndex=index\n  self.canvas=canvas\n  self.bind(\"mousedown\",self._select)\n  self.bind(\"touchstart\",self._select)\n  \n def _select(self,event):\n  if event.type ==\"mousedown\"and event.button >0:return\n  event.preventDefault()\n  event.stopPropagation()\n  if self.canvas.tool ==\"deletepoint\":\n   self.canvas._deletePoint(self.pointIndex)\n   return\n  self.canvas.startx=self.canvas.currentx=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  self.canvas.starty=self.canvas.currenty=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  self.canvas.mouseOwner=self\n  if isinstance(self.owner,BezierMixin):\n   if self.canvas.selectedhandle:\n    for ch in self.canvas.selectedhandle.controlHandles:ch.style.visibility=\"hidden\"\n   for ch in self.controlHandles:ch.style.visibility=\"visible\"\n  self.canvas.selectedhandle=self\n  \n def _movePoint(self,offset):\n  self.XY +=offset\n  if isinstance(self.owner,BezierMixin):\n   pointset=[None ,self.XY,None ]\n   for ch in self.controlHandles:\n    ch.XY +=offset\n    pointset[ch.subindex]=ch.XY\n   self.owner.setPointset(self.pointIndex,pointset)\n  else :\n   self.owner.setPoint(self.pointIndex,self.XY)\n   \nclass ControlHandle(PointObject):\n def __init__(self,owner,index,subindex,coords,colour,canvas):\n  pointsize=7 if canvas.mouseDetected else 15\n  opacity=0.4\n  strokewidth=3\n  PointObject.__init__(self,coords,colour,pointsize,canvas)\n  self.style.fillOpacity=opacity\n  self.style.strokeWidth=strokewidth\n  self.style.visibility=\"hidden\"\n  self.owner=owner\n  self.pointIndex=index\n  self.subindex=subindex\n  self.canvas=canvas\n  self.bind(\"mousedown\",self._select)\n  self.bind(\"touchstart\",self._select)\n  \n def _select(self,event):\n  event.stopPropagation()\n  self.canvas.startx=self.canvas.currentx=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  self.canvas.starty=self.canvas.currenty=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  self.canvas.mouseOwner=self\n  \n def _movePoint(self,offset):\n  self.XY +=offset\n  pointset=self.owner.pointsetList[self.pointIndex]\n  pointset[self.subindex]=self.XY\n  if self.linkedHandle:\n   point=pointset[1]\n   thisoffset=self.XY -point\n   otheroffset=self.linkedHandle.XY -point\n   newoffset=thisoffset *(otheroffset.length()/thisoffset.length())\n   newothercoords=point -newoffset\n   pointset[self.linkedHandle.subindex]=newothercoords\n   self.linkedHandle.XY=newothercoords\n  self.owner.setPointset(self.pointIndex,pointset)\n  \nnonbezier=[LineObject,RectangleObject,EllipseObject,CircleObject,SectorObject,PolylineObject,PolygonObject,ImageObject]\nfor cls in nonbezier:\n cls.__bases__=cls.__bases__+(NonBezierMixin,)\n \npolyshape=[PolylineObject,PolygonObject,SectorObject]\nfor cls in polyshape:\n cls.__bases__=cls.__bases__+(PolyshapeMixin,)\n \nbezier=[BezierObject,ClosedBezierObject,SmoothBezierObject,SmoothClosedBezierObject]\nfor cls in bezier:\n cls.__bases__=cls.__bases__+(BezierMixin,)\n \nCanvasObject.__bases__=CanvasObject.__bases__+(DrawCanvasMixin,)\n", ["brySVG.dragcanvas"]], "brySVG.dragcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n\n\n\n\nimport time\nfrom browser import document,alert,window\nimport browser.svg as svg\nimport browser.html as html\nfrom math import sin,cos,atan2,pi,hypot,floor,log10\nsvgbase=svg.svg(width=0,height=0)\nbasepoint=svgbase.createSVGPoint()\nlasttaptime=0\nMOUSEEVENTS=[\"mousedown\",\"mousemove\",\"mouseup\",\"click\"]\nTOUCHEVENTS=[\"touchstart\",\"touchmove\",\"touchend\"]\n\nclass Enum(list):\n def __init__(self,name,string):\n  values=string.split()\n  for i,value in enumerate(values):\n   setattr(self,value,i)\n   self.append(i)\n   \nMouseMode=Enum('MouseMode','NONE DRAG TRANSFORM DRAW EDIT PAN')\nTransformType=Enum('TransformType','NONE TRANSLATE ROTATE XSTRETCH YSTRETCH ENLARGE')\nPosition=Enum('Position','CONTAINS INSIDE OVERLAPS EQUAL DISJOINT')\n\nclass ObjectMixin(object):\n ''\n \n def cloneObject(self):\n  ''\n\n  \n  if isinstance(self,GroupObject):\n   newobject=self.__class__()\n   for obj in self.objectList:\n    if isinstance(obj,ObjectMixin):\n     newobj=obj.cloneObject()\n     newobject <=newobj\n     newobj.group=newobject\n     newobject.objectList.append(newobj)\n  elif isinstance(self,ObjectMixin):\n   if isinstance(self,ImageObject)and not self.imageloaded:raise RuntimeError(\"ImageObject cannot be cloned until fully loaded\")\n   \n   newobject=self.__class__()\n   for attrname in [\"XY\",\"pointList\",\"pointsetList\",\"angle\",\"fixed\",\"rotatestring\",\"centre\",\"_width\",\"_height\",\n   \"currentAspectRatio\",\"imageWidth\",\"imageHeight\",\"imageAspectRatio\",\"imageloaded\",\n   \"startangle\",\"endangle\",\"radius\"]:\n    attr=getattr(self,attrname,\"NO_SUCH_ATTRIBUTE\")\n    if attr ==\"NO_SUCH_ATTRIBUTE\":continue\n    newattr=list(attr)if isinstance(attr,list)else attr\n    setattr(newobject,attrname,newattr)\n  else :\n   return None\n   \n   \n  for key in self.attrs:\n   value=self.attrs[key]\n   newobject.attrs[key]=value\n  newobject.id=\"\"\n  return newobject\n  \n def setPointList(self,pointlist):\n  ''\n  self.pointList=[Point(coords)for coords in pointlist]\n  if isinstance(self,BezierObject):self.pointsetList=self._getpointsetlist(pointlist)\n  self._update()\n  self._updatehittarget()\n  \n def setStyle(self,attribute,value):\n  ''\n  self.style={attribute:value}\n  \n def _updatehittarget(self):\n  ''\n  hittarget=getattr(self,\"hitTarget\",None )\n  if hittarget:\n   hittarget.pointList=self.pointList\n   if isinstance(self,BezierObject):hittarget.pointsetList=self.pointsetList\n   if isinstance(self,(RectangleObject,EllipseObject,ImageObject,UseObject)):hittarget.angle=self.angle\n   hittarget._update()\n   \n def _transformedpointlist(self,matrix):\n  ''\n  newpointlist=[]\n  for point in self.pointList:\n   (basepoint.x,basepoint.y)=point\n   newpt=basepoint.matrixTransform(matrix)\n   newpointlist.append(Point((newpt.x,newpt.y)))\n  return newpointlist\n  \n def __repr__(self):\n  return f\"{self.__class__}{self.id}\"\n  \nclass SmoothBezierMixin(object):\n ''\n def _calculatecontrolpoints(self,points):\n  ''\n  [(x1,y1),(x2,y2),(x3,y3)]=points\n  (dx1,dy1)=((x2 -x1),(y2 -y1))\n  (dx3,dy3)=((x2 -x3),(y2 -y3))\n  d1=hypot(dx1,dy1)\n  d2=hypot(dx3,dy3)\n  if d1 ==0 or d2 ==0:return ((x2,y2),(x2,y2))\n  cos1,sin1=dx1 /d1,dy1 /d1\n  cos2,sin2=dx3 /d2,dy3 /d2\n  \n  (c1x,c1y)=(x2 -d1 *(cos1 -cos2)/2,y2 -d1 *(sin1 -sin2)/2)\n  (c2x,c2y)=(x2+d2 *(cos1 -cos2)/2,y2+d2 *(sin1 -sin2)/2)\n  c1=((c1x+x2)/2,(c1y+y2)/2)\n  c2=((c2x+x2)/2,(c2y+y2)/2)\n  return (Point(c1),Point(c2))\n  \n '''The following XxxObject classes share various common parameters and attributes.\n    ###Common Parameters\n    When created, as well as the paramters listed for each type of Object, they all share the following optional parameters:\n    `objid`: id of the object (for referencing in the document or using `canvas.getSelectedObject(id)`\n    (The following are not applicable to TextObject, WrappingTextObject, PointObject or UseObject)\n    `linecolour`: colour of the \"stroke\" or outline of the shape\n    `linewidth`: width of the outline of the shape (its \"stroke-width\")\n    `fillcolour`: colour of the interior of the shape (not applicable to LineObject). Use \"none\" if no fill desired.\n\n    ### Common Attributes\n    After creation and adding to the canvas using `canvas.addObject()`, they have following attributes:\n    `obj.fixed` (read/write): If set to `True`, the object cannot be dragged or transformed with the mouse (default `False`)\n    `obj.canvas` (read only): A reference to the canvas which contains the object\n    `obj.pointList` (read only): See individual object definitions for its meaning. (Not applicable to TextObject, WrappingTextObject or PointObject.)\n\n    They also share the following methods:\n    `obj.setPointList()`, `obj.setStyle()`, `obj.cloneObject`\n    '''\nclass LineObject(svg.line,ObjectMixin):\n ''\n\n \n def __init__(self,pointlist=[(0,0),(0,0)],style=\"solid\",linecolour=\"black\",linewidth=1,fillcolour=\"none\",objid=None ):\n  [(x1,y1),(x2,y2)]=pointlist\n  \n  if style ==\"faintdash1\":\n   dasharray=\"10,5\"\n   linecolour=\"grey\"\n  elif style ==\"faintdash2\":\n   dasharray=\"2,2\"\n   linecolour=\"lightgrey\"\n  else :\n   dasharray=None\n   \n  svg.line.__init__(self,x1=x1,y1=y1,x2=x2,y2=y2,style={\"stroke\":linecolour,\"strokeDasharray\":dasharray,\"stroke-width\":linewidth,\"fill\":\"none\"})\n  self.pointList=[Point(coords)for coords in pointlist]\n  if objid:self.id=objid\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  self.attrs[\"x1\"]=x1\n  self.attrs[\"y1\"]=y1\n  self.attrs[\"x2\"]=x2\n  self.attrs[\"y2\"]=y2\n  \nclass TextObject(svg.text,ObjectMixin):\n ''\n\n\n\n\n \n def __init__(self,string=\"\",anchorpoint=(0,0),anchorposition=1,fontsize=12,style=\"normal\",ignorescaling=False ,canvas=None ,objid=None ):\n  (x,y)=anchorpoint\n  stringlist=string.split(\"\\n\")\n  rowcount=len(stringlist)\n  if anchorposition in [3,6,9]:\n   horizpos=\"end\"\n  elif anchorposition in [2,5,8]:\n   horizpos=\"middle\"\n  else :\n   horizpos=\"start\"\n  lineheight=fontsize *1.2\n  if ignorescaling and canvas:\n   fontsize *=canvas.scaleFactor\n   lineheight *=canvas.scaleFactor\n  if anchorposition in [1,2,3]:\n   yoffset=fontsize\n  elif anchorposition in [4,5,6]:\n   yoffset=fontsize -lineheight *rowcount /2\n  else :\n   yoffset=fontsize -lineheight *rowcount\n   \n  svg.text.__init__(self,stringlist[0],x=x,y=y+yoffset,font_size=fontsize,text_anchor=horizpos)\n  for s in stringlist[1:]:\n   self <=svg.tspan(s,x=x,dy=lineheight)\n  if objid:self.id=objid\n  \nclass WrappingTextObject(svg.text):\n ''\n \n def __init__(self,canvas,string,anchorpoint,width,anchorposition=1,fontsize=12,style=\"normal\",ignorescaling=False ,objid=None ):\n  (x,y)=anchorpoint\n  lineheight=fontsize *1.2\n  if ignorescaling:\n   fontsize *=canvas.scaleFactor\n   lineheight *=canvas.scaleFactor\n  words=string.split()\n  svg.text.__init__(self,\"\",x=x,font_size=fontsize)\n  canvas <=self\n  tspan=svg.tspan(words.pop(0),x=x,dy=0)\n  self <=tspan\n  rowcount=1\n  for word in words:\n   tspan.text +=\" \"+word\n   if tspan.getComputedTextLength()>width:\n    tspan.text=tspan.text[:-len(word)-1]\n    tspan=svg.tspan(word,x=x,dy=lineheight)\n    self <=tspan\n    rowcount +=1\n    \n  if anchorposition in [3,6,9]:\n   horizpos=\"end\"\n  elif anchorposition in [2,5,8]:\n   horizpos=\"middle\"\n  else :\n   horizpos=\"start\"\n  self.attrs[\"text-anchor\"]=horizpos\n  if anchorposition in [1,2,3]:\n   yoffset=fontsize\n  elif anchorposition in [4,5,6]:\n   yoffset=fontsize *(1 -rowcount /2)\n  else :\n   yoffset=fontsize *(1 -rowcount)\n  self.attrs[\"y\"]=y+yoffset\n  if objid:self.id=objid\n  \nclass PolylineObject(svg.polyline,ObjectMixin):\n ''\n \n def __init__(self,pointlist=[(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"none\",objid=None ):\n  svg.polyline.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self.pointList=[Point(coords)for coords in pointlist]\n  self._update()\n  if objid:self.id=objid\n  \n def _update(self):\n  self.attrs[\"points\"]=\" \".join([str(point[0])+\",\"+str(point[1])for point in self.pointList])\n  \nclass PolygonObject(svg.polygon,ObjectMixin):\n ''\n \n def __init__(self,pointlist=[(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  svg.polygon.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self.attrs[\"points\"]=\" \".join([str(point[0])+\",\"+str(point[1])for point in pointlist])\n  if objid:self.id=objid\n  \n def _update(self):\n  self.attrs[\"points\"]=\" \".join([str(point[0])+\",\"+str(point[1])for point in self._pointList])\n  \n def __repr__(self):\n  return f\"polygon {self.id}\"if self.id else f\"polygon {id(self)}\"\n  \n def __str__(self):\n  return self.__repr__()\n  \n @property\n def pointList(self):\n  if getattr(self,\"_pointList\",None )is None :\n  \n   P=self.points\n   L=P.numberOfItems\n   self._pointList=[Point([P.getItem(i).x,P.getItem(i).y])for i in range(L)]\n  return self._pointList\n  \n @pointList.setter\n def pointList(self,pointlist):\n  self._pointList=[Point(coords)for coords in pointlist]\n  self._update()\n  \n def setPointList(self,pointlist):\n  self._pointList=[Point(coords)for coords in pointlist]\n  self._update()\n  \n def cloneObject(self):\n  newobject=self.__class__()\n  for key in self.attrs:\n   value=self.attrs[key]\n   newobject.attrs[key]=value\n  newobject.id=\"\"\n  \n  P=self.points\n  P2=newobject.points\n  L=P.numberOfItems\n  P2.clear()\n  for i in range(L):\n   pt=P.getItem(i)\n   P2.appendItem(pt)\n   \n  return newobject\n  \n def _transformpoints(self,points,matrix):\n  L=points.numberOfItems\n  for i in range(L):\n   pt=points.getItem(i)\n   newpt=pt.matrixTransform(matrix)\n   points.replaceItem(newpt,i)\n   \nclass RectangleObject(svg.rect,ObjectMixin):\n ''\n\n\n\n\n\n\n\n\n \n def __init__(self,pointlist=None ,centre=(0,0),width=0,height=None ,angle=0,linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  svg.rect.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self.angle=angle\n  if pointlist:\n   self.setPointList(pointlist)\n  else :\n   self.centre=Point(centre)\n   if not height:height=width\n   if height and not width:width=height\n   self._width=width\n   self._height=height\n   self.setPosition()\n  if objid:self.id=objid\n  \n def setPosition(self,centre=None ,width=None ,height=None ,angle=None ,preserveaspectratio=False ):\n  ''\n\n  \n  if centre:self.centre=Point(centre)\n  if width:\n   self._width=width\n   if preserveaspectratio and not height:self._height=width *self.currentAspectRatio\n  if height:\n   self._height=height\n   if preserveaspectratio and not width:self._width=height /self.currentAspectRatio\n  if angle is not None :self.angle=angle\n  \n  (cx,cy)=self.centre\n  self.pointList=[(cx -self._width /2,cy -self._height /2),(cx+self._width /2,cy+self._height /2)]\n  t=svgbase.createSVGTransform()\n  t.setRotate(self.angle,cx,cy)\n  self.pointList=self._transformedpointlist(t.matrix)\n  self._update()\n  self._updatehittarget()\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  (cx,cy)=((x1+x2)/2,(y1+y2)/2)\n  self.centre=Point((cx,cy))\n  self.rotatestring=self.style.transform=f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n  \n  t=svgbase.createSVGTransform()\n  t.setRotate(-self.angle,cx,cy)\n  basepointlist=self._transformedpointlist(t.matrix)\n  [(x1,y1),(x2,y2)]=basepointlist\n  self._width=abs(x2 -x1)\n  self._height=abs(y2 -y1)\n  if self._width !=0:self.currentAspectRatio=self._height /self._width\n  self.attrs[\"x\"]=x2 if x2 <x1 else x1\n  self.attrs[\"y\"]=y2 if y2 <y1 else y1\n  self.attrs[\"width\"]=self._width\n  self.attrs[\"height\"]=self._height\n  \nclass EllipseObject(svg.ellipse,ObjectMixin):\n ''\n\n\n\n\n\n\n\n\n\n \n def __init__(self,pointlist=None ,centre=(0,0),width=0,height=None ,angle=0,linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  svg.ellipse.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self.angle=angle\n  if pointlist:\n   self.setPointList(pointlist)\n  else :\n   self.centre=Point(centre)\n   if not height:height=width\n   if height and not width:width=height\n   self._width=width\n   self._height=height\n   self.setPosition()\n  if objid:self.id=objid\n  \n def setPosition(self,centre=None ,width=None ,height=None ,angle=None ,preserveaspectratio=False ):\n  ''\n\n  \n  if centre:self.centre=Point(centre)\n  if width:\n   self._width=width\n   if preserveaspectratio and not height:self._height=width *self.currentAspectRatio\n  if height:\n   self._height=height\n   if preserveaspectratio and not width:self._width=height /self.currentAspectRatio\n  if angle is not None :self.angle=angle\n  \n  (cx,cy)=self.centre\n  self.pointList=[(cx -self._width /2,cy -self._height /2),(cx+self._width /2,cy+self._height /2)]\n  t=svgbase.createSVGTransform()\n  t.setRotate(self.angle,cx,cy)\n  self.pointList=self._transformedpointlist(t.matrix)\n  self._update()\n  self._updatehittarget()\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  (cx,cy)=((x1+x2)/2,(y1+y2)/2)\n  self.centre=Point((cx,cy))\n  self.rotatestring=self.style.transform=f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n  \n  t=svgbase.createSVGTransform()\n  t.setRotate(-self.angle,cx,cy)\n  basepointlist=self._transformedpointlist(t.matrix)\n  [(x1,y1),(x2,y2)]=basepointlist\n  self._width=abs(x2 -x1)\n  self._height=abs(y2 -y1)\n  if self._width !=0:self.currentAspectRatio=self._height /self._width\n  self.attrs[\"cx\"]=(x1+x2)/2\n  self.attrs[\"cy\"]=(y1+y2)/2\n  self.attrs[\"rx\"]=self._width /2\n  self.attrs[\"ry\"]=self._height /2\n  \nclass CircleObject(svg.circle,ObjectMixin):\n ''\n\n \n def __init__(self,centre=(0,0),radius=0,pointlist=None ,linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  if pointlist:\n   self.pointList=[Point(coords)for coords in pointlist]\n  else :\n   (x,y)=centre\n   self.pointList=[Point((x,y)),Point((x+radius,y))]\n  svg.circle.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self._update()\n  if objid:self.id=objid\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  self.attrs[\"cx\"]=x1\n  self.attrs[\"cy\"]=y1\n  self.attrs[\"r\"]=hypot(x2 -x1,y2 -y1)\n  \nclass SectorObject(svg.path,ObjectMixin):\n def __init__(self,centre=(0,0),radius=0,startangle=0,endangle=0,pointlist=None ,linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  self.centre=Point(centre)\n  self.radius=radius\n  self.startangle=startangle\n  self.endangle=endangle\n  if pointlist:\n   self.pointList=pointlist\n  else :\n   (cx,cy)=centre\n   point1=Point((cx+radius *sin(startangle *pi /180),cy -radius *cos(startangle *pi /180)))\n   point2=Point((cx+radius *sin(endangle *pi /180),cy -radius *cos(endangle *pi /180)))\n   self.pointList=[self.centre,point1,point2]\n  svg.path.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  self._update()\n  if objid:self.id=objid\n  \n def _update(self):\n  [(x0,y0),(x1,y1)]=self.pointList[:2]\n  (x2,y2)=self.pointList[-1]\n  r=hypot(x1 -x0,y1 -y0)\n  largeArcFlag=1 if (self.endangle -self.startangle)%360 >180 else 0\n  self.attrs[\"d\"]=f\"M {x0} {y0} L {x1} {y1} A {r} {r} 0 {largeArcFlag} 1 {x2} {y2} Z\"\n  \nclass UseObject(svg.use,ObjectMixin):\n ''\n\n\n\n\n\n\n\n\n \n def __init__(self,href=None ,origin=None ,centre=(0,0),width=None ,height=None ,angle=0,scale=None ,objid=None ):\n  svg.use.__init__(self,href=href)\n  document <=svgbase\n  tempgroup=svg.g()\n  tempgroup <=self\n  svgbase <=tempgroup\n  bbox=tempgroup.getBBox()\n  svgbase.removeChild(tempgroup)\n  document.body.removeChild(svgbase)\n  self._origwidth=bbox.width\n  self._origheight=bbox.height\n  self._origaspectratio=self._origheight /self._origwidth\n  (cx,cy)=(bbox.x+bbox.width /2,bbox.y+bbox.height /2)\n  self.originoffset=Point((-cx,-cy))\n  \n  if width and height:\n   (self._width,self._height)=(width,height)\n  elif width:\n   (self._width,self._height)=(width,width *self._origaspectratio)\n  elif height:\n   (self._width,self._height)=(height /self._origaspectratio,height)\n  else :\n   (self._width,self._height)=(self._origwidth,self._origheight)\n   \n   \n  if origin:\n   scalefactors=(self._width /self._origwidth,self._height /self._origheight)\n   self.centre=Point(origin)-self.originoffset *scalefactors\n  else :\n   self.centre=Point(centre)\n  self.angle=angle\n  self.setPosition()\n  if objid:self.id=objid\n  \n def setPosition(self,origin=None ,centre=None ,width=None ,height=None ,angle=None ,preserveaspectratio=False ):\n  ''\n\n\n  \n  if width:\n   self._width=width\n   if preserveaspectratio and not height:self._height=width *self.currentAspectRatio\n  if height:\n   self._height=height\n   if preserveaspectratio and not width:self._width=height /self.currentAspectRatio\n  if self._width !=0:self.currentAspectRatio=self._height /self._width\n  \n  if origin:\n   scalefactors=(self._width /self._origwidth,self._height /self._origheight)\n   self.centre=Point(origin)-self.originoffset *scalefactors\n  elif centre:\n   self.centre=Point(centre)\n  if angle is not None :self.angle=angle\n  \n  (cx,cy)=self.centre\n  self.pointList=[(cx -self._width /2,cy -self._height /2),(cx+self._width /2,cy+self._height /2)]\n  t=svgbase.createSVGTransform()\n  t.setRotate(self.angle,cx,cy)\n  self.pointList=self._transformedpointlist(t.matrix)\n  self._update()\n  self._updatehittarget()\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  (cx,cy)=((x1+x2)/2,(y1+y2)/2)\n  self.centre=Point((cx,cy))\n  self.rotatestring=f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n  (xscale,yscale)=(self._width /self._origwidth,self._height /self._origheight)\n  self.scalestring=f\"translate({cx}px,{cy}px) scale({xscale},{yscale}) translate({-cx}px,{-cy}px)\"\n  self.style.transform=self.rotatestring+self.scalestring\n  self.origin=self.centre+self.originoffset\n  (self.attrs[\"x\"],self.attrs[\"y\"])=self.origin\n  \nclass ImageObject(svg.image,ObjectMixin):\n ''\n\n\n\n\n\n\n\n\n\n \n def __init__(self,href=None ,pointlist=None ,centre=(0,0),width=0,height=None ,angle=0,objid=None ):\n  def initialise(event):\n   nonlocal width,height\n   self.imageWidth=img.naturalWidth\n   self.imageHeight=img.naturalHeight\n   \n   self.imageAspectRatio=self.imageHeight /self.imageWidth\n   \n   self.attrs[\"preserveAspectRatio\"]=\"none\"\n   self.angle=angle\n   if pointlist:\n    self.setPointList(pointlist)\n   else :\n    self.centre=Point(centre)\n    if not width and not height:\n     width=self.imageWidth\n     height=self.imageHeight\n    elif not height:\n     height=width *self.imageAspectRatio\n    elif not width:\n     width=height /self.imageAspectRatio\n    self._width=width\n    self._height=height\n    self._setuppointlist()\n   self.style.visibility=\"visible\"\n   self.imageloaded=True\n   loadcomplete=window.Event.new(\"loadcomplete\")\n   self.dispatchEvent(loadcomplete)\n   \n  super().__init__()\n  if objid:self.id=objid\n  self.imageloaded=False\n  self.style.visibility=\"hidden\"\n  if not href:return\n  self.attrs[\"href\"]=href\n  img=html.IMG()\n  img.bind(\"load\",initialise)\n  img.attrs[\"src\"]=href\n  \n def setPosition(self,centre=None ,width=None ,height=None ,angle=None ,preserveaspectratio=False ):\n  ''\n\n  \n  def set_position(event=None ):\n  \n   if centre:self.centre=Point(centre)\n   if width:\n    self._width=width\n    if preserveaspectratio and not height:self._height=width *self.currentAspectRatio\n   if height:\n    self._height=height\n    if preserveaspectratio and not width:self._width=height /self.currentAspectRatio\n   if angle is not None :self.angle=angle\n   self._setuppointlist()\n   \n  if self.imageloaded:\n   set_position()\n  else :\n   self.bind(\"loadcomplete\",set_position)\n   \n def _setuppointlist(self):\n  (cx,cy)=self.centre\n  self.pointList=[(cx -self._width /2,cy -self._height /2),(cx+self._width /2,cy+self._height /2)]\n  t=svgbase.createSVGTransform()\n  t.setRotate(self.angle,cx,cy)\n  self.pointList=self._transformedpointlist(t.matrix)\n  self._update()\n  self._updatehittarget()\n  \n def _update(self):\n  [(x1,y1),(x2,y2)]=self.pointList\n  (cx,cy)=((x1+x2)/2,(y1+y2)/2)\n  self.centre=Point((cx,cy))\n  self.rotatestring=self.style.transform=f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n  \n  t=svgbase.createSVGTransform()\n  t.setRotate(-self.angle,cx,cy)\n  basepointlist=self._transformedpointlist(t.matrix)\n  [(x1,y1),(x2,y2)]=basepointlist\n  self._width=abs(x2 -x1)\n  self._height=abs(y2 -y1)\n  if self._width !=0:self.currentAspectRatio=self._height /self._width\n  self.attrs[\"x\"]=x2 if x2 <x1 else x1\n  self.attrs[\"y\"]=y2 if y2 <y1 else y1\n  self.attrs[\"width\"]=self._width\n  self.attrs[\"height\"]=self._height\n  \nclass BezierObject(svg.path,ObjectMixin):\n ''\n\n\n\n\n \n def __init__(self,pointsetlist=None ,pointlist=[(0,0),(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"none\",objid=None ):\n  def toPoint(coords):\n   return None if coords is None else Point(coords)\n  svg.path.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  if pointsetlist:\n   self.pointList=[Point(pointset[1])for pointset in pointsetlist]\n  else :\n   self.pointList=[Point(coords)for coords in pointlist]\n   pointsetlist=self._getpointsetlist(self.pointList)\n  self.pointsetList=[[toPoint(coords)for coords in pointset]for pointset in pointsetlist]\n  self._update()\n  if objid:self.id=objid\n  \n def _getpointsetlist(self,pointlist):\n  pointsetlist=[[None ,pointlist[0],(pointlist[0]+pointlist[1])/2]]\n  for i in range(1,len(pointlist)-1):\n   pointsetlist.append([(pointlist[i -1]+pointlist[i])/2,pointlist[i],(pointlist[i]+pointlist[i+1])/2])\n  pointsetlist.append([(pointlist[-2]+pointlist[-1])/2,pointlist[-1],None ])\n  return pointsetlist\n  \n def _updatepointsetlist(self):\n  if len(self.pointList)==2:\n   self.pointsetList=[[None ]+self.pointList,self.pointList+[None ]]\n  else :\n   cpoint=(self.pointList[-1]+self.pointList[-2])/2\n   self.pointsetList[-1]=[cpoint,self.pointList[-1],None ]\n   self.pointsetList[-2][2]=cpoint\n   \n def _update(self):\n  (dummy,(x1,y1),(c1x,c1y))=self.pointsetList[0]\n  ((c2x,c2y),(x2,y2),dummy)=self.pointsetList[-1]\n  self.plist=[\"M\",x1,y1,\"C\",c1x,c1y]+[x for p in self.pointsetList[1:-1]for c in p for x in c]+[c2x,c2y,x2,y2]\n  self.attrs[\"d\"]=\" \".join(str(x)for x in self.plist)\n  \nclass ClosedBezierObject(BezierObject):\n ''\n\n\n\n \n def __init__(self,pointsetlist=None ,pointlist=[(0,0),(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  svg.path.__init__(self,style={\"stroke\":linecolour,\"stroke-width\":linewidth,\"fill\":fillcolour})\n  if pointsetlist:\n   self.pointList=[Point(pointset[1])for pointset in pointsetlist]\n  else :\n   self.pointList=[Point(coords)for coords in pointlist]\n   pointsetlist=self._getpointsetlist(self.pointList)\n  self.pointsetList=[[Point(coords)for coords in pointset]for pointset in pointsetlist]\n  self._update()\n  if objid:self.id=objid\n  \n def _getpointsetlist(self,pointlist):\n  pointsetlist=[[(pointlist[0]+pointlist[-1])/2,pointlist[0],(pointlist[0]+pointlist[1])/2]]\n  for i in range(1,len(pointlist)-1):\n   pointsetlist.append([(pointlist[i -1]+pointlist[i])/2,pointlist[i],(pointlist[i]+pointlist[i+1])/2])\n  pointsetlist.append([(pointlist[-2]+pointlist[-1])/2,pointlist[-1],(pointlist[0]+pointlist[-1])/2])\n  return pointsetlist\n  \n def _updatepointsetlist(self):\n  if len(self.pointList)==2:\n   self.pointsetList=self._getpointsetlist(self.pointList)\n  else :\n   cpoint1,cpoint2=(self.pointList[-1]+self.pointList[-2])/2,(self.pointList[-1]+self.pointList[0])/2\n   self.pointsetList[-1]=(cpoint1,self.pointList[-1],cpoint2)\n   self.pointsetList[-2][2]=cpoint1\n   self.pointsetList[0][0]=cpoint2\n   \n def _update(self):\n  ((c1x,c1y),(x,y),(c2x,c2y))=self.pointsetList[0]\n  self.plist=[\"M\",x,y,\"C\",c2x,c2y]+[x for p in self.pointsetList[1:]for c in p for x in c]+[c1x,c1y,x,y]\n  self.attrs[\"d\"]=\" \".join(str(x)for x in self.plist)\n  \nclass SmoothBezierObject(SmoothBezierMixin,BezierObject):\n ''\n\n \n def __init__(self,pointlist=[(0,0),(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"none\",objid=None ):\n  self.pointList=[Point(coords)for coords in pointlist]\n  pointsetlist=self._getpointsetlist(self.pointList)\n  BezierObject.__init__(self,pointsetlist,linecolour=linecolour,linewidth=linewidth,fillcolour=fillcolour,objid=objid)\n  \n def _getpointsetlist(self,pointlist):\n  if len(pointlist)==2:return [[None ]+pointlist,pointlist+[None ]]\n  for i in range(1,len(pointlist)-1):\n   (c1,c2)=self._calculatecontrolpoints(pointlist[i -1:i+2])\n   if i ==1:\n    pointsetlist=[[None ,pointlist[0],(pointlist[0]+c1)/2]]\n   pointsetlist.append([c1,pointlist[i],c2])\n  pointsetlist.append([(pointlist[-1]+c2)/2,pointlist[-1],None ])\n  return pointsetlist\n  \n def _updatepointsetlist(self):\n  if len(self.pointList)==2:\n   self.pointsetList=[[None ]+self.pointList,self.pointList+[None ]]\n  else :\n   (c1,c2)=self._calculatecontrolpoints(self.pointList[-3:])\n   self.pointsetList[-1]=[(self.pointList[-1]+c2)/2,self.pointList[-1],None ]\n   self.pointsetList[-2]=[c1,self.pointList[-2],c2]\n   \nclass SmoothClosedBezierObject(SmoothBezierMixin,ClosedBezierObject):\n ''\n\n\n \n def __init__(self,pointlist=[(0,0),(0,0)],linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  self.pointList=[Point(coords)for coords in pointlist]\n  pointsetlist=self._getpointsetlist(self.pointList)\n  ClosedBezierObject.__init__(self,pointsetlist,linecolour=linecolour,linewidth=linewidth,fillcolour=fillcolour,objid=objid)\n  \n def _getpointsetlist(self,pointlist):\n  pointlist=[pointlist[-1]]+pointlist[:]+[pointlist[0]]\n  pointsetlist=[]\n  for i in range(1,len(pointlist)-1):\n   (c1,c2)=self._calculatecontrolpoints(pointlist[i -1:i+2])\n   pointsetlist.append([c1,pointlist[i],c2])\n  return pointsetlist\n  \n def _updatepointsetlist(self):\n  if len(self.pointList)==2:\n   self.pointsetList=self._getpointsetlist(self.pointList)\n  else :\n   L=len(self.pointList)\n   pointlist=self.pointList[:]+self.pointList[:2]\n   for j in range(L -2,L+1):\n    (c1,c2)=self._calculatecontrolpoints(pointlist[j -1:j+2])\n    self.pointsetList[j %L]=[c1,pointlist[j],c2]\n    \nclass PointObject(svg.circle,ObjectMixin):\n ''\n\n \n def __init__(self,XY=(0,0),colour=\"black\",pointsize=2,canvas=None ,objid=None ):\n  (x,y)=XY\n  sf=canvas.scaleFactor if canvas else 1\n  svg.circle.__init__(self,cx=x,cy=y,r=pointsize *sf,style={\"stroke\":colour,\"stroke-width\":1,\"fill\":colour,\"vector-effect\":\"non-scaling-stroke\"})\n  self._XY=None\n  self.XY=Point(XY)\n  if objid:self.id=objid\n  \n def _update(self):\n  pass\n  \n @property\n def XY(self):\n  return self._XY\n  \n @XY.setter\n def XY(self,XY):\n  self._XY=Point(XY)\n  self.attrs[\"cx\"]=self._XY[0]\n  self.attrs[\"cy\"]=self._XY[1]\n  \nclass RegularPolygon(PolygonObject):\n ''\n\n\n\n \n def __init__(self,sidecount=0,centre=None ,radius=None ,startpoint=None ,sidelength=None ,offsetangle=0,linecolour=\"black\",linewidth=1,fillcolour=\"yellow\",objid=None ):\n  pointlist=[]\n  if sidecount >0:\n   angle=2 *pi /sidecount\n   radoffset=offsetangle *pi /180\n   if not radius:radius=sidelength /(2 *sin(pi /sidecount))\n   if not centre:\n    (x,y)=startpoint\n    centre=(x -radius *sin(radoffset),y+radius *cos(radoffset))\n   (cx,cy)=centre\n   for i in range(sidecount):\n    t=radoffset+i *angle\n    pointlist.append(Point((cx+radius *sin(t),cy -radius *cos(t))))\n  PolygonObject.__init__(self,pointlist,linecolour,linewidth,fillcolour,objid)\n  if objid:self.id=objid\n  \nclass GroupObject(svg.g,ObjectMixin):\n ''\n\n\n\n\n\n\n\n \n def __init__(self,objlist=[],objid=None ):\n  svg.g.__init__(self)\n  if not isinstance(objlist,list):objlist=[objlist]\n  self.objectList=[]\n  self._canvas=None\n  for obj in objlist:\n   self.addObject(obj)\n  if objid:self.id=objid\n  \n def addObject(self,svgobject):\n  canvas=self.canvas\n  if canvas is not None :canvas.addObject(svgobject)\n  self <=svgobject\n  svgobject.group=self\n  self.objectList.append(svgobject)\n  \n def addObjects(self,objectlist):\n  canvas=self.canvas\n  for obj in objectlist:\n   if canvas is not None :canvas.addObject(obj)\n   self <=obj\n   obj.group=self\n   self.objectList.append(obj)\n   \n def _update(self):\n  pass\n  \n def removeObject(self,svgobject):\n  if not self.contains(svgobject):return\n  self.removeChild(svgobject)\n  self.objectList.remove(svgobject)\n  svgobject.group=None\n  try :\n   del self.canvas.objectDict[svgobject.id]\n  except (AttributeError,KeyError):\n   pass\n   \n def deleteAll(self):\n  if self.canvas:\n   for obj in self.objectList:del self.canvas.objectDict[obj.id]\n  while self.firstChild:self.removeChild(self.firstChild)\n  self.objectList=[]\n  \n def setStyle(self,attribute,value):\n  for obj in self.objectList:\n   obj.setStyle(attribute,value)\n   \n @property\n def canvas(self):\n  return self._canvas\n  \n @canvas.setter\n def canvas(self,canvas):\n  self._canvas=canvas\n  for obj in self.objectList:obj.canvas=canvas\n  \n @property\n def fixed(self):\n  return self._fixed\n  \n @fixed.setter\n def fixed(self,fixedvalue):\n  self._fixed=fixedvalue\n  for obj in self.objectList:obj.fixed=fixedvalue\n  \nclass Button(GroupObject):\n ''\n\n\n\n\n\n\n\n \n def __init__(self,position,size,text,onclick,fontsize=None ,fillcolour=\"lightgrey\",canvas=None ,objid=None ):\n  GroupObject.__init__(self)\n  if objid:self.id=objid\n  (x,y),(width,height)=position,size\n  self.button=RectangleObject([(x,y),(x+width,y+height)],fillcolour=fillcolour)\n  self.button.attrs[\"rx\"]=height /3\n  rowcount=text.count(\"\\n\")+1\n  if not fontsize:fontsize=height *0.75 /rowcount\n  self.label=TextObject(text,(x+width /2,y+height /2 -fontsize /8),anchorposition=5,fontsize=fontsize)\n  self.addObjects([self.button,self.label])\n  self.fixed=True\n  self.bind(\"mousedown\",self._onMouseDown)\n  self.bind(\"mouseup\",self._onMouseUp)\n  self.bind(\"click\",onclick)\n  self.bind(\"touchstart\",onclick)\n  self.attrs[\"cursor\"]=\"pointer\"\n  \n def _onMouseDown(self,event):\n  event.stopPropagation()\n  \n def _onMouseUp(self,event):\n  event.stopPropagation()\n  \n def setFillColour(self,colour):\n  self.button.style.fill=colour\n  \nclass ImageButton(GroupObject):\n ''\n\n\n \n def __init__(self,position,size,image,onclick,fontsize=None ,fillcolour=\"lightgrey\",canvas=None ,objid=None ):\n  GroupObject.__init__(self)\n  if objid:self.id=objid\n  (x,y),(width,height)=position,size\n  self.button=RectangleObject([(x,y),(x+width,y+height)],fillcolour=fillcolour)\n  self.button.attrs[\"rx\"]=height /3\n  image.style.transform=f\"translate({x+width/2}px,{y+height/2}px)\"\n  if canvas:\n   canvas <=image\n   bbox=image.getBBox()\n   canvas.removeChild(image)\n   scalefactor=min(width /bbox.width,height /bbox.height)*0.7\n   image.style.transform +=f\" scale({scalefactor})\"\n  self.addObjects([self.button,image])\n  self.fixed=True\n  self.bind(\"mousedown\",self._onMouseDown)\n  self.bind(\"mouseup\",self._onMouseUp)\n  self.bind(\"click\",onclick)\n  self.bind(\"touchstart\",onclick)\n  self.attrs[\"cursor\"]=\"pointer\"\n  \n def _onMouseDown(self,event):\n  event.stopPropagation()\n  \n def _onMouseUp(self,event):\n  event.stopPropagation()\n  \n def setFillColour(self,colour):\n  self.button.style.fill=colour\n  \nclass Definitions(svg.defs):\n ''\n\n \n def __init__(self,objlist=[],filename=None ):\n  svg.defs.__init__(self)\n  if filename:\n   self.innerHTML=open(filename).read()\n  for obj in objlist:self <=obj\n  \nclass CanvasObject(svg.svg):\n ''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n \n \n def __init__(self,width=None ,height=None ,colour=\"white\",objid=None ):\n  svg.svg.__init__(self,style={\"backgroundColor\":colour})\n  if width:self.style.width=width\n  if height:self.style.height=height\n  self.id=objid if objid else f\"canvas{id(self)}\"\n  self.objectDict={}\n  \n  \n  self.mouseMode=MouseMode.NONE\n  self.vertexSnap=False\n  self.snapDistance=10\n  self.lineWidthScaling=True\n  \n  self.edgeSnap=False\n  self.snapAngle=10\n  self.transformTypes=TransformType\n  self.penColour=\"black\"\n  self.fillColour=\"yellow\"\n  self.penWidth=3\n  \n  \n  self.scaleFactor=1\n  self.mouseDetected=False\n  self.mouseOwner=None\n  self.selectedObject=None\n  self.dragStartCoords=None\n  self.viewWindow=None\n  self.tool=\"select\"\n  \n  \n  self.panning=False\n  self.centre=None\n  self.nextid=0\n  self.objectDict={}\n  self.hittargets=[]\n  self.handles=None\n  self.controlhandles=None\n  self.transformHandles=[]\n  self.selectedhandle=None\n  self.transformorigin=None\n  self.transformBBox=RectangleObject(linecolour=\"blue\",fillcolour=\"none\")\n  self.transformBBox.style.vectorEffect=\"non-scaling-stroke\"\n  self.rotateLine=LineObject(linecolour=\"blue\")\n  self.rotateLine.style.vectorEffect=\"non-scaling-stroke\"\n  self.attrs[\"preserveAspectRatio\"]=\"xMidYMid meet\"\n  \n  self.bind(\"mousedown\",self._onMouseDown)\n  self.bind(\"mousemove\",self._onMouseMove)\n  self.bind(\"mouseup\",self._onLeftUp)\n  self.bind(\"touchstart\",self._onTouchStart)\n  self.bind(\"touchmove\",self._onMouseMove)\n  self.bind(\"touchend\",self._onLeftUp)\n  self.bind(\"dragstart\",self._onDragStart)\n  self.bind(\"dblclick\",self._onDoubleClick)\n  self.bind(\"contextmenu\",self._onRightClick)\n  self.bind(\"wheel\",self._onWheel)\n  document.bind(\"keydown\",self._onKeyDown)\n  \n  \n def setViewBox(self,pointlist):\n  ''\n\n\n  \n  ((x1,y1),(x2,y2))=pointlist\n  self.attrs[\"viewBox\"]=f\"{x1} {y1} {x2-x1} {y2-y1}\"\n  self.viewBoxRect=[Point((x1,y1)),Point((x2,y2))]\n  self.centre=Point(((x1+x2)/2,(y1+y2)/2))\n  self.xScaleFactor,self.yScaleFactor=self._getScaleFactors()\n  self.scaleFactor=max(self.xScaleFactor,self.yScaleFactor)\n  bcr=self.getBoundingClientRect()\n  pt=self.createSVGPoint()\n  (pt.x,pt.y)=(bcr.left,bcr.top)\n  SVGpt=pt.matrixTransform(self.getScreenCTM().inverse())\n  (x1,y1)=(SVGpt.x,SVGpt.y)\n  (pt.x,pt.y)=(bcr.left+bcr.width,bcr.top+bcr.height)\n  SVGpt=pt.matrixTransform(self.getScreenCTM().inverse())\n  (x2,y2)=(SVGpt.x,SVGpt.y)\n  self.viewWindow=[Point((x1,y1)),Point((x2,y2))]\n  return self.viewWindow\n  \n def _getDimensions(self):\n  ''\n\n  \n  bcr=self.getBoundingClientRect()\n  self.attrs[\"width\"]=bcr.width\n  self.attrs[\"height\"]=bcr.height\n  return bcr.width,bcr.height\n  \n def fitContents(self):\n  ''\n  \n  bbox=self.getBBox()\n  if bbox.width ==0 or bbox.height ==0:return\n  wmargin,hmargin=bbox.width /50,bbox.height /50\n  self.viewWindow=self.setViewBox(((bbox.x -wmargin,bbox.y -hmargin),(bbox.x+bbox.width+wmargin,bbox.y+bbox.height+hmargin)))\n  return self.viewWindow\n  \n def getSVGcoords(self,event):\n  ''\n  x=event.changedTouches[0].clientX if \"touch\"in event.type else event.clientX\n  y=event.changedTouches[0].clientY if \"touch\"in event.type else event.clientY\n  pt=self.createSVGPoint()\n  (pt.x,pt.y)=(x,y)\n  SVGpt=pt.matrixTransform(self.getScreenCTM().inverse())\n  return Point((SVGpt.x,SVGpt.y))\n  \n def addObject(self,svgobject,fixed=False ):\n  ''\n\n\n\n\n\n  \n  def AddToDict(svgobj):\n   if not svgobj.id:\n    svgobj.id=f\"{self.id}_id{self.nextid}\"\n    self.nextid +=1\n   self.objectDict[svgobj.id]=svgobj\n   if not getattr(svgobj.style,\"vectorEffect\",None ):\n    if self.lineWidthScaling is False :svgobj.style.vectorEffect=\"non-scaling-stroke\"\n   if isinstance(svgobj,GroupObject):\n    for obj in svgobj.objectList:\n     AddToDict(obj)\n  if not hasattr(svgobject,\"fixed\"):svgobject.fixed=fixed\n  self <=svgobject\n  AddToDict(svgobject)\n  svgobject.canvas=self\n  return svgobject\n  \n def addObjects(self,objectlist,fixed=False ):\n  ''\n  for obj in objectlist:\n   if isinstance(obj,(list,tuple)):\n    self.addObjects(obj,fixed=fixed)\n   else :\n    self.addObject(obj,fixed=fixed)\n    \n def deleteObject(self,svgobject):\n  ''\n  def deletefromdict(svgobj):\n   if isinstance(svgobj,GroupObject):\n    for obj in svgobj.objectList:\n     deletefromdict(obj)\n   hittarget=getattr(svgobj,\"hitTarget\",None )\n   if hittarget:self.deleteObject(hittarget)\n   if svgobj.id in self.objectDict:del self.objectDict[svgobj.id]\n   \n  if not self.contains(svgobject):return\n  self.removeChild(svgobject)\n  deletefromdict(svgobject)\n  \n def deleteAll(self,event=None ):\n  ''\n  while self.firstChild:\n   self.removeChild(self.firstChild)\n  self.objectDict={}\n  \n def deleteSelection(self):\n  ''\n  if self.selectedObject:\n   if self.handles:self.deleteObject(self.handles)\n   if self.controlhandles:self.deleteObject(self.controlhandles)\n   hittarget=getattr(self.selectedObject,\"hitTarget\",None )\n   if hittarget:self.deleteObject(hittarget)\n   self.deleteObject(self.selectedObject)\n   self.selectedObject=self.handles=self.controlhandles=None\n   \n def translateObject(self,svgobject,offset):\n  ''\n  \n  offset=Point(offset)\n  if isinstance(svgobject,GroupObject):\n   for obj in svgobject.objectList:\n    self.translateObject(obj,offset)\n   boundary=getattr(svgobject,\"boundary\",None )\n   if boundary:self.translateObject(boundary,offset)\n  elif isinstance(svgobject,PointObject):\n   svgobject.XY +=offset\n  else :\n   svgobject.pointList=[point+offset for point in svgobject.pointList]\n   if isinstance(svgobject,BezierObject):\n    svgobject.pointsetList=[(p1+offset,p2+offset,p3+offset)for (p1,p2,p3)in svgobject.pointsetList]\n   svgobject._update()\n   svgobject._updatehittarget()\n   if isinstance(svgobject,PolygonObject):svgobject._segments=None\n   \n   \n def rotateElement(self,element,angle,centre=None ):\n  ''\n  \n  if not centre:\n   bbox=element.getBBox()\n   centre=(bbox.x+bbox.width /2,bbox.y+bbox.height /2)\n  (cx,cy)=centre\n  transformstring=f\"translate({cx}px,{cy}px) rotate({angle}deg) translate({-cx}px,{-cy}px)\"\n  element.style.transform=transformstring+element.style.transform\n  t=svgbase.createSVGTransform()\n  t.setRotate(angle,*centre)\n  \n  return t.matrix\n  \n def scaleElement(self,element,xscale,yscale=None ):\n  ''\n  \n  if not yscale:yscale=xscale\n  transformstring=f\"scale({xscale},{yscale})\"\n  element.style.transform=transformstring+element.style.transform\n  t=svgbase.createSVGTransform()\n  t.setScale(xscale,yscale)\n  \n  return t.matrix\n  \n def translateElement(self,element,vector):\n  ''\n  (dx,dy)=vector\n  transformstring=f\"translate({dx}px,{dy}px)\"\n  element.style.transform=transformstring+element.style.transform\n  t=svgbase.createSVGTransform()\n  t.setTranslate(*vector)\n  \n  return t.matrix\n  \n  \n @property\n def mouseMode(self):\n  return self._mouseMode\n  \n @mouseMode.setter\n def mouseMode(self,mm):\n  if mm in [MouseMode.DRAG,MouseMode.EDIT,MouseMode.TRANSFORM]:\n   self.createHitTargets()\n  currentmm=getattr(self,\"_mouseMode\",None )\n  if currentmm ==mm:return\n  if currentmm ==MouseMode.TRANSFORM:self.hideTransformHandles()\n  elif currentmm ==MouseMode.EDIT:self.deselectObject()\n  self._mouseMode=mm\n  if mm in [MouseMode.DRAG,MouseMode.PAN,MouseMode.TRANSFORM]:\n   self.tool=\"select\"\n   \n @property\n def lineWidthScaling(self):\n  return self._lineWidthScaling\n  \n @lineWidthScaling.setter\n def lineWidthScaling(self,lws):\n  currentlws=getattr(self,\"_lineWidthScaling\",None )\n  if currentlws ==lws:return\n  self._lineWidthScaling=lws\n  for objid in self.objectDict:\n   self.objectDict[objid].style.vectorEffect=\"none\"if lws else \"non-scaling-stroke\"\n   \n def _getScaleFactors(self):\n  ''\n  width,height=self._getDimensions()\n  \n  vbleft,vbtop,vbwidth,vbheight=[float(x)for x in self.attrs[\"viewBox\"].split()]\n  xScaleFactor=vbwidth /width if width !=0 else 1\n  yScaleFactor=vbheight /height if height !=0 else 1\n  return xScaleFactor,yScaleFactor\n  \n def createHitTargets(self):\n  try :\n   self._createEditHitTargets()\n  except AttributeError:\n   self._createHitTargets()\n   \n def _createHitTargets(self):\n  objlist=list(self.objectDict.values())\n  for obj in objlist:\n   if isinstance(obj,GroupObject):continue\n   if hasattr(obj,\"hitTarget\"):continue\n   if hasattr(obj,\"reference\"):continue\n   if isinstance(obj,UseObject):\n    newobj=RectangleObject(pointlist=obj.pointList,angle=obj.angle)\n   elif obj.style.fill !=\"none\"or obj.fixed:\n    continue\n   else :\n    newobj=obj.cloneObject()\n    newobj.style.strokeWidth=10 *self.scaleFactor if self.mouseDetected else 25 *self.scaleFactor\n   newobj.style.opacity=0\n   for event in MOUSEEVENTS:newobj.bind(event,self._onHitTargetMouseEvent)\n   for event in TOUCHEVENTS:newobj.bind(event,self._onHitTargetTouchEvent)\n   newobj.reference=obj\n   obj.hitTarget=newobj\n   self.hittargets.append(newobj)\n   self.addObject(newobj)\n   \n def _onWheel(self,event):\n  if self.mouseMode ==MouseMode.PAN:\n   event.preventDefault()\n   zoomfactor=0.9 if event.deltaY <0 else 1.1\n   newviewbox=[self.centre+zoomfactor *(point -self.centre)for point in self.viewBoxRect]\n   self.setViewBox(newviewbox)\n   \n def _onRightClick(self,event):\n \n  pass\n  \n def _onDragStart(self,event):\n  event.preventDefault()\n  \n def _onTouchStart(self,event):\n  event.preventDefault()\n  global lasttaptime\n  latesttaptime=time.time()\n  if event.touches.length ==1 and latesttaptime -lasttaptime <0.3:\n   for function in self.events(\"dblclick\"):\n    function(event)\n  else :\n   self._onLeftDown(event)\n  lasttaptime=latesttaptime\n  \n def _onMouseDown(self,event):\n  event.preventDefault()\n  if not self.mouseDetected:\n   self.mouseDetected=True\n   for obj in self.objectDict.values():\n    if hasattr(obj,\"reference\"):\n     if isinstance(obj.reference,UseObject):continue\n     obj.style.strokeWidth=10 *self.scaleFactor\n  if event.button >0:return\n  self._onLeftDown(event)\n  \n def _onLeftDown(self,event):\n  if self.mouseMode ==MouseMode.DRAG:\n   self._prepareDrag(event)\n  elif self.mouseMode ==MouseMode.TRANSFORM:\n   self._prepareTransform(event)\n  elif self.mouseMode ==MouseMode.DRAW:\n   self._drawPoint(event)\n  elif self.mouseMode ==MouseMode.EDIT:\n   self._prepareEdit(event)\n  elif self.mouseMode ==MouseMode.PAN:\n   self._preparePan(event)\n   \n def _onMouseMove(self,event):\n  event.preventDefault()\n  if self.mouseMode ==MouseMode.PAN:\n   if self.panning:self._doPan(event)\n   return\n  if not self.mouseOwner:return\n  if self.mouseMode ==MouseMode.DRAG:\n   self._doDrag(event)\n  else :\n   self._movePoint(event)\n   \n def _onLeftUp(self,event):\n  if event.type ==\"mouseup\"and event.button >0:return\n  if self.mouseMode ==MouseMode.PAN:\n   self._endPan(event)\n   return\n  if not self.mouseOwner:return\n  if self.mouseMode ==MouseMode.DRAG:\n   self._endDrag(event)\n  elif self.mouseMode ==MouseMode.TRANSFORM:\n   self._endTransform(event)\n   self.mouseOwner=None\n  elif self.mouseMode ==MouseMode.EDIT:\n   self._endEdit(event)\n   \n def _onHitTargetMouseEvent(self,event):\n  eventdict={attr:getattr(event,attr)for attr in dir(event)}\n  eventdict[\"bubbles\"]=False\n  newevent=window.MouseEvent.new(event.type,eventdict)\n  obj=self.objectDict[event.target.id]\n  obj.reference.dispatchEvent(newevent)\n  \n def _onHitTargetTouchEvent(self,event):\n  eventdict={attr:getattr(event,attr)for attr in dir(event)}\n  eventdict[\"bubbles\"]=False\n  newevent=window.TouchEvent.new(event.type,eventdict)\n  obj=self.objectDict[event.target.id]\n  obj.reference.dispatchEvent(newevent)\n  latesttime=time.time()\n  if event.type ==\"touchend\"and latesttime -lasttaptime <0.6:\n   eventdict[\"clientX\"]=event.changedTouches[0].clientX\n   eventdict[\"clientY\"]=event.changedTouches[0].clientY\n   newevent=window.MouseEvent.new(\"click\",eventdict)\n   obj.reference.dispatchEvent(newevent)\n   \n def _onDoubleClick(self,event):\n  if self.mouseMode ==MouseMode.DRAW:\n   self.setTool(\"select\")\n  elif self.mouseMode ==MouseMode.PAN:\n   self.fitContents()\n   \n def _onKeyDown(self,event):\n  if event.keyCode ==46:self.deleteSelection()\n  \n def _prepareDrag(self,event):\n  self.dragStartCoords=self.getSVGcoords(event)\n  self.selectedObject=self.getSelectedObject(event.target.id)\n  if self.selectedObject and not self.selectedObject.fixed:\n   self.mouseOwner=self.selectedObject\n   self <=self.mouseOwner\n   if (hittarget :=getattr(self.mouseOwner,\"hitTarget\",None )):self <=hittarget\n   self.startx=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n   self.starty=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n   \n def _doDrag(self,event):\n  x=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  y=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  dx,dy=(x -self.startx)*self.scaleFactor,(y -self.starty)*self.scaleFactor\n  self.mouseOwner.style.transform=f\"translate({dx}px,{dy}px)\"\n  if isinstance(self.mouseOwner,[EllipseObject,RectangleObject,UseObject,ImageObject]):\n   self.mouseOwner.style.transform +=self.mouseOwner.rotatestring\n   if isinstance(self.mouseOwner,UseObject):self.mouseOwner.style.transform +=self.mouseOwner.scalestring\n   \n def _endDrag(self,event):\n  self.mouseOwner.style.transform=\"translate(0px,0px)\"\n  currentcoords=self.getSVGcoords(event)\n  offset=currentcoords -self.dragStartCoords\n  self.translateObject(self.mouseOwner,offset)\n  if self.edgeSnap:self._doEdgeSnap(self.mouseOwner)\n  elif self.vertexSnap:self._doVertexSnap(self.mouseOwner)\n  self.mouseOwner=None\n  \n def _preparePan(self,event):\n  if not self.centre:\n   (width,height)=self._getDimensions()\n   self.setViewBox([(0,0),(width,height)])\n  if \"touch\"in event.type and event.touches.length ==2:\n   point0=Point((event.touches[0].clientX,event.touches[0].clientY))\n   point1=Point((event.touches[1].clientX,event.touches[1].clientY))\n   self.startZoomLength=(point1 -point0).length()\n   \n  x=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  y=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  self.startPoint=Point((x,y))\n  self.startCentre=self.centre\n  self.panStart=self.viewBoxRect\n  self.panning=True\n  \n def _doPan(self,event):\n  if \"touch\"in event.type and event.touches.length ==2:\n   point0=Point((event.touches[0].clientX,event.touches[0].clientY))\n   point1=Point((event.touches[1].clientX,event.touches[1].clientY))\n   newzoomlength=(point1 -point0).length()\n   zoomfactor=self.startZoomLength /newzoomlength\n   \n   newviewbox=[self.centre+zoomfactor *(point -self.centre)for point in self.viewBoxRect]\n   self.setViewBox(newviewbox)\n   self.startZoomLength=newzoomlength\n  else :\n   x=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n   y=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n   sf=(self.xScaleFactor,self.yScaleFactor)if self.attrs[\"preserveAspectRatio\"]==\"none\"else self.scaleFactor\n   delta=(Point((x,y))-self.startPoint)*sf\n   \n   newviewbox=[point -delta for point in self.panStart]\n   self.setViewBox(newviewbox)\n   \n def _endPan(self,event):\n  self.panning=False\n  \n def getSelectedObject(self,objectid,getGroup=True ):\n  ''\n\n\n  \n  try :\n   svgobj=self.objectDict[objectid]\n  except KeyError:\n   return\n  try :\n   svgobj=svgobj.reference\n  except AttributeError:\n   pass\n  if getGroup:\n   while getattr(svgobj,\"group\",None ):\n    svgobj=svgobj.group\n  return svgobj\n  \n def _doVertexSnap(self,svgobject,checkpoints=None ):\n  if not hasattr(svgobject,\"pointList\"):return\n  snapd=self.snapDistance\n  bestdx=bestdy=bestd=None\n  bbox=svgobject.getBBox()\n  L,R,T,B=bbox.x,bbox.x+bbox.width,bbox.y,bbox.y+bbox.height\n  \n  if checkpoints is None :\n   checkpoints=[]\n   for objid in self.objectDict:\n    if objid ==svgobject.id:continue\n    obj=self.objectDict[objid]\n    if not hasattr(obj,\"pointList\"):continue\n    if hasattr(obj,\"reference\"):continue\n    if obj.style.visibility ==\"hidden\":continue\n    if objgroup :=getattr(obj,\"group\",None )and hasattr(objgroup,\"pointList\"):continue\n    bbox=obj.getBBox()\n    L1,R1,T1,B1=bbox.x,bbox.x+bbox.width,bbox.y,bbox.y+bbox.height\n    if L1 -R >snapd or R1 -L <-snapd or T1 -B >snapd or B1 -T <-snapd:continue\n    checkpoints.extend(obj.pointList)\n  if not checkpoints:return\n  checkpoints.sort(key=lambda p:p.coords)\n  objpoints=sorted(svgobject.pointList,key=lambda p:p.coords)\n  \n  checkstart=0\n  for i,point1 in enumerate(objpoints):\n   checkpoints=checkpoints[checkstart:]\n   if not checkpoints:break\n   try :\n    (tonextx,y)=objpoints[i+1]-point1\n   except IndexError:\n    tonextx=0\n   checkstart=0\n   for point2 in checkpoints:\n    (dx,dy)=point2 -point1\n    if abs(dx)<snapd and abs(dy)<snapd:\n     d=hypot(dx,dy)\n     if bestd is None or d <bestd:(bestd,bestdx,bestdy)=(d,dx,dy)\n    if tonextx -dx >snapd:checkstart +=1\n    if dx >snapd:break\n  if bestd:self.translateObject(svgobject,(bestdx,bestdy))\n  \nclass Point(object):\n ''\n def __init__(self,coords):\n  self.coords=list(coords.coords)if isinstance(coords,Point)else list(coords)\n  \n def __repr__(self):\n  return str(tuple(self.coords))\n  \n def __eq__(self,other):\n  if isinstance(other,Point):\n   return (self.coords ==other.coords)\n  elif isinstance(other,list):\n   return (self.coords ==other)\n  elif isinstance(other,tuple):\n   return (tuple(self.coords)==other)\n  else :\n   return False\n   \n def __lt__(self,other):\n  return self.coords <other.coords\n  \n def __add__(self,other):\n  if isinstance(other,Point):\n   return Point([xi+yi for (xi,yi)in zip(self.coords,other.coords)])\n  elif isinstance(other,(list,tuple)):\n   return Point([xi+yi for (xi,yi)in zip(self.coords,other)])\n  elif other is None :\n   return None\n  else :\n   return NotImplemented\n   \n def __radd__(self,other):\n  return self+other\n  \n def __iadd__(self,other):\n  if isinstance(other,(list,tuple)):\n   for i in range(len(self.coords)):\n    self.coords[i]+=other[i]\n  else :\n   for i in range(len(self.coords)):\n    self.coords[i]+=other.coords[i]\n  return self\n  \n def __sub__(self,other):\n  return Point([xi -yi for (xi,yi)in zip(self.coords,other.coords)])\n  \n def __rsub__(self,other):\n  return Point([xi -yi for (xi,yi)in zip(other.coords,self.coords)])\n  \n def __neg__(self):\n  return Point([-xi for xi in self.coords])\n  \n def __mul__(self,other):\n  if isinstance(other,(int,float)):\n   return Point([other *xi for xi in self.coords])\n  elif isinstance(other,(list,tuple)):\n   return Point([xi *yi for (xi,yi)in zip(self.coords,other)])\n  elif isinstance(other,Point):\n   return sum([xi *yi for (xi,yi)in zip(self.coords,other.coords)])\n  elif isinstance(other,Matrix):\n   return Point([self *col for col in other.cols])\n  else :\n   return NotImplemented\n   \n def __rmul__(self,other):\n  if isinstance(other,(int,float)):\n   return Point([other *xi for xi in self.coords])\n  elif isinstance(other,(list,tuple)):\n   return Point([xi *yi for (xi,yi)in zip(self.coords,other)])\n  elif isinstance(other,Point):\n   return sum([xi *yi for (xi,yi)in zip(self.coords,other.coords)])\n  else :\n   return NotImplemented\n   \n def __truediv__(self,other):\n  return Point([xi /other for xi in self.coords])\n  \n def __getitem__(self,i):\n  return self.coords[i]\n  \n def __hash__(self):\n  return hash(tuple(self.coords))\n  \n def __round__(self,n):\n  (x,y)=self.coords\n  return Point((round(float(x),n),round(float(y),n)))\n  \n def __len__(self):\n  return len(self.coords)\n  \n def length(self):\n  (x,y)=self.coords\n  return hypot(x,y)\n  \n def angle(self):\n  return atan2(self.coords[1],self.coords[0])\n  \n def anglefrom(self,other):\n  dot=other *self\n  cross=other.cross(self)\n  if cross ==0:cross=-0.0\n  angle=atan2(cross,dot)\n  return angle\n  \n def cross(self,other):\n  x1,y1=self.coords\n  x2,y2=other.coords\n  return x1 *y2 -y1 *x2\n  \n def roundsf(self,sf):\n  x,y=self.coords\n  return Point((roundsf(x,sf),roundsf(y,sf)))\n  \nclass Matrix(object):\n def __init__(self,rows):\n  self.rows=rows\n  self.cols=[Point([self.rows[i][j]for i in range(len(self.rows))])for j in range(len(self.rows[0]))]\n  \n def __str__(self):\n  return str(\"\\n\".join(str(row)for row in self.rows))\n  \n def __rmul__(self,other):\n  if isinstance(other,(list,tuple)):\n   return [Point([p *col for col in self.cols])for p in other]\n  else :\n   return Point([other *col for col in self.cols])\n   \ndef roundsf(x,sf=3):\n if x ==0:return 0\n return round(x,sf -int(floor(log10(abs(x))))-1)\n \nshapetypes={\"line\":LineObject,\"polygon\":PolygonObject,\"polyline\":PolylineObject,\n\"rectangle\":RectangleObject,\"ellipse\":EllipseObject,\"circle\":CircleObject,\"sector\":SectorObject,\n\"bezier\":BezierObject,\"closedbezier\":ClosedBezierObject,\"smoothbezier\":SmoothBezierObject,\"smoothclosedbezier\":SmoothClosedBezierObject}\n", ["browser", "browser.html", "browser.svg", "math", "time"]], "brySVG.fullcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n\n\n\n\n\nfrom brySVG.transformcanvas import *\nfrom brySVG.drawcanvas import *\n", ["brySVG.drawcanvas", "brySVG.transformcanvas"]], "brySVG": [".py", "", [], 1], "brySVG.transformcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n\n\n\n\n\nfrom brySVG.dragcanvas import *\n\nclass TransformMixin(object):\n ''\n\n \n \n def _transformedpoint(self,matrix):\n  ''\n  pt=svgbase.createSVGPoint()\n  (pt.x,pt.y)=self.XY\n  pt=pt.matrixTransform(matrix)\n  return Point((pt.x,pt.y))\n  \n def _transformedpointsetlist(self,matrix):\n  ''\n  pt=svgbase.createSVGPoint()\n  newpointsetlist=[]\n  for pointset in self.pointsetList:\n   newpointset=[]\n   for point in pointset:\n    if point is None :\n     newpointset.append(None )\n    else :\n     (pt.x,pt.y)=point\n     pt=pt.matrixTransform(matrix)\n     newpointset.append(Point((pt.x,pt.y)))\n   newpointsetlist.append(newpointset)\n  return newpointsetlist\n  \n def matrixTransform(self,matrix):\n  ''\n  if isinstance(self,GroupObject):\n   for obj in self.objectList:\n    obj.matrixTransform(matrix)\n  elif isinstance(self,PointObject):\n   self.XY=self._transformedpoint(matrix)\n  elif isinstance(self,PolygonObject):\n  \n   self._transformpoints(self.points,matrix)\n   self._pointList=None\n   self._segments=None\n  else :\n   self.pointList=self._transformedpointlist(matrix)\n   if isinstance(self,BezierObject):self.pointsetList=self._transformedpointsetlist(matrix)\n   self._update()\n  self._updatehittarget()\n  \n def translate(self,vector):\n  ''\n  t=svgbase.createSVGTransform()\n  t.setTranslate(*vector)\n  self.matrixTransform(t.matrix)\n  \n def rotate(self,angle,centre=None ):\n  ''\n  \n  if not centre:\n   bbox=self.getBBox()\n   centre=(bbox.x+bbox.width /2,bbox.y+bbox.height /2)\n  if isinstance(self,(EllipseObject,RectangleObject,ImageObject,UseObject)):\n   self.angle +=angle\n  t=svgbase.createSVGTransform()\n  t.setRotate(angle,*centre)\n  self.matrixTransform(t.matrix)\n  \n def rotateAndTranslate(self,angle,centre=None ,vector=(0,0)):\n  ''\n  \n  if not centre:\n   bbox=self.getBBox()\n   centre=(bbox.x+bbox.width /2,bbox.y+bbox.height /2)\n  t=svgbase.createSVGTransform()\n  if angle !=0:t.setRotate(angle,*centre)\n  M=t.matrix.translate(*vector)if vector !=(0,0)else t.matrix\n  self.matrixTransform(M)\n  \n def rotateByVectors(self,vec1,vec2,centre=(0,0)):\n  ''\n  \n  (cx,cy)=centre\n  (x1,y1)=vec1\n  (x2,y2)=vec2\n  (x3,y3)=(x1 *x2+y1 *y2,x1 *y2 -x2 *y1)\n  angle=atan2(y3,x3)*180 /pi\n  if isinstance(self,(EllipseObject,RectangleObject,ImageObject,UseObject)):\n   self.angle +=angle\n  matrix=svgbase.createSVGMatrix()\n  matrix=matrix.translate(cx,cy)\n  matrix=matrix.rotateFromVector(x3,y3)\n  matrix=matrix.translate(-cx,-cy)\n  self.matrixTransform(matrix)\n  \n def xstretch(self,xscale,cx=0):\n  ''\n  \n  if isinstance(self,UseObject):return\n  angle=0\n  if isinstance(self,(EllipseObject,RectangleObject,ImageObject))and self.angle !=0:\n   angle=self.angle\n   self.rotate(-angle)\n  matrix=svgbase.createSVGMatrix()\n  matrix=matrix.translate(cx,0)\n  matrix.a=xscale\n  matrix=matrix.translate(-cx,0)\n  self.matrixTransform(matrix)\n  if angle !=0:self.rotate(angle)\n  \n def ystretch(self,yscale,cy=0):\n  ''\n  \n  if isinstance(self,UseObject):return\n  angle=0\n  if isinstance(self,(EllipseObject,RectangleObject,ImageObject))and self.angle !=0:\n   angle=self.angle\n   self.rotate(-angle)\n  matrix=svgbase.createSVGMatrix()\n  matrix=matrix.translate(0,cy)\n  matrix.d=yscale\n  matrix=matrix.translate(0,-cy)\n  self.matrixTransform(matrix)\n  if angle !=0:self.rotate(angle)\n  \n def enlarge(self,scalefactor,centre=(0,0)):\n  ''\n  \n  if isinstance(self,UseObject):return\n  (cx,cy)=centre\n  matrix=svgbase.createSVGMatrix()\n  matrix=matrix.translate(cx,cy)\n  matrix=matrix.scale(scalefactor)\n  matrix=matrix.translate(-cx,-cy)\n  self.matrixTransform(matrix)\n  \nclass TransformCanvasMixin(object):\n def _prepareTransform(self,event):\n  self.selectedObject=self.getSelectedObject(event.target.id)\n  if self.selectedObject and not self.selectedObject.fixed:\n   self <=self.selectedObject\n   self.showTransformHandles(self.selectedObject)\n   if TransformType.TRANSLATE in self.transformTypes:self.transformHandles[TransformType.TRANSLATE]._select(event)\n  else :\n   self.hideTransformHandles()\n   \n def _endTransform(self,event):\n  if not isinstance(self.mouseOwner,TransformHandle):return\n  currentcoords=self.getSVGcoords(event)\n  offset=currentcoords -self.StartPoint\n  if offset.coords !=[0,0]:\n   centre=(cx,cy)=self.selectedObject.centre\n   vec1=(x1,y1)=self.StartPoint -centre\n   vec2=(x2,y2)=currentcoords -centre\n   transformtype=self.mouseOwner.transformType\n   \n   self.selectedObject.style.transform=\"translate(0px,0px)\"\n   if transformtype ==TransformType.TRANSLATE:\n    self.selectedObject.translate(offset)\n   elif transformtype ==TransformType.ROTATE:\n    self.selectedObject.rotateByVectors(vec1,vec2,(cx,cy))\n   elif transformtype ==TransformType.XSTRETCH:\n    self.selectedObject.xstretch(x2 /x1,cx)\n   elif transformtype ==TransformType.YSTRETCH:\n    self.selectedObject.ystretch(y2 /y1,cy)\n   elif transformtype ==TransformType.ENLARGE:\n    self.selectedObject.enlarge(hypot(x2,y2)/hypot(x1,y1),(cx,cy))\n    \n   if self.edgeSnap:self._doEdgeSnap(self.selectedObject)\n   elif self.vertexSnap:self._doVertexSnap(self.selectedObject)\n   \n  if self.transformorigin:\n   self.removeChild(self.transformorigin)\n   self.transformorigin=None\n  self.showTransformHandles(self.selectedObject)\n  self.mouseOwner=None\n  \n def showTransformHandles(self,svgobj):\n  tempgroup=svg.g()\n  tempgroup <=svgobj.cloneNode(True )\n  self <=tempgroup\n  bbox=tempgroup.getBBox()\n  (x1,y1),(x2,y2)=svgobj.bbox=(bbox.x,bbox.y),(bbox.x+bbox.width,bbox.y+bbox.height)\n  self.removeChild(tempgroup)\n  (cx,cy)=svgobj.centre=Point(((x1+x2)/2,(y1+y2)/2))\n  ((left,top),(right,bottom))=self.viewWindow\n  \n  if not self.transformHandles:self.transformHandles=[self.transformBBox]+[TransformHandle(None ,i,(0,0),self)for i in range(1,6)]\n  for i,coords in enumerate([((x1+x2)/2,(y1+y2)/2),(x1,y1),(x2,(y1+y2)/2),((x1+x2)/2,y2),(x2,y2)]):\n   self.transformHandles[i+1].XY=coords\n   self.transformHandles[i+1].owner=svgobj\n  self.hideTransformHandles()\n  \n  self.usebox=False\n  if not isinstance(svgobj,UseObject):\n   for ttype in self.transformTypes:\n    if ttype in [TransformType.XSTRETCH,TransformType.YSTRETCH,TransformType.ENLARGE]:self.usebox=True\n    \n  if self.usebox:\n   self.transformBBox.setPointList([Point((x1,y1)),Point((x2,y2))])\n   \n   self <=self.transformBBox\n   self.transformBBox.style.visibility=\"visible\"\n  else :\n   handlelength=min((bottom -top)*0.4,(y2 -y1)*2)\n   ypos=cy -handlelength\n   if ypos <top:ypos=cy+handlelength\n   handleposition=Point(((x1+x2)/2,ypos))\n   self.transformHandles[2].XY=handleposition\n   self.rotateLine.setPointList([svgobj.centre,handleposition])\n   \n   self <=self.rotateLine\n   self.rotateLine.style.visibility=\"visible\"\n  for ttype in self.transformTypes:\n   if isinstance(svgobj,UseObject)and ttype in [TransformType.XSTRETCH,TransformType.YSTRETCH,TransformType.ENLARGE]:continue\n   thandle=self.transformHandles[ttype]\n   self <=thandle\n   if ttype !=TransformType.TRANSLATE:thandle.style.visibility=\"visible\"\n  return [(x1,y1),(x2,y2)]\n  \n def hideTransformHandles(self):\n  for obj in self.transformHandles:obj.style.visibility=\"hidden\"\n  self.rotateLine.style.visibility=\"hidden\"\n  \n def _showTransformOrigin(self,svgobj,transformtype):\n  (cx,cy)=svgobj.centre\n  (x1,y1),(x2,y2)=svgobj.bbox\n  if transformtype in [TransformType.NONE,TransformType.TRANSLATE]:return\n  if transformtype in [TransformType.ROTATE,TransformType.ENLARGE]:\n   self.transformorigin=PointObject((cx,cy),colour=\"blue\",pointsize=4,canvas=self)\n  elif transformtype ==TransformType.XSTRETCH:\n   self.transformorigin=LineObject([(cx,y1),(cx,y2)],linecolour=\"blue\",linewidth=2)\n  elif transformtype ==TransformType.YSTRETCH:\n   self.transformorigin=LineObject([(x1,cy),(x2,cy)],linecolour=\"blue\",linewidth=2)\n  self.transformorigin.style.vectorEffect=\"non-scaling-stroke\"\n  self <=self.transformorigin\n  \n def _movePoint(self,event):\n  x=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  y=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  dx,dy=x -self.currentx,y -self.currenty\n  if \"touch\"in event.type and abs(dx)<5 and abs(dy)<5:return\n  self.currentx,self.currenty=x,y\n  coords=self.getSVGcoords(event)\n  if self.mouseMode ==MouseMode.DRAW:\n   self.mouseOwner._movePoint(coords)\n  else :\n   if self.mouseMode ==MouseMode.TRANSFORM:dx,dy=x -self.startx,y -self.starty\n   dx,dy=dx *self.scaleFactor,dy *self.scaleFactor\n   self.mouseOwner._movePoint((dx,dy))\n  return coords\n  \nclass TransformHandle(PointObject):\n def __init__(self,owner,transformtype,coords,canvas):\n  pointsize=7 if canvas.mouseDetected else 15\n  opacity=0.4\n  strokewidth=3\n  PointObject.__init__(self,coords,\"red\",pointsize,canvas)\n  self.style.fillOpacity=opacity\n  self.style.strokeWidth=strokewidth\n  self.style.vectorEffect=\"non-scaling-stroke\"\n  self.owner=owner\n  self.canvas=canvas\n  self.transformType=transformtype\n  self.bind(\"mousedown\",self._select)\n  self.bind(\"touchstart\",self._select)\n  \n def _select(self,event):\n  event.stopPropagation()\n  self.canvas.mouseOwner=self\n  self.startx,self.starty=self.canvas.StartPoint=self.canvas.getSVGcoords(event)\n  self.canvas.startx=self.canvas.currentx=event.targetTouches[0].clientX if \"touch\"in event.type else event.clientX\n  self.canvas.starty=self.canvas.currenty=event.targetTouches[0].clientY if \"touch\"in event.type else event.clientY\n  self.canvas.hideTransformHandles()\n  if self.transformType ==TransformType.ROTATE:self.canvas.rotateLine.style.visibility=\"visible\"\n  if self.transformType !=TransformType.TRANSLATE:self.style.visibility=\"visible\"\n  self.canvas._showTransformOrigin(self.owner,self.transformType)\n  \n def _movePoint(self,offset):\n  (dx,dy)=offset\n  if (dx,dy)==(0,0):return\n  (x,y)=self.startx+dx,self.starty+dy\n  self.XY=(x,y)\n  if self.transformType ==TransformType.TRANSLATE:\n   transformstring=f\"translate({dx}px,{dy}px)\"\n   if isinstance(self.owner,(EllipseObject,RectangleObject,ImageObject,UseObject)):\n    self.owner.style.transform=transformstring+self.owner.rotatestring\n    if isinstance(self.owner,UseObject):self.owner.style.transform +=self.owner.scalestring\n   else :\n    self.owner.style.transform=transformstring\n   return\n   \n  (cx,cy)=self.owner.centre\n  (x1,y1)=self.startx -cx,self.starty -cy\n  (x2,y2)=x -cx,y -cy\n  if self.transformType ==TransformType.ROTATE:\n   (x3,y3)=(x1 *x2+y1 *y2,x1 *y2 -x2 *y1)\n   angle=atan2(y3,x3)*180 /pi\n   transformstring=f\"translate({cx}px,{cy}px) rotate({angle}deg) translate({-cx}px,{-cy}px)\"\n   if not self.canvas.usebox:\n    self.canvas.rotateLine.pointList=[self.owner.centre,self.XY]\n    self.canvas.rotateLine._update()\n  elif self.transformType ==TransformType.XSTRETCH:\n   xfactor=x2 /x1\n   yfactor=xfactor if isinstance(self.owner,CircleObject)else 1\n   transformstring=f\"translate({cx}px,{cy}px) scale({xfactor},{yfactor}) translate({-cx}px,{-cy}px)\"\n  elif self.transformType ==TransformType.YSTRETCH:\n   yfactor=y2 /y1\n   xfactor=yfactor if isinstance(self.owner,CircleObject)else 1\n   transformstring=f\"translate({cx}px,{cy}px) scale({xfactor},{yfactor}) translate({-cx}px,{-cy}px)\"\n  elif self.transformType ==TransformType.ENLARGE:\n   transformstring=f\"translate({cx}px,{cy}px) scale({hypot(x2, y2)/hypot(x1, y1)}) translate({-cx}px,{-cy}px)\"\n   \n  if isinstance(self.owner,(EllipseObject,RectangleObject,ImageObject,UseObject)):\n   self.owner.style.transform=self.owner.rotatestring+transformstring\n   if isinstance(self.owner,UseObject):self.owner.style.transform +=self.owner.scalestring\n  else :\n   self.owner.style.transform=transformstring\n   \nclasses=[LineObject,RectangleObject,EllipseObject,CircleObject,SectorObject,PolylineObject,PolygonObject,BezierObject,\nClosedBezierObject,SmoothBezierObject,SmoothClosedBezierObject,PointObject,RegularPolygon,GroupObject,ImageObject,UseObject]\nfor cls in classes:\n cls.__bases__=cls.__bases__+(TransformMixin,)\n \nCanvasObject.__bases__=CanvasObject.__bases__+(TransformCanvasMixin,)\n", ["brySVG.dragcanvas"]], "brySVG.polygoncanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n\n\n\n\n\nfrom math import sin,cos,atan2,pi,log10,floor,inf\nfrom .transformcanvas import *\nimport time\n\nclass Enum(list):\n def __init__(self,name,string):\n  values=string.split()\n  for i,value in enumerate(values):\n   setattr(self,value,i)\n   self.append(i)\n   \nPosition=Enum('Position','CONTAINS INSIDE OVERLAPS EQUAL DISJOINT TOUCHING')\ndp=2\ndp1=dp -1\ndp2=dp -2\n\nclass ListDict(dict):\n def __getitem__(self,key):\n  try :\n   return super().__getitem__(key)\n  except KeyError:\n   self[key]=[]\n   return self[key]\n   \nclass SetDict(dict):\n def __getitem__(self,key):\n  try :\n   return super().__getitem__(key)\n  except KeyError:\n   self[key]=set()\n   return self[key]\n   \nclass Segment(object):\n def __init__(self,startpoint,endpoint,poly,index):\n  if endpoint <startpoint:\n   self.leftpoint,self.rightpoint=endpoint,startpoint\n   self.leftindex,self.rightindex=reversed(index)\n  else :\n   self.leftpoint,self.rightpoint=startpoint,endpoint\n   self.leftindex,self.rightindex=index\n   \n  self.leftx,self.lefty=self.leftpoint\n  self.rightx,self.righty=self.rightpoint\n  (self.top,self.bottom)=(self.righty,self.lefty)if self.righty <self.lefty else (self.lefty,self.righty)\n  self.poly=poly\n  self.index=index\n  self.dx,self.dy=self.rightx -self.leftx,self.righty -self.lefty\n  self.gradient=inf if self.dx ==0 else self.dy /self.dx\n  self.angle=atan2(self.dy,self.dx)-pi /2+pi *(self.dy <0)\n  self.y=self.lefty\n  self.xpos=\"L\"\n  \n def __repr__(self):\n  return f\"{self.poly}{self.index}: [{self.leftpoint}, {self.rightpoint}]; currenty: {self.y}, xpos: {self.xpos}, gradient: {self.gradient}, angle: {self.angle}\"\n  \nclass Intersection(object):\n def __init__(self,polyrefs,point=None ):\n  (poly1,index1),(poly2,index2)=polyrefs\n  self.polyrefs={poly1:index1,poly2:index2}\n  self.point=point if point is not None else Point((0,0))\n  \n def __repr__(self):\n  s=f\"{self.point} \\n\"\n  polys=sorted(self.polyrefs,key=lambda poly:poly.id)\n  for poly in polys:\n   index=self.polyrefs[poly]\n   if isinstance(index,int):\n    s +=f\"at vertex {index} on polygon {poly}\\n\"\n   else :\n    i1,i2=index\n    s +=f\"between vertices {i1} and {i2} on polygon {poly}\\n\"\n  return s\n  \nclass PolygonMixin(object):\n @property\n def segments(self):\n  if isinstance(self,PolygonGroup):return self.boundary.segments\n  if getattr(self,\"_segments\",None )is None :\n  \n   L=len(self.pointList)\n   self._segments=[Segment(self.pointList[i -1],self.pointList[i],self,((i -1)%L,i))for i in range(L)]\n  return self._segments\n  \n def containspoint(self,point,dp=1):\n  ''\n\n  \n  poly=getattr(poly,\"pointList\",poly)\n  poly=[(round(x,dp),round(y,dp))for (x,y)in poly]\n  point=getattr(point,\"XY\",point)\n  (x,y)=(round(point[0],dp),round(point[1],dp))\n  if (x,y)in poly:return \"vertex\"\n  length=len(poly)\n  counter=0\n  (x1,y1)=poly[0]\n  for i in range(1,length+1):\n   (x2,y2)=poly[i %length]\n   if x1 ==x2 ==x and min(y1,y2)<=y <=max(y1,y2):return \"edge\"\n   if y1 ==y2:\n    if y ==y1 and min(x1,x2)<=x <=max(x1,x2):return \"edge\"\n   elif min(y1,y2)<y <=max(y1,y2)and x <max(x1,x2):\n    xcheck=x1+(y -y1)*(x2 -x1)/(y2 -y1)\n    if x ==xcheck:return \"edge\"\n    elif x <xcheck:\n     counter +=1\n   (x1,y1)=(x2,y2)\n  return \"interior\"if counter %2 ==1 else False\n  \n def area(self):\n  ''\n  return _area(self.pointList)\n  \n def getBoundingBox(self):\n  ''\n  \n  return _getboundingbox(self.pointList)\n  \n def getCentre(self):\n  (left,top),(right,bottom)=_getboundingbox(self.pointList)\n  return ((left+right)/2,(top+bottom)/2)\n  \n def isEqual(self,other):\n  ''\n  return _equalpolygons(self.pointList,other.pointList)\n  \n def positionRelativeTo(self,other):\n  ''\n  \n  return relativeposition(self,other)\n  \n def getIntersections(self,other):\n  ''\n\n\n\n\n\n  \n  ixlist=findintersections([self,other])\n  for ix in ixlist:\n   polyrefs=ix.polyrefs\n   ix.selfindex,ix.otherindex=polyrefs[self],polyrefs[other]\n  return ixlist\n  \n def merge(self,other):\n  ''\n  \n  return boundary([self,other])\n  \nclass PolygonGroup(GroupObject,PolygonMixin):\n def __init__(self,objlist=[],objid=None ):\n  self.boundary=None\n  super().__init__(objlist)\n  if objid:self.id=objid\n  \n def __repr__(self):\n  return f\"group {self.id}\"if self.id else f\"group {id(self)}\"\n  \n def __str__(self):\n  return self.__repr__()\n  \n def addObject(self,svgobject):\n  if not isinstance(svgobject,(PolygonObject,PolygonGroup)):return False\n  if self.objectList ==[]:\n   self.boundary=PolygonObject(svgobject.pointList)\n  else :\n   newboundary=self.boundary.merge(svgobject)\n   if newboundary is False :\n    return False\n   elif newboundary is None :\n    return None\n   else :\n    self.boundary=newboundary\n    \n  super().addObject(svgobject)\n  \n  return True\n  \n def addObjects(self,polylist,listboundary=None ):\n  if polylist ==[]:return None\n  blist=[self.boundary]if self.boundary else []\n  if listboundary:\n   blist.append(listboundary)\n  else :\n   blist.extend(polylist)\n  newboundary=blist[0]if len(blist)==1 else boundary(blist)\n  if newboundary is False :\n   return False\n  elif newboundary is None :\n   return None\n  else :\n   self.boundary=newboundary\n  super().addObjects(polylist)\n  \n  return True\n  \n def removeObject(self,svgobject):\n  if not self.contains(svgobject):return\n  groupcopy=self.objectList[:]\n  groupcopy.remove(svgobject)\n  newboundary=boundary(groupcopy)\n  if newboundary is False :\n   return False\n  elif newboundary is None :\n   return None\n  else :\n   self.boundary=newboundary\n  super().removeObject(svgobject)\n  \n  return True\n  \n def deleteAll(self):\n  self.boundary=None\n  \n  super().deleteAll()\n  \n @property\n def pointList(self):\n  return []if self.boundary is None else self.boundary.pointList\n  \n @pointList.setter\n def pointList(self,pointlist):\n  pass\n  \n @property\n def points(self):\n  return None if self.boundary is None else self.boundary.points\n  \n def matrixTransform(self,matrix):\n  def addalltopointslist(group):\n   for obj in group.objectList:\n    if isinstance(obj,PolygonGroup):\n     addalltopointslist(obj)\n    else :\n     pointslist.append(obj.points)\n     obj._pointList=None\n     obj._segments=None\n   pointslist.append(group.boundary.points)\n   group.boundary._pointList=None\n   group.boundary._segments=None\n   \n  pointslist=[]\n  addalltopointslist(self)\n  \n  self._transformpoints(pointslist,matrix)\n  \n def _transformpoints(self,pointslist,matrix):\n  for points in pointslist:\n   L=points.numberOfItems\n   for i in range(L):\n    pt=points.getItem(i)\n    newpt=pt.matrixTransform(matrix)\n    points.replaceItem(newpt,i)\n    \n def cloneObject(self):\n  newobject=super().cloneObject()\n  newobject.boundary=self.boundary.cloneObject()\n  \n  return newobject\n  \nclass PolygonCanvasMixin(object):\n ''\n\n\n \n def _doEdgeSnap(self,svgobject):\n  tt=time.time()\n  if not isinstance(svgobject,(PolygonObject,PolygonGroup)):return\n  snapangle=self.snapAngle *pi /180\n  snapd=self.snapDistance\n  bestangle=None\n  bbox=svgobject.getBBox()\n  L1,R1,T1,B1=bbox.x,bbox.x+bbox.width,bbox.y,bbox.y+bbox.height\n  \n  checksegs=[]\n  checkobjs=[]\n  for objid in self.objectDict:\n   if objid ==svgobject.id:continue\n   obj=self.objectDict[objid]\n   if getattr(obj,\"group\",None ):continue\n   if not isinstance(obj,(PolygonObject,PolygonGroup)):continue\n   bbox=obj.getBBox()\n   L2,R2,T2,B2=bbox.x,bbox.x+bbox.width,bbox.y,bbox.y+bbox.height\n   if L2 -R1 >snapd or R2 -L1 <-snapd or T2 -B1 >snapd or B2 -T1 <-snapd:continue\n   checksegs.extend(obj.segments)\n   checkobjs.append(obj)\n  if not checksegs:\n  \n   return\n  checksegs.sort(key=lambda seg:seg.angle)\n  for seg in checksegs:\n   if seg.angle >snapangle -pi /2:break\n   newseg=Segment(seg.leftpoint,seg.rightpoint,seg.poly,seg.index)\n   newseg.angle=seg.angle+pi\n   checksegs.append(newseg)\n   \n  objsegs=sorted(svgobject.segments,key=lambda seg:seg.angle)\n  for seg in objsegs:\n   if seg.angle >snapangle -pi /2:break\n   newseg=Segment(seg.leftpoint,seg.rightpoint,seg.poly,seg.index)\n   newseg.angle=seg.angle+pi\n   objsegs.append(newseg)\n   \n   \n   \n   \n   \n   \n  checkstart=0\n  piby4=pi /4\n  found=False\n  for i,seg1 in enumerate(objsegs):\n   angle1=seg1.angle\n   \n   checksegs=checksegs[checkstart:]\n   if not checksegs:break\n   \n   try :\n    tonextangle=objsegs[i+1].angle -angle1\n   except IndexError:\n    tonextangle=0\n    \n   checkstart=0\n   for seg2 in checksegs:\n    angle2=seg2.angle\n    \n    angled=angle2 -angle1\n    \n    \n    absangle=abs(angled)\n    if (bestangle is None and absangle <snapangle)or (bestangle is not None and absangle <bestangle):\n    \n     (objleft,objright)=(seg1.leftx,seg1.rightx)\n     (objtop,objbottom)=(seg1.top,seg1.bottom)\n     (checkleft,checkright)=(seg2.leftx -snapd,seg2.rightx+snapd)\n     (checktop,checkbottom)=(seg2.top -snapd,seg2.bottom+snapd)\n     if not (objleft >checkright or objright <checkleft or objtop >checkbottom or objbottom <checktop):\n      objp,objq=seg1.leftpoint,seg1.rightpoint\n      checkp,checkq=seg2.leftpoint,seg2.rightpoint\n      \n      \n      \n      objv,checkv=objq -objp,checkq -checkp\n      diff,product=checkp -objp,objv.cross(checkv)\n      (t,u)=(diff.cross(objv)/product,diff.cross(checkv)/product)if product !=0 else (inf,inf)\n      \n      if 0 <=t <=1 and 0 <=u <=1:\n       (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,objp+u *objv,(0,0),seg1,seg2)\n      else :\n       bestd=None\n       (objx1,objy1),(objx2,objy2)=objp,objq\n       (checkx1,checky1),(checkx2,checky2)=checkp,checkq\n       if abs(angle2)<piby4:\n        if checktop <=objy1 <=checkbottom:\n         checkx=checkx1+(objy1 -checky1)/(checky2 -checky1)*(checkx2 -checkx1)\n         diff=checkx -objx1\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx1,objy1),(diff,0),seg1,seg2)\n        if checktop <=objy2 <=checkbottom:\n         checkx=checkx1+(objy2 -checky1)/(checky2 -checky1)*(checkx2 -checkx1)\n         diff=checkx -objx2\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx2,objy2),(diff,0),seg1,seg2)\n       else :\n        if checkleft <=objx1 <=checkright:\n         checky=checky1+(objx1 -checkx1)/(checkx2 -checkx1)*(checky2 -checky1)\n         diff=checky -objy1\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx1,objy1),(0,diff),seg1,seg2)\n        if checkleft <=objx2 <=checkright:\n         checky=checky1+(objx2 -checkx1)/(checkx2 -checkx1)*(checky2 -checky1)\n         diff=checky -objy2\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx2,objy2),(0,diff),seg1,seg2)\n       if abs(angle1)<piby4:\n        if objtop <=checky1 <=objbottom:\n         objx=objx1+(checky1 -objy1)/(objy2 -objy1)*(objx2 -objx1)\n         diff=checkx1 -objx\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx,checky1),(diff,0),seg1,seg2)\n        if objtop <=checky2 <=objbottom:\n         objx=objx1+(checky2 -objy1)/(objy2 -objy1)*(objx2 -objx1)\n         diff=checkx2 -objx\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(objx,checky2),(diff,0),seg1,seg2)\n       else :\n        if objleft <=checkx1 <=objright:\n         objy=objy1+(checkx1 -objx1)/(objx2 -objx1)*(objy2 -objy1)\n         diff=checky1 -objy\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(checkx1,objy),(0,diff),seg1,seg2)\n        if objleft <=checkx2 <=objright:\n         objy=objy1+(checkx2 -objx1)/(objx2 -objx1)*(objy2 -objy1)\n         diff=checky2 -objy\n         \n         if (bestd is None and abs(diff)<=snapd)or (bestd is not None and abs(diff)<bestd):\n          (bestangle,angle,centre,vector,objseg,checkseg)=(absangle,angled,(checkx2,objy),(0,diff),seg1,seg2)\n          \n    if tonextangle -angled >snapangle:\n     checkstart +=1\n     \n    if angled >snapangle:\n    \n     break\n    if bestangle ==0:\n     found=True\n     break\n   if found:break\n   \n   \n  if bestangle is not None :\n  \n   if not (angle ==0 and vector ==(0,0)):svgobject.rotateAndTranslate(angle *180 /pi,centre,vector)\n  if self.vertexSnap:\n   self._doVertexSnap(svgobject,[p for obj in checkobjs for p in obj.pointList])\n   \n   \ndef _getboundingbox(poly,xdp=None ,ydp=None ):\n xcoords=[round(x,xdp)for (x,y)in poly]if xdp else [x for (x,y)in poly]\n left=min(xcoords)\n right=max(xcoords)\n ycoords=[round(y,ydp)for (x,y)in poly]if ydp else [y for (x,y)in poly]\n top=min(ycoords)\n bottom=max(ycoords)\n return (left,top),(right,bottom)\n \ndef _compareboundingboxes(poly1,poly2,xdp=None ,ydp=None ):\n if xdp and not ydp:ydp=xdp\n ((left1,top1),(right1,bottom1))=_getboundingbox(poly1,xdp,ydp)\n ((left2,top2),(right2,bottom2))=_getboundingbox(poly2,xdp,ydp)\n if right1 <left2 or right2 <left1 or bottom1 <top2 or bottom2 <top1:return Position.DISJOINT\n if right1 ==left2 or right2 ==left1 or bottom1 ==top2 or bottom2 ==top1:return Position.TOUCHING\n if left1 <left2:\n  if right1 <right2:return Position.OVERLAPS\n  else :xresult=Position.CONTAINS\n elif left1 ==left2:\n  xresult=Position.INSIDE if right1 <right2 else Position.EQUAL if right1 ==right2 else Position.CONTAINS\n else :\n  if right1 >right2:return Position.OVERLAPS\n  else :xresult=Position.INSIDE\n  \n if top1 <top2:\n  if bottom1 <bottom2:return Position.OVERLAPS\n  else :return Position.OVERLAPS if xresult ==Position.INSIDE else Position.CONTAINS\n elif top1 ==top2:\n  if bottom1 <bottom2:return Position.OVERLAPS if xresult ==Position.CONTAINS else Position.INSIDE\n  elif bottom1 ==bottom2:return xresult\n  else :return Position.OVERLAPS if xresult ==Position.INSIDE else Position.CONTAINS\n else :\n  if bottom1 >bottom2:return Position.OVERLAPS\n  else :return Position.OVERLAPS if xresult ==Position.CONTAINS else Position.INSIDE\n  \ndef _area(poly):\n ''\n area=0\n (x0,y0)=poly[-1]\n for (x1,y1)in poly:\n  area +=x1 *y0 -x0 *y1\n  (x0,y0)=(x1,y1)\n return abs(area /2)\n \ndef _equalpolygons(poly1,poly2):\n ''\n \n start1=poly1.index(min(poly1))\n poly1=poly1[start1+1:]+poly1[:start1]\n start2=poly2.index(min(poly2))\n poly2=poly2[start2+1:]+poly2[:start2]\n return poly1 ==poly2 or poly1 ==poly2[::-1]\n \ndef _getrotatedcoords(polylist,xdp):\n def getbestangle(polylist):\n  anglesfromvertical=[]\n  for poly in polylist:\n   segs=poly.segments\n   anglesfromvertical.extend([round(abs(seg.angle),3)for seg in segs])\n   \n  if 0 not in anglesfromvertical:return 0\n  positiveangles=[a for a in anglesfromvertical if a >0.1]\n  return round(min(positiveangles)/2,1)\n  \n a=getbestangle(polylist)\n cosa,sina=cos(a),sin(a)\n \n coordslists=[]\n for poly in polylist:\n \n  if a ==0:\n   polyrotated=poly.pointList\n  else :\n   polyrotated=[]\n   t=svgbase.createSVGTransform()\n   t.setRotate(a *180 /pi,5500,5500)\n   M=t.matrix\n   P=poly.points\n   L=P.numberOfItems\n   for i in range(L):\n    pt=P.getItem(i)\n    newpt=pt.matrixTransform(M)\n    polyrotated.append((newpt.x,newpt.y))\n    \n  coords=[(round(x,xdp),y)for (x,y)in polyrotated]\n  coordslists.append(coords)\n  \n return coordslists\n \ndef _getsortedsegments(polylist,coordslists):\n segments=[]\n for poly,coordslist in zip(polylist,coordslists):\n  L=len(coordslist)\n  segments.extend([Segment(coordslist[i -1],coordslist[i],poly,((i -1)%L,i))for i in range(L)])\n segments.sort(key=lambda seg:(seg.leftx,round(seg.lefty,dp1),seg.gradient))\n return segments\n \ndef mergelists(list1,list2):\n if not list1:return list(list2)\n if not list2:return list(list1)\n \n list1iter,list2iter=iter(list1),iter(list2)\n item1=next(list1iter)\n item2=next(list2iter)\n result=[]\n \n while item1:\n  while item2 and (item2.y <item1.y or (item2.y ==item1.y and item1.xpos !=\"R\"and item2.gradient <item1.gradient)):\n   result.append(item2)\n   item2=next(list2iter,None )\n  result.append(item1)\n  item1=next(list1iter,None )\n if item2:\n  result.append(item2)\n  result.extend(list2iter)\n return result\n \ndef relativeposition(self,other):\n ''\n \n def sweeppast(x,latestoutcome,livesegments):\n \n  for seg in livesegments:\n   if seg.rightx ==x:\n    seg.y=round(seg.righty,dp2)\n   else :\n    seg.y=round(seg.lefty+(x -seg.leftx)*seg.gradient,dp2)\n    \n  for i,seg in enumerate(livesegments):\n   for seg2 in livesegments[i+1:]:\n   \n    if seg.y ==inf or seg2.y ==inf:continue\n    if seg.y >seg2.y and seg.poly !=seg2.poly:\n    \n     return Position.OVERLAPS,None\n  livesegments=[seg for seg in livesegments if round(seg.rightx,dp1)>round(x,dp1)]\n  \n  while unusedsegments and round(unusedsegments[0].leftx,dp1)==round(x,dp1):\n   newseg=unusedsegments.pop(0)\n   newseg.y=round(newseg.lefty,dp2)\n   livesegments.append(newseg)\n  livesegments.sort(key=lambda seg:(seg.y,seg.gradient))\n  \n  \n  yvaluesA=[seg.y for seg in livesegments if seg.poly ==polyA]\n  intervalsA=list(zip(yvaluesA[::2],yvaluesA[1::2]))\n  yvaluesB=[seg.y for seg in livesegments if seg.poly ==polyB]\n  intervalsB=list(zip(yvaluesB[::2],yvaluesB[1::2]))\n  \n  \n  for (startB,endB)in intervalsB:\n   for (startA,endA)in intervalsA:\n    if startB ==endB and (startA ==startB or endA ==endB):break\n    if startA <=startB and endA >=endB:\n     if latestoutcome ==Position.DISJOINT:return Position.OVERLAPS,None\n     latestoutcome=Position.CONTAINS\n     break\n    elif startB <startA <endB or startB <endA <endB:\n     return Position.OVERLAPS,None\n   else :\n    if latestoutcome ==Position.CONTAINS:return Position.OVERLAPS,None\n    latestoutcome=Position.DISJOINT\n  return latestoutcome,livesegments\n  \n polyA,polyB=getattr(self,\"boundary\",self),getattr(other,\"boundary\",other)\n coordslist1,coordslist2=_getrotatedcoords([polyA,polyB],xdp=dp)\n \n transposed=False\n bboxresult=_compareboundingboxes(coordslist1,coordslist2,ydp=dp)\n \n if bboxresult in {Position.DISJOINT,Position.TOUCHING}:return Position.DISJOINT\n if bboxresult ==Position.EQUAL:\n  if _equalpolygons(coordslist1,coordslist2):return Position.EQUAL\n  elif _area(coordslist2)>_area(coordslist1):\n   coordslist1,coordslist2=coordslist2,coordslist1\n   polyA,polyB=polyB,polyA\n   transposed=True\n if bboxresult ==Position.INSIDE:\n  coordslist1,coordslist2=coordslist2,coordslist1\n  polyA,polyB=polyB,polyA\n  transposed=True\n  \n  \n unusedsegments=_getsortedsegments([polyA,polyB],[coordslist1,coordslist2])\n \n \n livesegments=[]\n currentoutcome=None\n xvalues=sorted(set(x for (x,y)in coordslist1+coordslist2))\n \n for x in xvalues:\n \n  currentoutcome,livesegments=sweeppast(x,currentoutcome,livesegments)\n  \n  if currentoutcome ==Position.OVERLAPS:return currentoutcome\n  \n if currentoutcome ==Position.CONTAINS and transposed:currentoutcome=Position.INSIDE\n return currentoutcome\n \ndef findintersections(polylist):\n ''\n\n\n\n\n\n \n def calculatepoint(polyrefs):\n  (poly1,index1),(poly2,index2)=polyrefs\n  (i1a,i1b),(i2a,i2b)=index1,index2\n  p1,p2=poly1.pointList[i1a],poly2.pointList[i2a]\n  v1,v2=poly1.pointList[i1b]-p1,poly2.pointList[i2b]-p2\n  \n  \n  \n  if v1.cross(v2)==0:return Point((0,0))\n  t=(p2 -p1).cross(v2)/v1.cross(v2)\n  point=p1+t *v1\n  return point\n  \n def addtoixdict(point,polyrefs):\n  ixkey=round(point,dp2)\n  if ixkey in ixpoints:\n  \n   existingrefs=ixpoints[ixkey].polyrefs\n   for poly,index in polyrefs:\n    if (poly not in existingrefs)or isinstance(index,int):\n     existingrefs[poly]=index\n    else :\n     oldindex=existingrefs[poly]\n     if isinstance(oldindex,tuple)and index !=oldindex:\n      (a,b),(c,d)=index,oldindex\n      existingrefs[poly]=b if b ==c else a\n  else :\n  \n   ixpoints[ixkey]=Intersection(polyrefs,point)\n   \n   \n def sweeppast(x,livesegments):\n  for seg in livesegments:\n   if seg.rightx ==x:\n    seg.y=round(seg.righty,dp2)\n    seg.xpos=\"R\"\n    seg.currentindex=seg.rightindex\n   else :\n    seg.y=round(seg.lefty+(x -seg.leftx)*seg.gradient,dp2)\n    seg.xpos=\"M\"\n    seg.currentindex=seg.index\n    \n    \n    \n  for i,seg in enumerate(livesegments):\n   for seg2 in livesegments[i+1:]:\n   \n    if seg.y ==inf or seg2.y ==inf:continue\n    if seg.y >seg2.y and seg.poly !=seg2.poly:\n    \n     polyrefs=[(seg.poly,seg.index),(seg2.poly,seg2.index)]\n     point=calculatepoint(polyrefs)\n     addtoixdict(point,polyrefs)\n     \n  newsegments=[]\n  while unusedsegments and unusedsegments[0].leftx ==x:\n   newseg=unusedsegments.pop(0)\n   newseg.y=round(newseg.lefty,dp2)\n   newseg.xpos=\"L\"\n   newseg.currentindex=newseg.leftindex\n   newsegments.append(newseg)\n   \n  livesegments.sort(key=lambda seg:seg.y)\n  livesegments=mergelists(livesegments,newsegments)\n  \n  \n  segiter=iter(livesegments)\n  seg=next(segiter,None )\n  while seg is not None :\n   prevseg=seg\n   seg=next(segiter,None )\n   if seg is None :break\n   \n   if seg.y ==prevseg.y and seg.poly !=prevseg.poly:\n    if seg.xpos in {\"L\",\"R\"}or prevseg.xpos in {\"L\",\"R\"}:\n    \n     point=seg.poly.pointList[seg.currentindex]if seg.xpos in {\"L\",\"R\"}else prevseg.poly.pointList[prevseg.currentindex]\n     addtoixdict(point,[(seg.poly,seg.currentindex),(prevseg.poly,prevseg.currentindex)])\n     \n  livesegments=[seg for seg in livesegments if seg.xpos !=\"R\"]\n  return livesegments\n  \n  \n  \n tt=time.time()\n polylist=[getattr(poly,\"boundary\",poly)for poly in polylist]\n coordslists=_getrotatedcoords(polylist,xdp=dp)\n \n \n unusedsegments=_getsortedsegments(polylist,coordslists)\n \n \n ixpoints={}\n livesegments=[]\n xvalues=sorted(set(x for coordslist in coordslists for (x,y)in coordslist))\n \n for x in xvalues:\n  livesegments=sweeppast(x,livesegments)\n  \n  \n return list(ixpoints.values())\n \ndef boundary(polylist):\n ''\n \n tt=time.time()\n polylist=[getattr(poly,\"boundary\",poly)for poly in polylist]\n ixlist=findintersections(polylist)\n \n if ixlist ==[]:\n  maxarea=0\n  for poly in polylist:\n   polyarea=poly.area()\n   if polyarea >maxarea:(maxarea,maxpoly)=(polyarea,poly)\n  for poly in polylist:\n   if poly is maxpoly:continue\n   if maxpoly.positionRelativeTo(poly)!=Position.CONTAINS:return None\n  return PolygonObject(maxpoly.pointList)\n  \n ixlist.sort(key=lambda ix:ix.point)\n pointlists=[]\n for i,poly in enumerate(polylist):\n  poly.listindex=i\n  pointlists.append(poly.pointList)\n pointlists.append([ix.point for ix in ixlist])\n \n L=len(polylist)\n reflists=[[(j,i)for i in range(len(pointlists[j]))]for j in range(L)]\n \n ixdicts=[ListDict()for j in range(L)]\n regions=[]\n for i,ix in enumerate(ixlist):\n \n  for (poly,index)in ix.polyrefs.items():\n  \n   j=poly.listindex\n   if isinstance(index,tuple):\n   \n    ixdicts[j][index].append((L,i))\n   else :\n   \n    reflists[j][index]=(L,i)\n  polyset=set(ix.polyrefs)\n  for region in regions:\n   if polyset&region:\n    region.update(polyset)\n    break\n  else :\n   regions.append(polyset)\n   \n polyregions=[]\n while regions:\n \n  mainregion=regions.pop(0)\n  for region in regions[:]:\n   if region&mainregion:\n    mainregion.update(region)\n    regions.remove(region)\n  polyregions.append(mainregion)\n  \n  \n  \n  \n for j in range(L):\n  offset=1\n  for index in sorted(ixdicts[j]):\n   (i,k)=index\n   insert=ixdicts[j][index]\n   pl=pointlists[j]\n   if pl[k]<pl[i]:insert.reverse()\n   reflists[j][i+offset:i+offset]=insert\n   offset +=len(insert)\n   \n vertexdict=SetDict()\n for j in range(L):\n  last=len(reflists[j])-1\n  for i in range(last+1):vertexdict[reflists[j][i]].update({reflists[j][i -1],reflists[j][(i+1)if i <last else 0]})\n  \n  \n  \n  \n  \n  \n minp=Point((inf,inf))\n for (j,i)in vertexdict:\n  p=pointlists[j][i]\n  if p <minp:minp,minref=p,(j,i)\n currentref=minref\n currentp=start=minp\n newpointlist=[currentp]\n v1=Point((0,1))\n usedrefs={(minref,v1)}\n (j,i)=minref\n startpoly=next(iter(ixlist[i].polyrefs))if j ==L else polylist[j]\n for region in polyregions:\n  if startpoly in region:\n   boundaryregion=region\n   break\n else :\n  boundaryregion={startpoly}\n  \n  \n while True :\n  maxangle=-pi\n  for (j,i)in vertexdict[currentref]:\n   p=pointlists[j][i]\n   v2=p -currentp\n   angle=v2.anglefrom(v1)\n   \n   if angle >maxangle:(maxangle,bestp,bestref)=(angle,p,(j,i))\n  if [currentp,bestp]==newpointlist[:2]:break\n  currentref=bestref\n  newpointlist.append(bestp)\n  v1=bestp -currentp\n  currentp=bestp\n  \n  if (currentref,v1)in usedrefs:break\n  usedrefs.add((currentref,v1))\n  (j,i)=currentref\n  \n  \n  \n if currentp !=start:return False\n boundary=PolygonObject(newpointlist[:-1])\n if not (len(polyregions)==1 and len(boundaryregion)==L):\n  for poly in polylist:\n   if poly not in boundaryregion:\n   \n    if boundary.positionRelativeTo(poly)!=Position.CONTAINS:return None\n    \n    \n return boundary\n \nPolygonObject.__bases__=PolygonObject.__bases__+(PolygonMixin,)\nCanvasObject.__bases__=CanvasObject.__bases__+(PolygonCanvasMixin,)\nclass RegularPolygon(RegularPolygon,PolygonObject):\n pass\n", ["brySVG.transformcanvas", "math", "time"]]}
+var scripts = {"$timestamp": 1792416469517, "brySVG.drawcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\nfrom brySVG.dragcanvas import *\nimport brySVG.curvefit as curvefit\n\nclass NonBezierMixin(object):\n    ''\n    def setPoint(self, i, point):\n        self._unshare()\n        log = self._operationlog()\n        if log is not None: old = list(self.pointList[i])\n        self.pointList[i] = point\n        self._update()\n        self._updatehittarget()\n        if log is not None: log.record({\"op\":\"setvertices\", \"id\":self.id, \"changes\":[[i%len(self.pointList), old, list(point)]]})\n    \"\"\"\n    def setPoints(self, pointlist):\n        self.pointList = pointlist\n        self._update()\n        self._updatehittarget()\n    \"\"\"\n    def _movePoint(self, coords):\n       self.setPoint(-1, coords)\n\nclass PolyshapeMixin(object):\n    ''\n    def _appendPoint(self, point):\n        self._unshare()\n        self.pointList.append(point)\n        self._update()\n\n    def insertPoint(self, index, point):\n        self._unshare()\n        log = self._operationlog()\n        before = None if log is None else self._vertexdata()\n        self.pointList.insert(index, point)\n        self._update()\n        self._updatehittarget()\n        if log is not None: log.record(oplog.vertexOp(\"insertvertices\", self.id, before, self._vertexdata(), index if index >= 0 else index+len(before), 1))\n\n    def deletePoint(self, index):\n        self.deletePoints(index, index+1)\n\n    def deletePoints(self, start, end):\n        self._unshare()\n        log = self._operationlog()\n        before = None if log is None else self._vertexdata()\n        del self.pointList[slice(start, end)]\n        self._update()\n        self._updatehittarget()\n        if log is not None: self._logDeletion(log, before, start, end)\n\nclass BezierMixin(object):\n    ''\n    def setPointset(self, i, pointset):\n        self._unshare()\n        log = self._operationlog()\n        if log is not None: old = [None if point is None else list(point) for point in self.pointsetList[i]]\n        self.pointList[i] = pointset[1]\n        self.pointsetList[i] = pointset\n        self._update()\n        self._updatehittarget()\n        if log is not None:\n            new = [None if point is None else list(point) for point in pointset]\n            log.record({\"op\":\"setvertices\", \"id\":self.id, \"changes\":[[i%len(self.pointsetList), old, new]]})\n\n    def setPointsetList(self, pointsetlist):\n        self.pointList = [pointset[1] for pointset in pointsetlist]\n        self.pointsetList = pointsetlist\n        self._update()\n        self._updatehittarget()\n\n    def setPoint(self, i, point):\n        self._unshare()\n        log = self._operationlog()\n        if isinstance(self, SmoothBezierMixin) and len(self.pointList) > 2:\n            i %= len(self.pointList)\n            window = self._controlwindow([i])\n            if log is not None: old = self._vertexdata(window)\n            self.pointList[i] = point\n            self._updatecontrolpoints([i])\n            self._updatehittarget()\n            if log is not None:\n                changes = [[j, oldvalue, newvalue] for (j, oldvalue, newvalue) in zip(window, old, self._vertexdata(window)) if oldvalue != newvalue]\n                log.record({\"op\":\"setvertices\", \"id\":self.id, \"changes\":changes})\n            return\n        before = None if log is None else self._vertexdata()\n        self.pointList[i] = point\n        self.pointsetList = self._getpointsetlist(self.pointList)\n        self._update()\n        self._updatehittarget()\n        if log is not None: log.record(oplog.vertexOp(\"setvertices\", self.id, before, self._vertexdata()))\n    \"\"\"\n    def setPoints(self, pointlist):\n        self.pointList = pointlist\n        self.pointsetList = self._getpointsetlist(pointlist)\n        self._update()\n        self._updatehittarget()\n    \"\"\"\n    def _appendPoint(self, point):\n        self._unshare()\n        self.pointList.append(point)\n        if isinstance(self, SmoothBezierMixin):\n            self.pointsetList.append(None)\n            self._pathsegments.append(None)\n            self._updatecontrolpoints([len(self.pointList)-1])\n        else:\n            self.pointsetList = self._getpointsetlist(self.pointList)\n            self._update()\n\n    def deletePoints(self, start, end):\n        self._unshare()\n        log = self._operationlog()\n        before = None if log is None else self._vertexdata()\n        if isinstance(self, SmoothBezierMixin):\n            L = len(self.pointList)\n            (start, end, step) = slice(start, end).indices(L)\n            del self.pointList[start:end]\n            del self.pointsetList[start:end]\n            self._deletepathsegments(start, end, L)\n            self._updatecontrolpoints([start-1, start])\n        else:\n            del self.pointList[slice(start, end)]\n            self.pointsetList = self._getpointsetlist(self.pointList)\n            self._update()\n        self._updatehittarget()\n        if log is not None: self._logDeletion(log, before, start, end)\n\n    def insertPoint(self, index, point):\n        self._unshare()\n        log = self._operationlog()\n        before = None if log is None else self._vertexdata()\n        L = len(self.pointList)+1\n        index = min(index, L-1) if index >= 0 else max(0, index+L-1)\n        self.pointList.insert(index, point)\n        self._pathsegments.insert(index, None)\n        if isinstance(self, SmoothBezierMixin):\n            self.pointsetList.insert(index, None)\n            self._updatecontrolpoints([index])\n        else:\n            triple = [self.pointList[index-1], point, self.pointList[(index+1)%L]]\n            cpoint1, cpoint2 = SmoothBezierMixin._calculatecontrolpoints(self, triple)\n\n            self.pointsetList.insert(index, [cpoint1, point, cpoint2])\n            self.pointsetList[index-1][2] = cpoint1\n            self.pointsetList[(index+1)%L][0] = cpoint2\n            self._updatepath([index-1, index, index+1])\n        self._updatehittarget()\n        if log is not None: log.record(oplog.vertexOp(\"insertvertices\", self.id, before, self._vertexdata(), index, 1))\n\n    def deletePoint(self, index):\n        self._unshare()\n        log = self._operationlog()\n        before = None if log is None else self._vertexdata()\n        L = len(self.pointsetList)\n        index %= L\n        point = self.pointList[index]\n        del self.pointList[index]\n        self._deletepathsegments(index, index+1, L)\n        if isinstance(self, SmoothBezierMixin):\n            del self.pointsetList[index]\n            self._updatecontrolpoints([index-1, index])\n        else:\n\n\n\n\n            if index == 0 and self.pointsetList[index][0] is None:\n                self.pointsetList[index+1][0] = None\n            elif index == L-1 and self.pointsetList[index][2] is None:\n                self.pointsetList[index-1][2] = None\n            else:\n                self.pointsetList[(index-1)%L][2] = point\n                self.pointsetList[(index+1)%L][0] = point\n            del self.pointsetList[index]\n            self._updatepath([index-1, index])\n        self._updatehittarget()\n        if log is not None: log.record(oplog.vertexOp(\"deletevertices\", self.id, before, self._vertexdata(), index, 1))\n\n    def _movePoint(self, point):\n        self._unshare()\n        self.pointList[-1] = point\n        self._updatepointsetlist()\n        if len(self.pointList) == 2:\n            self._update()\n        else:\n            L = len(self.pointList)\n            self._updatepath([L-2, L-1, 0] if isinstance(self, ClosedBezierObject) else [L-2, L-1])\n\nclass DrawCanvasMixin(object):\n    def setTool(self, tool):\n        if self.mouseMode == MouseMode.DRAW: self._endDraw()\n        self.tool = tool\n        self.mouseMode = MouseMode.EDIT if tool in {\"select\", \"insertpoint\", \"deletepoint\"} else MouseMode.DRAW\n\n    def _createObject(self, coords):\n        colour = \"none\" if self.tool in [\"polyline\", \"bezier\", \"smoothbezier\"] else self.fillColour\n        self.mouseOwner = shapetypes[self.tool](pointlist=[coords, coords], linecolour=self.penColour, linewidth=self.penWidth, fillcolour=colour)\n        self.addObject(self.mouseOwner)\n        self.mouseOwner.shapeType = self.tool\n\n    def _drawPoint(self, event):\n        if self.tool == \"select\": return\n        if self.tool == \"freehand\":\n            self._endStroke()\n            self._startStroke(event)\n            return\n        if self.mouseOwner:\n            if isinstance(self.mouseOwner, (PolyshapeMixin, BezierMixin)):\n                coords = self.getSVGcoords(event)\n                self.mouseOwner._appendPoint(coords)\n        else:\n            self.startx = self.currentx = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n            self.starty = self.currenty = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n            coords = self.getSVGcoords(event)\n            self._createObject(coords)\n\n    def _endDraw(self, event=None):\n        if self.tool == \"freehand\": return self._endStroke()\n        if not self.mouseOwner: return\n        svgobj = self.mouseOwner\n        if isinstance(svgobj, (PolyshapeMixin, BezierMixin)):\n            evtype = getattr(event, \"type\", None)\n            if evtype == \"dblclick\":\n                svgobj.deletePoints(-2, None)\n\n            elif self.mouseDetected:\n                svgobj.deletePoints(-1, None)\n\n            elif svgobj.pointList[0] == svgobj.pointList[1]:\n                svgobj.deletePoints(None, 1)\n\n            while len(svgobj.pointList) > 1 and svgobj.pointList[-1] == svgobj.pointList[-2]:\n                svgobj.deletePoints(-1, None)\n            if len(svgobj.pointList) == 1: self.deleteObject(svgobj)\n            if isinstance(svgobj, SectorObject): svgobj.pointList = svgobj.pointList[:2] + svgobj.pointList[-1:]\n        elif isinstance(svgobj, NonBezierMixin):\n            if svgobj.pointList[0] == svgobj.pointList[1]: self.deleteObject(svgobj)\n        self.mouseOwner = None\n        self.mouseMode = MouseMode.EDIT\n        if self.operationLog is not None: self._logObjectOperation(\"addobject\", svgobj)\n        return svgobj\n\n    def _startStroke(self, event):\n        ''\n\n        self.stroke = curvefit.StrokeSimplifier(self.freehandTolerance*self.scaleFactor/2)\n        self.stroke.addPoint(self.getSVGcoords(event))\n        self.strokeString = \"\"\n        self.strokeDrawn = 0\n        self.mouseOwner = svg.polyline(style={\"stroke\":self.penColour, \"stroke-width\":self.penWidth, \"fill\":\"none\"})\n        self <= self.mouseOwner\n\n    def _continueStroke(self, event):\n        ''\n\n\n        try:\n            events = event.getCoalescedEvents() or [event]\n        except AttributeError:\n            events = [event]\n        m = self.getScreenCTM().inverse()\n        addpoint = self.stroke.addPoint\n        for ev in events:\n            (x, y) = (ev.changedTouches[0].clientX, ev.changedTouches[0].clientY) if \"touch\" in ev.type else (ev.clientX, ev.clientY)\n            addpoint((m.a*x + m.c*y + m.e, m.b*x + m.d*y + m.f))\n        if self.strokeFrame is None: self.strokeFrame = window.requestAnimationFrame(self._drawStroke)\n\n    @timings.timed(\"DOM-drawStroke\")\n    def _drawStroke(self, timestamp=None):\n        ''\n        self.strokeFrame = None\n        stroke = self.stroke\n        if stroke is None: return\n        if stroke.reduced:\n            (self.strokeString, self.strokeDrawn, stroke.reduced) = (\"\", 0, False)\n        self.strokeString += \"\".join(f\"{x},{y} \" for (x, y) in stroke.points[self.strokeDrawn:])\n        self.strokeDrawn = len(stroke.points)\n        latest = \"\" if stroke.latest is None else f\"{stroke.latest[0]},{stroke.latest[1]}\"\n        self.mouseOwner.attrs[\"points\"] = self.strokeString + latest\n\n    def _endStroke(self):\n        ''\n\n        if self.stroke is None: return None\n        if self.strokeFrame is not None: window.cancelAnimationFrame(self.strokeFrame)\n        points = self.stroke.finish()\n        tolerance = self.stroke.tolerance\n        self.removeChild(self.mouseOwner)\n        self.mouseOwner = self.stroke = self.strokeFrame = None\n        pointsetlist = curvefit.fitPolyline(points, tolerance)\n        if not pointsetlist: return None\n        svgobj = BezierObject(pointsetlist, linecolour=self.penColour, linewidth=self.penWidth)\n        svgobj.shapeType = \"freehand\"\n        self.addObject(svgobj)\n        return svgobj\n\n    def _createEditHitTargets(self):\n        objlist = list(self.objectDict.values())\n        for obj in objlist:\n            if isinstance(obj, GroupObject): continue\n            if hasattr(obj, \"hitTarget\"): continue\n            if hasattr(obj, \"reference\"): continue\n            if isinstance(obj, UseObject):\n                newobj = RectangleObject(obj.pointList, obj.angle)\n            elif obj.fixed:\n                continue\n            elif isinstance(obj, (PolyshapeMixin, BezierMixin)):\n                newobj = HitTarget(obj, self)\n            else:\n                if obj.style.fill != \"none\": continue\n                newobj = obj.cloneObject()\n                newobj.style.strokeWidth = HITTARGETWIDTH\n            newobj.reference = obj\n            newobj.style.opacity = 0\n            if not isinstance(newobj, HitTarget):\n                for event in MOUSEEVENTS: newobj.bind(event, self._onHitTargetMouseEvent)\n                for event in TOUCHEVENTS: newobj.bind(event, self._onHitTargetTouchEvent)\n            self._addHitTarget(obj, newobj)\n\n    def _prepareEdit(self, event):\n        if self.selectedObject: self.deselectObject()\n        svgobject = self.getSelectedObject(event.target.id, getGroup=False)\n        if not svgobject or svgobject.fixed: return\n        self.selectedObject = svgobject\n        self.createHandles(svgobject)\n        if self.tool == \"insertpoint\":\n            index, point = self._insertPoint(event)\n\n    def createHandles(self, svgobject):\n        if isinstance(svgobject, UseObject): return\n        if isinstance(svgobject, BezierMixin):\n            handles = []\n            for i, (point0, point1, point2) in enumerate(svgobject.pointsetList):\n                handle = Handle(svgobject, i, point1, \"red\", self)\n                handle.controlHandles = []\n                ch0 = None if point0 is None else ControlHandle(svgobject, i, 0, point0, \"green\", self)\n                ch2 = None if point2 is None else ControlHandle(svgobject, i, 2, point2, \"green\", self)\n                if ch0:\n                    ch0.linkedHandle = ch2 if isinstance(svgobject, SmoothBezierMixin) else None\n                    handle.controlHandles.append(ch0)\n                if ch2:\n                    ch2.linkedHandle = ch0 if isinstance(svgobject, SmoothBezierMixin) else None\n                    handle.controlHandles.append(ch2)\n                handles.append(handle)\n            self.handles = GroupObject(handles)\n            self <= self.handles\n            self.controlhandles = GroupObject([ch for handle in handles for ch in handle.controlHandles])\n            self <= self.controlhandles\n        else:\n            self.handles = GroupObject([Handle(svgobject, i, coords, \"red\", self) for i, coords in enumerate(svgobject.pointList)])\n            self <= self.handles\n\n    def _movePoint(self, event):\n        if self.stroke is not None:\n            self._continueStroke(event)\n            return\n        x = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        y = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        dx, dy = x-self.currentx, y-self.currenty\n        if \"touch\" in event.type and abs(dx) < 5 and abs(dy) < 5: return\n        self.currentx, self.currenty = x, y\n        if self.mouseMode == MouseMode.DRAW:\n            coords = self.getSVGcoords(event)\n            self.mouseOwner._movePoint(coords)\n        else:\n            if self.mouseMode == MouseMode.TRANSFORM: dx, dy = x-self.startx, y-self.starty\n            dx, dy = dx*self.scaleFactor, dy*self.scaleFactor\n            self.mouseOwner._movePoint((dx, dy))\n\n    def _insertPoint(self, event):\n        if not self.selectedObject: return None, None\n        try:\n            index = self.objectDict[event.target.id].segmentindex\n        except (KeyError, AttributeError):\n            return None, None\n        self.deleteObject(self.handles)\n        self.deleteObject(self.controlhandles)\n        clickpoint = self.getSVGcoords(event)\n        svgobject = self.selectedObject\n        svgobject.insertPoint(index, clickpoint)\n        self.createHandles(svgobject)\n        return index, clickpoint\n\n    def _deletePoint(self, index):\n        if not self.selectedObject: return None\n        if not isinstance(self.selectedObject, (PolyshapeMixin, BezierObject)): return None\n        svgobject = self.selectedObject\n        if len(svgobject.pointList) <= 2:\n            self.deleteSelection()\n            return None\n        self.deleteObject(self.handles)\n        self.deleteObject(self.controlhandles)\n        svgobject.deletePoint(index)\n        self.createHandles(svgobject)\n        return index\n\n    def _endEdit(self, event):\n        if self.selectedObject:\n            self.selectedObject._updatehittarget()\n            if self.handles: self <= self.handles\n            if self.controlhandles: self <= self.controlhandles\n        self.mouseOwner = None\n\n    def deselectObject(self):\n        if not self.selectedObject: return\n        self.deleteHandles()\n        self.mouseOwner = self.selectedObject = self.selectedhandle = None\n\n    def deleteHandles(self):\n        self.deleteObject(self.handles)\n        self.handles = None\n        if isinstance(self.selectedObject, BezierMixin):\n            self.deleteObject(self.controlhandles)\n            self.controlhandles = None\n\nclass HitTargetSegment(LineObject):\n    def __init__(self, pointlist, width, reference, index):\n        LineObject.__init__(self, pointlist, linewidth=width)\n        self.reference = reference\n        self.segmentindex = index\n        self.style.opacity = 0\n\nclass BezierHitTargetSegment(BezierObject):\n    def __init__(self, pointsetlist, width, reference, index):\n        BezierObject.__init__(self, pointsetlist, linewidth=width)\n        self.reference = reference\n        self.segmentindex = index\n        self.style.opacity = 0\n\nclass HitTarget(GroupObject):\n    def __init__(self, reference, canvas):\n        GroupObject.__init__(self)\n        self.reference = reference\n        self.style.cursor = reference.style.cursor\n        self.canvas = canvas\n        self._update()\n\n    def _update(self):\n        self.deleteAll()\n        width = HITTARGETWIDTH\n        if isinstance(self.reference, PolyshapeMixin):\n            pointlist = self.reference.pointList[:]\n            if isinstance(self.reference, PolygonObject): pointlist.append(pointlist[0])\n            for i in range(len(pointlist)-1):\n                segment = HitTargetSegment(pointlist[i:i+2], width, self.reference, i+1)\n                self.addObject(segment)\n        else:\n            pointsetlist = self.reference.pointsetList[:]\n            if isinstance(self.reference, (ClosedBezierObject, SmoothClosedBezierObject)): pointsetlist.append(pointsetlist[0])\n            for i in range(len(pointsetlist)-1):\n                ps0 = [None] + pointsetlist[i][1:]\n                ps1 = pointsetlist[i+1][:-1] + [None]\n                segment = BezierHitTargetSegment([ps0, ps1], width, self.reference, i+1)\n                self.addObject(segment)\n        self.canvas.deleteObject(self)\n        self.canvas.addObject(self)\n        parent = self.canvas._hittargetparent(self.reference)\n        if parent is not self.canvas: parent <= self\n\nclass Handle(PointObject):\n    def __init__(self, owner, index, coords, colour, canvas):\n        pointsize = 7 if canvas.mouseDetected else 15\n        opacity = 0.4\n        strokewidth = 3\n        PointObject.__init__(self, coords, colour, pointsize, canvas)\n        self.style.strokeWidth = strokewidth\n        self.style.fillOpacity = opacity\n        self.owner = owner\n        self.pointIndex = index\n        self.canvas = canvas\n        self.bind(\"mousedown\", self._select)\n        self.bind(\"touchstart\", self._select)\n\n    def _select(self, event):\n        if event.type == \"mousedown\" and event.button > 0: return\n        event.preventDefault()\n        event.stopPropagation()\n        if self.canvas.tool == \"deletepoint\":\n            self.canvas._deletePoint(self.pointIndex)\n            return\n        self.canvas.startx = self.canvas.currentx = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        self.canvas.starty = self.canvas.currenty = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        self.canvas.mouseOwner = self\n        if isinstance(self.owner, BezierMixin):\n            if self.canvas.selectedhandle:\n                for ch in self.canvas.selectedhandle.controlHandles: ch.style.visibility = \"hidden\"\n            for ch in self.controlHandles: ch.style.visibility = \"visible\"\n        self.canvas.selectedhandle = self\n\n    def _movePoint(self, offset):\n        self.XY = self.XY + offset\n        if isinstance(self.owner, BezierMixin):\n            pointset = [None, self.XY, None]\n            for ch in self.controlHandles:\n                ch.XY = ch.XY + offset\n                pointset[ch.subindex] = ch.XY\n            self.owner.setPointset(self.pointIndex, pointset)\n        else:\n            self.owner.setPoint(self.pointIndex, self.XY)\n\nclass ControlHandle(PointObject):\n    def __init__(self, owner, index, subindex, coords, colour, canvas):\n        pointsize = 7 if canvas.mouseDetected else 15\n        opacity = 0.4\n        strokewidth = 3\n        PointObject.__init__(self, coords, colour, pointsize, canvas)\n        self.style.fillOpacity = opacity\n        self.style.strokeWidth = strokewidth\n        self.style.visibility = \"hidden\"\n        self.owner = owner\n        self.pointIndex = index\n        self.subindex = subindex\n        self.canvas = canvas\n        self.bind(\"mousedown\", self._select)\n        self.bind(\"touchstart\", self._select)\n\n    def _select(self, event):\n        event.stopPropagation()\n        self.canvas.startx = self.canvas.currentx = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        self.canvas.starty = self.canvas.currenty = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        self.canvas.mouseOwner = self\n\n    def _movePoint(self, offset):\n        self.XY = self.XY + offset\n        pointset = list(self.owner.pointsetList[self.pointIndex])\n        pointset[self.subindex] = self.XY\n        if self.linkedHandle:\n            point = pointset[1]\n            thisoffset = self.XY - point\n            otheroffset = self.linkedHandle.XY - point\n            newoffset = thisoffset*(otheroffset.length()/thisoffset.length())\n            newothercoords = point-newoffset\n            pointset[self.linkedHandle.subindex] = newothercoords\n            self.linkedHandle.XY = newothercoords\n        self.owner.setPointset(self.pointIndex, pointset)\n\nnonbezier = [LineObject, RectangleObject, EllipseObject, CircleObject, SectorObject, PolylineObject, PolygonObject, ImageObject]\nfor cls in nonbezier:\n    cls.__bases__ = cls.__bases__ + (NonBezierMixin,)\n\npolyshape = [PolylineObject, PolygonObject, SectorObject]\nfor cls in polyshape:\n    cls.__bases__ = cls.__bases__ + (PolyshapeMixin,)\n\nbezier = [BezierObject, ClosedBezierObject, SmoothBezierObject, SmoothClosedBezierObject]\nfor cls in bezier:\n    cls.__bases__ = cls.__bases__ + (BezierMixin,)\n\nCanvasObject.__bases__ = CanvasObject.__bases__ + (DrawCanvasMixin,)\n", ["brySVG.curvefit", "brySVG.dragcanvas"]], "brySVG.dragcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\nimport time\nfrom collections import deque\nfrom browser import document, alert, window\nimport browser.svg as svg\nimport browser.html as html\nfrom math import sin, cos, atan2, pi, hypot, floor, log10\nimport brySVG.scene as scene\nimport brySVG.svgexport as svgexport\nimport brySVG.svgimport as svgimport\nimport brySVG.oplog as oplog\nimport brySVG.textmetrics as textmetrics\nimport brySVG.textlayout as textlayout\nimport brySVG.flatten as flatten\nimport brySVG.timings as timings\nimport brySVG.inputlog as inputlog\nfrom brySVG.geometry import Point, Matrix, roundsf\nimport brySVG.geometry as geometry\nsvgbase = svg.svg(width=0, height=0)\nbasepoint = svgbase.createSVGPoint()\nlasttaptime = 0\nMOUSEEVENTS = [\"mousedown\", \"mousemove\", \"mouseup\", \"click\"]\nTOUCHEVENTS = [\"touchstart\", \"touchmove\", \"touchend\"]\nHITTARGETWIDTH = \"var(--hittargetwidth)\"\nCANVASSTYLE = \".nonscalingstroke * {vector-effect: non-scaling-stroke;}\"\n\nPOINTBYTES = 100\nDOMPOINTBYTES = 8\nSEGMENTBYTES = 60\nPATHSEGMENTBYTES = 40\n\nclass Enum(list):\n    def __init__(self, name, string):\n        values = string.split()\n        for i, value in enumerate(values):\n            setattr(self, value, i)\n            self.append(i)\n\nMouseMode = Enum('MouseMode', 'NONE DRAG TRANSFORM DRAW EDIT PAN')\nTransformType = Enum('TransformType', 'NONE TRANSLATE ROTATE XSTRETCH YSTRETCH ENLARGE')\nPosition = Enum ('Position', 'CONTAINS INSIDE OVERLAPS EQUAL DISJOINT')\n\nclass ObjectMixin(object):\n    ''\n    _pendingMatrix = None\n    _sharedGeometry = False\n\n    @property\n    def pointList(self):\n        pointlist = self._pointList\n        if self._hasPending():\n            self._materialise()\n            pointlist = self._pointList\n        return pointlist\n\n    @pointList.setter\n    def pointList(self, pointlist):\n        if self._hasPending(): self._materialise()\n        self._pointList = pointlist\n\n    @property\n    def pointsetList(self):\n        pointsetlist = self._pointsetList\n        if self._hasPending():\n            self._materialise()\n            pointsetlist = self._pointsetList\n        return pointsetlist\n\n    @pointsetList.setter\n    def pointsetList(self, pointsetlist):\n        if self._hasPending(): self._materialise()\n        self._pointsetList = pointsetlist\n\n    def cloneObject(self):\n        ''\n\n\n\n\n\n        self._materialise()\n        if isinstance(self, GroupObject):\n            newobject = self.__class__()\n            for obj in self.objectList:\n                if isinstance(obj, ObjectMixin):\n                    newobj = obj.cloneObject()\n                    newobject <= newobj\n                    newobj.group = newobject\n                    newobject.objectList.append(newobj)\n        elif isinstance(self, ImageObject) and not self.imageloaded:\n            newobject = self.__class__(self.attrs.get(\"href\"), *getattr(self, \"_imageargs\", ()))\n        elif isinstance(self, ObjectMixin):\n\n            newobject = self.__class__()\n            self._sharegeometry(newobject)\n            for attrname in [\"XY\", \"angle\", \"fixed\", \"rotatestring\", \"centre\", \"_width\", \"_height\",\n                             \"currentAspectRatio\", \"imageWidth\", \"imageHeight\", \"imageAspectRatio\", \"imageloaded\",\n                             \"startangle\", \"endangle\", \"radius\"]:\n                attr = getattr(self, attrname, \"NO_SUCH_ATTRIBUTE\")\n                if attr == \"NO_SUCH_ATTRIBUTE\": continue\n                newattr = list(attr) if isinstance(attr, list) else attr\n                setattr(newobject, attrname, newattr)\n        else:\n            return None\n\n\n        for key in self.attrs:\n            value = self.attrs[key]\n            newobject.attrs[key] = value\n        newobject.id = \"\"\n        return newobject\n\n    def _sharegeometry(self, newobject):\n        ''\n\n        shared = False\n        for attrname in [\"_pointList\", \"_pointsetList\", \"_pathsegments\"]:\n            attr = getattr(self, attrname, None)\n            if attr is None: continue\n            setattr(newobject, attrname, attr)\n            shared = True\n        if isinstance(self, BezierObject):\n            newobject._geometryversion = self._geometryversion\n            newobject._flattened = getattr(self, \"_flattened\", None)\n        if shared: self._sharedGeometry = newobject._sharedGeometry = True\n\n    def _unshare(self):\n        ''\n\n        if not self._sharedGeometry: return\n        self._sharedGeometry = False\n        pointlist = getattr(self, \"_pointList\", None)\n        if pointlist is not None: self._pointList = list(pointlist)\n        pointsetlist = getattr(self, \"_pointsetList\", None)\n        if pointsetlist is not None: self._pointsetList = [list(pointset) for pointset in pointsetlist]\n        segments = getattr(self, \"_pathsegments\", None)\n        if segments is not None: self._pathsegments = list(segments)\n\n    def setPointList(self, pointlist):\n        ''\n        self.pointList = [Point(coords) for coords in pointlist]\n        if isinstance(self, BezierObject): self.pointsetList = self._getpointsetlist(pointlist)\n        self._update()\n        self._updatehittarget()\n\n    def setStyle(self, attribute, value):\n        ''\n        self.style = {attribute:value}\n\n    def _updatehittarget(self):\n        ''\n        hittarget = getattr(self, \"hitTarget\", None)\n        if hittarget:\n            hittarget.style.transform = \"\"\n            hittarget.pointList = self.pointList\n            if isinstance(self, (RectangleObject, EllipseObject, ImageObject, UseObject)): hittarget.angle = self.angle\n            if isinstance(self, BezierObject):\n                hittarget.pointsetList = self.pointsetList\n                hittarget._pathsegments = self._pathsegments\n                hittarget._setpath()\n            else:\n                hittarget._update()\n\n    def _transformedpointlist(self, matrix):\n        ''\n        newpointlist = []\n        for point in self.pointList:\n            (basepoint.x, basepoint.y) = point\n            newpt =  basepoint.matrixTransform(matrix)\n            newpointlist.append(Point((newpt.x, newpt.y)))\n        return newpointlist\n\n    def _transformedpoint(self, matrix):\n        ''\n        (basepoint.x, basepoint.y) = self.XY\n        newpt =  basepoint.matrixTransform(matrix)\n        return Point((newpt.x, newpt.y))\n\n    def _transformedpointsetlist(self, matrix):\n        ''\n        newpointsetlist = []\n        for pointset in self.pointsetList:\n            newpointset = []\n            for point in pointset:\n                if point is None:\n                    newpointset.append(None)\n                else:\n                    (basepoint.x, basepoint.y) = point\n                    newpt = basepoint.matrixTransform(matrix)\n                    newpointset.append(Point((newpt.x, newpt.y)))\n            newpointsetlist.append(newpointset)\n        return newpointsetlist\n\n    def _applyMatrix(self, matrix):\n        ''\n        if isinstance(self, PointObject):\n            self.XY = self._transformedpoint(matrix)\n        elif isinstance(self, PolygonObject):\n            self._transformpoints(self.points, matrix)\n            self._pointList = None\n            self._segments = None\n        elif hasattr(self, \"pointList\"):\n            self.pointList = self._transformedpointlist(matrix)\n            if isinstance(self, BezierObject): self.pointsetList = self._transformedpointsetlist(matrix)\n            self._update()\n        else:\n            self._deferMatrix(matrix)\n            return\n        self._updatehittarget()\n\n    def bake(self):\n        ''\n\n        self._materialise()\n        if isinstance(self, GroupObject):\n            for obj in self.objectList:\n                if isinstance(obj, ObjectMixin): obj.bake()\n\n    def _deferMatrix(self, matrix):\n        ''\n\n        self._materialiseGroups()\n        self._pendingMatrix = matrix if self._pendingMatrix is None else matrix.multiply(self._pendingMatrix)\n        self.style.transform = self._transformstring()\n        canvas = getattr(self, \"canvas\", None)\n        if canvas is None: return\n\n\n\n        if isinstance(self, GroupObject):\n            container = getattr(self, \"hitTargetGroup\", None)\n            if container is not None: container.style.transform = self._pendingstring()\n            return\n        hittarget = canvas.hittargets.get(self.id)\n        if hittarget is not None: hittarget.style.transform = self._pendingstring() + hittarget._transformstring()\n\n    def _hasPending(self):\n        ''\n\n        obj = self\n        while obj is not None:\n            if obj._pendingMatrix is not None: return True\n            obj = getattr(obj, \"group\", None)\n        return False\n\n    def _totalPending(self):\n        ''\n        matrix = None\n        obj = self\n        while obj is not None:\n            if obj._pendingMatrix is not None:\n                matrix = obj._pendingMatrix if matrix is None else obj._pendingMatrix.multiply(matrix)\n            obj = getattr(obj, \"group\", None)\n        return matrix\n\n    def _materialise(self):\n        ''\n\n        self._materialiseGroups()\n        if self._pendingMatrix is None: return\n        tt = timings.start()\n        matrix = self._pendingMatrix\n        self._pendingMatrix = None\n        self.style.transform = self._transformstring()\n        if getattr(self, \"hitTargetGroup\", None) is not None: self.hitTargetGroup.style.transform = \"\"\n        self._applyMatrix(matrix)\n        timings.lap(\"DOM-materialise\", tt)\n\n    def _materialiseGroups(self):\n        ''\n        group = getattr(self, \"group\", None)\n        if group is not None and group._hasPending(): group._materialise()\n\n    def _transformstring(self):\n        ''\n        return self._pendingstring() + getattr(self, \"rotatestring\", \"\") + getattr(self, \"scalestring\", \"\")\n\n    def _pendingstring(self):\n        ''\n        m = self._pendingMatrix\n        return \"\" if m is None else f\"matrix({m.a},{m.b},{m.c},{m.d},{m.e},{m.f}) \"\n\n    def _transform(self, matrix, angle=0):\n        ''\n\n        self._materialiseGroups()\n        if angle and isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)): self.angle += angle\n        self._deferMatrix(matrix)\n        self._logOperation({\"op\":\"transform\", \"id\":self.id, \"matrix\":[matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f], \"angle\":angle})\n\n    def _operationlog(self):\n        ''\n        canvas = getattr(self, \"canvas\", None)\n        if getattr(canvas, \"operationLog\", None) is None: return None\n        return canvas._getOperationLog(self)\n\n    def _logOperation(self, op):\n        ''\n        log = self._operationlog()\n        if log is not None: log.record(op)\n\n    def _vertexdata(self, indices=None):\n        ''\n\n        vertices = self.pointsetList if isinstance(self, BezierObject) else self.pointList\n        if indices is not None: vertices = [vertices[i] for i in indices]\n        if isinstance(self, BezierObject): return [[None if point is None else list(point) for point in pointset] for pointset in vertices]\n        return [list(point) for point in vertices]\n\n    def _setvertexdata(self, vertices):\n        ''\n\n        if isinstance(self, BezierObject):\n            self.pointsetList = [[None if coords is None else Point(coords) for coords in pointset] for pointset in vertices]\n            self.pointList = [pointset[1] for pointset in self.pointsetList]\n            self._update()\n            self._updatehittarget()\n        else:\n            self.setPointList(vertices)\n            if isinstance(self, PolygonObject): self._updatehittarget()\n\n    def _snappoints(self):\n        ''\n\n        return getattr(self, \"pointList\", None)\n\n    def _boundingbox(self):\n        ''\n        self._materialise()\n        bbox = self.getBBox()\n        return ((bbox.x, bbox.y), (bbox.x+bbox.width, bbox.y+bbox.height))\n\n    def _logDeletion(self, log, before, start, end):\n        ''\n        (start, end, step) = slice(start, end).indices(len(before))\n        log.record(oplog.vertexOp(\"deletevertices\", self.id, before, self._vertexdata(), start, end-start))\n\n    def _getRecord(self, objtype):\n        ''\n        self._materialise()\n        record = {\"type\":objtype}\n        if self.id: record[\"id\"] = self.id\n        if getattr(self, \"fixed\", False): record[\"fixed\"] = True\n        style = {}\n        for i in range(self.style.length):\n            name = self.style.item(i)\n            if name != \"transform\": style[name] = self.style.getPropertyValue(name)\n        if style: record[\"style\"] = style\n\n        if isinstance(self, GroupObject):\n            record[\"objects\"] = [_getrecord(obj) for obj in self.objectList]\n        elif isinstance(self, PointObject):\n            record[\"points\"] = list(self.XY)\n            record[\"size\"] = float(self.attrs[\"r\"])\n        elif isinstance(self, BezierObject):\n            record[\"points\"] = [coord for pointset in self.pointsetList for point in pointset if point is not None for coord in point]\n        elif isinstance(self, UseObject):\n            record.update({\"href\":self.attrs[\"href\"], \"centre\":list(self.centre), \"width\":self._width, \"height\":self._height, \"angle\":self.angle})\n            record.update({\"origin\":list(self.origin), \"scale\":[self._width/self._origwidth, self._height/self._origheight]})\n        else:\n            if isinstance(self, ImageObject):\n                if not self.imageloaded: raise RuntimeError(\"ImageObject cannot be saved until fully loaded\")\n                record[\"href\"] = self.attrs[\"href\"]\n            record[\"points\"] = [coord for point in self.pointList for coord in point]\n            if isinstance(self, (RectangleObject, EllipseObject, ImageObject)): record[\"angle\"] = self.angle\n            if isinstance(self, SectorObject): record.update({\"radius\":self.radius, \"startangle\":self.startangle, \"endangle\":self.endangle})\n        return record\n\n    def __repr__(self):\n        return f\"{self.__class__}{self.id}\"\n\nclass SmoothBezierMixin(object):\n    ''\n    def _calculatecontrolpoints(self, points):\n        ''\n        [(x1, y1), (x2, y2), (x3, y3)] = points\n        (dx1, dy1) = ((x2-x1), (y2-y1))\n        (dx3, dy3) = ((x2-x3), (y2-y3))\n        d1 = hypot(dx1, dy1)\n        d2 = hypot(dx3, dy3)\n        if d1 == 0 or d2 == 0: return ((x2, y2), (x2, y2))\n        cos1, sin1 = dx1/d1, dy1/d1\n        cos2, sin2 = dx3/d2, dy3/d2\n\n        (c1x, c1y) = (x2 - d1*(cos1-cos2)/2, y2 - d1*(sin1-sin2)/2)\n        (c2x, c2y) = (x2 + d2*(cos1-cos2)/2, y2 + d2*(sin1-sin2)/2)\n        c1 = ((c1x+x2)/2, (c1y+y2)/2)\n        c2 = ((c2x+x2)/2, (c2y+y2)/2)\n        return (Point(c1), Point(c2))\n\n    def _controlwindow(self, indices):\n        ''\n\n        L = len(self.pointList)\n        if isinstance(self, ClosedBezierObject): return sorted({j%L for i in indices for j in range(i-1, i+2)})\n        return sorted({j for i in indices for j in range(i-2, i+3) if 0 <= j < L})\n\n    def _updatecontrolpoints(self, indices):\n        ''\n\n\n        self._unshare()\n        pointlist = self.pointList\n        if len(pointlist) < 3:\n            self.pointsetList = self._getpointsetlist(pointlist)\n            self._update()\n            return\n        pointsetlist = self.pointsetList\n        window = self._controlwindow(indices)\n        for j in window: pointsetlist[j] = self._pointset(pointlist, j)\n        self._updatepath(window)\n\n    '''The following XxxObject classes share various common parameters and attributes.\n    ###Common Parameters\n    When created, as well as the paramters listed for each type of Object, they all share the following optional parameters:\n    `objid`: id of the object (for referencing in the document or using `canvas.getSelectedObject(id)`\n    (The following are not applicable to TextObject, WrappingTextObject, PointObject or UseObject)\n    `linecolour`: colour of the \"stroke\" or outline of the shape\n    `linewidth`: width of the outline of the shape (its \"stroke-width\")\n    `fillcolour`: colour of the interior of the shape (not applicable to LineObject). Use \"none\" if no fill desired.\n\n    ### Common Attributes\n    After creation and adding to the canvas using `canvas.addObject()`, they have following attributes:\n    `obj.fixed` (read/write): If set to `True`, the object cannot be dragged or transformed with the mouse (default `False`)\n    `obj.canvas` (read only): A reference to the canvas which contains the object\n    `obj.pointList` (read only): See individual object definitions for its meaning. (Not applicable to TextObject, WrappingTextObject or PointObject.)\n\n    They also share the following methods:\n    `obj.setPointList()`, `obj.setStyle()`, `obj.cloneObject`\n    '''\nclass LineObject(svg.line, ObjectMixin):\n    ''\n\n\n    def __init__(self, pointlist=[(0,0), (0,0)], style=\"solid\", linecolour=\"black\", linewidth=1, fillcolour=\"none\", objid=None):\n        [(x1, y1), (x2, y2)] = pointlist\n\n        if style == \"faintdash1\":\n            dasharray = \"10,5\"\n            linecolour = \"grey\"\n        elif style == \"faintdash2\":\n            dasharray = \"2,2\"\n            linecolour = \"lightgrey\"\n        else:\n            dasharray = None\n\n        svg.line.__init__(self, x1=x1, y1=y1, x2=x2, y2=y2, style={\"stroke\":linecolour, \"strokeDasharray\":dasharray, \"stroke-width\":linewidth, \"fill\":\"none\"})\n        self.pointList = [Point(coords) for coords in pointlist]\n        if objid: self.id = objid\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        self.attrs[\"x1\"] = x1\n        self.attrs[\"y1\"] = y1\n        self.attrs[\"x2\"] = x2\n        self.attrs[\"y2\"] = y2\n\nclass TextMixin(object):\n    ''\n\n    def getBoundingBox(self):\n        ''\n        corners = self._snappoints()\n        xcoords = [x for (x, y) in corners]\n        ycoords = [y for (x, y) in corners]\n        return ((min(xcoords), min(ycoords)), (max(xcoords), max(ycoords)))\n\n    def _snappoints(self):\n        ''\n\n        canvas = getattr(self, \"canvas\", None)\n        metrics = canvas.getFontMetrics() if canvas is not None else textmetrics.getMetrics()\n        ((x1, y1), (x2, y2)) = self.textLayout.bbox(metrics)\n        corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]\n        m = self._totalPending()\n        if m is not None: corners = [(m.a*x+m.c*y+m.e, m.b*x+m.d*y+m.f) for (x, y) in corners]\n        return [Point(corner) for corner in corners]\n\n    def _boundingbox(self):\n        ''\n        return self.getBoundingBox()\n\nclass TextObject(svg.text, TextMixin, ObjectMixin):\n    ''\n\n\n\n\n\n    def __init__(self, string=\"\", anchorpoint=(0,0), anchorposition=1, fontsize=12, linecolour=\"none\", linewidth=1, textcolour=\"black\", ignorescaling=False, canvas=None, objid=None):\n        lineheight = fontsize*1.2\n        if ignorescaling and canvas:\n            fontsize *= canvas.scaleFactor\n            lineheight *= canvas.scaleFactor\n        layout = self.textLayout = textlayout.layout(string, anchorpoint, anchorposition, fontsize, lineheight)\n        svg.text.__init__(self, layout.lines[0], x=layout.x, y=layout.y, font_size=fontsize, text_anchor=layout.textanchor, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":textcolour})\n        for s in layout.lines[1:]:\n            self <= svg.tspan(s, x=layout.x, dy=lineheight)\n        if objid: self.id = objid\n\nclass WrappingTextObject(svg.text, TextMixin, ObjectMixin):\n    ''\n\n\n\n    def __init__(self, canvas, string, anchorpoint, width, anchorposition=1, fontsize=12, linecolour=\"none\", linewidth=1, textcolour=\"black\", style=\"normal\", ignorescaling=False, objid=None):\n        lineheight = fontsize*1.2\n        if ignorescaling:\n            fontsize *= canvas.scaleFactor\n            lineheight *= canvas.scaleFactor\n        layout = self.textLayout = textlayout.layout(string, anchorpoint, anchorposition, fontsize, lineheight, width, canvas.getFontMetrics())\n        svg.text.__init__(self, \"\", x=layout.x, y=layout.y, font_size=fontsize, text_anchor=layout.textanchor, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":textcolour})\n        canvas <= self\n        for (i, line) in enumerate(layout.lines):\n            self <= svg.tspan(line, x=layout.x, dy=0 if i == 0 else lineheight)\n        if objid: self.id = objid\n\nclass PolylineObject(svg.polyline, ObjectMixin):\n    ''\n\n    def __init__(self, pointlist=[(0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"none\", objid=None):\n        svg.polyline.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self.pointList = [Point(coords) for coords in pointlist]\n        self._update()\n        if objid: self.id = objid\n\n    def _update(self):\n        self.attrs[\"points\"] = \" \".join([str(point[0])+\",\"+str(point[1]) for point in self.pointList])\n\nclass PolygonObject(svg.polygon, ObjectMixin):\n    ''\n\n    def __init__(self, pointlist=[(0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        svg.polygon.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self.attrs[\"points\"] = \" \".join([str(point[0])+\",\"+str(point[1]) for point in pointlist])\n        if objid: self.id = objid\n\n    def _update(self):\n        self.attrs[\"points\"] = \" \".join([str(point[0])+\",\"+str(point[1]) for point in self._pointList])\n\n    def __repr__(self):\n        return f\"polygon {self.id}\" if self.id else f\"polygon {id(self)}\"\n\n    def __str__(self):\n        return self.__repr__()\n\n    @property\n    def pointList(self):\n        if self._hasPending(): self._materialise()\n        if getattr(self, \"_pointList\", None) is None:\n\n            P = self.points\n            L = P.numberOfItems\n            self._pointList = [Point([P.getItem(i).x, P.getItem(i).y]) for i in range(L)]\n        return self._pointList\n\n    @pointList.setter\n    def pointList(self, pointlist):\n        if self._hasPending(): self._materialise()\n        self._pointList = [Point(coords) for coords in pointlist]\n        self._update()\n\n    def setPointList(self, pointlist):\n        if self._hasPending(): self._materialise()\n        self._pointList = [Point(coords) for coords in pointlist]\n        self._update()\n\n    def cloneObject(self):\n        self._materialise()\n        newobject = self.__class__()\n        for key in self.attrs:\n            value = self.attrs[key]\n            newobject.attrs[key] = value\n        newobject.id = \"\"\n        self._sharegeometry(newobject)\n        return newobject\n\n    def _transformpoints(self, points, matrix):\n        L = points.numberOfItems\n        for i in range(L):\n            pt = points.getItem(i)\n            newpt =  pt.matrixTransform(matrix)\n            points.replaceItem(newpt, i)\n\nclass RectangleObject(svg.rect, ObjectMixin):\n    ''\n\n\n\n\n\n\n\n\n\n    def __init__(self, pointlist=None, centre=(0,0), width=0, height=None, angle=0, linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        svg.rect.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self.angle = angle\n        if pointlist:\n            self.setPointList(pointlist)\n        else:\n            self.centre = Point(centre)\n            if not height: height = width\n            if height and not width: width = height\n            self._width = width\n            self._height = height\n            self.setPosition()\n        if objid: self.id = objid\n\n    def setPosition(self, centre=None, width=None, height=None, angle=None, preserveaspectratio=False):\n        ''\n\n\n        self._materialise()\n        if centre: self.centre = Point(centre)\n        if width:\n            self._width = width\n            if preserveaspectratio and not height: self._height = width*self.currentAspectRatio\n        if height:\n            self._height = height\n            if preserveaspectratio and not width: self._width = height/self.currentAspectRatio\n        if angle is not None: self.angle = angle\n\n        (cx, cy) = self.centre\n        self.pointList = [(cx-self._width/2, cy-self._height/2), (cx+self._width/2, cy+self._height/2)]\n        t = svgbase.createSVGTransform()\n        t.setRotate(self.angle, cx, cy)\n        self.pointList = self._transformedpointlist(t.matrix)\n        self._update()\n        self._updatehittarget()\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n        self.centre = Point((cx, cy))\n        self.rotatestring = self.style.transform = f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n\n        t = svgbase.createSVGTransform()\n        t.setRotate(-self.angle, cx, cy)\n        basepointlist = self._transformedpointlist(t.matrix)\n        [(x1, y1), (x2, y2)] = basepointlist\n        self._width = abs(x2-x1)\n        self._height = abs(y2-y1)\n        if self._width != 0: self.currentAspectRatio = self._height/self._width\n        self.attrs[\"x\"] = x2 if x2<x1 else x1\n        self.attrs[\"y\"] = y2 if y2<y1 else y1\n        self.attrs[\"width\"] = self._width\n        self.attrs[\"height\"] = self._height\n\nclass EllipseObject(svg.ellipse, ObjectMixin):\n    ''\n\n\n\n\n\n\n\n\n\n\n    def __init__(self, pointlist=None, centre=(0,0), width=0, height=None, angle=0, linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        svg.ellipse.__init__(self, style = {\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self.angle = angle\n        if pointlist:\n            self.setPointList(pointlist)\n        else:\n            self.centre = Point(centre)\n            if not height: height = width\n            if height and not width: width = height\n            self._width = width\n            self._height = height\n            self.setPosition()\n        if objid: self.id = objid\n\n    def setPosition(self, centre=None, width=None, height=None, angle=None, preserveaspectratio=False):\n        ''\n\n\n        self._materialise()\n        if centre: self.centre = Point(centre)\n        if width:\n            self._width = width\n            if preserveaspectratio and not height: self._height = width*self.currentAspectRatio\n        if height:\n            self._height = height\n            if preserveaspectratio and not width: self._width = height/self.currentAspectRatio\n        if angle is not None: self.angle = angle\n\n        (cx, cy) = self.centre\n        self.pointList = [(cx-self._width/2, cy-self._height/2), (cx+self._width/2, cy+self._height/2)]\n        t = svgbase.createSVGTransform()\n        t.setRotate(self.angle, cx, cy)\n        self.pointList = self._transformedpointlist(t.matrix)\n        self._update()\n        self._updatehittarget()\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n        self.centre = Point((cx, cy))\n        self.rotatestring = self.style.transform = f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n\n        t = svgbase.createSVGTransform()\n        t.setRotate(-self.angle, cx, cy)\n        basepointlist = self._transformedpointlist(t.matrix)\n        [(x1, y1), (x2, y2)] = basepointlist\n        self._width = abs(x2-x1)\n        self._height = abs(y2-y1)\n        if self._width != 0: self.currentAspectRatio = self._height/self._width\n        self.attrs[\"cx\"] = (x1+x2)/2\n        self.attrs[\"cy\"] = (y1+y2)/2\n        self.attrs[\"rx\"] = self._width/2\n        self.attrs[\"ry\"] = self._height/2\n\nclass CircleObject(svg.circle, ObjectMixin):\n    ''\n\n\n    def __init__(self, centre=(0,0), radius=0, pointlist=None, linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        if pointlist:\n            self.pointList = [Point(coords) for coords in pointlist]\n        else:\n            (x, y) = centre\n            self.pointList = [Point((x, y)), Point((x+radius, y))]\n        svg.circle.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self._update()\n        if objid: self.id = objid\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        self.attrs[\"cx\"]=x1\n        self.attrs[\"cy\"]=y1\n        self.attrs[\"r\"]=hypot(x2-x1, y2-y1)\n\nclass SectorObject(svg.path, ObjectMixin):\n    ''\n\n\n\n\n    def __init__(self, centre=(0,0), radius=0, startangle=0, endangle=0, pointlist=None, linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        self.centre = Point(centre)\n        self.radius = radius\n        self.startangle = startangle\n        self.endangle = endangle\n        if pointlist:\n            self.pointList = pointlist\n        else:\n            (cx, cy) = centre\n            point1 = Point((cx+radius*sin(startangle*pi/180), cy-radius*cos(startangle*pi/180)))\n            point2 = Point((cx+radius*sin(endangle*pi/180), cy-radius*cos(endangle*pi/180)))\n            self.pointList = [self.centre, point1, point2]\n        svg.path.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        self._update()\n        if objid: self.id = objid\n\n    def _update(self):\n        [(x0, y0), (x1, y1)] = self.pointList[:2]\n        (x2, y2) = self.pointList[-1]\n        r = hypot(x1-x0, y1-y0)\n        largeArcFlag = 1 if (self.endangle - self.startangle) % 360 > 180 else 0\n        self.attrs[\"d\"] = f\"M {x0} {y0} L {x1} {y1} A {r} {r} 0 {largeArcFlag} 1 {x2} {y2} Z\"\n\nclass UseObject(svg.use, ObjectMixin):\n    ''\n\n\n\n\n\n\n\n\n\n\n\n\n    def __init__(self, href=None, origin=None, centre=(0,0), width=None, height=None, angle=0, scale=None, objid=None):\n        svg.use.__init__(self, href=href)\n        (x, y, self._origwidth, self._origheight) = _usegeometry(href, self)\n        self._origaspectratio = self._origheight/self._origwidth\n        (cx, cy) = (x+self._origwidth/2, y+self._origheight/2)\n        self.originoffset = Point((-cx, -cy))\n\n        if scale and not (width or height):\n            (xscale, yscale) = scale if isinstance(scale, (list, tuple)) else (scale, scale)\n            (width, height) = (self._origwidth*xscale, self._origheight*yscale)\n        if width and height:\n            (self._width, self._height) = (width, height)\n        elif width:\n            (self._width, self._height) = (width, width*self._origaspectratio)\n        elif height:\n            (self._width, self._height) = (height/self._origaspectratio, height)\n        else:\n            (self._width, self._height) = (self._origwidth, self._origheight)\n\n\n        if origin:\n            scalefactors = (self._width/self._origwidth, self._height/self._origheight)\n            self.centre = Point(origin) - self.originoffset*scalefactors\n        else:\n            self.centre = Point(centre)\n        self.angle = angle\n        self.setPosition()\n        if objid: self.id = objid\n\n    def setPosition(self, origin=None, centre=None, width=None, height=None, angle=None, preserveaspectratio=False):\n        ''\n\n\n\n        self._materialise()\n        if width:\n            self._width = width\n            if preserveaspectratio and not height: self._height = width*self.currentAspectRatio\n        if height:\n            self._height = height\n            if preserveaspectratio and not width: self._width = height/self.currentAspectRatio\n        if self._width != 0: self.currentAspectRatio = self._height/self._width\n\n        if origin:\n            scalefactors = (self._width/self._origwidth, self._height/self._origheight)\n            self.centre = Point(origin) - self.originoffset*scalefactors\n        elif centre:\n            self.centre = Point(centre)\n        if angle is not None: self.angle = angle\n\n        (cx, cy) = self.centre\n        self.pointList = [(cx-self._width/2, cy-self._height/2), (cx+self._width/2, cy+self._height/2)]\n        t = svgbase.createSVGTransform()\n        t.setRotate(self.angle, cx, cy)\n        self.pointList = self._transformedpointlist(t.matrix)\n        self._update()\n        self._updatehittarget()\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n        self.centre = Point((cx, cy))\n        self.rotatestring = f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n        (xscale, yscale) = (self._width/self._origwidth, self._height/self._origheight)\n        self.scalestring = f\"translate({cx}px,{cy}px) scale({xscale},{yscale}) translate({-cx}px,{-cy}px)\"\n        self.style.transform = self.rotatestring + self.scalestring\n        self.origin = self.centre + self.originoffset\n        (self.attrs[\"x\"], self.attrs[\"y\"]) = self.origin\n\n_usegeometries = {}\n\ndef _usegeometry(href, useobject):\n    ''\n\n    geometry = _usegeometries.get(href)\n    if geometry is not None: return geometry\n    document <= svgbase\n    tempgroup = svg.g()\n    tempgroup <= useobject\n    svgbase <= tempgroup\n    bbox = tempgroup.getBBox()\n    svgbase.removeChild(tempgroup)\n    document.body.removeChild(svgbase)\n    geometry = (bbox.x, bbox.y, bbox.width, bbox.height)\n    if bbox.width and bbox.height: _usegeometries[href] = geometry\n    return geometry\n\ndef clearUseGeometry(href=None):\n    ''\n\n    if href is None:\n        _usegeometries.clear()\n    else:\n        _usegeometries.pop(href, None)\n\nclass ImageCache(object):\n    ''\n\n\n    def __init__(self, maxconcurrent=6):\n        self.maxConcurrent = maxconcurrent\n        self.sizes = {}\n        self.callbacks = {}\n        self.queue = deque()\n        self.loading = 0\n\n    def getSize(self, href):\n        ''\n        return self.sizes.get(href)\n\n    def load(self, href, callback=None):\n        ''\n\n\n        size = self.sizes.get(href)\n        if size is not None:\n            if callback: callback(size)\n            return\n        if href not in self.callbacks:\n            self.callbacks[href] = []\n            self.queue.append(href)\n        if callback: self.callbacks[href].append(callback)\n        self._loadnext()\n\n    def preload(self, hrefs, callback=None):\n        ''\n\n        hrefs = list(set(hrefs))\n        remaining = len(hrefs)\n        def loaded(size):\n            nonlocal remaining\n            remaining -= 1\n            if remaining == 0 and callback: callback()\n        if not hrefs and callback: callback()\n        for href in hrefs: self.load(href, loaded)\n\n    def _loadnext(self):\n        ''\n        while self.queue and self.loading < self.maxConcurrent:\n            href = self.queue.popleft()\n            self.loading += 1\n            img = html.IMG()\n            img.bind(\"load\", lambda event, href=href, img=img: self._loaded(href, (img.naturalWidth, img.naturalHeight)))\n            img.bind(\"error\", lambda event, href=href: self._loaded(href, None))\n            img.attrs[\"src\"] = href\n\n    def _loaded(self, href, size):\n        ''\n        self.loading -= 1\n        if size is not None: self.sizes[href] = size\n        for callback in self.callbacks.pop(href, []): callback(size)\n        self._loadnext()\n\nimageCache = ImageCache()\n\nclass ImageObject(svg.image, ObjectMixin):\n    ''\n\n\n\n\n\n\n\n\n\n\n\n\n    def __init__(self, href=None, pointlist=None, centre=(0,0), width=0, height=None, angle=0, objid=None):\n        def initialise(size):\n            nonlocal width, height\n            if size is None: return\n            (self.imageWidth, self.imageHeight) = size\n\n            self.imageAspectRatio = self.imageHeight/self.imageWidth\n\n            self.attrs[\"preserveAspectRatio\"] = \"none\"\n            self.angle = angle\n            if pointlist:\n                self.setPointList(pointlist)\n            else:\n                self.centre = Point(centre)\n                if not width and not height:\n                    width = self.imageWidth\n                    height = self.imageHeight\n                elif not height:\n                    height = width*self.imageAspectRatio\n                elif not width:\n                    width = height/self.imageAspectRatio\n                self._width = width\n                self._height = height\n                self._setuppointlist()\n            self.style.visibility = \"visible\"\n            self.imageloaded = True\n            loadcomplete = window.Event.new(\"loadcomplete\")\n            self.dispatchEvent(loadcomplete)\n\n        super().__init__()\n        if objid: self.id = objid\n        self.imageloaded = False\n        self.style.visibility = \"hidden\"\n        if not href: return\n        self.attrs[\"href\"] = href\n        self._imageargs = (pointlist, centre, width, height, angle)\n        imageCache.load(href, initialise)\n\n    def setPosition(self, centre=None, width=None, height=None, angle=None, preserveaspectratio=False):\n        ''\n\n\n        def set_position(event=None):\n\n            self._materialise()\n            if centre: self.centre = Point(centre)\n            if width:\n                self._width = width\n                if preserveaspectratio and not height: self._height = width*self.currentAspectRatio\n            if height:\n                self._height = height\n                if preserveaspectratio and not width: self._width = height/self.currentAspectRatio\n            if angle is not None: self.angle = angle\n            self._setuppointlist()\n\n        if self.imageloaded:\n            set_position()\n        else:\n            self.bind(\"loadcomplete\", set_position)\n\n    def _setuppointlist(self):\n        (cx, cy) = self.centre\n        self.pointList = [(cx-self._width/2, cy-self._height/2), (cx+self._width/2, cy+self._height/2)]\n        t = svgbase.createSVGTransform()\n        t.setRotate(self.angle, cx, cy)\n        self.pointList = self._transformedpointlist(t.matrix)\n        self._update()\n        self._updatehittarget()\n\n    def _update(self):\n        [(x1, y1), (x2, y2)] = self.pointList\n        (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n        self.centre = Point((cx, cy))\n        self.rotatestring = self.style.transform = f\"translate({cx}px,{cy}px) rotate({self.angle}deg) translate({-cx}px,{-cy}px)\"\n\n        t = svgbase.createSVGTransform()\n        t.setRotate(-self.angle, cx, cy)\n        basepointlist = self._transformedpointlist(t.matrix)\n        [(x1, y1), (x2, y2)] = basepointlist\n        self._width = abs(x2-x1)\n        self._height = abs(y2-y1)\n        if self._width != 0: self.currentAspectRatio = self._height/self._width\n        self.attrs[\"x\"] = x2 if x2<x1 else x1\n        self.attrs[\"y\"] = y2 if y2<y1 else y1\n        self.attrs[\"width\"] = self._width\n        self.attrs[\"height\"] = self._height\n\nclass BezierObject(svg.path, ObjectMixin):\n    ''\n\n\n\n\n\n    _geometryversion = 0\n\n    def __init__(self, pointsetlist=None, pointlist=[(0,0), (0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"none\", objid=None):\n        def toPoint(coords):\n            return None if coords is None else Point(coords)\n        svg.path.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        if pointsetlist:\n            self.pointList = [Point(pointset[1]) for pointset in pointsetlist]\n        else:\n            self.pointList = [Point(coords) for coords in pointlist]\n            pointsetlist = self._getpointsetlist(self.pointList)\n        self.pointsetList = [[toPoint(coords) for coords in pointset] for pointset in pointsetlist]\n        self._update()\n        if objid: self.id = objid\n\n    def _getpointsetlist(self, pointlist):\n        pointsetlist = [[None, pointlist[0], (pointlist[0]+pointlist[1])/2]]\n        for i in range(1, len(pointlist)-1):\n            pointsetlist.append([(pointlist[i-1]+pointlist[i])/2, pointlist[i], (pointlist[i]+pointlist[i+1])/2])\n        pointsetlist.append([(pointlist[-2]+pointlist[-1])/2, pointlist[-1], None])\n        return pointsetlist\n\n    def _updatepointsetlist(self):\n        if len(self.pointList) == 2:\n            self.pointsetList = [[None]+self.pointList, self.pointList+[None]]\n        else:\n            cpoint = (self.pointList[-1]+self.pointList[-2])/2\n            self.pointsetList[-1] = [cpoint, self.pointList[-1], None]\n            self.pointsetList[-2][2] = cpoint\n\n    def _update(self):\n        pointsetlist = self.pointsetList\n        L = len(pointsetlist)\n        self._pathsegments = [self._pathsegment(pointsetlist, i) for i in range(L if isinstance(self, ClosedBezierObject) else L-1)]\n        self._setpath()\n\n    def _updatepath(self, indices):\n        ''\n\n\n        self._unshare()\n        pointsetlist = self.pointsetList\n        L = len(pointsetlist)\n        segments = self._pathsegments\n        for i in {j%L for index in indices for j in (index-1, index)}:\n            if i < len(segments): segments[i] = self._pathsegment(pointsetlist, i)\n        self._setpath()\n\n    def _deletepathsegments(self, start, end, count):\n        ''\n\n        self._unshare()\n        if end < count or isinstance(self, ClosedBezierObject):\n            del self._pathsegments[start:end]\n        else:\n            del self._pathsegments[start-1:end-1]\n\n    def _pathsegment(self, pointsetlist, i):\n        ''\n        (c1x, c1y) = pointsetlist[i][2]\n        ((c2x, c2y), (x, y), dummy) = pointsetlist[(i+1)%len(pointsetlist)]\n        return f\"C {c1x} {c1y} {c2x} {c2y} {x} {y}\"\n\n    def _setpath(self):\n        ''\n        (x, y) = self.pointsetList[0][1]\n        self.attrs[\"d\"] = f\"M {x} {y} \" + \" \".join(self._pathsegments)\n        self._geometryversion += 1\n\n    def getFlattened(self, tolerance=flatten.TOLERANCE):\n        ''\n\n        pointsetlist = self.pointsetList\n        key = (self._geometryversion, tolerance)\n        cached = getattr(self, \"_flattened\", None)\n        if cached is None or cached[0] != key:\n            points = [Point(coords) for coords in flatten.flattenPointsetList(pointsetlist, isinstance(self, ClosedBezierObject), tolerance)]\n            cached = self._flattened = (key, points)\n        return cached[1]\n\n    def getBoundingBox(self):\n        ''\n\n        return flatten.boundingBox(self.getFlattened())\n\n    def _boundingbox(self):\n        ''\n        return self.getBoundingBox()\n\nclass ClosedBezierObject(BezierObject):\n    ''\n\n\n\n\n    def __init__(self, pointsetlist=None, pointlist=[(0,0), (0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        svg.path.__init__(self, style={\"stroke\":linecolour, \"stroke-width\":linewidth, \"fill\":fillcolour})\n        if pointsetlist:\n            self.pointList = [Point(pointset[1]) for pointset in pointsetlist]\n        else:\n            self.pointList = [Point(coords) for coords in pointlist]\n            pointsetlist = self._getpointsetlist(self.pointList)\n        self.pointsetList = [[Point(coords) for coords in pointset] for pointset in pointsetlist]\n        self._update()\n        if objid: self.id = objid\n\n    def _getpointsetlist(self, pointlist):\n        pointsetlist = [[(pointlist[0]+pointlist[-1])/2, pointlist[0], (pointlist[0]+pointlist[1])/2]]\n        for i in range(1, len(pointlist)-1):\n            pointsetlist.append([(pointlist[i-1]+pointlist[i])/2, pointlist[i], (pointlist[i]+pointlist[i+1])/2])\n        pointsetlist.append([(pointlist[-2]+pointlist[-1])/2, pointlist[-1], (pointlist[0]+pointlist[-1])/2])\n        return pointsetlist\n\n    def _updatepointsetlist(self):\n        if len(self.pointList) == 2:\n            self.pointsetList = self._getpointsetlist(self.pointList)\n        else:\n            cpoint1, cpoint2 = (self.pointList[-1]+self.pointList[-2])/2, (self.pointList[-1]+self.pointList[0])/2\n            self.pointsetList[-1] = (cpoint1, self.pointList[-1], cpoint2)\n            self.pointsetList[-2][2] = cpoint1\n            self.pointsetList[0][0] = cpoint2\n\nclass SmoothBezierObject(SmoothBezierMixin, BezierObject):\n    ''\n\n\n    def __init__(self, pointlist=[(0,0), (0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"none\", objid=None):\n        self.pointList = [Point(coords) for coords in pointlist]\n        pointsetlist = self._getpointsetlist(self.pointList)\n        BezierObject.__init__(self, pointsetlist, linecolour=linecolour, linewidth=linewidth, fillcolour=fillcolour, objid=objid)\n\n    def _getpointsetlist(self, pointlist):\n        if len(pointlist) == 2: return [[None]+pointlist, pointlist+[None]]\n        return [self._pointset(pointlist, i) for i in range(len(pointlist))]\n\n    def _pointset(self, pointlist, i):\n        ''\n        if i == 0:\n            (c1, c2) = self._calculatecontrolpoints(pointlist[:3])\n            return [None, pointlist[0], (pointlist[0]+c1)/2]\n        if i == len(pointlist)-1:\n            (c1, c2) = self._calculatecontrolpoints(pointlist[-3:])\n            return [(pointlist[-1]+c2)/2, pointlist[-1], None]\n        (c1, c2) = self._calculatecontrolpoints(pointlist[i-1:i+2])\n        return [c1, pointlist[i], c2]\n\n    def _updatepointsetlist(self):\n        if len(self.pointList) == 2:\n            self.pointsetList = [[None]+self.pointList, self.pointList+[None]]\n        else:\n            (c1, c2) = self._calculatecontrolpoints(self.pointList[-3:])\n            self.pointsetList[-1] = [(self.pointList[-1]+c2)/2, self.pointList[-1], None]\n            self.pointsetList[-2] = [c1, self.pointList[-2], c2]\n\nclass SmoothClosedBezierObject(SmoothBezierMixin, ClosedBezierObject):\n    ''\n\n\n\n    def __init__(self, pointlist=[(0,0), (0,0)], linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        self.pointList = [Point(coords) for coords in pointlist]\n        pointsetlist = self._getpointsetlist(self.pointList)\n        ClosedBezierObject.__init__(self, pointsetlist, linecolour=linecolour, linewidth=linewidth, fillcolour=fillcolour, objid=objid)\n\n    def _getpointsetlist(self, pointlist):\n        return [self._pointset(pointlist, i) for i in range(len(pointlist))]\n\n    def _pointset(self, pointlist, i):\n        ''\n        (c1, c2) = self._calculatecontrolpoints([pointlist[i-1], pointlist[i], pointlist[(i+1)%len(pointlist)]])\n        return [c1, pointlist[i], c2]\n\n    def _updatepointsetlist(self):\n        if len(self.pointList) == 2:\n            self.pointsetList = self._getpointsetlist(self.pointList)\n        else:\n            L = len(self.pointList)\n            pointlist = self.pointList[:]+self.pointList[:2]\n            for j in range(L-2, L+1):\n                (c1, c2) = self._calculatecontrolpoints(pointlist[j-1:j+2])\n                self.pointsetList[j%L] = [c1, pointlist[j], c2]\n\nclass PointObject(svg.circle, ObjectMixin):\n    ''\n\n\n    def __init__(self, XY=(0,0), colour=\"black\", pointsize=2, canvas=None, objid=None):\n        (x, y) = XY\n        sf = canvas.scaleFactor if canvas else 1\n        svg.circle.__init__(self, cx=x, cy=y, r=pointsize*sf, style={\"stroke\":colour, \"stroke-width\":1, \"fill\":colour, \"vector-effect\":\"non-scaling-stroke\"})\n        self._XY = None\n        self.XY = Point(XY)\n        if objid: self.id = objid\n\n    def _update(self):\n        pass\n\n    @property\n    def XY(self):\n        if self._hasPending(): self._materialise()\n        return self._XY\n\n    @XY.setter\n    def XY(self, XY):\n        if self._hasPending(): self._materialise()\n        self._XY = Point(XY)\n        self.attrs[\"cx\"] = self._XY[0]\n        self.attrs[\"cy\"] = self._XY[1]\n\nclass RegularPolygon(PolygonObject):\n    ''\n\n\n\n\n    def __init__(self, sidecount=0, centre=None, radius=None, startpoint=None, sidelength=None, offsetangle=0, linecolour=\"black\", linewidth=1, fillcolour=\"yellow\", objid=None):\n        pointlist = []\n        if sidecount>0:\n            angle = 2*pi/sidecount\n            radoffset = offsetangle*pi/180\n            if not radius: radius = sidelength/(2*sin(pi/sidecount))\n            if not centre:\n                (x, y) = startpoint\n                centre = (x-radius*sin(radoffset), y+radius*cos(radoffset))\n            (cx, cy) = centre\n            for i in range(sidecount):\n                t = radoffset+i*angle\n                pointlist.append(Point((cx+radius*sin(t), cy-radius*cos(t))))\n        PolygonObject.__init__(self, pointlist, linecolour, linewidth, fillcolour, objid)\n        if objid: self.id = objid\n\nclass ObjectList(object):\n    ''\n\n\n\n\n\n    __hash__ = None\n\n    def __init__(self, objlist=()):\n        self._objects = {}\n        self._ordered = []\n        self._iterating = False\n        for obj in objlist: self.append(obj)\n\n    def append(self, obj):\n        if obj in self._objects: return\n        self._objects[obj] = obj\n        if self._ordered is None: return\n        if self._iterating: (self._ordered, self._iterating) = (None, False)\n        else: self._ordered.append(obj)\n\n    def extend(self, objlist):\n        for obj in objlist: self.append(obj)\n\n    def remove(self, obj):\n        try:\n            del self._objects[obj]\n        except KeyError:\n            raise ValueError(f\"{obj} is not in the ObjectList\")\n        self._ordered = None\n\n    def discard(self, obj):\n        if self._objects.pop(obj, None) is not None: self._ordered = None\n\n    def clear(self):\n        self._objects = {}\n        (self._ordered, self._iterating) = ([], False)\n\n    def _list(self):\n        ''\n        if self._ordered is None: (self._ordered, self._iterating) = (list(self._objects.values()), False)\n        return self._ordered\n\n    def __contains__(self, obj):\n        return obj in self._objects\n\n    def __iter__(self):\n        ordered = self._list()\n        self._iterating = True\n        return iter(ordered)\n\n    def __len__(self):\n        return len(self._objects)\n\n    def __getitem__(self, i):\n        return self._list()[i]\n\n    def __eq__(self, other):\n        return self._list() == list(other)\n\n    def __repr__(self):\n        return f\"ObjectList({self._list()})\"\n\nclass GroupObject(svg.g, ObjectMixin):\n    ''\n\n\n\n\n\n\n\n\n    def __init__(self, objlist=[], objid=None):\n        svg.g.__init__(self)\n        if not isinstance(objlist, list): objlist = [objlist]\n        self.objectList = ObjectList()\n        self._canvas = None\n        for obj in objlist:\n            self.addObject(obj)\n        if objid: self.id = objid\n\n    def addObject(self, svgobject):\n        self._materialise()\n        canvas = self.canvas\n        svgobject.group = self\n        if canvas is not None: canvas.addObject(svgobject)\n        self <= svgobject\n        self.objectList.append(svgobject)\n\n    def addObjects(self, objectlist):\n        self._materialise()\n        canvas = self.canvas\n        log = getattr(canvas, \"operationLog\", None)\n        if log is not None: log.begin()\n        for obj in objectlist:\n            obj.group = self\n            if canvas is not None: canvas.addObject(obj)\n            self <= obj\n            self.objectList.append(obj)\n        if log is not None: log.end()\n\n    def _update(self):\n        pass\n\n    def _applyMatrix(self, matrix):\n        ''\n\n        for obj in self.objectList:\n            if isinstance(obj, GroupObject):\n                obj._deferMatrix(matrix)\n            elif isinstance(obj, ObjectMixin):\n                if obj._pendingMatrix is not None: obj._materialise()\n                obj._applyMatrix(matrix)\n            else:\n                obj.style.transform = f\"matrix({matrix.a},{matrix.b},{matrix.c},{matrix.d},{matrix.e},{matrix.f}) \" + obj.style.transform\n\n    def removeObject(self, svgobject):\n        if svgobject not in self.objectList: return\n        self.removeChild(svgobject)\n        self.objectList.remove(svgobject)\n        svgobject.group = None\n\n        if self.canvas is not None: self.canvas._deleteFromDict(svgobject)\n\n    def deleteAll(self):\n        if self.canvas is not None:\n            for obj in self.objectList: self.canvas._deleteFromDict(obj)\n        self.textContent = \"\"\n        self.objectList = ObjectList()\n\n    def setStyle(self, attribute, value):\n        for obj in self.objectList:\n            obj.setStyle(attribute, value)\n\n    def _addMembersFromRecord(self, members, record):\n        ''\n        self.addObjects(members)\n\n    @property\n    def canvas(self):\n        return self._canvas\n\n    @canvas.setter\n    def canvas(self, canvas):\n        self._canvas = canvas\n        for obj in self.objectList: obj.canvas = canvas\n\n    @property\n    def fixed(self):\n        return self._fixed\n\n    @fixed.setter\n    def fixed(self, fixedvalue):\n        self._fixed = fixedvalue\n        for obj in self.objectList: obj.fixed = fixedvalue\n\nclass Button(GroupObject):\n    ''\n\n\n\n\n\n\n\n\n    def __init__(self, position, size, text, onclick, fontsize=None, fillcolour=\"lightgrey\", canvas=None, objid=None):\n        GroupObject.__init__(self)\n        if objid: self.id = objid\n        (x, y), (width, height) = position, size\n        self.button = RectangleObject([(x,y),(x+width, y+height)], fillcolour=fillcolour)\n        self.button.attrs[\"rx\"] = height/3\n        rowcount = text.count(\"\\n\") + 1\n        if not fontsize:\n            metrics = canvas.getFontMetrics() if canvas else textmetrics.getMetrics()\n            widest = max(metrics.textWidth(line, 1) for line in text.split(\"\\n\"))\n            fontsize = height*0.75/rowcount\n            if widest: fontsize = min(fontsize, width*0.9/widest)\n        self.label = TextObject(text,(x+width/2,y+height/2-fontsize/8),anchorposition=5, fontsize=fontsize)\n        self.addObjects([self.button, self.label])\n        self.fixed = True\n        self.bind(\"mousedown\", self._onMouseDown)\n        self.bind(\"mouseup\", self._onMouseUp)\n        self.bind(\"click\", onclick)\n        self.bind(\"touchstart\", onclick)\n        self.attrs[\"cursor\"] = \"pointer\"\n\n    def _onMouseDown(self, event):\n        event.stopPropagation()\n\n    def _onMouseUp(self, event):\n        event.stopPropagation()\n\n    def setFillColour(self, colour):\n        self.button.style.fill = colour\n\nclass ImageButton(GroupObject):\n    ''\n\n\n\n    def __init__(self, position, size, image, onclick, fontsize=None, fillcolour=\"lightgrey\", canvas=None, objid=None):\n        GroupObject.__init__(self)\n        if objid: self.id = objid\n        (x, y), (width, height) = position, size\n        self.button = RectangleObject([(x,y),(x+width, y+height)], fillcolour=fillcolour)\n        self.button.attrs[\"rx\"] = height/3\n        image.style.transform = f\"translate({x+width/2}px,{y+height/2}px)\"\n        if canvas:\n            canvas <= image\n            bbox = image.getBBox()\n            canvas.removeChild(image)\n            scalefactor = min(width/bbox.width, height/bbox.height)*0.7\n            image.style.transform += f\" scale({scalefactor})\"\n        self.addObjects([self.button, image])\n        self.fixed = True\n        self.bind(\"mousedown\", self._onMouseDown)\n        self.bind(\"mouseup\", self._onMouseUp)\n        self.bind(\"click\", onclick)\n        self.bind(\"touchstart\", onclick)\n        self.attrs[\"cursor\"] = \"pointer\"\n\n    def _onMouseDown(self, event):\n        event.stopPropagation()\n\n    def _onMouseUp(self, event):\n        event.stopPropagation()\n\n    def setFillColour(self, colour):\n        self.button.style.fill = colour\n\nclass Definitions(svg.defs):\n    ''\n\n\n    def __init__(self, objlist=[], filename=None):\n        svg.defs.__init__(self)\n        if filename:\n            self.innerHTML = open(filename).read()\n        for obj in objlist: self <= obj\n        self.observer = window.MutationObserver.new(self._onMutation)\n        self.observer.observe(self, {\"childList\":True, \"subtree\":True, \"attributes\":True, \"characterData\":True})\n\n    def _onMutation(self, mutations, observer):\n        ''\n        for mutation in mutations:\n            nodes = list(mutation.addedNodes) + list(mutation.removedNodes) + [mutation.target]\n            for node in nodes:\n                while node is not None and node != self:\n                    nodeid = getattr(node, \"id\", None)\n                    if nodeid: clearUseGeometry(\"#\"+nodeid)\n                    node = node.parentNode\n\nclass CanvasObject(svg.svg):\n    ''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n    def __init__(self, width=None, height=None, colour=\"white\", objid=None):\n        svg.svg.__init__(self, style={\"backgroundColor\":colour})\n        if width: self.style.width = width\n        if height: self.style.height = height\n        self.id = objid if objid else f\"canvas{id(self)}\"\n        self.objectDict = {}\n\n\n        self.mouseMode = MouseMode.NONE\n        self.vertexSnap = False\n        self.snapDistance = 10\n        self.lineWidthScaling = True\n        self.operationLog = None\n        self.timings = None\n        self.inputRecorder = None\n\n        self.edgeSnap = False\n        self.snapAngle = 10\n        self.transformTypes = TransformType\n        self.penColour = \"black\"\n        self.fillColour  = \"yellow\"\n        self.penWidth = 3\n        self.freehandTolerance = 1.5\n\n\n        self.scaleFactor = 1\n        self.mouseDetected = False\n        self.mouseOwner = None\n        self.selectedObject = None\n        self.dragStartCoords = None\n        self.viewWindow = None\n        self.tool = \"select\"\n\n\n        self.panning = False\n        self.inGesture = False\n        self.stroke = None\n        self.strokeFrame = None\n        self.fontFamily = None\n        self.centre = None\n        self.nextid = 0\n        self.objectDict = {}\n        self.hittargets = {}\n        self.inputlisteners = False\n        self.replaying = False\n        self.handles = None\n        self.controlhandles  = None\n        self.transformHandles = []\n        self.selectedhandle = None\n        self.transformorigin = None\n        self.transformBBox = RectangleObject(linecolour=\"blue\", fillcolour=\"none\")\n        self.transformBBox.style.vectorEffect = \"non-scaling-stroke\"\n        self.rotateLine = LineObject(linecolour=\"blue\")\n        self.rotateLine.style.vectorEffect = \"non-scaling-stroke\"\n        self.attrs[\"preserveAspectRatio\"] = \"xMidYMid meet\"\n        self.styleSheet = svg.style(CANVASSTYLE)\n        self <= self.styleSheet\n        self._setHitTargetWidth()\n\n        self.bind(\"mousedown\", self._onMouseDown)\n        self.bind(\"mousemove\", self._onMouseMove)\n        self.bind(\"mouseup\", self._onLeftUp)\n        self.bind(\"touchstart\", self._onTouchStart)\n        self.bind(\"touchmove\", self._onMouseMove)\n        self.bind(\"touchend\", self._onLeftUp)\n        self.bind(\"dragstart\", self._onDragStart)\n        self.bind(\"dblclick\", self._onDoubleClick)\n        self.bind(\"contextmenu\", self._onRightClick)\n        self.bind(\"wheel\", self._onWheel)\n        document.bind(\"keydown\", self._onKeyDown)\n\n\n    def setViewBox(self, pointlist):\n        ''\n\n\n\n        ((x1, y1), (x2, y2)) = pointlist\n        self.attrs[\"viewBox\"] = f\"{x1} {y1} {x2-x1} {y2-y1}\"\n        self.viewBoxRect = [Point((x1, y1)), Point((x2, y2))]\n        self.centre = Point(((x1+x2)/2, (y1+y2)/2))\n        self.xScaleFactor, self.yScaleFactor = self._getScaleFactors()\n        self.scaleFactor  = max(self.xScaleFactor, self.yScaleFactor)\n        self._setHitTargetWidth()\n        bcr = self.getBoundingClientRect()\n        pt = self.createSVGPoint()\n        (pt.x, pt.y) = (bcr.left, bcr.top)\n        SVGpt =  pt.matrixTransform(self.getScreenCTM().inverse())\n        (x1, y1) = (SVGpt.x, SVGpt.y)\n        (pt.x, pt.y) = (bcr.left+bcr.width, bcr.top+bcr.height)\n        SVGpt =  pt.matrixTransform(self.getScreenCTM().inverse())\n        (x2, y2) = (SVGpt.x, SVGpt.y)\n        self.viewWindow = [Point((x1, y1)), Point((x2, y2))]\n        return self.viewWindow\n\n    def _getDimensions(self):\n        ''\n\n\n        bcr = self.getBoundingClientRect()\n        self.attrs[\"width\"] = bcr.width\n        self.attrs[\"height\"] = bcr.height\n        return bcr.width, bcr.height\n\n    def fitContents(self):\n        ''\n\n        bbox = self.getBBox()\n        if bbox.width == 0 or bbox.height == 0: return\n        wmargin, hmargin = bbox.width/50, bbox.height/50\n        self.viewWindow = self.setViewBox(((bbox.x-wmargin, bbox.y-hmargin), (bbox.x+bbox.width+wmargin, bbox.y+bbox.height+hmargin)))\n        return self.viewWindow\n\n    def getFontMetrics(self, font=None):\n        ''\n\n        if font is None:\n            if self.fontFamily is None: self.fontFamily = window.getComputedStyle(self).fontFamily\n            font = self.fontFamily\n        def measure(chars):\n            sample = svg.text(chars, x=0, y=0, font_size=textmetrics.REFERENCESIZE,\n                              style={\"fontFamily\":font, \"fontKerning\":\"none\", \"whiteSpace\":\"pre\", \"visibility\":\"hidden\"})\n            self <= sample\n            widths = [sample.getSubStringLength(i, 1) for i in range(len(chars))]\n            self.removeChild(sample)\n            return widths if any(widths) else None\n        return textmetrics.getMetrics(font, measure)\n\n    def getSVGcoords(self, event):\n        ''\n        x = event.changedTouches[0].clientX if \"touch\" in event.type else event.clientX\n        y = event.changedTouches[0].clientY if \"touch\" in event.type else event.clientY\n        pt = self.createSVGPoint()\n        (pt.x, pt.y) = (x, y)\n        SVGpt =  pt.matrixTransform(self.getScreenCTM().inverse())\n        return Point((SVGpt.x, SVGpt.y))\n\n    def addObject(self, svgobject, fixed=False):\n        ''\n\n\n\n\n\n\n        if not hasattr(svgobject, \"fixed\"): svgobject.fixed = fixed\n        self <= svgobject\n        self._addToDict(svgobject)\n        svgobject.canvas = self\n        if self.operationLog is not None: self._logObjectOperation(\"addobject\", svgobject)\n        return svgobject\n\n    def addUseObjects(self, href, placements, fixed=False):\n        ''\n\n\n        objlist = [UseObject(href, **placement) for placement in placements]\n        self.addObjects(objlist, fixed)\n        return objlist\n\n    @timings.timed(\"addObjects\")\n    def addObjects(self, objectlist, fixed=False):\n        ''\n\n        def flatten(objlist):\n            for obj in objlist:\n                if isinstance(obj, (list, tuple)):\n                    yield from flatten(obj)\n                else:\n                    yield obj\n        fragment = document.createDocumentFragment()\n        objlist = list(flatten(objectlist))\n        for obj in objlist:\n            if not hasattr(obj, \"fixed\"): obj.fixed = fixed\n            fragment <= obj\n            self._addToDict(obj)\n            obj.canvas = self\n        tt = timings.start()\n        self <= fragment\n        timings.lap(\"DOM-insert\", tt)\n        log = self.operationLog\n        if log is not None:\n            log.begin()\n            for obj in objlist: self._logObjectOperation(\"addobject\", obj)\n            log.end()\n\n    def dumps(self, binary=False):\n        ''\n\n\n        return scene.dumps(self._getRecords(), binary)\n\n    def dump(self, fp, binary=False):\n        ''\n        scene.dump(self._getRecords(), fp, binary)\n\n    def writeSVG(self, fp):\n        ''\n\n        viewbox = getattr(self, \"viewBoxRect\", None)\n        svgexport.write(self._getRecords(), fp, viewbox)\n\n    def loads(self, data):\n        ''\n\n\n        return self._addRecords(scene.loads(data))\n\n    def load(self, fp):\n        ''\n        return self._addRecords(scene.load(fp))\n\n    def deleteObject(self, svgobject):\n        ''\n\n\n        if svgobject is None or not self.contains(svgobject): return\n        op = None if self.operationLog is None else self._objectOperation(\"deleteobject\", svgobject)\n        group = getattr(svgobject, \"group\", None)\n        if group is not None and svgobject in group.objectList:\n            group.removeObject(svgobject)\n            if svgobject in group.objectList: return\n        if svgobject.parentNode is not None:\n            svgobject.parentNode.removeChild(svgobject)\n            self._deleteFromDict(svgobject)\n        if op is not None: self.operationLog.record(op)\n\n    def deleteObjects(self, objectlist):\n        ''\n        for obj in objectlist:\n            if isinstance(obj, (list, tuple)):\n                self.deleteObjects(obj)\n            else:\n                self.deleteObject(obj)\n\n    def deleteAll(self, event=None):\n        ''\n\n        self.textContent = \"\"\n        self <= self.styleSheet\n        self.objectDict = {}\n        self.hittargets = {}\n        if self.operationLog is not None: self.operationLog.clear()\n\n    def deleteSelection(self):\n        ''\n        if self.selectedObject:\n            if self.handles: self.deleteObject(self.handles)\n            if self.controlhandles: self.deleteObject(self.controlhandles)\n            self.deleteObject(self.selectedObject)\n            self.selectedObject = self.handles = self.controlhandles = None\n\n    @timings.timed(\"translateObject\")\n    def translateObject(self, svgobject, offset):\n        ''\n\n        offset = Point(offset)\n        if isinstance(svgobject, (GroupObject, TextMixin)):\n            svgobject._transform(svgbase.createSVGMatrix().translate(*offset))\n            return\n        elif isinstance(svgobject, PointObject):\n            svgobject.XY += offset\n        else:\n            svgobject.pointList = [point+offset for point in svgobject.pointList]\n            if isinstance(svgobject, BezierObject):\n                svgobject.pointsetList = [(p1+offset,p2+offset,p3+offset) for (p1,p2,p3) in svgobject.pointsetList]\n            svgobject._update()\n            svgobject._updatehittarget()\n            if isinstance(svgobject, PolygonObject): svgobject._segments = None\n        (dx, dy) = offset\n        svgobject._logOperation({\"op\":\"transform\", \"id\":svgobject.id, \"matrix\":[1, 0, 0, 1, dx, dy], \"angle\":0})\n\n    def undo(self):\n        ''\n\n        operations = None if self.operationLog is None else self.operationLog.undo()\n        if operations is None: return False\n        self.applyOperations(operations)\n        return True\n\n    def redo(self):\n        ''\n        operations = None if self.operationLog is None else self.operationLog.redo()\n        if operations is None: return False\n        self.applyOperations(operations)\n        return True\n\n    def applyOperations(self, operations):\n        ''\n\n        if self.handles: self.deselectObject()\n        if self.mouseMode == MouseMode.TRANSFORM: self.hideTransformHandles()\n        (log, self.operationLog) = (self.operationLog, None)\n        try:\n            for op in operations: self._applyOperation(op)\n        finally:\n            self.operationLog = log\n        if self.mouseMode in [MouseMode.DRAG, MouseMode.EDIT, MouseMode.TRANSFORM]: self.createHitTargets()\n\n    def importSVG(self, fp, flatten=True, keepgroups=True):\n        ''\n\n\n\n        return self._addRecords(svgimport.records(fp, flatten, keepgroups))\n\n    def stats(self):\n        ''\n\n\n\n\n\n\n\n\n\n\n        objectdict = self.objectDict\n        classes = {}\n        (detached, vertices, domvertices, nbytes) = (0, 0, 0, 0)\n        seen = set()\n        orphans = set()\n        for obj in objectdict.values():\n            name = type(obj).__name__\n            classes[name] = classes.get(name, 0) + 1\n            if obj.parentNode is None: detached += 1\n            reference = getattr(obj, \"reference\", None)\n            if reference is not None and objectdict.get(reference.id) is not reference: orphans.add(id(obj))\n            pointlist = getattr(obj, \"_pointList\", None)\n            if pointlist is not None and id(pointlist) not in seen:\n                seen.add(id(pointlist))\n                vertices += len(pointlist)\n                nbytes += len(pointlist)*POINTBYTES\n            elif pointlist is None and isinstance(obj, PolygonObject):\n                domvertices += obj.points.numberOfItems\n                nbytes += obj.points.numberOfItems*DOMPOINTBYTES\n            pointsetlist = getattr(obj, \"_pointsetList\", None)\n            if pointsetlist is not None and id(pointsetlist) not in seen:\n                seen.add(id(pointsetlist))\n                vertices += 2*len(pointsetlist)\n                nbytes += 2*len(pointsetlist)*POINTBYTES\n            pathsegments = getattr(obj, \"_pathsegments\", None)\n            if pathsegments is not None and id(pathsegments) not in seen:\n                seen.add(id(pathsegments))\n                nbytes += len(pathsegments)*PATHSEGMENTBYTES\n            segments = getattr(obj, \"_segments\", None)\n            if segments: nbytes += len(segments)*SEGMENTBYTES\n            flattened = getattr(obj, \"_flattened\", None)\n            if flattened is not None and id(flattened) not in seen:\n                seen.add(id(flattened))\n                nbytes += len(flattened[1])*POINTBYTES\n        for (objid, hittarget) in self.hittargets.items():\n            reference = getattr(hittarget, \"reference\", None)\n            if objectdict.get(objid) is not reference or hittarget.parentNode is None: orphans.add(id(hittarget))\n        handles = [handle for group in (self.handles, self.controlhandles) if group is not None for handle in group.objectList]\n        orphanedhandles = 0\n        for handle in handles:\n            name = type(handle).__name__\n            classes[name] = classes.get(name, 0) + 1\n            owner = getattr(handle, \"owner\", None)\n            if self.selectedObject is None or owner is None or objectdict.get(owner.id) is not owner: orphanedhandles += 1\n        for obj in self.transformHandles + ([self.rotateLine] if self.transformHandles else []):\n            name = type(obj).__name__\n            classes[name] = classes.get(name, 0) + 1\n        return {\"objects\":len(objectdict), \"classes\":classes, \"domnodes\":self.getElementsByTagName(\"*\").length, \"detached\":detached,\n                \"hittargets\":len(self.hittargets), \"handles\":len(handles)+len(self.transformHandles[1:]),\n                \"vertices\":vertices, \"domvertices\":domvertices, \"bytes\":nbytes,\n                \"orphanedhittargets\":len(orphans), \"orphanedhandles\":orphanedhandles}\n\n    def startInputRecording(self, maxevents=None):\n        ''\n\n\n        if not self.inputlisteners:\n            for eventtype in inputlog.EVENTTYPES:\n                (document if eventtype == \"keydown\" else self).addEventListener(eventtype, self._recordInput, True)\n            self.inputlisteners = True\n        self.inputRecorder = inputlog.InputRecorder(maxevents)\n        return self.inputRecorder\n\n    def stopInputRecording(self):\n        ''\n        (recorder, self.inputRecorder) = (self.inputRecorder, None)\n        return recorder\n\n    def replayInput(self, events, dispatch=False):\n        ''\n\n\n\n\n\n\n        if not dispatch: return inputlog.replay(events, self)\n        (latencies, summary) = ([], timings.Timings())\n        self.replaying = True\n        try:\n            for entry in events:\n                if entry[1] == \"keydown\":\n                    (target, event) = (None, inputlog.ReplayEvent(entry))\n                else:\n                    (target, event) = self._replayevent(entry)\n                starttime = time.perf_counter()\n                if target is None: getattr(self, inputlog.HANDLERS[entry[1]])(event)\n                else: target.dispatchEvent(event)\n                elapsed = time.perf_counter() - starttime\n                latencies.append(elapsed*1000)\n                summary.record(entry[1], elapsed)\n        finally:\n            self.replaying = False\n        return (latencies, summary)\n\n    def _recordInput(self, event):\n        ''\n        if self.inputRecorder is not None and event.isTrusted and not self.replaying: self.inputRecorder.record(event)\n\n    def _replayevent(self, entry):\n        ''\n\n        event = inputlog.ReplayEvent(entry)\n        target = document.getElementById(event.target.id) if event.target.id else None\n        if target is None: target = document.elementFromPoint(event.clientX, event.clientY)\n        if target is None or not self.contains(target): target = self\n        eventdict = {\"bubbles\":True, \"cancelable\":True, \"clientX\":event.clientX, \"clientY\":event.clientY}\n        if event.type in inputlog.TOUCHEVENTS:\n            del eventdict[\"clientX\"], eventdict[\"clientY\"]\n            for attr in (\"touches\", \"targetTouches\", \"changedTouches\"):\n                eventdict[attr] = [window.Touch.new({\"identifier\":touch.identifier, \"target\":target, \"clientX\":touch.clientX,\n                                    \"clientY\":touch.clientY}) for touch in getattr(event, attr)]\n            return (target, window.TouchEvent.new(event.type, eventdict))\n        if event.type == \"wheel\":\n            eventdict[\"deltaY\"] = event.deltaY\n            return (target, window.WheelEvent.new(event.type, eventdict))\n        (eventdict[\"button\"], eventdict[\"buttons\"]) = (event.button, event.buttons)\n        return (target, window.MouseEvent.new(event.type, eventdict))\n\n    def _applyOperation(self, op):\n        ''\n        kind = op[\"op\"]\n        if kind == \"addobject\":\n            obj = self._objectFromRecord(op[\"record\"])\n            group = self.objectDict.get(op.get(\"group\"))\n            if group is not None:\n                group.addObject(obj)\n            else:\n                self.addObject(obj)\n                nextobj = self.objectDict.get(op.get(\"before\"))\n                if nextobj is not None and nextobj.parentNode == self: self.insertBefore(obj, nextobj)\n            return\n        obj = self.objectDict[op[\"id\"]]\n        if kind == \"deleteobject\":\n            self.deleteObject(obj)\n        elif kind == \"transform\":\n            matrix = svgbase.createSVGMatrix()\n            (matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f) = op[\"matrix\"]\n            obj._transform(matrix, op.get(\"angle\", 0))\n        else:\n            vertices = obj._vertexdata()\n            oplog.applyToVertices(vertices, op)\n            obj._setvertexdata(vertices)\n\n    def _getOperationLog(self, svgobject):\n        ''\n\n        if hasattr(svgobject, \"reference\") or self.objectDict.get(svgobject.id) is not svgobject: return None\n        if self.mouseMode == MouseMode.DRAW and svgobject is self.mouseOwner: return None\n        return self.operationLog\n\n    def _objectOperation(self, kind, svgobject):\n        ''\n\n        if self._getOperationLog(svgobject) is None: return None\n        if isinstance(svgobject, ImageObject) and not svgobject.imageloaded: return None\n        op = {\"op\":kind, \"id\":svgobject.id, \"record\":_getrecord(svgobject)}\n        group = getattr(svgobject, \"group\", None)\n        if group is not None:\n            op[\"group\"] = group.id\n        else:\n            sibling = svgobject.nextSibling\n            while sibling is not None:\n                obj = self.objectDict.get(getattr(sibling, \"id\", None))\n                if obj is not None and not hasattr(obj, \"reference\"):\n                    op[\"before\"] = obj.id\n                    break\n                sibling = sibling.nextSibling\n        return op\n\n    def _logObjectOperation(self, kind, svgobject):\n        ''\n        op = self._objectOperation(kind, svgobject)\n        if op is not None: self.operationLog.record(op)\n\n    def _addToDict(self, svgobject):\n        ''\n\n        prefix = f\"{self.id}_id\"\n        stack = [svgobject]\n        while stack:\n            svgobj = stack.pop()\n            if not svgobj.id or self.objectDict.get(svgobj.id, svgobj) is not svgobj:\n                svgobj.id = f\"{prefix}{self.nextid}\"\n                self.nextid += 1\n            elif svgobj.id.startswith(prefix) and svgobj.id[len(prefix):].isdigit():\n                self.nextid = max(self.nextid, int(svgobj.id[len(prefix):])+1)\n            self.objectDict[svgobj.id] = svgobj\n            if isinstance(svgobj, GroupObject): stack.extend(svgobj.objectList)\n\n    def _getRecords(self):\n        ''\n\n        for element in self.children:\n            obj = self.objectDict.get(element.id)\n            if obj is None or hasattr(obj, \"reference\"): continue\n            yield _getrecord(obj)\n\n    def _addRecords(self, records):\n        ''\n        objlist = [self._objectFromRecord(record) for record in records]\n        self.addObjects(objlist)\n        if self.mouseMode in [MouseMode.DRAG, MouseMode.EDIT, MouseMode.TRANSFORM]: self.createHitTargets()\n        return objlist\n\n    def _objectFromRecord(self, record, matrix=None):\n        ''\n\n\n        if \"transform\" in record: matrix = tuple(record[\"transform\"]) if matrix is None else svgimport._multiply(matrix, tuple(record[\"transform\"]))\n        if matrix is not None and \"objects\" not in record and record[\"type\"] != \"element\": (record, matrix) = svgimport.shapeForTransform(record, matrix)\n        objtype = record[\"type\"]\n        coords = record.get(\"points\", [])\n        pointlist = [Point((coords[i], coords[i+1])) for i in range(0, len(coords), 2)]\n        angle = record.get(\"angle\", 0)\n        if objtype == \"element\":\n            obj = document.createElementNS(\"http://www.w3.org/2000/svg\", record[\"tag\"])\n            for (key, value) in record[\"attrs\"].items(): obj.attrs[key] = value\n            obj.innerHTML = record[\"content\"]\n            if matrix is not None: obj.attrs[\"transform\"] = \"matrix({},{},{},{},{},{}) \".format(*matrix) + obj.attrs.get(\"transform\", \"\")\n        else:\n            cls = scenetypes[objtype]\n            if issubclass(cls, GroupObject):\n                obj = cls()\n                obj._addMembersFromRecord([self._objectFromRecord(member, matrix) for member in record[\"objects\"]], record)\n            elif issubclass(cls, PointObject):\n                obj = cls(pointlist[0], pointsize=record[\"size\"])\n            elif issubclass(cls, BezierObject):\n                if not issubclass(cls, ClosedBezierObject): pointlist = [None]+pointlist+[None]\n                pointsetlist = [pointlist[i:i+3] for i in range(0, len(pointlist), 3)]\n                if issubclass(cls, SmoothBezierMixin):\n                    obj = cls([pointset[1] for pointset in pointsetlist])\n                    obj.pointsetList = pointsetlist\n                    obj._update()\n                else:\n                    obj = cls(pointsetlist)\n            elif issubclass(cls, UseObject):\n                obj = cls(record[\"href\"], centre=record[\"centre\"], width=record[\"width\"], height=record[\"height\"], angle=angle)\n            elif issubclass(cls, ImageObject):\n                obj = cls(record[\"href\"], pointlist, angle=angle)\n            elif issubclass(cls, (RectangleObject, EllipseObject)):\n                obj = cls(pointlist, angle=angle)\n            elif issubclass(cls, SectorObject):\n                obj = cls(radius=record[\"radius\"], startangle=record[\"startangle\"], endangle=record[\"endangle\"], pointlist=pointlist)\n            else:\n                obj = cls(pointlist=pointlist)\n            for (name, value) in record.get(\"style\", {}).items(): obj.style.setProperty(name, value)\n            if matrix is not None and not isinstance(obj, GroupObject):\n                (a, b, c, d, e, f) = matrix\n                svgmatrix = svgbase.createSVGMatrix()\n                (svgmatrix.a, svgmatrix.b, svgmatrix.c, svgmatrix.d, svgmatrix.e, svgmatrix.f) = matrix\n                obj._transform(svgmatrix, atan2(b, a)*180/pi)\n        if \"id\" in record: obj.id = record[\"id\"]\n        if isinstance(obj, GroupObject):\n            obj._fixed = record.get(\"fixed\", False)\n        else:\n            obj.fixed = record.get(\"fixed\", False)\n        return obj\n\n    def _deleteFromDict(self, svgobject):\n        ''\n\n        stack = [svgobject]\n        while stack:\n            svgobj = stack.pop()\n            if isinstance(svgobj, GroupObject):\n                stack.extend(svgobj.objectList)\n                container = getattr(svgobj, \"hitTargetGroup\", None)\n                if container is not None:\n                    if container.parentNode is not None: container.parentNode.removeChild(container)\n                    svgobj.hitTargetGroup = None\n            hittarget = self.hittargets.pop(svgobj.id, None)\n            if hittarget is not None:\n                if hittarget.parentNode is not None: hittarget.parentNode.removeChild(hittarget)\n                stack.append(hittarget)\n            self.objectDict.pop(svgobj.id, None)\n\n\n    def rotateElement(self, element, angle, centre=None):\n        ''\n\n        if not centre:\n            bbox = element.getBBox()\n            centre = (bbox.x+bbox.width/2, bbox.y+bbox.height/2)\n        (cx, cy) = centre\n        transformstring = f\"translate({cx}px,{cy}px) rotate({angle}deg) translate({-cx}px,{-cy}px)\"\n        element.style.transform = transformstring + element.style.transform\n        t = svgbase.createSVGTransform()\n        t.setRotate(angle, *centre)\n\n        return t.matrix\n\n    def scaleElement(self, element, xscale, yscale=None):\n        ''\n\n        if not yscale: yscale = xscale\n        transformstring = f\"scale({xscale},{yscale})\"\n        element.style.transform = transformstring + element.style.transform\n        t = svgbase.createSVGTransform()\n        t.setScale(xscale, yscale)\n\n        return t.matrix\n\n    def translateElement(self, element, vector):\n        ''\n        (dx, dy) = vector\n        transformstring = f\"translate({dx}px,{dy}px)\"\n        element.style.transform = transformstring + element.style.transform\n        t = svgbase.createSVGTransform()\n        t.setTranslate(*vector)\n\n        return t.matrix\n\n\n    @property\n    def mouseMode(self):\n        return self._mouseMode\n\n    @mouseMode.setter\n    def mouseMode(self, mm):\n        if mm in [MouseMode.DRAG, MouseMode.EDIT, MouseMode.TRANSFORM]:\n            self.createHitTargets()\n        currentmm = getattr(self, \"_mouseMode\", None)\n        if currentmm == mm: return\n        if currentmm == MouseMode.TRANSFORM: self.hideTransformHandles()\n        elif currentmm == MouseMode.EDIT: self.deselectObject()\n        self._mouseMode = mm\n        if mm in [MouseMode.DRAG, MouseMode.PAN, MouseMode.TRANSFORM]:\n            self.tool = \"select\"\n\n    @property\n    def lineWidthScaling(self):\n        return self._lineWidthScaling\n\n    @lineWidthScaling.setter\n    def lineWidthScaling(self, lws):\n        currentlws = getattr(self, \"_lineWidthScaling\", None)\n        if currentlws == lws: return\n        self._lineWidthScaling = lws\n\n        if lws:\n            self.classList.remove(\"nonscalingstroke\")\n        else:\n            self.classList.add(\"nonscalingstroke\")\n\n    def _setHitTargetWidth(self):\n        ''\n\n        width = 10*self.scaleFactor if self.mouseDetected else 25*self.scaleFactor\n        self.style.setProperty(\"--hittargetwidth\", f\"{width}px\")\n\n    def _getScaleFactors(self):\n        ''\n        width, height = self._getDimensions()\n\n        vbleft, vbtop, vbwidth, vbheight = [float(x) for x in self.attrs[\"viewBox\"].split()]\n        xScaleFactor = vbwidth/width if width != 0 else 1\n        yScaleFactor = vbheight/height if height!= 0 else 1\n        return xScaleFactor, yScaleFactor\n\n    def createHitTargets(self):\n        try:\n            self._createEditHitTargets()\n        except AttributeError:\n            self._createHitTargets()\n\n    def _createHitTargets(self):\n        objlist = list(self.objectDict.values())\n        for obj in objlist:\n            if isinstance(obj, GroupObject): continue\n            if hasattr(obj, \"hitTarget\"): continue\n            if hasattr(obj, \"reference\"): continue\n            if isinstance(obj, UseObject):\n                newobj = RectangleObject(pointlist=obj.pointList, angle=obj.angle)\n            elif obj.style.fill != \"none\" or obj.fixed:\n                continue\n            else:\n                newobj = obj.cloneObject()\n                newobj.style.strokeWidth = HITTARGETWIDTH\n            newobj.style.opacity = 0\n            for event in MOUSEEVENTS: newobj.bind(event, self._onHitTargetMouseEvent)\n            for event in TOUCHEVENTS: newobj.bind(event, self._onHitTargetTouchEvent)\n            newobj.reference = obj\n            self._addHitTarget(obj, newobj)\n\n    def _addHitTarget(self, obj, hittarget):\n        ''\n        obj.hitTarget = hittarget\n        self.hittargets[obj.id] = hittarget\n        self.addObject(hittarget)\n        parent = self._hittargetparent(obj)\n        if parent is not self: parent <= hittarget\n\n    def _hittargetparent(self, obj):\n        ''\n\n\n\n        group = getattr(obj, \"group\", None)\n        if group is None: return self\n        container = getattr(group, \"hitTargetGroup\", None)\n        if container is None or container.parentNode is None:\n            container = group.hitTargetGroup = svg.g()\n            container.style.transform = group._pendingstring()\n            self._hittargetparent(group) <= container\n        return container\n\n    def _onWheel(self, event):\n        if self.mouseMode == MouseMode.PAN:\n            event.preventDefault()\n            zoomfactor = 0.9 if event.deltaY < 0 else 1.1\n            newviewbox = [self.centre + zoomfactor*(point - self.centre) for point in self.viewBoxRect]\n            self.setViewBox(newviewbox)\n\n    def _onRightClick(self, event):\n\n        pass\n\n    def _onDragStart(self, event):\n        event.preventDefault()\n\n    @timings.timed(\"_onTouchStart\")\n    def _onTouchStart(self, event):\n        event.preventDefault()\n        global lasttaptime\n        latesttaptime = time.time()\n        if event.touches.length == 1 and latesttaptime - lasttaptime < 0.3:\n            for function in self.events(\"dblclick\"):\n                function(event)\n        else:\n            self._onLeftDown(event)\n        lasttaptime = latesttaptime\n\n    @timings.timed(\"_onMouseDown\")\n    def _onMouseDown(self, event):\n        event.preventDefault()\n        if not self.mouseDetected:\n            self.mouseDetected = True\n            self._setHitTargetWidth()\n        if event.button > 0: return\n        self._onLeftDown(event)\n\n    def _onLeftDown(self, event):\n        log = self.operationLog\n        if log is not None:\n            if self.inGesture: log.end()\n            log.begin()\n            self.inGesture = True\n        if self.mouseMode == MouseMode.DRAG:\n            self._prepareDrag(event)\n        elif self.mouseMode == MouseMode.TRANSFORM:\n            self._prepareTransform(event)\n        elif self.mouseMode == MouseMode.DRAW:\n            self._drawPoint(event)\n        elif self.mouseMode == MouseMode.EDIT:\n            self._prepareEdit(event)\n        elif self.mouseMode == MouseMode.PAN:\n            self._preparePan(event)\n\n    @timings.timed(\"_onMouseMove\")\n    def _onMouseMove(self, event):\n        event.preventDefault()\n        if self.mouseMode == MouseMode.PAN:\n            if self.panning: self._doPan(event)\n            return\n        if not self.mouseOwner: return\n        if self.mouseMode == MouseMode.DRAG:\n            self._doDrag(event)\n        else:\n            self._movePoint(event)\n\n    @timings.timed(\"_onLeftUp\")\n    def _onLeftUp(self, event):\n        if event.type == \"mouseup\" and event.button > 0: return\n        if self.mouseMode == MouseMode.PAN:\n            self._endPan(event)\n        elif not self.mouseOwner:\n            pass\n        elif self.mouseMode == MouseMode.DRAG:\n            self._endDrag(event)\n        elif self.mouseMode == MouseMode.TRANSFORM:\n            self._endTransform(event)\n            self.mouseOwner = None\n        elif self.mouseMode == MouseMode.EDIT:\n            self._endEdit(event)\n        elif self.mouseMode == MouseMode.DRAW and self.tool == \"freehand\":\n            self._endStroke()\n        if self.inGesture:\n            self.inGesture = False\n            if self.operationLog is not None: self.operationLog.end()\n\n    def _onHitTargetMouseEvent(self, event):\n        eventdict = {attr: getattr(event, attr) for attr in dir(event)}\n        eventdict[\"bubbles\"] = False\n        newevent = window.MouseEvent.new(event.type, eventdict)\n        obj = self.objectDict[event.target.id]\n        obj.reference.dispatchEvent(newevent)\n\n    def _onHitTargetTouchEvent(self, event):\n        eventdict = {attr: getattr(event, attr) for attr in dir(event)}\n        eventdict[\"bubbles\"] = False\n        newevent = window.TouchEvent.new(event.type, eventdict)\n        obj = self.objectDict[event.target.id]\n        obj.reference.dispatchEvent(newevent)\n        latesttime = time.time()\n        if event.type == \"touchend\" and latesttime - lasttaptime < 0.6:\n            eventdict[\"clientX\"] = event.changedTouches[0].clientX\n            eventdict[\"clientY\"] = event.changedTouches[0].clientY\n            newevent = window.MouseEvent.new(\"click\", eventdict)\n            obj.reference.dispatchEvent(newevent)\n\n    def _onDoubleClick(self, event):\n        if self.mouseMode == MouseMode.DRAW:\n            self.setTool(\"select\")\n        elif self.mouseMode == MouseMode.PAN:\n            self.fitContents()\n\n    def _onKeyDown(self, event):\n        if event.keyCode == 46: self.deleteSelection()\n\n    def _prepareDrag(self, event):\n        self.dragStartCoords = self.getSVGcoords(event)\n        self.selectedObject = self.getSelectedObject(event.target.id)\n        if self.selectedObject and not self.selectedObject.fixed:\n            self.mouseOwner = self.selectedObject\n            self <= self.mouseOwner\n            hittarget = getattr(self.mouseOwner, \"hitTarget\", None)\n            if hittarget is not None and hittarget.parentNode is not None: hittarget.parentNode <= hittarget\n            self.startx = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n            self.starty = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n\n    def _doDrag(self, event):\n        x = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        y = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        dx, dy = (x-self.startx)*self.scaleFactor, (y-self.starty)*self.scaleFactor\n        transformstring = f\"translate({dx}px,{dy}px)\"\n        if isinstance(self.mouseOwner, ObjectMixin): transformstring += self.mouseOwner._transformstring()\n        self.mouseOwner.style.transform = transformstring\n\n    @timings.timed(\"_endDrag\")\n    def _endDrag(self, event):\n        self.mouseOwner.style.transform = \"translate(0px,0px)\"\n        currentcoords = self.getSVGcoords(event)\n        offset = currentcoords - self.dragStartCoords\n        self.translateObject(self.mouseOwner, offset)\n        if self.edgeSnap: self._doEdgeSnap(self.mouseOwner)\n        elif self.vertexSnap: self._doVertexSnap(self.mouseOwner)\n        self.mouseOwner = None\n\n    def _preparePan(self, event):\n        if not self.centre:\n            (width, height) = self._getDimensions()\n            self.setViewBox([(0,0), (width,height)])\n        if \"touch\" in event.type and event.touches.length == 2:\n            point0 = Point((event.touches[0].clientX, event.touches[0].clientY))\n            point1 = Point((event.touches[1].clientX, event.touches[1].clientY))\n            self.startZoomLength = (point1-point0).length()\n\n        x = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        y = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        self.startPoint = Point((x, y))\n        self.startCentre = self.centre\n        self.panStart = self.viewBoxRect\n        self.panning = True\n\n    def _doPan(self, event):\n        if \"touch\" in event.type and event.touches.length == 2:\n            point0 = Point((event.touches[0].clientX, event.touches[0].clientY))\n            point1 = Point((event.touches[1].clientX, event.touches[1].clientY))\n            newzoomlength = (point1-point0).length()\n            zoomfactor = self.startZoomLength/newzoomlength\n\n            newviewbox = [self.centre + zoomfactor*(point - self.centre) for point in self.viewBoxRect]\n            self.setViewBox(newviewbox)\n            self.startZoomLength = newzoomlength\n        else:\n            x = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n            y = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n            sf = (self.xScaleFactor, self.yScaleFactor) if self.attrs[\"preserveAspectRatio\"] == \"none\" else self.scaleFactor\n            delta = (Point((x, y)) - self.startPoint)*sf\n\n            newviewbox = [point-delta for point in self.panStart]\n            self.setViewBox(newviewbox)\n\n    def _endPan(self, event):\n        self.panning = False\n\n    def getSelectedObject(self, objectid, getGroup = True):\n        ''\n\n\n\n        try:\n            svgobj = self.objectDict[objectid]\n        except KeyError:\n            return\n        try:\n            svgobj = svgobj.reference\n        except AttributeError:\n            pass\n        if getGroup:\n            while getattr(svgobj, \"group\", None):\n                svgobj = svgobj.group\n        return svgobj\n\n    @timings.timed(\"_doVertexSnap\")\n    def _doVertexSnap(self, svgobject, checkpoints=None):\n        objpoints = svgobject._snappoints() if isinstance(svgobject, ObjectMixin) else None\n        if objpoints is None: return\n        snapd = self.snapDistance\n        ((L, T), (R, B)) = svgobject._boundingbox()\n\n        if checkpoints is None:\n            checkpoints = []\n            for objid in self.objectDict:\n                if objid == svgobject.id: continue\n                obj = self.objectDict[objid]\n                if not isinstance(obj, ObjectMixin): continue\n                if hasattr(obj, \"reference\"): continue\n                if obj.style.visibility == \"hidden\": continue\n                if objgroup := getattr(obj, \"group\", None) and hasattr(objgroup, \"pointList\") : continue\n                points = obj._snappoints()\n                if points is None: continue\n                ((L1, T1), (R1, B1)) = obj._boundingbox()\n                if L1-R > snapd or R1-L < -snapd or T1-B > snapd or B1-T < -snapd: continue\n                checkpoints.extend(points)\n        if not checkpoints: return\n        vector = geometry.findvertexsnap(objpoints, checkpoints, snapd)\n        if vector: self.translateObject(svgobject, vector)\n\nshapetypes = {\"line\":LineObject, \"polygon\":PolygonObject, \"polyline\":PolylineObject,\n\"rectangle\":RectangleObject, \"ellipse\":EllipseObject, \"circle\":CircleObject, \"sector\":SectorObject,\n\"bezier\":BezierObject, \"closedbezier\":ClosedBezierObject, \"smoothbezier\":SmoothBezierObject, \"smoothclosedbezier\":SmoothClosedBezierObject}\n\n\nscenetypes = dict(shapetypes, point=PointObject, use=UseObject, image=ImageObject, group=GroupObject)\n\ndef _getrecord(element):\n    ''\n    for cls in type(element).__mro__:\n        for (objtype, scenetype) in scenetypes.items():\n            if cls is scenetype: return element._getRecord(objtype)\n    record = {\"type\":\"element\", \"tag\":element.tagName}\n    if element.id: record[\"id\"] = element.id\n    if getattr(element, \"fixed\", False): record[\"fixed\"] = True\n    record[\"attrs\"] = {key:element.attrs[key] for key in element.attrs if key != \"id\"}\n    record[\"content\"] = element.innerHTML\n    return record\n", ["browser", "browser.html", "browser.svg", "brySVG.flatten", "brySVG.geometry", "brySVG.inputlog", "brySVG.oplog", "brySVG.scene", "brySVG.svgexport", "brySVG.svgimport", "brySVG.textlayout", "brySVG.textmetrics", "brySVG.timings", "collections", "math", "time"]], "brySVG.fullcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\nfrom brySVG.transformcanvas import *\nfrom brySVG.drawcanvas import *\n", ["brySVG.drawcanvas", "brySVG.transformcanvas"]], "brySVG": [".py", "", [], 1], "brySVG.transformcanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\nfrom brySVG.dragcanvas import *\n\nclass TransformMixin(object):\n    ''\n\n\n\n    def matrixTransform(self, matrix):\n        ''\n\n\n        self._transform(matrix)\n\n    def _centre(self):\n        ''\n\n        self._materialiseGroups()\n        if isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)):\n            (cx, cy) = self.centre\n            m = self._pendingMatrix\n            return (cx, cy) if m is None else (m.a*cx+m.c*cy+m.e, m.b*cx+m.d*cy+m.f)\n        self._materialise()\n        bbox = self.getBBox()\n        return (bbox.x+bbox.width/2, bbox.y+bbox.height/2)\n\n    def translate(self, vector):\n        ''\n        t = svgbase.createSVGTransform()\n        t.setTranslate(*vector)\n        self.matrixTransform(t.matrix)\n\n    def rotate(self, angle, centre=None):\n        ''\n\n        if not centre: centre = self._centre()\n        t = svgbase.createSVGTransform()\n        t.setRotate(angle, *centre)\n        self._transform(t.matrix, angle)\n\n    def rotateAndTranslate(self, angle, centre=None, vector=(0,0)):\n        ''\n\n        if not centre: centre = self._centre()\n        t = svgbase.createSVGTransform()\n        if angle != 0: t.setRotate(angle, *centre)\n        M = t.matrix.translate(*vector) if vector != (0,0) else t.matrix\n        self.matrixTransform(M)\n\n    def rotateByVectors(self, vec1, vec2, centre=(0, 0)):\n        ''\n\n        (cx, cy) = centre\n        (x1, y1) = vec1\n        (x2, y2) = vec2\n        (x3, y3) = (x1*x2+y1*y2, x1*y2-x2*y1)\n        angle = atan2(y3, x3)*180/pi\n        matrix = svgbase.createSVGMatrix()\n        matrix = matrix.translate(cx, cy)\n        matrix = matrix.rotateFromVector(x3, y3)\n        matrix = matrix.translate(-cx, -cy)\n        self._transform(matrix, angle)\n\n    def xstretch(self, xscale, cx=0):\n        ''\n\n        if isinstance(self, UseObject): return\n        angle = 0\n        if isinstance(self, (EllipseObject, RectangleObject, ImageObject)) and self.angle != 0:\n            angle = self.angle\n            self.rotate(-angle)\n        matrix = svgbase.createSVGMatrix()\n        matrix = matrix.translate(cx, 0)\n        matrix.a = xscale\n        matrix = matrix.translate(-cx, 0)\n        self.matrixTransform(matrix)\n        if angle != 0: self.rotate(angle)\n\n    def ystretch(self, yscale, cy=0):\n        ''\n\n        if isinstance(self, UseObject): return\n        angle = 0\n        if isinstance(self, (EllipseObject, RectangleObject, ImageObject)) and self.angle != 0:\n            angle = self.angle\n            self.rotate(-angle)\n        matrix = svgbase.createSVGMatrix()\n        matrix = matrix.translate(0, cy)\n        matrix.d = yscale\n        matrix = matrix.translate(0, -cy)\n        self.matrixTransform(matrix)\n        if angle != 0: self.rotate(angle)\n\n    def enlarge(self, scalefactor, centre=(0,0)):\n        ''\n\n        if isinstance(self, UseObject): return\n        (cx, cy) = centre\n        matrix = svgbase.createSVGMatrix()\n        matrix = matrix.translate(cx, cy)\n        matrix = matrix.scale(scalefactor)\n        matrix = matrix.translate(-cx, -cy)\n        self.matrixTransform(matrix)\n\nclass TransformCanvasMixin(object):\n    def _prepareTransform(self, event):\n        self.selectedObject = self.getSelectedObject(event.target.id)\n        if self.selectedObject and not self.selectedObject.fixed:\n            self <= self.selectedObject\n            self.showTransformHandles(self.selectedObject)\n            if TransformType.TRANSLATE in self.transformTypes: self.transformHandles[TransformType.TRANSLATE]._select(event)\n        else:\n            self.hideTransformHandles()\n\n    @timings.timed(\"_endTransform\")\n    def _endTransform(self, event):\n        if not isinstance(self.mouseOwner, TransformHandle): return\n        currentcoords = self.getSVGcoords(event)\n        offset = currentcoords - self.StartPoint\n        if offset.coords != [0, 0]:\n            centre = (cx, cy) = self.selectedObject.centre\n            vec1 = (x1, y1) = self.StartPoint - centre\n            vec2 = (x2, y2) = currentcoords - centre\n            transformtype = self.mouseOwner.transformType\n\n            self.selectedObject.style.transform = \"translate(0px,0px)\"\n            if transformtype == TransformType.TRANSLATE:\n                self.selectedObject.translate(offset)\n            elif transformtype == TransformType.ROTATE:\n                self.selectedObject.rotateByVectors(vec1, vec2, (cx, cy))\n            elif transformtype == TransformType.XSTRETCH:\n                self.selectedObject.xstretch(x2/x1, cx)\n            elif transformtype == TransformType.YSTRETCH:\n                self.selectedObject.ystretch(y2/y1, cy)\n            elif transformtype == TransformType.ENLARGE:\n                self.selectedObject.enlarge(hypot(x2, y2)/hypot(x1, y1), (cx, cy))\n\n            if self.edgeSnap: self._doEdgeSnap(self.selectedObject)\n            elif self.vertexSnap: self._doVertexSnap(self.selectedObject)\n\n        if self.transformorigin:\n            self.removeChild(self.transformorigin)\n            self.transformorigin = None\n        self.showTransformHandles(self.selectedObject)\n        self.mouseOwner = None\n\n    def showTransformHandles(self, svgobj):\n\n        if isinstance(svgobj, (EllipseObject, RectangleObject, ImageObject, UseObject)): svgobj.bake()\n        tempgroup = svg.g()\n        tempgroup <= svgobj.cloneNode(True)\n        self <= tempgroup\n        bbox = tempgroup.getBBox()\n        (x1, y1), (x2, y2) = svgobj.bbox = (bbox.x, bbox.y), (bbox.x+bbox.width, bbox.y+bbox.height)\n        self.removeChild(tempgroup)\n        (cx, cy) = svgobj.centre = Point(((x1+x2)/2, (y1+y2)/2))\n        ((left, top), (right, bottom)) = self.viewWindow\n\n        if not self.transformHandles: self.transformHandles = [self.transformBBox] + [TransformHandle(None, i, (0,0), self) for i in range(1,6)]\n        for i, coords in enumerate([((x1+x2)/2,(y1+y2)/2), (x1,y1), (x2,(y1+y2)/2), ((x1+x2)/2,y2), (x2,y2)]):\n            self.transformHandles[i+1].XY = coords\n            self.transformHandles[i+1].owner = svgobj\n        self.hideTransformHandles()\n\n        self.usebox = False\n        if not isinstance(svgobj, UseObject):\n            for ttype in self.transformTypes:\n                if ttype in [TransformType.XSTRETCH, TransformType.YSTRETCH, TransformType.ENLARGE]: self.usebox = True\n\n        if self.usebox:\n            self.transformBBox.setPointList([Point((x1,y1)),Point((x2,y2))])\n\n            self <= self.transformBBox\n            self.transformBBox.style.visibility = \"visible\"\n        else:\n            handlelength = min((bottom-top)*0.4, (y2-y1)*2)\n            ypos = cy-handlelength\n            if ypos < top: ypos = cy+handlelength\n            handleposition = Point(((x1+x2)/2, ypos))\n            self.transformHandles[2].XY = handleposition\n            self.rotateLine.setPointList([svgobj.centre, handleposition])\n\n            self <= self.rotateLine\n            self.rotateLine.style.visibility = \"visible\"\n        for ttype in self.transformTypes:\n            if isinstance(svgobj, UseObject) and ttype in [TransformType.XSTRETCH, TransformType.YSTRETCH, TransformType.ENLARGE]: continue\n            thandle = self.transformHandles[ttype]\n            self <= thandle\n            if ttype != TransformType.TRANSLATE: thandle.style.visibility = \"visible\"\n        return [(x1,y1), (x2,y2)]\n\n    def hideTransformHandles(self):\n        for obj in self.transformHandles: obj.style.visibility = \"hidden\"\n        self.rotateLine.style.visibility = \"hidden\"\n\n    def _showTransformOrigin(self, svgobj, transformtype):\n        (cx, cy) = svgobj.centre\n        (x1, y1), (x2, y2) = svgobj.bbox\n        if transformtype in [TransformType.NONE, TransformType.TRANSLATE]: return\n        if transformtype in [TransformType.ROTATE, TransformType.ENLARGE]:\n            self.transformorigin = PointObject((cx, cy), colour=\"blue\", pointsize=4,canvas=self)\n        elif transformtype == TransformType.XSTRETCH:\n            self.transformorigin = LineObject([(cx,y1), (cx,y2)], linecolour=\"blue\", linewidth=2)\n        elif transformtype == TransformType.YSTRETCH:\n            self.transformorigin = LineObject([(x1, cy), (x2, cy)], linecolour=\"blue\", linewidth=2)\n        self.transformorigin.style.vectorEffect = \"non-scaling-stroke\"\n        self <= self.transformorigin\n\n    def _movePoint(self, event):\n        x = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        y = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        dx, dy = x-self.currentx, y-self.currenty\n        if \"touch\" in event.type and abs(dx) < 5 and abs(dy) < 5: return\n        self.currentx, self.currenty = x, y\n        coords = self.getSVGcoords(event)\n        if self.mouseMode == MouseMode.DRAW:\n            self.mouseOwner._movePoint(coords)\n        else:\n            if self.mouseMode == MouseMode.TRANSFORM: dx, dy = x-self.startx, y-self.starty\n            dx, dy = dx*self.scaleFactor, dy*self.scaleFactor\n            self.mouseOwner._movePoint((dx, dy))\n        return coords\n\nclass TransformHandle(PointObject):\n    def __init__(self, owner, transformtype, coords, canvas):\n        pointsize = 7 if canvas.mouseDetected else 15\n        opacity = 0.4\n        strokewidth = 3\n        PointObject.__init__(self, coords, \"red\", pointsize, canvas)\n        self.style.fillOpacity = opacity\n        self.style.strokeWidth = strokewidth\n        self.style.vectorEffect = \"non-scaling-stroke\"\n        self.owner = owner\n        self.canvas = canvas\n        self.transformType = transformtype\n        self.bind(\"mousedown\", self._select)\n        self.bind(\"touchstart\", self._select)\n\n    def _select(self, event):\n        event.stopPropagation()\n        self.canvas.mouseOwner = self\n        self.startx, self.starty = self.canvas.StartPoint = self.canvas.getSVGcoords(event)\n        self.canvas.startx = self.canvas.currentx = event.targetTouches[0].clientX if \"touch\" in event.type else event.clientX\n        self.canvas.starty = self.canvas.currenty = event.targetTouches[0].clientY if \"touch\" in event.type else event.clientY\n        self.canvas.hideTransformHandles()\n        if self.transformType == TransformType.ROTATE: self.canvas.rotateLine.style.visibility = \"visible\"\n        if self.transformType != TransformType.TRANSLATE: self.style.visibility = \"visible\"\n        self.canvas._showTransformOrigin(self.owner, self.transformType)\n\n    def _movePoint(self, offset):\n        (dx, dy) = offset\n        if (dx, dy) == (0, 0): return\n        (x, y) = self.startx + dx, self.starty + dy\n        self.XY = (x, y)\n        if self.transformType == TransformType.TRANSLATE:\n            self.owner.style.transform = f\"translate({dx}px,{dy}px)\" + self.owner._transformstring()\n            return\n\n        (cx, cy) = self.owner.centre\n        (x1, y1) = self.startx - cx, self.starty - cy\n        (x2, y2) = x -cx, y - cy\n        if self.transformType == TransformType.ROTATE:\n            (x3, y3) = (x1*x2+y1*y2, x1*y2-x2*y1)\n            angle = atan2(y3, x3)*180/pi\n            transformstring = f\"translate({cx}px,{cy}px) rotate({angle}deg) translate({-cx}px,{-cy}px)\"\n            if not self.canvas.usebox:\n                self.canvas.rotateLine.pointList = [self.owner.centre, self.XY]\n                self.canvas.rotateLine._update()\n        elif self.transformType == TransformType.XSTRETCH:\n            xfactor = x2/x1\n            yfactor = xfactor if isinstance(self.owner, CircleObject) else 1\n            transformstring = f\"translate({cx}px,{cy}px) scale({xfactor},{yfactor}) translate({-cx}px,{-cy}px)\"\n        elif self.transformType == TransformType.YSTRETCH:\n            yfactor = y2/y1\n            xfactor = yfactor if isinstance(self.owner, CircleObject) else 1\n            transformstring = f\"translate({cx}px,{cy}px) scale({xfactor},{yfactor}) translate({-cx}px,{-cy}px)\"\n        elif self.transformType == TransformType.ENLARGE:\n            transformstring = f\"translate({cx}px,{cy}px) scale({hypot(x2, y2)/hypot(x1, y1)}) translate({-cx}px,{-cy}px)\"\n\n        if isinstance(self.owner, (EllipseObject, RectangleObject, ImageObject, UseObject)):\n            self.owner.style.transform = self.owner.rotatestring + transformstring\n            if isinstance(self.owner, UseObject): self.owner.style.transform += self.owner.scalestring\n        else:\n            self.owner.style.transform = transformstring + self.owner._transformstring()\n\nclasses = [LineObject, RectangleObject, EllipseObject, CircleObject, SectorObject, PolylineObject, PolygonObject, BezierObject,\nClosedBezierObject, SmoothBezierObject, SmoothClosedBezierObject, PointObject, RegularPolygon, GroupObject, ImageObject, UseObject]\nfor cls in classes:\n    cls.__bases__ = cls.__bases__ + (TransformMixin,)\n\nCanvasObject.__bases__ = CanvasObject.__bases__ + (TransformCanvasMixin,)\n", ["brySVG.dragcanvas"]], "brySVG.polygoncanvas": [".py", "#!/usr/bin/python\n\n\n\n\n\n\nfrom math import sin, cos, atan2, pi, log10, floor, inf\nfrom .transformcanvas import *\nfrom brySVG.geometry import Position, Segment, Intersection, area, boundingBox, equalPolygons\nimport brySVG.geometry as geometry\nimport brySVG.jobs as jobs\nfrom browser import aio, worker\nimport json\nimport time\n\nclass PolygonMixin(object):\n    @property\n    def segments(self):\n        if isinstance(self, PolygonGroup): return self.boundary.segments\n        if getattr(self, \"_segments\", None) is None:\n\n            L = len(self.pointList)\n            self._segments = [Segment(self.pointList[i-1], self.pointList[i], self, ((i-1)%L, i)) for i in range(L)]\n        return self._segments\n\n    def containspoint(self, point, dp=1):\n        ''\n\n\n        poly = getattr(poly, \"pointList\", poly)\n        poly = [(round(x,dp), round(y,dp)) for (x, y) in poly]\n        point = getattr(point, \"XY\", point)\n        (x, y) = (round(point[0],dp), round(point[1],dp))\n        if (x, y) in poly: return \"vertex\"\n        length = len(poly)\n        counter = 0\n        (x1, y1) = poly[0]\n        for i in range(1, length+1):\n            (x2, y2) = poly[i%length]\n            if x1 == x2 == x and min(y1,y2)<=y<=max(y1,y2): return \"edge\"\n            if y1 == y2:\n                if y == y1 and min(x1,x2)<=x<=max(x1,x2): return \"edge\"\n            elif min(y1,y2)<y<=max(y1,y2) and x<max(x1, x2):\n                xcheck = x1 + (y-y1)*(x2-x1)/(y2-y1)\n                if x == xcheck: return \"edge\"\n                elif x < xcheck:\n                    counter += 1\n            (x1, y1) = (x2, y2)\n        return \"interior\" if counter%2 == 1 else False\n\n    def area(self):\n        ''\n        return area(self.pointList)\n\n    def getBoundingBox(self):\n        ''\n\n        return boundingBox(self.pointList)\n\n    def getCentre(self):\n        (left, top), (right, bottom) = boundingBox(self.pointList)\n        return ((left+right)/2, (top+bottom)/2)\n\n    def isEqual(self, other):\n        ''\n        return equalPolygons(self.pointList, other.pointList)\n\n    def positionRelativeTo(self, other):\n        ''\n\n        return relativeposition(self, other)\n\n    def getIntersections(self, other):\n        ''\n\n\n\n\n\n\n        ixlist = findintersections([self, other])\n        (selfpoly, otherpoly) = (_aspolygon(self), _aspolygon(other))\n        for ix in ixlist:\n            polyrefs = ix.polyrefs\n            ix.selfindex, ix.otherindex = polyrefs[selfpoly], polyrefs[otherpoly]\n        return ixlist\n\n    def merge(self, other):\n        ''\n\n        return boundary([self, other])\n\nclass CurveMixin(object):\n    ''\n\n\n    @property\n    def polygon(self):\n        ''\n\n        points = self.getFlattened()\n        cached = getattr(self, \"_polygon\", None)\n        if cached is None or cached[0] is not points:\n            poly = PolygonObject(points) if isinstance(self, ClosedBezierObject) else PolylineObject(points)\n            poly.id = self.id\n            cached = self._polygon = (points, poly)\n        return cached[1]\n\n    @property\n    def segments(self):\n        poly = self.polygon\n        if isinstance(poly, PolygonObject): return poly.segments\n        if getattr(poly, \"_segments\", None) is None:\n            points = poly.pointList\n            poly._segments = [Segment(points[i-1], points[i], poly, (i-1, i)) for i in range(1, len(points))]\n        return poly._segments\n\n    def area(self):\n        ''\n        return area(self.polygon.pointList)\n\n    def getCentre(self):\n        (left, top), (right, bottom) = self.getBoundingBox()\n        return ((left+right)/2, (top+bottom)/2)\n\n    def isEqual(self, other):\n        ''\n        return equalPolygons(self.polygon.pointList, _aspolygon(other).pointList)\n\nclass PolygonGroup(GroupObject, PolygonMixin):\n    def __init__(self, objlist=[], objid=None):\n        self.boundary = None\n        super().__init__(objlist)\n        if objid: self.id = objid\n\n    def __repr__(self):\n        return f\"group {self.id}\" if self.id else f\"group {id(self)}\"\n\n    @property\n    def boundary(self):\n        if self._hasPending(): self._materialise()\n        return self._boundary\n\n    @boundary.setter\n    def boundary(self, boundary):\n        self._boundary = boundary\n\n    def __str__(self):\n        return self.__repr__()\n\n    def addObject(self, svgobject):\n        if not isinstance(svgobject, (PolygonObject, PolygonGroup)): return False\n        if not self.objectList:\n            self.boundary = PolygonObject(svgobject.pointList)\n        else:\n            newboundary = self.boundary.merge(svgobject)\n            if newboundary is False:\n                return False\n            elif newboundary is None:\n                return None\n            else:\n                self.boundary = newboundary\n\n        super().addObject(svgobject)\n\n        return True\n\n    async def addObjectAsync(self, svgobject, budget=0.01, progress=None, cancelled=None):\n        ''\n\n        if not isinstance(svgobject, (PolygonObject, PolygonGroup)): return False\n        if not self.objectList:\n            self.boundary = PolygonObject(svgobject.pointList)\n        else:\n            newboundary = await boundaryAsync([self.boundary, svgobject], budget, progress, cancelled)\n            if newboundary is False:\n                return False\n            elif newboundary is None:\n                return None\n            else:\n                self.boundary = newboundary\n\n        super().addObject(svgobject)\n        return True\n\n    def addObjects(self, polylist, listboundary=None):\n        if polylist == []: return None\n        blist = [self.boundary] if self.boundary else []\n        if listboundary:\n            blist.append(listboundary)\n        else:\n            blist.extend(polylist)\n        newboundary = blist[0] if len(blist) == 1 else boundary(blist)\n        if newboundary is False:\n            return False\n        elif newboundary is None:\n            return None\n        else:\n            self.boundary = newboundary\n        super().addObjects(polylist)\n\n        return True\n\n    def removeObject(self, svgobject):\n        if svgobject not in self.objectList: return\n        groupcopy = self.objectList[:]\n        groupcopy.remove(svgobject)\n        newboundary = boundary(groupcopy)\n        if newboundary is False:\n            return False\n        elif newboundary is None:\n            return None\n        else:\n            self.boundary = newboundary\n        super().removeObject(svgobject)\n\n        return True\n\n    def deleteAll(self):\n        self.boundary = None\n\n        super().deleteAll()\n\n    @property\n    def pointList(self):\n        return [] if self.boundary is None else self.boundary.pointList\n\n    @pointList.setter\n    def pointList(self, pointlist):\n        pass\n\n    @property\n    def points(self):\n        return None if self.boundary is None else self.boundary.points\n\n    def _applyMatrix(self, matrix):\n        super()._applyMatrix(matrix)\n        if self._boundary is not None: self._boundary._applyMatrix(matrix)\n\n    def cloneObject(self):\n        newobject = super().cloneObject()\n        newobject.boundary = self.boundary.cloneObject()\n\n        return newobject\n\n    def _getRecord(self, objtype):\n        record = super()._getRecord(objtype)\n        if self.boundary is not None: record[\"boundary\"] = [coord for point in self.boundary.pointList for coord in point]\n        return record\n\n    def _addMembersFromRecord(self, members, record):\n\n        coords = record.get(\"boundary\")\n        listboundary = None if coords is None else PolygonObject([(coords[i], coords[i+1]) for i in range(0, len(coords), 2)])\n        self.addObjects(members, listboundary)\n\nclass PolygonCanvasMixin(object):\n    ''\n\n\n\n\n\n\n    @timings.timed(\"_doEdgeSnap\")\n    def _doEdgeSnap(self, svgobject):\n        tt = timings.start()\n        if not isinstance(svgobject, (PolygonObject, PolygonGroup, CurveMixin)): return\n        snapangle = self.snapAngle*pi/180\n        snapd = self.snapDistance\n        checkobjs = self._edgesnapcandidates(svgobject)\n        checksegs = [seg for obj in checkobjs for seg in obj.segments]\n        tt = timings.lap(\"ES-findcandidates\", tt)\n        if not checksegs: return\n        snap = geometry.findedgesnap(svgobject.segments, checksegs, snapangle, snapd)\n        tt = timings.start()\n\n        if snap is not None:\n            (angle, centre, vector) = snap\n\n            if not (angle ==0 and vector == (0, 0)): svgobject.rotateAndTranslate(angle*180/pi, centre, vector)\n        if self.vertexSnap:\n            self._doVertexSnap(svgobject, [p for obj in checkobjs for p in obj.pointList])\n        timings.lap(\"ES-dosnap\", tt)\n\n    def _edgesnapcandidates(self, svgobject):\n        ''\n        snapd = self.snapDistance\n        ((L1, T1), (R1, B1)) = svgobject._boundingbox()\n        checkobjs = []\n        for objid in self.objectDict:\n            if objid == svgobject.id: continue\n            obj = self.objectDict[objid]\n            if getattr(obj, \"group\", None): continue\n            if not isinstance(obj, (PolygonObject, PolygonGroup, CurveMixin)): continue\n            ((L2, T2), (R2, B2)) = obj._boundingbox()\n            if L2-R1 > snapd or R2-L1 < -snapd or T2-B1 > snapd or B2-T1 < -snapd: continue\n            checkobjs.append(obj)\n        return checkobjs\n\n    def _getjobrunner(self):\n        ''\n        if getattr(self, \"jobRunner\", None) is None: self.jobRunner = DeferredJobRunner()\n        return self.jobRunner\n\n    def requestRelativePosition(self, poly1, poly2, callback, key=None, errorcallback=None):\n        ''\n\n\n        return self._getjobrunner().submit(\"relativeposition\", [_aspolygon(poly1), _aspolygon(poly2)], callback, key, errorcallback)\n\n    def requestIntersections(self, polylist, callback, key=None, errorcallback=None):\n        ''\n\n        polygons = [_aspolygon(poly) for poly in polylist]\n        def decode(result):\n            intersections = []\n            for (x, y, refs) in result:\n                ix = Intersection([(polygons[k], tuple(index) if len(index) > 1 else index[0]) for (k, *index) in refs[:2]], Point((x, y)))\n                for (k, *index) in refs[2:]: ix.polyrefs[polygons[k]] = tuple(index) if len(index) > 1 else index[0]\n                intersections.append(ix)\n            callback(intersections)\n        return self._getjobrunner().submit(\"findintersections\", polygons, decode, key, errorcallback)\n\n    def requestBoundary(self, polylist, callback, key=None, errorcallback=None):\n        ''\n\n        def decode(result):\n            callback(PolygonObject([(result[i], result[i+1]) for i in range(0, len(result), 2)]) if result else result)\n        return self._getjobrunner().submit(\"boundary\", [_aspolygon(poly) for poly in polylist], decode, key, errorcallback)\n\n    def requestEdgeSnap(self, svgobject, callback=None, key=None, errorcallback=None):\n        ''\n\n\n        if not isinstance(svgobject, (PolygonObject, PolygonGroup, CurveMixin)): return None\n        if key is None: key = (\"snap\", svgobject.id)\n        checkobjs = self._edgesnapcandidates(svgobject)\n        if not checkobjs: return None\n        polygons = [_aspolygon(obj) for obj in [svgobject]+checkobjs]\n        openpolys = [i for (i, poly) in enumerate(polygons) if not isinstance(poly, PolygonObject)]\n        def onedgesnap(result):\n            if result:\n                (angle, cx, cy, dx, dy) = result\n                if not (angle == 0 and (dx, dy) == (0, 0)): svgobject.rotateAndTranslate(angle*180/pi, (cx, cy), (dx, dy))\n            if self.vertexSnap:\n                points = [point for obj in checkobjs for point in obj.pointList]\n                self._getjobrunner().submit(\"vertexsnap\", [svgobject._snappoints(), points], onvertexsnap, key, errorcallback, snapdistance=self.snapDistance)\n            elif callback:\n                callback(svgobject)\n        def onvertexsnap(result):\n            if result: self.translateObject(svgobject, result)\n            if callback: callback(svgobject)\n        return self._getjobrunner().submit(\"edgesnap\", polygons, onedgesnap, key, errorcallback,\n                                     snapangle=self.snapAngle*pi/180, snapdistance=self.snapDistance, open=openpolys)\n\nclass WorkerJobRunner(jobs.JobRunner):\n    ''\n\n    def __init__(self, workerid):\n        super().__init__()\n        self.worker = worker.Worker(workerid)\n        self.worker.bind(\"message\", lambda event: self.receive(json.loads(event.data)))\n\n    def _send(self, job):\n        ''\n        self.worker.send(json.dumps(job))\n\nclass DeferredJobRunner(jobs.JobRunner):\n    ''\n\n    def _send(self, job):\n        ''\n        aio.run(self._run(job))\n\n    async def _run(self, job):\n        ''\n        await aio.sleep(0)\n        if job[\"id\"] in self.pending: self.receive(jobs.runJob(job))\n\ndef _aspolygon(poly):\n    ''\n\n    if isinstance(poly, PolygonGroup): return poly.boundary\n    if isinstance(poly, CurveMixin): return poly.polygon\n    return poly\n\ndef relativeposition(self, other):\n    ''\n\n    return geometry.relativeposition(_aspolygon(self), _aspolygon(other))\n\ndef findintersections(polylist):\n    ''\n\n\n\n\n\n\n    return geometry.findintersections([_aspolygon(poly) for poly in polylist])\n\ndef boundary(polylist):\n    ''\n\n    result = geometry.boundary([_aspolygon(poly) for poly in polylist])\n    return PolygonObject(result.pointList) if result else result\n\nasync def findintersectionsAsync(polylist, budget=0.01, progress=None, cancelled=None):\n    ''\n\n\n    return await _runsliced(geometry.findintersectionsteps([_aspolygon(poly) for poly in polylist]), budget, progress, cancelled)\n\nasync def boundaryAsync(polylist, budget=0.01, progress=None, cancelled=None):\n    ''\n    result = await _runsliced(geometry.boundarysteps([_aspolygon(poly) for poly in polylist]), budget, progress, cancelled)\n    return PolygonObject(result.pointList) if result else result\n\nasync def _runsliced(steps, budget, progress, cancelled):\n    ''\n\n    slices = geometry.sliced(steps, budget, progress, cancelled)\n    while True:\n        try:\n            next(slices)\n        except StopIteration as stop:\n            return stop.value\n        await aio.sleep(0)\n\nPolygonObject.__bases__ = PolygonObject.__bases__ + (PolygonMixin,)\nBezierObject.__bases__ = BezierObject.__bases__ + (CurveMixin,)\nClosedBezierObject.__bases__ = ClosedBezierObject.__bases__ + (PolygonMixin,)\nCanvasObject.__bases__ = CanvasObject.__bases__ + (PolygonCanvasMixin,)\nscenetypes[\"polygongroup\"] = PolygonGroup\nclass RegularPolygon(RegularPolygon, PolygonObject):\n    pass\n", ["browser", "brySVG.geometry", "brySVG.jobs", "brySVG.transformcanvas", "json", "math", "time"]], "brySVG.curvefit": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\nfrom math import hypot\n\nMAXPOINTS = 1000\nMAXITERATIONS = 4\n\nclass StrokeSimplifier(object):\n    ''\n\n\n\n\n\n\n    def __init__(self, tolerance=1, maxpoints=MAXPOINTS):\n        self.tolerance = tolerance\n        self.maxpoints = maxpoints\n        self.points = []\n        self.latest = None\n        self.direction = None\n        self.reach = 0\n        self.reduced = False\n\n    def addPoint(self, point):\n        ''\n        (x, y) = point\n        if not self.points:\n            self.points.append((x, y))\n            return\n        (ax, ay) = self.points[-1]\n        (dx, dy) = (x-ax, y-ay)\n        tolerance = self.tolerance\n        if self.direction is None:\n            d = hypot(dx, dy)\n            if d > tolerance: (self.direction, self.reach) = ((dx/d, dy/d), d)\n            self.latest = (x, y)\n            return\n        (ux, uy) = self.direction\n        along = dx*ux + dy*uy\n        if abs(dx*uy - dy*ux) <= tolerance and along >= self.reach - tolerance:\n            self.reach = max(self.reach, along)\n            self.latest = (x, y)\n            return\n        self._keep(self.latest)\n        (ax, ay) = self.latest\n        (dx, dy) = (x-ax, y-ay)\n        d = hypot(dx, dy)\n        (self.direction, self.reach) = ((dx/d, dy/d), d) if d > tolerance else (None, 0)\n        self.latest = (x, y)\n\n    def finish(self):\n        ''\n        if self.latest is not None and self.latest != self.points[-1]: self._keep(self.latest)\n        self.latest = None\n        return self.points\n\n    def _keep(self, point):\n        ''\n        self.points.append(point)\n        if len(self.points) > self.maxpoints:\n            points = self.points\n            while len(points) > self.maxpoints//2:\n                self.tolerance *= 2\n                points = simplify(points, self.tolerance)\n            self.points = points\n            self.reduced = True\n\ndef simplify(points, tolerance=1):\n    ''\n    simplifier = StrokeSimplifier(tolerance, maxpoints=len(points)+1)\n    for point in points: simplifier.addPoint(point)\n    return simplifier.finish()\n\ndef fitCurve(points, tolerance=1, maxiterations=MAXITERATIONS):\n    ''\n\n    points = [tuple(point) for (i, point) in enumerate(points) if i == 0 or tuple(point) != tuple(points[i-1])]\n    n = len(points)\n    if n < 2: return []\n    curves = []\n    stack = [(0, n-1, _unit(points[0], points[1]), _unit(points[-1], points[-2]))]\n    while stack:\n        (first, last, tangent1, tangent2) = stack.pop()\n        (curve, split) = _fitcubic(points, first, last, tangent1, tangent2, tolerance, maxiterations)\n        if curve is not None:\n            curves.append(curve)\n            continue\n        centretangent = _unit(points[split+1], points[split-1])\n        stack.append((split, last, (-centretangent[0], -centretangent[1]), tangent2))\n        stack.append((first, split, tangent1, centretangent))\n    pointsetlist = [[None, curves[0][0], curves[0][1]]]\n    for (previous, curve) in zip(curves, curves[1:]): pointsetlist.append([previous[2], curve[0], curve[1]])\n    pointsetlist.append([curves[-1][2], curves[-1][3], None])\n    return pointsetlist\n\ndef fitPolyline(points, tolerance=1):\n    ''\n\n    spacing = 4*tolerance\n    dense = []\n    for i in range(len(points)-1):\n        ((x1, y1), (x2, y2)) = (points[i], points[i+1])\n        count = int(hypot(x2-x1, y2-y1)/spacing) + 1\n        dense.extend((x1 + (x2-x1)*j/count, y1 + (y2-y1)*j/count) for j in range(count))\n    dense.extend(points[-1:])\n    return fitCurve(dense, tolerance)\n\ndef fitStroke(samples, tolerance=1, maxpoints=MAXPOINTS):\n    ''\n\n    simplifier = StrokeSimplifier(tolerance, maxpoints)\n    for sample in samples: simplifier.addPoint(sample)\n    return fitPolyline(simplifier.finish(), tolerance)\n\ndef _fitcubic(points, first, last, tangent1, tangent2, tolerance, maxiterations):\n    ''\n\n    (p0, p3) = (points[first], points[last])\n    if last - first == 1:\n        d = hypot(p3[0]-p0[0], p3[1]-p0[1])/3\n        return ([p0, _along(p0, tangent1, d), _along(p3, tangent2, d), p3], None)\n    params = _chordlengths(points, first, last)\n    curve = _generatecurve(points, first, last, params, tangent1, tangent2)\n    (error, split) = _maxerror(points, first, last, curve, params)\n    limit = tolerance*tolerance\n    if error <= limit: return (curve, None)\n    if error <= 4*limit:\n        for i in range(maxiterations):\n            params = [_newtonstep(curve, points[first+j], u) for (j, u) in enumerate(params)]\n            curve = _generatecurve(points, first, last, params, tangent1, tangent2)\n            (error, split) = _maxerror(points, first, last, curve, params)\n            if error <= limit: return (curve, None)\n    return (None, split)\n\ndef _generatecurve(points, first, last, params, tangent1, tangent2):\n    ''\n\n    (p0, p3) = (points[first], points[last])\n    (t1x, t1y), (t2x, t2y) = tangent1, tangent2\n    c00 = c01 = c11 = x0 = x1 = 0\n    for (j, u) in enumerate(params):\n        v = 1-u\n        (b0, b1, b2, b3) = (v*v*v, 3*u*v*v, 3*u*u*v, u*u*u)\n        (a1x, a1y, a2x, a2y) = (t1x*b1, t1y*b1, t2x*b2, t2y*b2)\n        c00 += a1x*a1x + a1y*a1y\n        c01 += a1x*a2x + a1y*a2y\n        c11 += a2x*a2x + a2y*a2y\n        (px, py) = points[first+j]\n        rx = px - (p0[0]*(b0+b1) + p3[0]*(b2+b3))\n        ry = py - (p0[1]*(b0+b1) + p3[1]*(b2+b3))\n        x0 += a1x*rx + a1y*ry\n        x1 += a2x*rx + a2y*ry\n    det = c00*c11 - c01*c01\n    chord = hypot(p3[0]-p0[0], p3[1]-p0[1])\n    (alpha1, alpha2) = (0, 0) if det == 0 else ((x0*c11 - x1*c01)/det, (c00*x1 - c01*x0)/det)\n    if alpha1 < 1e-6*chord or alpha2 < 1e-6*chord: (alpha1, alpha2) = (chord/3, chord/3)\n    return [p0, _along(p0, tangent1, alpha1), _along(p3, tangent2, alpha2), p3]\n\ndef _maxerror(points, first, last, curve, params):\n    ''\n\n    (maxerror, split) = (0, (first+last)//2)\n    for j in range(1, last-first):\n        (x, y) = _bezier(curve, params[j])\n        (px, py) = points[first+j]\n        error = (x-px)*(x-px) + (y-py)*(y-py)\n        if error > maxerror: (maxerror, split) = (error, first+j)\n    return (maxerror, split)\n\ndef _newtonstep(curve, point, u):\n    ''\n    (p0, p1, p2, p3) = curve\n    (qx, qy) = _bezier(curve, u)\n    v = 1-u\n    (d1x, d1y) = (3*(v*v*(p1[0]-p0[0]) + 2*u*v*(p2[0]-p1[0]) + u*u*(p3[0]-p2[0])),\n                  3*(v*v*(p1[1]-p0[1]) + 2*u*v*(p2[1]-p1[1]) + u*u*(p3[1]-p2[1])))\n    (d2x, d2y) = (6*(v*(p2[0]-2*p1[0]+p0[0]) + u*(p3[0]-2*p2[0]+p1[0])),\n                  6*(v*(p2[1]-2*p1[1]+p0[1]) + u*(p3[1]-2*p2[1]+p1[1])))\n    (ex, ey) = (qx-point[0], qy-point[1])\n    denominator = d1x*d1x + d1y*d1y + ex*d2x + ey*d2y\n    if denominator == 0: return u\n    return min(1, max(0, u - (ex*d1x + ey*d1y)/denominator))\n\ndef _chordlengths(points, first, last):\n    ''\n    lengths = [0]\n    for i in range(first+1, last+1):\n        (x1, y1), (x2, y2) = points[i-1], points[i]\n        lengths.append(lengths[-1] + hypot(x2-x1, y2-y1))\n    total = lengths[-1]\n    return [length/total for length in lengths]\n\ndef _bezier(curve, u):\n    ''\n    (p0, p1, p2, p3) = curve\n    v = 1-u\n    (b0, b1, b2, b3) = (v*v*v, 3*u*v*v, 3*u*u*v, u*u*u)\n    return (b0*p0[0] + b1*p1[0] + b2*p2[0] + b3*p3[0], b0*p0[1] + b1*p1[1] + b2*p2[1] + b3*p3[1])\n\ndef _unit(start, end):\n    ''\n    (dx, dy) = (end[0]-start[0], end[1]-start[1])\n    d = hypot(dx, dy)\n    return (dx/d, dy/d) if d else (0, 0)\n\ndef _along(point, direction, distance):\n    ''\n    return (point[0] + direction[0]*distance, point[1] + direction[1]*distance)\n", ["math"]], "brySVG.flatten": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\nTOLERANCE = 0.25\nMAXDEPTH = 16\n\ndef flattenCubic(p0, p1, p2, p3, tolerance=TOLERANCE):\n    ''\n\n    limit = (tolerance*4/3)**2\n    points = []\n    stack = [(tuple(p0), tuple(p1), tuple(p2), tuple(p3), 0)]\n    while stack:\n        (a, b, c, d, depth) = stack.pop()\n        if depth >= MAXDEPTH or (_segmentdistance2(b, a, d) <= limit and _segmentdistance2(c, a, d) <= limit):\n            points.append(d)\n            continue\n        ab = ((a[0]+b[0])/2, (a[1]+b[1])/2)\n        bc = ((b[0]+c[0])/2, (b[1]+c[1])/2)\n        cd = ((c[0]+d[0])/2, (c[1]+d[1])/2)\n        abc = ((ab[0]+bc[0])/2, (ab[1]+bc[1])/2)\n        bcd = ((bc[0]+cd[0])/2, (bc[1]+cd[1])/2)\n        m = ((abc[0]+bcd[0])/2, (abc[1]+bcd[1])/2)\n        stack.append((m, bcd, cd, d, depth+1))\n        stack.append((a, ab, abc, m, depth+1))\n    return points\n\ndef flattenPointsetList(pointsetlist, closed=False, tolerance=TOLERANCE):\n    ''\n\n    count = len(pointsetlist)\n    if count == 0: return []\n    points = [tuple(pointsetlist[0][1])]\n    for i in range(count if closed else count-1):\n        (pointset, nextset) = (pointsetlist[i], pointsetlist[(i+1)%count])\n        points.extend(flattenCubic(pointset[1], pointset[2], nextset[0], nextset[1], tolerance))\n    if closed: points.pop()\n    return points\n\ndef boundingBox(points):\n    ''\n    xcoords = [x for (x, y) in points]\n    ycoords = [y for (x, y) in points]\n    return ((min(xcoords), min(ycoords)), (max(xcoords), max(ycoords)))\n\ndef _segmentdistance2(p, a, b):\n    ''\n    (dx, dy) = (b[0]-a[0], b[1]-a[1])\n    (px, py) = (p[0]-a[0], p[1]-a[1])\n    length2 = dx*dx + dy*dy\n    t = 0 if length2 == 0 else max(0, min(1, (px*dx + py*dy)/length2))\n    (ex, ey) = (px - t*dx, py - t*dy)\n    return ex*ex + ey*ey\n", []], "brySVG.geometry": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\nfrom math import sin, cos, atan2, pi, hypot, floor, log10, inf\nimport time\nimport brySVG.timings as timings\n\nclass Enum(list):\n    def __init__(self, name, string):\n        values = string.split()\n        for i, value in enumerate(values):\n            setattr(self, value, i)\n            self.append(i)\n\nPosition = Enum ('Position', 'CONTAINS INSIDE OVERLAPS EQUAL DISJOINT TOUCHING')\ndp = 2\ndp1 = dp-1\ndp2 = dp-2\n\nclass Point(object):\n    ''\n    def __init__(self, coords):\n        self.coords = list(coords.coords) if isinstance(coords, Point) else list(coords)\n\n    def __repr__(self):\n        return str(tuple(self.coords))\n\n    def __eq__(self, other):\n        if isinstance(other, Point):\n            return (self.coords == other.coords)\n        elif isinstance(other, list):\n            return (self.coords == other)\n        elif isinstance(other, tuple):\n            return (tuple(self.coords) == other)\n        else:\n            return False\n\n    def __lt__(self, other):\n        return self.coords < other.coords\n\n    def __add__(self, other):\n        if isinstance(other, Point):\n            return Point([xi+yi for (xi, yi) in zip(self.coords, other.coords)])\n        elif isinstance(other, (list, tuple)):\n            return Point([xi+yi for (xi, yi) in zip(self.coords, other)])\n        elif other is None:\n            return None\n        else:\n            return NotImplemented\n\n    def __radd__(self, other):\n        return self + other\n\n    def __iadd__(self, other):\n        if isinstance(other, (list, tuple)):\n            for i in range(len(self.coords)):\n                self.coords[i] += other[i]\n        else:\n            for i in range(len(self.coords)):\n                self.coords[i] += other.coords[i]\n        return self\n\n    def __sub__(self, other):\n        return Point([xi-yi for (xi, yi) in zip(self.coords, other.coords)])\n\n    def __rsub__(self, other):\n        return Point([xi-yi for (xi, yi) in zip(other.coords, self.coords)])\n\n    def __neg__(self):\n        return Point([-xi for xi in self.coords])\n\n    def __mul__(self, other):\n        if isinstance(other, (int, float)):\n            return Point([other*xi for xi in self.coords])\n        elif isinstance(other, (list, tuple)):\n            return Point([xi*yi for (xi, yi) in zip(self.coords, other)])\n        elif isinstance(other, Point):\n            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])\n        elif isinstance(other, Matrix):\n            return Point([self*col for col in other.cols])\n        else:\n            return NotImplemented\n\n    def __rmul__(self, other):\n        if isinstance(other, (int, float)):\n            return Point([other*xi for xi in self.coords])\n        elif isinstance(other, (list, tuple)):\n           return Point([xi*yi for (xi, yi) in zip(self.coords, other)])\n        elif isinstance(other, Point):\n            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])\n        else:\n            return NotImplemented\n\n    def __truediv__(self, other):\n        return Point([xi/other for xi in self.coords])\n\n    def __getitem__(self, i):\n        return self.coords[i]\n\n    def __hash__(self):\n        return hash(tuple(self.coords))\n\n    def __round__(self, n):\n        (x, y) = self.coords\n        return Point((round(float(x), n), round(float(y), n)))\n\n    def __len__(self):\n        return len(self.coords)\n\n    def length(self):\n        (x, y) = self.coords\n        return hypot(x, y)\n\n    def angle(self):\n        return atan2(self.coords[1], self.coords[0])\n\n    def anglefrom(self, other):\n        dot = other*self\n        cross = other.cross(self)\n        if cross == 0: cross = -0.0\n        angle = atan2(cross, dot)\n        return angle\n\n    def cross(self, other):\n        x1, y1 = self.coords\n        x2, y2 = other.coords\n        return x1*y2 - y1*x2\n\n    def roundsf(self, sf):\n        x, y = self.coords\n        return Point((roundsf(x, sf), roundsf(y, sf)))\n\nclass Matrix(object):\n    def __init__(self, rows):\n        self.rows = rows\n        self.cols = [Point([self.rows[i][j] for i in range(len(self.rows))]) for j in range(len(self.rows[0]))]\n\n    def __str__(self):\n        return str(\"\\n\".join(str(row) for row in self.rows))\n\n    def __rmul__(self, other):\n        if isinstance(other, (list, tuple)):\n            return [Point([p*col for col in self.cols]) for p in other]\n        else:\n            return Point([other*col for col in self.cols])\n\ndef roundsf(x, sf=3):\n    if x == 0: return 0\n    return round(x, sf-int(floor(log10(abs(x))))-1)\n\nclass ListDict(dict):\n    def __getitem__(self, key):\n        try:\n            return super().__getitem__(key)\n        except KeyError:\n            self[key] = []\n            return self[key]\n\nclass SetDict(dict):\n    def __getitem__(self, key):\n        try:\n            return super().__getitem__(key)\n        except KeyError:\n            self[key] = set()\n            return self[key]\n\nclass Segment(object):\n    def __init__(self, startpoint, endpoint, poly, index):\n        if endpoint < startpoint:\n            self.leftpoint, self.rightpoint = endpoint, startpoint\n            self.leftindex, self.rightindex = reversed(index)\n        else:\n            self.leftpoint, self.rightpoint = startpoint, endpoint\n            self.leftindex, self.rightindex = index\n\n        self.leftx, self.lefty = self.leftpoint\n        self.rightx, self.righty = self.rightpoint\n        (self.top, self.bottom) = (self.righty, self.lefty) if self.righty<self.lefty else (self.lefty, self.righty)\n        self.poly = poly\n        self.index = index\n        self.dx, self.dy = self.rightx-self.leftx, self.righty-self.lefty\n        self.gradient = inf if self.dx == 0 else self.dy/self.dx\n        self.angle = atan2(self.dy, self.dx)-pi/2+pi*(self.dy<0)\n        self.y = self.lefty\n        self.xpos = \"L\"\n\n    def __repr__(self):\n        return f\"{self.poly}{self.index}: [{self.leftpoint}, {self.rightpoint}]; currenty: {self.y}, xpos: {self.xpos}, gradient: {self.gradient}, angle: {self.angle}\"\n\nclass Intersection(object):\n    def __init__(self, polyrefs, point=None):\n        (poly1, index1), (poly2, index2) = polyrefs\n        self.polyrefs = {poly1:index1, poly2:index2}\n        self.point = point if point is not None else Point((0, 0))\n\n    def __repr__(self):\n        s = f\"{self.point} \\n\"\n        polys = sorted(self.polyrefs, key = lambda poly: poly.id)\n        for poly in polys:\n            index = self.polyrefs[poly]\n            if isinstance(index, int):\n                s += f\"at vertex {index} on polygon {poly}\\n\"\n            else:\n                i1, i2 = index\n                s += f\"between vertices {i1} and {i2} on polygon {poly}\\n\"\n        return s\n\nclass Polygon(object):\n    ''\n\n\n    def __init__(self, pointlist, polyid=\"\"):\n        self.pointList = [Point(coords) for coords in pointlist]\n        self.id = polyid\n        self._segments = None\n\n    def __repr__(self):\n        return f\"polygon {self.id}\" if self.id else f\"polygon {id(self)}\"\n\n    @property\n    def segments(self):\n        if self._segments is None:\n            L = len(self.pointList)\n            self._segments = [Segment(self.pointList[i-1], self.pointList[i], self, ((i-1)%L, i)) for i in range(L)]\n        return self._segments\n\n    def area(self):\n        ''\n        return area(self.pointList)\n\ndef boundingBox(poly, xdp=None, ydp=None):\n    xcoords = [round(x, xdp) for (x,y) in poly] if xdp else [x for (x,y) in poly]\n    left = min(xcoords)\n    right = max(xcoords)\n    ycoords = [round(y, ydp) for (x,y) in poly] if ydp else [y for (x,y) in poly]\n    top = min(ycoords)\n    bottom = max(ycoords)\n    return (left, top), (right, bottom)\n\ndef _compareboundingboxes(poly1, poly2, xdp=None, ydp=None):\n    if xdp and not ydp: ydp = xdp\n    ((left1, top1), (right1, bottom1)) = boundingBox(poly1, xdp, ydp)\n    ((left2, top2), (right2, bottom2)) = boundingBox(poly2, xdp, ydp)\n    if right1 < left2 or right2 < left1 or bottom1 < top2 or bottom2 < top1: return Position.DISJOINT\n    if right1 == left2 or right2 == left1 or bottom1 == top2 or bottom2 == top1: return Position.TOUCHING\n    if left1 < left2:\n        if right1 < right2: return Position.OVERLAPS\n        else: xresult = Position.CONTAINS\n    elif left1 == left2:\n        xresult = Position.INSIDE if right1 < right2 else Position.EQUAL if right1 == right2 else Position.CONTAINS\n    else:\n        if right1 > right2: return Position.OVERLAPS\n        else: xresult = Position.INSIDE\n\n    if top1 < top2:\n        if bottom1 < bottom2: return Position.OVERLAPS\n        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS\n    elif top1 == top2:\n        if bottom1 < bottom2: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE\n        elif bottom1 == bottom2: return xresult\n        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS\n    else:\n        if bottom1 > bottom2: return Position.OVERLAPS\n        else: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE\n\ndef area(poly):\n    ''\n    area = 0\n    (x0, y0) = poly[-1]\n    for (x1, y1) in poly:\n        area += x1*y0 - x0*y1\n        (x0, y0) = (x1, y1)\n    return abs(area/2)\n\ndef equalPolygons(poly1, poly2):\n    ''\n\n    start1 = poly1.index(min(poly1))\n    poly1 =  poly1[start1+1:]+poly1[:start1]\n    start2 = poly2.index(min(poly2))\n    poly2 =  poly2[start2+1:]+poly2[:start2]\n    return poly1 == poly2 or poly1 == poly2[::-1]\n\ndef _getrotatedcoords(polylist, xdp):\n    def getbestangle(polylist):\n        anglesfromvertical = []\n        for poly in polylist:\n            segs = poly.segments\n            anglesfromvertical.extend([round(abs(seg.angle), 3) for seg in segs])\n\n        if 0 not in anglesfromvertical: return 0\n        positiveangles = [a for a in anglesfromvertical if a>0.1]\n        return round(min(positiveangles)/2, 1)\n\n    a = getbestangle(polylist)\n    cosa, sina = cos(a), sin(a)\n\n    coordslists = []\n    for poly in polylist:\n\n        if a == 0:\n            polyrotated = poly.pointList\n        else:\n            polyrotated = [(5500 + (x-5500)*cosa - (y-5500)*sina, 5500 + (x-5500)*sina + (y-5500)*cosa) for (x, y) in poly.pointList]\n\n        coords = [(round(x, xdp), y) for (x, y) in polyrotated]\n        coordslists.append(coords)\n\n    return coordslists\n\ndef _getsortedsegments(polylist, coordslists):\n    segments = []\n    for poly, coordslist in zip(polylist, coordslists):\n        L = len(coordslist)\n        segments.extend([Segment(coordslist[i-1], coordslist[i], poly, ((i-1)%L, i)) for i in range(L)])\n    segments.sort(key = lambda seg: (seg.leftx, round(seg.lefty, dp1), seg.gradient))\n    return segments\n\ndef mergelists(list1,list2):\n    if not list1:  return list(list2)\n    if not list2:  return list(list1)\n\n    list1iter, list2iter = iter(list1), iter(list2)\n    item1 = next(list1iter)\n    item2 = next(list2iter)\n    result = []\n\n    while item1:\n        while item2 and (item2.y < item1.y or (item2.y == item1.y and item1.xpos != \"R\" and item2.gradient < item1.gradient)):\n            result.append(item2)\n            item2 = next(list2iter, None)\n        result.append(item1)\n        item1 = next(list1iter, None)\n    if item2:\n        result.append(item2)\n        result.extend(list2iter)\n    return result\n\ndef findedgesnap(objsegments, checksegments, snapangle, snapd):\n    ''\n\n\n\n    tt = timings.start()\n    bestangle = None\n    checksegs = sorted(checksegments, key = lambda seg: seg.angle)\n    for seg in checksegs:\n        if seg.angle > snapangle - pi/2: break\n        newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)\n        newseg.angle = seg.angle + pi\n        checksegs.append(newseg)\n\n    objsegs = sorted(objsegments, key = lambda seg: seg.angle)\n    for seg in objsegs:\n        if seg.angle > snapangle - pi/2: break\n        newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)\n        newseg.angle = seg.angle + pi\n        objsegs.append(newseg)\n\n    tt = timings.lap(\"ES-createsegments\", tt)\n\n\n\n\n    checkstart = 0\n    piby4 = pi/4\n    found = False\n    for i, seg1 in enumerate(objsegs):\n        angle1 = seg1.angle\n\n        checksegs = checksegs[checkstart:]\n        if not checksegs: break\n\n        try:\n            tonextangle = objsegs[i+1].angle - angle1\n        except IndexError:\n            tonextangle = 0\n\n        checkstart = 0\n        for seg2 in checksegs:\n            angle2 = seg2.angle\n\n            angled = angle2 - angle1\n\n\n            absangle = abs(angled)\n            if (bestangle is None and absangle < snapangle) or (bestangle is not None and absangle < bestangle):\n\n                (objleft, objright) = (seg1.leftx, seg1.rightx)\n                (objtop, objbottom) = (seg1.top, seg1.bottom)\n                (checkleft, checkright) = (seg2.leftx-snapd, seg2.rightx+snapd)\n                (checktop, checkbottom) = (seg2.top-snapd, seg2.bottom+snapd)\n                if not (objleft > checkright or objright < checkleft or objtop > checkbottom or objbottom < checktop):\n                    objp, objq = seg1.leftpoint, seg1.rightpoint\n                    checkp, checkq = seg2.leftpoint, seg2.rightpoint\n\n\n\n                    objv, checkv = objq-objp, checkq-checkp\n                    diff, product = checkp - objp, objv.cross(checkv)\n                    (t, u) = (diff.cross(objv)/product, diff.cross(checkv)/product) if product != 0 else (inf, inf)\n\n                    if 0<=t<=1 and 0<=u<=1:\n                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, objp + u*objv, (0, 0), seg1, seg2)\n                    else:\n                        bestd = None\n                        (objx1, objy1), (objx2, objy2) = objp, objq\n                        (checkx1, checky1), (checkx2, checky2) = checkp, checkq\n                        if abs(angle2) < piby4:\n                            if checktop <= objy1 <= checkbottom:\n                                checkx = checkx1 + (objy1-checky1)/(checky2-checky1)*(checkx2-checkx1)\n                                diff = checkx-objx1\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (diff, 0), seg1, seg2)\n                            if checktop <= objy2 <= checkbottom:\n                                checkx = checkx1 + (objy2-checky1)/(checky2-checky1)*(checkx2-checkx1)\n                                diff = checkx-objx2\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (diff, 0), seg1, seg2)\n                        else:\n                            if checkleft <= objx1 <= checkright:\n                                checky = checky1 + (objx1-checkx1)/(checkx2-checkx1)*(checky2-checky1)\n                                diff = checky-objy1\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (0, diff), seg1, seg2)\n                            if checkleft <= objx2 <= checkright:\n                                checky = checky1 + (objx2-checkx1)/(checkx2-checkx1)*(checky2-checky1)\n                                diff = checky-objy2\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (0, diff), seg1, seg2)\n                        if abs(angle1) < piby4:\n                            if objtop <= checky1 <= objbottom:\n                                objx = objx1 + (checky1-objy1)/(objy2-objy1)*(objx2-objx1)\n                                diff = checkx1-objx\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky1), (diff, 0), seg1, seg2)\n                            if objtop <= checky2 <= objbottom:\n                                objx = objx1 + (checky2-objy1)/(objy2-objy1)*(objx2-objx1)\n                                diff = checkx2-objx\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky2), (diff, 0), seg1, seg2)\n                        else:\n                            if objleft <= checkx1 <= objright:\n                                objy = objy1 + (checkx1-objx1)/(objx2-objx1)*(objy2-objy1)\n                                diff = checky1-objy\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx1, objy), (0, diff), seg1, seg2)\n                            if objleft <= checkx2 <= objright:\n                                objy = objy1 + (checkx2-objx1)/(objx2-objx1)*(objy2-objy1)\n                                diff = checky2-objy\n\n                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):\n                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx2, objy), (0, diff), seg1, seg2)\n\n            if tonextangle - angled > snapangle:\n                checkstart += 1\n\n            if angled > snapangle:\n\n                break\n            if bestangle == 0:\n                found = True\n                break\n        if found: break\n    timings.lap(\"ES-findbestsnap\", tt)\n    return None if bestangle is None else (angle, centre, vector)\n\ndef findvertexsnap(objpoints, checkpoints, snapd):\n    ''\n\n    bestdx = bestdy = bestd = None\n    checkpoints = sorted(checkpoints, key=lambda p:p.coords)\n    objpoints = sorted(objpoints, key=lambda p:p.coords)\n\n    checkstart = 0\n    for i, point1 in enumerate(objpoints):\n        checkpoints = checkpoints[checkstart:]\n        if not checkpoints: break\n        try:\n            (tonextx, y) = objpoints[i+1] - point1\n        except IndexError:\n            tonextx = 0\n        checkstart = 0\n        for point2 in checkpoints:\n            (dx, dy) = point2 - point1\n            if abs(dx) < snapd and abs(dy) < snapd:\n                d = hypot(dx, dy)\n                if bestd is None or d < bestd: (bestd, bestdx, bestdy) = (d, dx, dy)\n            if tonextx - dx > snapd: checkstart += 1\n            if dx > snapd: break\n    return (bestdx, bestdy) if bestd else None\n\nclass Cancelled(Exception):\n    ''\n    pass\n\ndef complete(steps):\n    ''\n    while True:\n        try:\n            next(steps)\n        except StopIteration as stop:\n            return stop.value\n\ndef sliced(steps, budget=0.01, progress=None, cancelled=None):\n    ''\n\n\n\n    fraction = 0\n    while True:\n        end = time.time() + budget\n        try:\n            fraction = next(steps)\n            while time.time() < end: fraction = next(steps)\n        except StopIteration as stop:\n            if progress: progress(1)\n            return stop.value\n        if progress: progress(fraction)\n        if cancelled and cancelled():\n            steps.close()\n            raise Cancelled()\n        yield fraction\n\ndef _scaled(steps, start, end):\n    ''\n\n    while True:\n        try:\n            fraction = next(steps)\n        except StopIteration as stop:\n            return stop.value\n        yield start + fraction*(end-start)\n\ndef relativeposition(self, other):\n    ''\n\n    def sweeppast(x, latestoutcome, livesegments):\n\n        for seg in livesegments:\n            if seg.rightx == x:\n                seg.y = round(seg.righty, dp2)\n            else:\n                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)\n\n        for i, seg in enumerate(livesegments):\n            for seg2 in livesegments[i+1:]:\n\n                if seg.y == inf or seg2.y == inf: continue\n                if seg.y > seg2.y and seg.poly != seg2.poly:\n\n                    return Position.OVERLAPS, None\n        livesegments = [seg for seg in livesegments if round(seg.rightx, dp1) > round(x, dp1)]\n\n        while unusedsegments and round(unusedsegments[0].leftx, dp1) == round(x, dp1):\n            newseg = unusedsegments.pop(0)\n            newseg.y = round(newseg.lefty, dp2)\n            livesegments.append(newseg)\n        livesegments.sort(key=lambda seg: (seg.y, seg.gradient))\n\n\n        yvaluesA = [seg.y for seg in livesegments if seg.poly == polyA]\n        intervalsA = list(zip(yvaluesA[::2], yvaluesA[1::2]))\n        yvaluesB = [seg.y for seg in livesegments if seg.poly == polyB]\n        intervalsB = list(zip(yvaluesB[::2], yvaluesB[1::2]))\n\n\n        for (startB, endB) in intervalsB:\n            for (startA, endA) in intervalsA:\n                if startB == endB and (startA == startB or endA == endB): break\n                if startA <= startB and endA >= endB:\n                    if latestoutcome == Position.DISJOINT: return Position.OVERLAPS, None\n                    latestoutcome = Position.CONTAINS\n                    break\n                elif startB < startA < endB or startB < endA < endB:\n                    return Position.OVERLAPS, None\n            else:\n                if latestoutcome == Position.CONTAINS: return Position.OVERLAPS, None\n                latestoutcome = Position.DISJOINT\n        return latestoutcome, livesegments\n\n    tt = timings.start()\n    polyA, polyB = self, other\n    coordslist1, coordslist2 = _getrotatedcoords([polyA, polyB], xdp=dp)\n\n    transposed = False\n    bboxresult = _compareboundingboxes(coordslist1, coordslist2, ydp=dp)\n\n    if bboxresult in {Position.DISJOINT, Position.TOUCHING}: return Position.DISJOINT\n    if bboxresult == Position.EQUAL:\n        if equalPolygons(coordslist1, coordslist2): return Position.EQUAL\n        elif area(coordslist2) > area(coordslist1):\n            coordslist1, coordslist2 = coordslist2, coordslist1\n            polyA, polyB = polyB, polyA\n            transposed = True\n    if bboxresult == Position.INSIDE:\n        coordslist1, coordslist2 = coordslist2, coordslist1\n        polyA, polyB = polyB, polyA\n        transposed = True\n\n\n    unusedsegments = _getsortedsegments([polyA, polyB], [coordslist1, coordslist2])\n    tt = timings.lap(\"RP-getsortedsegments\", tt)\n\n    livesegments = []\n    currentoutcome = None\n    xvalues = sorted(set(x for (x, y) in coordslist1+coordslist2))\n\n    for x in xvalues:\n\n        currentoutcome, livesegments = sweeppast(x, currentoutcome, livesegments)\n\n        if currentoutcome == Position.OVERLAPS: break\n    timings.lap(\"RP-sweeppast\", tt)\n    if currentoutcome == Position.CONTAINS and transposed: currentoutcome = Position.INSIDE\n    return currentoutcome\n\ndef findintersections(polylist):\n    ''\n\n\n\n\n\n\n    return complete(findintersectionsteps(polylist))\n\ndef findintersectionsteps(polylist):\n    ''\n\n    def calculatepoint(polyrefs):\n        (poly1, index1), (poly2, index2) = polyrefs\n        (i1a, i1b), (i2a, i2b) = index1, index2\n        p1, p2 = poly1.pointList[i1a], poly2.pointList[i2a]\n        v1, v2 = poly1.pointList[i1b] - p1, poly2.pointList[i2b] - p2\n\n\n\n        if v1.cross(v2) == 0: return Point((0,0))\n        t = (p2-p1).cross(v2)/v1.cross(v2)\n        point = p1+t*v1\n        return point\n\n    def addtoixdict(point, polyrefs):\n        ixkey = round(point, dp2)\n        if ixkey in ixpoints:\n\n            existingrefs = ixpoints[ixkey].polyrefs\n            for poly, index in polyrefs:\n                if (poly not in existingrefs) or isinstance(index, int):\n                    existingrefs[poly] = index\n                else:\n                    oldindex = existingrefs[poly]\n                    if isinstance(oldindex, tuple) and index != oldindex:\n                        (a,b), (c,d) = index, oldindex\n                        existingrefs[poly] = b if b==c else a\n        else:\n\n            ixpoints[ixkey] = Intersection(polyrefs, point)\n\n\n    def sweeppast(x, livesegments):\n        for seg in livesegments:\n            if seg.rightx == x:\n                seg.y = round(seg.righty, dp2)\n                seg.xpos = \"R\"\n                seg.currentindex = seg.rightindex\n            else:\n                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)\n                seg.xpos = \"M\"\n                seg.currentindex = seg.index\n\n\n\n        for i, seg in enumerate(livesegments):\n            for seg2 in livesegments[i+1:]:\n\n                if seg.y == inf or seg2.y == inf: continue\n                if seg.y > seg2.y and seg.poly != seg2.poly:\n\n                    polyrefs = [(seg.poly, seg.index), (seg2.poly, seg2.index)]\n                    point = calculatepoint(polyrefs)\n                    addtoixdict(point, polyrefs)\n\n        newsegments = []\n        while unusedsegments and unusedsegments[0].leftx == x:\n            newseg = unusedsegments.pop(0)\n            newseg.y = round(newseg.lefty, dp2)\n            newseg.xpos = \"L\"\n            newseg.currentindex = newseg.leftindex\n            newsegments.append(newseg)\n\n        livesegments.sort(key=lambda seg: seg.y)\n        livesegments = mergelists(livesegments, newsegments)\n\n\n        segiter = iter(livesegments)\n        seg = next(segiter, None)\n        while seg is not None:\n            prevseg = seg\n            seg = next(segiter, None)\n            if seg is None: break\n\n            if seg.y == prevseg.y and seg.poly != prevseg.poly:\n                if seg.xpos in {\"L\",\"R\"} or prevseg.xpos in {\"L\",\"R\"}:\n\n                    point = seg.poly.pointList[seg.currentindex] if seg.xpos in {\"L\",\"R\"} else prevseg.poly.pointList[prevseg.currentindex]\n                    addtoixdict(point, [(seg.poly, seg.currentindex), (prevseg.poly, prevseg.currentindex)])\n\n        livesegments = [seg for seg in livesegments if seg.xpos != \"R\"]\n        return livesegments\n\n\n\n    tt = timings.start()\n    coordslists = _getrotatedcoords(polylist, xdp=dp)\n    tt = timings.lap(\"FI-getrotatedcoords\", tt)\n\n    unusedsegments = _getsortedsegments(polylist, coordslists)\n    tt = timings.lap(\"FI-getsortedsegments\", tt)\n\n    ixpoints = {}\n    livesegments = []\n    xvalues = sorted(set(x for coordslist in coordslists for (x, y) in coordslist))\n\n    for (i, x) in enumerate(xvalues):\n        livesegments = sweeppast(x, livesegments)\n        yield (i+1)/len(xvalues)\n    timings.lap(\"FI-sweeppast\", tt)\n\n    return list(ixpoints.values())\n\ndef boundary(polylist):\n    ''\n\n    return complete(boundarysteps(polylist))\n\ndef boundarysteps(polylist):\n    ''\n\n    tt = timings.start()\n    ixlist = yield from _scaled(findintersectionsteps(polylist), 0, 0.5)\n    tt = timings.lap(\"B-findintersections\", tt)\n    L = len(polylist)\n    if ixlist == []:\n        maxarea = 0\n        for poly in polylist:\n            polyarea = area(poly.pointList)\n            if polyarea > maxarea: (maxarea, maxpoly) = (polyarea, poly)\n        for (k, poly) in enumerate(polylist):\n            if poly is maxpoly: continue\n            if relativeposition(maxpoly, poly) != Position.CONTAINS: return None\n            yield 0.5 + 0.5*(k+1)/L\n        return Polygon(maxpoly.pointList)\n\n    ixlist.sort(key = lambda ix:ix.point)\n    pointlists = []\n    for i, poly in enumerate(polylist):\n        poly.listindex = i\n        pointlists.append(poly.pointList)\n    pointlists.append([ix.point for ix in ixlist])\n\n    reflists = [[(j, i) for i in range(len(pointlists[j]))] for j in range(L)]\n\n    ixdicts = [ListDict() for j in range(L)]\n    regions = []\n    for i, ix in enumerate(ixlist):\n\n        for (poly, index) in ix.polyrefs.items():\n\n            j = poly.listindex\n            if isinstance(index, tuple):\n\n                ixdicts[j][index].append((L,i))\n            else:\n\n                reflists[j][index] = (L, i)\n        polyset = set(ix.polyrefs)\n        for region in regions:\n            if polyset & region:\n                region.update(polyset)\n                break\n        else:\n            regions.append(polyset)\n\n    polyregions = []\n    while regions:\n\n        mainregion = regions.pop(0)\n        for region in regions[:]:\n            if region & mainregion:\n                mainregion.update(region)\n                regions.remove(region)\n        polyregions.append(mainregion)\n\n\n\n\n    for j in range(L):\n        offset = 1\n        for index in sorted(ixdicts[j]):\n            (i, k) = index\n            insert = ixdicts[j][index]\n            pl = pointlists[j]\n            if pl[k] < pl[i]: insert.reverse()\n            reflists[j][i+offset:i+offset] = insert\n            offset += len(insert)\n\n    vertexdict = SetDict()\n    for j in range(L):\n        last = len(reflists[j]) - 1\n        for i in range(last+1): vertexdict[reflists[j][i]].update({reflists[j][i-1], reflists[j][(i+1) if i<last else 0]})\n    tt = timings.lap(\"B-makevertexdict\", tt)\n\n\n\n\n\n    minp = Point((inf, inf))\n    for (j, i) in vertexdict:\n        p = pointlists[j][i]\n        if p < minp: minp, minref = p, (j, i)\n    currentref = minref\n    currentp = start = minp\n    newpointlist = [currentp]\n    v1 = Point((0,1))\n    usedrefs ={(minref, v1)}\n    (j, i) = minref\n    startpoly = next(iter(ixlist[i].polyrefs)) if j == L else polylist[j]\n    for region in polyregions:\n        if startpoly in region:\n            boundaryregion = region\n            break\n    else:\n        boundaryregion = {startpoly}\n\n\n    while True:\n        maxangle = -pi\n        for (j, i) in vertexdict[currentref]:\n            p = pointlists[j][i]\n            v2 = p-currentp\n            angle = v2.anglefrom(v1)\n\n            if angle > maxangle: (maxangle, bestp, bestref) = (angle, p, (j, i))\n        if [currentp, bestp] == newpointlist[:2]: break\n        currentref = bestref\n        newpointlist.append(bestp)\n        v1 = bestp - currentp\n        currentp = bestp\n\n        if (currentref, v1) in usedrefs: break\n        usedrefs.add((currentref, v1))\n        (j, i) = currentref\n        yield 0.5 + 0.5*min(1, len(newpointlist)/len(vertexdict))\n\n    tt = timings.lap(\"B-constructboundary\", tt)\n\n    if currentp != start: return False\n    boundary = Polygon(newpointlist[:-1])\n    if not (len(polyregions) == 1 and len(boundaryregion) == L):\n        for poly in polylist:\n            if poly not in boundaryregion:\n\n                if relativeposition(boundary, poly) != Position.CONTAINS: return None\n                yield 1\n    timings.lap(\"B-checkunusedpolys\", tt)\n\n    return boundary\n", ["brySVG.timings", "math", "time"]], "brySVG.inputlog": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\nfrom collections import deque\nimport json\nimport time\nimport brySVG.timings as timings\n\nVERSION = 1\nHEADER = {\"format\":\"brySVG-input\", \"version\":VERSION}\nMOUSEEVENTS = (\"mousedown\", \"mousemove\", \"mouseup\", \"dblclick\")\nTOUCHEVENTS = (\"touchstart\", \"touchmove\", \"touchend\")\nEVENTTYPES = MOUSEEVENTS + TOUCHEVENTS + (\"wheel\", \"keydown\")\n\nHANDLERS = {\"mousedown\":\"_onMouseDown\", \"mousemove\":\"_onMouseMove\", \"mouseup\":\"_onLeftUp\", \"dblclick\":\"_onDoubleClick\",\n            \"touchstart\":\"_onTouchStart\", \"touchmove\":\"_onMouseMove\", \"touchend\":\"_onLeftUp\",\n            \"wheel\":\"_onWheel\", \"keydown\":\"_onKeyDown\"}\n\nclass InputRecorder(object):\n    ''\n\n\n    def __init__(self, maxevents=None):\n        self.maxevents = maxevents\n        self.events = deque(maxlen=maxevents)\n        self.starttime = None\n\n    def record(self, event):\n        ''\n        if self.starttime is None: self.starttime = event.timeStamp\n        entry = [round(event.timeStamp - self.starttime, 1), event.type, getattr(event.target, \"id\", \"\") or \"\"]\n        if event.type in TOUCHEVENTS:\n            entry.extend([_packtouches(event.touches), _packtouches(event.targetTouches), _packtouches(event.changedTouches)])\n        elif event.type == \"wheel\":\n            entry.extend([event.clientX, event.clientY, event.deltaY])\n        elif event.type == \"keydown\":\n            entry.extend([event.keyCode, event.key])\n        else:\n            entry.extend([event.clientX, event.clientY, event.button, event.buttons])\n        self.events.append(entry)\n\n    def clear(self):\n        ''\n        self.events.clear()\n        self.starttime = None\n\nclass ReplayEvent(object):\n    ''\n    def __init__(self, entry):\n        (self.timeStamp, self.type, targetid) = entry[:3]\n        self.target = _Target(targetid)\n        self.clientX = self.clientY = 0\n        self.button = self.buttons = 0\n        if self.type in TOUCHEVENTS:\n            (self.touches, self.targetTouches, self.changedTouches) = [_unpacktouches(touches) for touches in entry[3:6]]\n            if self.changedTouches: (self.clientX, self.clientY) = (self.changedTouches[0].clientX, self.changedTouches[0].clientY)\n        elif self.type == \"wheel\":\n            (self.clientX, self.clientY, self.deltaY) = entry[3:6]\n        elif self.type == \"keydown\":\n            (self.keyCode, self.key) = entry[3:5]\n        else:\n            (self.clientX, self.clientY, self.button, self.buttons) = entry[3:7]\n\n    def preventDefault(self):\n        pass\n\n    def stopPropagation(self):\n        pass\n\ndef replay(events, canvas):\n    ''\n\n\n\n    (latencies, summary) = ([], timings.Timings())\n    for entry in events:\n        handler = getattr(canvas, HANDLERS[entry[1]])\n        event = ReplayEvent(entry)\n        starttime = time.perf_counter()\n        handler(event)\n        elapsed = time.perf_counter() - starttime\n        latencies.append(elapsed*1000)\n        summary.record(entry[1], elapsed)\n    return (latencies, summary)\n\ndef dumps(events):\n    ''\n    return \"\\n\".join([json.dumps(HEADER)] + [json.dumps(entry, separators=(\",\", \":\")) for entry in events]) + \"\\n\"\n\ndef loads(data):\n    ''\n    lines = data.splitlines()\n    header = json.loads(lines[0]) if lines else None\n    if not isinstance(header, dict) or header.get(\"format\") != HEADER[\"format\"]: raise ValueError(\"Not a brySVG input log\")\n    if header.get(\"version\") != VERSION: raise ValueError(f\"Unsupported brySVG input log version: {header.get('version')}\")\n    return [json.loads(line) for line in lines[1:] if line.strip()]\n\nclass _Target(object):\n    ''\n    def __init__(self, targetid):\n        self.id = targetid\n\nclass _Touch(object):\n    ''\n    def __init__(self, identifier, clientX, clientY):\n        (self.identifier, self.clientX, self.clientY) = (identifier, clientX, clientY)\n\nclass _TouchList(list):\n    ''\n    @property\n    def length(self):\n        return len(self)\n\ndef _packtouches(touchlist):\n    ''\n    packed = []\n    for i in range(touchlist.length):\n        touch = touchlist[i]\n        packed.extend([touch.identifier, touch.clientX, touch.clientY])\n    return packed\n\ndef _unpacktouches(packed):\n    ''\n    return _TouchList(_Touch(*packed[i:i+3]) for i in range(0, len(packed), 3))\n", ["brySVG.timings", "collections", "json", "time"]], "brySVG.oplog": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\nimport json\nfrom collections import deque\n\nVERTEXOPS = (\"setvertices\", \"insertvertices\", \"deletevertices\")\nINVERSES = {\"insertvertices\":\"deletevertices\", \"deletevertices\":\"insertvertices\", \"addobject\":\"deleteobject\", \"deleteobject\":\"addobject\"}\n\nclass OperationLog(object):\n    ''\n\n\n\n\n    def __init__(self, maxentries=100):\n        self.undoStack = deque(maxlen=maxentries)\n        self.redoStack = deque(maxlen=maxentries)\n        self.listeners = []\n        self.depth = 0\n        self.pending = []\n\n    def addListener(self, callback):\n        ''\n\n        self.listeners.append(callback)\n\n    def removeListener(self, callback):\n        self.listeners.remove(callback)\n\n    def begin(self):\n        ''\n        self.depth += 1\n\n    def end(self):\n        self.depth = max(0, self.depth-1)\n        if self.depth == 0: self._commit()\n\n    def record(self, op):\n        ''\n        merged = merge(self.pending[-1], op) if self.pending else None\n        if merged is None:\n            self.pending.append(op)\n        else:\n            self.pending[-1] = merged\n        if self.depth == 0: self._commit()\n\n    def undo(self):\n        ''\n\n        self._commit()\n        if not self.undoStack: return None\n        entry = self.undoStack.pop()\n        self.redoStack.append(entry)\n        inverse = [invert(op) for op in reversed(entry)]\n        self._notify(inverse)\n        return inverse\n\n    def redo(self):\n        ''\n\n        self._commit()\n        if not self.redoStack: return None\n        entry = self.redoStack.pop()\n        self.undoStack.append(entry)\n        self._notify(entry)\n        return entry\n\n    def clear(self):\n        ''\n        self.undoStack.clear()\n        self.redoStack.clear()\n        self.pending = []\n\n    def _commit(self):\n        ''\n        if not self.pending: return\n        entry = self.pending\n        self.pending = []\n        self.redoStack.clear()\n        try:\n            for op in entry: invert(op)\n        except ValueError:\n            self.undoStack.clear()\n        else:\n            self.undoStack.append(entry)\n        self._notify(entry)\n\n    def _notify(self, entry):\n        ''\n        for callback in self.listeners: callback(entry)\n\ndef dumps(entry):\n    ''\n    return json.dumps(entry, separators=(\",\", \":\"))\n\ndef loads(line):\n    ''\n    return json.loads(line)\n\ndef invert(op):\n    ''\n    kind = op[\"op\"]\n    if kind == \"setvertices\":\n        return dict(op, changes=[[i, new, old] for (i, old, new) in op[\"changes\"]])\n    elif kind == \"transform\":\n        return dict(op, matrix=_invertmatrix(op[\"matrix\"]), angle=-op.get(\"angle\", 0))\n    return dict(op, op=INVERSES[kind])\n\ndef merge(first, second):\n    ''\n    if first[\"id\"] != second[\"id\"] or first[\"op\"] != second[\"op\"]: return None\n    if first[\"op\"] == \"setvertices\":\n        changes = {i:[old, new] for (i, old, new) in first[\"changes\"]}\n        for (i, old, new) in second[\"changes\"]:\n            if i in changes:\n                changes[i][1] = new\n            else:\n                changes[i] = [old, new]\n        return dict(first, changes=[[i, old, new] for (i, (old, new)) in changes.items()])\n    elif first[\"op\"] == \"transform\":\n        return dict(first, matrix=_multiply(second[\"matrix\"], first[\"matrix\"]), angle=first.get(\"angle\", 0)+second.get(\"angle\", 0))\n    return None\n\ndef vertexOp(kind, objid, before, after, start=0, count=0):\n    ''\n\n    if kind == \"setvertices\":\n        return {\"op\":kind, \"id\":objid, \"changes\":[[i, old, new] for (i, (old, new)) in enumerate(zip(before, after)) if old != new]}\n    (without, withvalues) = (before, after) if kind == \"insertvertices\" else (after, before)\n    changes = []\n    for (i, value) in enumerate(without):\n        j = i if i < start else i+count\n        if value != withvalues[j]: changes.append([j, value, withvalues[j]])\n    return {\"op\":kind, \"id\":objid, \"index\":start, \"values\":withvalues[start:start+count], \"changes\":changes}\n\ndef applyToVertices(vertices, op):\n    ''\n    kind = op[\"op\"]\n    if kind == \"setvertices\":\n        for (i, old, new) in op[\"changes\"]: vertices[i] = new\n    elif kind == \"insertvertices\":\n        vertices[op[\"index\"]:op[\"index\"]] = op[\"values\"]\n        for (i, without, withvalue) in op[\"changes\"]: vertices[i] = withvalue\n    else:\n        for (i, without, withvalue) in op[\"changes\"]: vertices[i] = without\n        del vertices[op[\"index\"]:op[\"index\"]+len(op[\"values\"])]\n\ndef _multiply(m1, m2):\n    ''\n    (a1, b1, c1, d1, e1, f1) = m1\n    (a2, b2, c2, d2, e2, f2) = m2\n    return [a1*a2+c1*b2, b1*a2+d1*b2, a1*c2+c1*d2, b1*c2+d1*d2, a1*e2+c1*f2+e1, b1*e2+d1*f2+f1]\n\ndef _invertmatrix(m):\n    ''\n    (a, b, c, d, e, f) = m\n    det = a*d - b*c\n    if det == 0: raise ValueError(\"Transform cannot be undone\")\n    return [d/det, -b/det, -c/det, a/det, (c*f-d*e)/det, (b*e-a*f)/det]\n", ["collections", "json"]], "brySVG.scene": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\nimport json\nimport struct\n\nVERSION = 1\nMAGIC = b\"bSVG\"\nHEADER = {\"format\":\"brySVG\", \"version\":VERSION}\nCOORDKEYS = (\"points\", \"boundary\")\n\ndef dumps(records, binary=False):\n    ''\n    if binary:\n        return MAGIC + struct.pack(\"<H\", VERSION) + b\"\".join(_binaryframe(record) for record in records)\n    return \"\\n\".join([json.dumps(HEADER)] + [_jsonline(record) for record in records]) + \"\\n\"\n\ndef dump(records, fp, binary=False):\n    ''\n\n    if binary:\n        fp.write(MAGIC + struct.pack(\"<H\", VERSION))\n        for record in records: fp.write(_binaryframe(record))\n    else:\n        fp.write(json.dumps(HEADER) + \"\\n\")\n        for record in records: fp.write(_jsonline(record) + \"\\n\")\n\ndef loads(data):\n    ''\n    if isinstance(data, (bytes, bytearray)):\n        if data[:4] != MAGIC: return loads(data.decode(\"utf-8\"))\n        _checklength(data, 6)\n        _checkversion(struct.unpack_from(\"<H\", data, 4)[0])\n        records = []\n        offset = 6\n        while offset < len(data):\n            (record, offset) = _readframe(data, offset)\n            records.append(record)\n        return records\n    lines = data.splitlines()\n    if not lines: raise ValueError(\"Empty scene\")\n    _checkheader(lines[0])\n    return [json.loads(line) for line in lines[1:] if line.strip()]\n\ndef load(fp):\n    ''\n\n    start = fp.read(len(MAGIC))\n    if start == MAGIC:\n        _checkversion(struct.unpack(\"<H\", _read(fp, 2))[0])\n        while True:\n            lengths = fp.read(4)\n            if not lengths: return\n            if len(lengths) < 4: raise ValueError(\"Truncated brySVG scene\")\n            (jsonlength,) = struct.unpack(\"<I\", lengths)\n            record = json.loads(_read(fp, jsonlength).decode(\"utf-8\"))\n            (floatcount,) = struct.unpack(\"<I\", _read(fp, 4))\n            floats = struct.unpack(f\"<{floatcount}d\", _read(fp, 8*floatcount))\n            _restorecoords(record, iter(floats))\n            yield record\n    else:\n        rest = fp.readline()\n        if isinstance(start, bytes): (start, rest) = (start.decode(\"utf-8\"), rest.decode(\"utf-8\"))\n        _checkheader(start + rest)\n        for line in fp:\n            if isinstance(line, bytes): line = line.decode(\"utf-8\")\n            if line.strip(): yield json.loads(line)\n\ndef _jsonline(record):\n    ''\n    return json.dumps(record, separators=(\",\", \":\"))\n\ndef _binaryframe(record):\n    ''\n    floats = []\n    header = json.dumps(_extractcoords(record, floats), separators=(\",\", \":\")).encode(\"utf-8\")\n    return struct.pack(\"<I\", len(header)) + header + struct.pack(f\"<I{len(floats)}d\", len(floats), *floats)\n\ndef _readframe(data, offset):\n    ''\n\n    _checklength(data, offset+4)\n    (jsonlength,) = struct.unpack_from(\"<I\", data, offset)\n    offset += 4\n    _checklength(data, offset+jsonlength+4)\n    record = json.loads(bytes(data[offset:offset+jsonlength]).decode(\"utf-8\"))\n    offset += jsonlength\n    (floatcount,) = struct.unpack_from(\"<I\", data, offset)\n    offset += 4\n    _checklength(data, offset+8*floatcount)\n    floats = struct.unpack_from(f\"<{floatcount}d\", data, offset)\n    _restorecoords(record, iter(floats))\n    return (record, offset + 8*floatcount)\n\ndef _extractcoords(record, floats):\n    ''\n\n    newrecord = dict(record)\n    for key in COORDKEYS:\n        if key in record:\n            floats.extend(record[key])\n            newrecord[key] = len(record[key])\n    if \"objects\" in record:\n        newrecord[\"objects\"] = [_extractcoords(member, floats) for member in record[\"objects\"]]\n    return newrecord\n\ndef _restorecoords(record, floats):\n    ''\n    for key in COORDKEYS:\n        if key in record:\n            record[key] = [next(floats) for i in range(record[key])]\n    for member in record.get(\"objects\", []):\n        _restorecoords(member, floats)\n\ndef _read(fp, size):\n    ''\n    data = fp.read(size)\n    if len(data) < size: raise ValueError(\"Truncated brySVG scene\")\n    return data\n\ndef _checklength(data, end):\n    ''\n    if len(data) < end: raise ValueError(\"Truncated brySVG scene\")\n\ndef _checkheader(line):\n    ''\n    try:\n        header = json.loads(line)\n    except ValueError:\n        header = None\n    if not isinstance(header, dict) or header.get(\"format\") != HEADER[\"format\"]:\n        raise ValueError(\"Not a brySVG scene\")\n    _checkversion(header.get(\"version\"))\n\ndef _checkversion(version):\n    ''\n    if version != VERSION: raise ValueError(f\"Unsupported brySVG scene version: {version}\")\n", ["json", "struct"]], "brySVG.svgexport": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\nfrom math import sin, cos, atan2, pi, hypot, sqrt\nimport io\nimport brySVG.flatten as flatten\n\nSVGHEADER = '<svg xmlns=\"http://www.w3.org/2000/svg\" xmlns:xlink=\"http://www.w3.org/1999/xlink\"'\n\ndef write(records, fp, viewbox=None, width=None, height=None):\n    ''\n\n\n    header = SVGHEADER\n    if viewbox:\n        ((x1, y1), (x2, y2)) = viewbox\n        header += f' viewBox=\"{x1} {y1} {x2-x1} {y2-y1}\"'\n    if width is not None: header += f' width=\"{width}\"'\n    if height is not None: header += f' height=\"{height}\"'\n    fp.write(header + \">\\n\")\n    for record in records:\n        _writerecord(record, fp)\n    fp.write(\"</svg>\\n\")\n\ndef tostring(records, viewbox=None, width=None, height=None):\n    ''\n    fp = io.StringIO()\n    write(records, fp, viewbox, width, height)\n    return fp.getvalue()\n\ndef boundingBox(records):\n    ''\n\n\n\n    box = None\n    for record in records:\n        box = _unionbox(box, _recordbox(record))\n    return box\n\ndef fitViewBox(records):\n    ''\n\n\n    box = boundingBox(records)\n    if box is None: return None\n    ((x1, y1), (x2, y2)) = box\n    (width, height) = (x2-x1, y2-y1)\n    if width == 0 or height == 0: return None\n    (wmargin, hmargin) = (width/50, height/50)\n    return ((x1-wmargin, y1-hmargin), (x2+wmargin, y2+hmargin))\n\ndef _recordbox(record):\n    ''\n\n    objtype = record[\"type\"]\n    if objtype == \"element\": return None\n    if \"transform\" in record:\n        return _transformbox(_recordbox({key:value for (key, value) in record.items() if key != \"transform\"}), record[\"transform\"])\n    if \"objects\" in record:\n        return boundingBox(record[\"objects\"])\n    c = record.get(\"points\", [])\n    points = [(c[i], c[i+1]) for i in range(0, len(c)-1, 2)]\n    if objtype in (\"line\", \"polygon\", \"polyline\"):\n        return flatten.boundingBox(points) if points else None\n    elif objtype in (\"circle\", \"point\"):\n        r = hypot(c[2]-c[0], c[3]-c[1]) if objtype == \"circle\" else record[\"size\"]\n        return ((c[0]-r, c[1]-r), (c[0]+r, c[1]+r))\n    elif objtype == \"sector\":\n        ((cx, cy), start, end) = (points[0], points[1], points[-1])\n        r = hypot(start[0]-cx, start[1]-cy)\n        startangle = atan2(start[1]-cy, start[0]-cx)\n        sweep = (atan2(end[1]-cy, end[0]-cx) - startangle) % (2*pi)\n        extremes = [(cx + r*cos(angle), cy + r*sin(angle)) for angle in (0, pi/2, pi, 3*pi/2) if (angle-startangle) % (2*pi) <= sweep]\n        return flatten.boundingBox([(cx, cy), start, end] + extremes)\n    elif objtype in (\"bezier\", \"smoothbezier\", \"closedbezier\", \"smoothclosedbezier\"):\n        if objtype in (\"closedbezier\", \"smoothclosedbezier\"): points = points[1:] + points[:2]\n        curve = [points[0]]\n        for i in range(1, len(points)-2, 3):\n            curve.extend(flatten.flattenCubic(points[i-1], points[i], points[i+1], points[i+2]))\n        return flatten.boundingBox(curve)\n    elif objtype == \"use\":\n        (cx, cy) = record[\"centre\"]\n        return _rotatedbox(cx, cy, record[\"width\"]/2, record[\"height\"]/2, record[\"angle\"])\n    elif objtype in (\"rectangle\", \"ellipse\", \"image\"):\n        ((x1, y1), (x2, y2), cx, cy) = _unrotatedbox(c, record[\"angle\"])\n        (rx, ry) = (abs(x2-x1)/2, abs(y2-y1)/2)\n        if objtype == \"ellipse\":\n            (cosa, sina) = (cos(record[\"angle\"]*pi/180), sin(record[\"angle\"]*pi/180))\n            (halfwidth, halfheight) = (sqrt((rx*cosa)**2 + (ry*sina)**2), sqrt((rx*sina)**2 + (ry*cosa)**2))\n            return ((cx-halfwidth, cy-halfheight), (cx+halfwidth, cy+halfheight))\n        return _rotatedbox(cx, cy, rx, ry, record[\"angle\"])\n    raise ValueError(f\"Cannot export objects of type {objtype}\")\n\ndef _rotatedbox(cx, cy, rx, ry, angle):\n    ''\n\n    (c, s) = (abs(cos(angle*pi/180)), abs(sin(angle*pi/180)))\n    (halfwidth, halfheight) = (rx*c + ry*s, rx*s + ry*c)\n    return ((cx-halfwidth, cy-halfheight), (cx+halfwidth, cy+halfheight))\n\ndef _transformbox(box, m):\n    ''\n    if box is None: return None\n    (a, b, c, d, e, f) = m\n    ((x1, y1), (x2, y2)) = box\n    return flatten.boundingBox([(a*x + c*y + e, b*x + d*y + f) for (x, y) in ((x1, y1), (x2, y1), (x2, y2), (x1, y2))])\n\ndef _unionbox(box1, box2):\n    ''\n    if box1 is None: return box2\n    if box2 is None: return box1\n    (((L1, T1), (R1, B1)), ((L2, T2), (R2, B2))) = (box1, box2)\n    return ((min(L1, L2), min(T1, T2)), (max(R1, R2), max(B1, B2)))\n\ndef _writerecord(record, fp):\n    ''\n    objtype = record[\"type\"]\n    if objtype == \"element\":\n        attrs = record[\"attrs\"]\n        if \"id\" in record: attrs = dict(attrs, id=record[\"id\"])\n        fp.write(f'<{record[\"tag\"]}{_attrstring(attrs)}>{record[\"content\"]}</{record[\"tag\"]}>\\n')\n        return\n    common = \"\"\n    if \"id\" in record: common += f' id=\"{_escape(record[\"id\"])}\"'\n    style = record.get(\"style\")\n    if style: common += ' style=\"' + _escape(\";\".join(f\"{name}:{value}\" for (name, value) in style.items())) + '\"'\n    matrix = record.get(\"transform\")\n    matrix = \"matrix({},{},{},{},{},{})\".format(*matrix) if matrix else \"\"\n    if \"objects\" in record:\n        if matrix: common += f' transform=\"{matrix}\"'\n        fp.write(f\"<g{common}>\\n\")\n        for member in record[\"objects\"]:\n            _writerecord(member, fp)\n        fp.write(\"</g>\\n\")\n        return\n    (tag, geometry, transform) = _geometry(objtype, record)\n    transform = \" \".join(t for t in (matrix, transform) if t)\n    if transform: geometry += f' transform=\"{transform}\"'\n    fp.write(f\"<{tag}{common} {geometry}/>\\n\")\n\ndef _geometry(objtype, record):\n    ''\n\n    c = record.get(\"points\", [])\n    if objtype == \"line\":\n        return (\"line\", f'x1=\"{c[0]}\" y1=\"{c[1]}\" x2=\"{c[2]}\" y2=\"{c[3]}\"', \"\")\n    elif objtype in (\"polygon\", \"polyline\"):\n        return (objtype, 'points=\"' + \" \".join(f\"{c[i]},{c[i+1]}\" for i in range(0, len(c), 2)) + '\"', \"\")\n    elif objtype == \"circle\":\n        return (\"circle\", f'cx=\"{c[0]}\" cy=\"{c[1]}\" r=\"{hypot(c[2]-c[0], c[3]-c[1])}\"', \"\")\n    elif objtype == \"point\":\n        return (\"circle\", f'cx=\"{c[0]}\" cy=\"{c[1]}\" r=\"{record[\"size\"]}\"', \"\")\n    elif objtype == \"sector\":\n        r = hypot(c[2]-c[0], c[3]-c[1])\n        largearcflag = 1 if (record[\"endangle\"] - record[\"startangle\"]) % 360 > 180 else 0\n        return (\"path\", f'd=\"M {c[0]} {c[1]} L {c[2]} {c[3]} A {r} {r} 0 {largearcflag} 1 {c[-2]} {c[-1]} Z\"', \"\")\n    elif objtype in (\"bezier\", \"smoothbezier\"):\n        return (\"path\", f'd=\"M {c[0]} {c[1]} C ' + \" \".join(str(x) for x in c[2:]) + '\"', \"\")\n    elif objtype in (\"closedbezier\", \"smoothclosedbezier\"):\n        return (\"path\", f'd=\"M {c[2]} {c[3]} C {c[4]} {c[5]} ' + \" \".join(str(x) for x in c[6:]) + f' {c[0]} {c[1]} {c[2]} {c[3]}\"', \"\")\n    elif objtype == \"use\":\n        (cx, cy) = record[\"centre\"]\n        (x, y) = record[\"origin\"]\n        (xscale, yscale) = record[\"scale\"]\n        href = _escape(record[\"href\"])\n        return (\"use\", f'href=\"{href}\" xlink:href=\"{href}\" x=\"{x}\" y=\"{y}\"',\n                f'rotate({record[\"angle\"]},{cx},{cy}) translate({cx},{cy}) scale({xscale},{yscale}) translate({-cx},{-cy})')\n    elif objtype in (\"rectangle\", \"ellipse\", \"image\"):\n        ((x1, y1), (x2, y2), cx, cy) = _unrotatedbox(c, record[\"angle\"])\n        rotate = f'rotate({record[\"angle\"]},{cx},{cy})' if record[\"angle\"] else \"\"\n        (width, height) = (abs(x2-x1), abs(y2-y1))\n        if objtype == \"ellipse\":\n            return (\"ellipse\", f'cx=\"{cx}\" cy=\"{cy}\" rx=\"{width/2}\" ry=\"{height/2}\"', rotate)\n        box = f'x=\"{min(x1, x2)}\" y=\"{min(y1, y2)}\" width=\"{width}\" height=\"{height}\"'\n        if objtype == \"image\":\n            href = _escape(record[\"href\"])\n            return (\"image\", f'href=\"{href}\" xlink:href=\"{href}\" preserveAspectRatio=\"none\" ' + box, rotate)\n        return (\"rect\", box, rotate)\n    raise ValueError(f\"Cannot export objects of type {objtype}\")\n\ndef _unrotatedbox(coords, angle):\n    ''\n\n    (x1, y1, x2, y2) = coords[:4]\n    (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n    if not angle: return ((x1, y1), (x2, y2), cx, cy)\n    (c, s) = (cos(angle*pi/180), sin(angle*pi/180))\n    corners = [(cx + c*(x-cx) + s*(y-cy), cy - s*(x-cx) + c*(y-cy)) for (x, y) in ((x1, y1), (x2, y2))]\n    return (corners[0], corners[1], cx, cy)\n\ndef _attrstring(attrs):\n    ''\n    return \"\".join(f' {key}=\"{_escape(str(value))}\"' for (key, value) in attrs.items())\n\ndef _escape(value):\n    ''\n    return value.replace(\"&\", \"&amp;\").replace(\"<\", \"&lt;\").replace('\"', \"&quot;\")\n", ["brySVG.flatten", "io", "math"]], "brySVG.svgimport": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\nimport re\nfrom math import sin, cos, tan, atan2, pi, hypot\nimport xml.etree.ElementTree as ElementTree\nimport brySVG.pathdata as pathdata\n\nCHUNKSIZE = 1 << 16\nIDENTITY = (1, 0, 0, 1, 0, 0)\nSKIPPED = {\"defs\", \"symbol\", \"clipPath\", \"mask\", \"pattern\", \"marker\", \"linearGradient\", \"radialGradient\", \"filter\",\n           \"style\", \"script\", \"title\", \"desc\", \"metadata\"}\nGROUPS = {\"svg\", \"g\", \"a\", \"switch\"}\nSHAPES = {\"polygon\", \"polyline\", \"line\", \"rect\", \"ellipse\", \"circle\", \"path\", \"image\"}\nINHERITED = {\"fill\", \"fill-opacity\", \"fill-rule\", \"stroke\", \"stroke-width\", \"stroke-opacity\", \"stroke-dasharray\",\n             \"stroke-dashoffset\", \"stroke-linecap\", \"stroke-linejoin\", \"stroke-miterlimit\", \"font-family\", \"font-size\",\n             \"font-style\", \"font-weight\", \"text-anchor\", \"visibility\", \"color\"}\nPRESENTATION = INHERITED | {\"opacity\", \"display\"}\nDEFAULTSTYLE = {\"fill\":\"black\", \"stroke\":\"none\", \"stroke-width\":\"1\"}\nNUMBER = re.compile(r\"[-+]?(?:\\d+\\.?\\d*|\\.\\d+)(?:[eE][-+]?\\d+)?\")\nTRANSFORM = re.compile(r\"(matrix|translate|scale|rotate|skewX|skewY)\\s*\\(([^)]*)\\)\")\n\nclass Frame(object):\n    ''\n    def __init__(self, element, tag, attrs, matrix=IDENTITY, childmatrix=IDENTITY, style={}, members=None, skip=False, intext=False):\n        self.element = element\n        self.tag = tag\n        self.attrs = attrs\n        self.matrix = matrix\n        self.childmatrix = childmatrix\n        self.style = style\n        self.members = members\n        self.skip = skip\n        self.intext = intext\n\ndef records(fp, flatten=True, keepgroups=True, chunksize=CHUNKSIZE):\n    ''\n\n\n\n\n    parser = ElementTree.XMLPullParser((\"start\", \"end\"))\n    stack = []\n    while True:\n        chunk = fp.read(chunksize)\n        if chunk:\n            parser.feed(chunk)\n        else:\n            parser.close()\n        for (event, element) in parser.read_events():\n            if event == \"start\":\n                stack.append(_startframe(element, stack[-1] if stack else None, flatten, keepgroups))\n                continue\n            frame = stack.pop()\n            record = None if frame.skip else _endrecord(frame, element, flatten)\n            if not frame.intext:\n                element.clear()\n                if stack: stack[-1].element.remove(element)\n            if record is None: continue\n            parent = next((f for f in reversed(stack) if f.members is not None), None)\n            if parent is None:\n                yield record\n            else:\n                parent.members.append(record)\n        if not chunk: return\n\ndef fromstring(text, flatten=True, keepgroups=True):\n    ''\n    import io\n    fp = io.BytesIO(text) if isinstance(text, bytes) else io.StringIO(text)\n    return list(records(fp, flatten, keepgroups))\n\ndef shapeForTransform(record, m):\n    ''\n\n\n\n\n\n\n    objtype = record[\"type\"]\n    if _similarity(m) or objtype not in (\"rectangle\", \"ellipse\", \"circle\", \"image\"): return (record, m)\n    (a, b, c, d, e, f) = m\n    if objtype == \"image\":\n        (xscale, theta) = (hypot(a, b), atan2(b, a))\n        yscale = (a*d - b*c)/xscale\n        return (record, (xscale*cos(theta), xscale*sin(theta), -yscale*sin(theta), yscale*cos(theta), e, f))\n    record = dict(record)\n    angle = record.pop(\"angle\", 0)\n    if objtype == \"rectangle\":\n        (x1, y1, x2, y2, cx, cy) = _unrotatedbox(record[\"points\"], angle)\n        points = [x1, y1, x2, y1, x2, y2, x1, y2]\n        record[\"type\"] = \"polygon\"\n    else:\n        if objtype == \"circle\":\n            points = _ellipsepoints(record[\"points\"], objtype)\n        else:\n            (x1, y1, x2, y2, cx, cy) = _unrotatedbox(record[\"points\"], angle)\n            points = _ellipsepoints([x1, y1, x2, y2], objtype)\n        record[\"type\"] = \"closedbezier\"\n    if angle and objtype != \"circle\":\n        (cosa, sina) = (cos(angle*pi/180), sin(angle*pi/180))\n        points = [value for i in range(0, len(points), 2)\n                  for value in (cx + cosa*(points[i]-cx) - sina*(points[i+1]-cy), cy + sina*(points[i]-cx) + cosa*(points[i+1]-cy))]\n    record[\"points\"] = points\n    return (record, m)\n\ndef _startframe(element, parent, flatten, keepgroups):\n    ''\n    tag = _localname(element.tag)\n    attrs = {_localname(key):value for (key, value) in element.attrib.items()}\n    if parent is not None and (parent.tag == \"text\" or parent.intext):\n        return Frame(element, tag, attrs, skip=True, intext=True)\n    if (parent is not None and parent.skip) or tag in SKIPPED or not (tag in GROUPS or tag in SHAPES or tag == \"text\"):\n        return Frame(element, tag, attrs, skip=True)\n\n    style = dict(DEFAULTSTYLE) if parent is None else {name:value for (name, value) in parent.style.items() if name in INHERITED}\n    for name in PRESENTATION:\n        if name in attrs: style[name] = attrs[name]\n    for declaration in attrs.get(\"style\", \"\").split(\";\"):\n        if \":\" in declaration:\n            (name, value) = declaration.split(\":\", 1)\n            style[name.strip()] = value.strip()\n    inherited = IDENTITY if parent is None else parent.childmatrix\n    matrix = _multiply(inherited, _parsetransform(attrs.get(\"transform\", \"\")))\n    keep = keepgroups and tag in GROUPS and parent is not None\n\n    childmatrix = IDENTITY if (keep and not flatten) else matrix\n    return Frame(element, tag, attrs, matrix, childmatrix, style, [] if keep else None)\n\ndef _endrecord(frame, element, flatten):\n    ''\n    tag, attrs, matrix = frame.tag, frame.attrs, frame.matrix\n    if tag in GROUPS:\n        if frame.members is None or not frame.members: return None\n        record = {\"type\":\"group\", \"objects\":frame.members}\n        ownstyle = {name:frame.style[name] for name in (\"opacity\", \"display\") if name in frame.style}\n        if ownstyle: record[\"style\"] = ownstyle\n        if not flatten and matrix != IDENTITY: record[\"transform\"] = list(matrix)\n    elif tag == \"text\":\n        textattrs = {key:value for (key, value) in attrs.items() if key not in PRESENTATION and key not in (\"id\", \"style\", \"transform\")}\n        textattrs[\"style\"] = \";\".join(f\"{name}:{value}\" for (name, value) in frame.style.items())\n        if matrix != IDENTITY: textattrs[\"transform\"] = \"matrix({},{},{},{},{},{})\".format(*matrix)\n        content = \"\".join(element.itertext()).replace(\"&\", \"&amp;\").replace(\"<\", \"&lt;\")\n        record = {\"type\":\"element\", \"tag\":\"text\", \"attrs\":textattrs, \"content\":content}\n    else:\n        records = _shaperecords(tag, attrs)\n        if not records: return None\n        for record in records:\n            record[\"style\"] = dict(frame.style)\n            if matrix != IDENTITY:\n                if flatten:\n                    _transformrecord(record, matrix)\n                else:\n                    record[\"transform\"] = list(matrix)\n        record = records[0] if len(records) == 1 else {\"type\":\"group\", \"objects\":records}\n    if \"id\" in attrs: record[\"id\"] = attrs[\"id\"]\n    return record\n\ndef _shaperecords(tag, attrs):\n    ''\n    def number(name, default=0):\n        match = NUMBER.match(attrs.get(name, \"\").strip())\n        return float(match.group()) if match else default\n    if tag in (\"polygon\", \"polyline\"):\n        coords = [float(x) for x in NUMBER.findall(attrs.get(\"points\", \"\"))]\n        if len(coords) < 4: return []\n        return [{\"type\":tag, \"points\":coords[:len(coords)//2*2]}]\n    elif tag == \"line\":\n        return [{\"type\":\"line\", \"points\":[number(\"x1\"), number(\"y1\"), number(\"x2\"), number(\"y2\")]}]\n    elif tag in (\"rect\", \"image\"):\n        (x, y, width, height) = (number(\"x\"), number(\"y\"), number(\"width\"), number(\"height\"))\n        if tag == \"image\":\n            href = attrs.get(\"href\")\n            if not href: return []\n            return [{\"type\":\"image\", \"href\":href, \"points\":[x, y, x+width, y+height], \"angle\":0}]\n        return [{\"type\":\"rectangle\", \"points\":[x, y, x+width, y+height], \"angle\":0}]\n    elif tag == \"ellipse\":\n        (cx, cy, rx, ry) = (number(\"cx\"), number(\"cy\"), number(\"rx\"), number(\"ry\"))\n        return [{\"type\":\"ellipse\", \"points\":[cx-rx, cy-ry, cx+rx, cy+ry], \"angle\":0}]\n    elif tag == \"circle\":\n        (cx, cy, r) = (number(\"cx\"), number(\"cy\"), number(\"r\"))\n        return [{\"type\":\"circle\", \"points\":[cx, cy, cx+r, cy]}]\n    elif tag == \"path\":\n        return _pathrecords(attrs.get(\"d\", \"\"))\n    return []\n\ndef _pathrecords(d):\n    ''\n    records = []\n    for (vertices, controls, closed) in pathdata.subpaths(d):\n        if len(vertices) < 2: continue\n        if all(control is None for control in controls):\n            records.append({\"type\":\"polygon\" if closed else \"polyline\", \"points\":[coord for vertex in vertices for coord in vertex]})\n            continue\n        pointsetlist = pathdata.toPointsetList(vertices, controls, closed)\n        coords = [coord for pointset in pointsetlist for point in pointset if point is not None for coord in point]\n        records.append({\"type\":\"closedbezier\" if closed else \"bezier\", \"points\":coords})\n    return records\n\ndef _transformrecord(record, m):\n    ''\n\n    coords = record[\"points\"]\n    objtype = record[\"type\"]\n    (a, b, c, d, e, f) = m\n    if objtype in (\"rectangle\", \"ellipse\", \"image\", \"circle\") and not _similarity(m):\n        if objtype == \"image\":\n            record[\"transform\"] = list(m)\n            return\n        elif objtype == \"rectangle\":\n            (x1, y1, x2, y2) = coords\n            record.update({\"type\":\"polygon\", \"points\":[x1, y1, x2, y1, x2, y2, x1, y2]})\n            del record[\"angle\"]\n        else:\n            record.update({\"type\":\"closedbezier\", \"points\":_ellipsepoints(coords, objtype)})\n            record.pop(\"angle\", None)\n        coords = record[\"points\"]\n    elif objtype in (\"rectangle\", \"ellipse\", \"image\"):\n        record[\"angle\"] = record.get(\"angle\", 0) + atan2(b, a)*180/pi\n    record[\"points\"] = [value for i in range(0, len(coords), 2)\n                        for value in (a*coords[i] + c*coords[i+1] + e, b*coords[i] + d*coords[i+1] + f)]\n\ndef _similarity(m):\n    ''\n    (a, b, c, d, e, f) = m\n    return abs(a-d) < 1e-9 and abs(b+c) < 1e-9\n\ndef _unrotatedbox(coords, angle):\n    ''\n\n\n    (x1, y1, x2, y2) = coords[:4]\n    (cx, cy) = ((x1+x2)/2, (y1+y2)/2)\n    if not angle: return (x1, y1, x2, y2, cx, cy)\n    (cosa, sina) = (cos(angle*pi/180), sin(angle*pi/180))\n    (x1, y1, x2, y2) = [value for (x, y) in ((x1, y1), (x2, y2)) for value in (cx + cosa*(x-cx) + sina*(y-cy), cy - sina*(x-cx) + cosa*(y-cy))]\n    return (x1, y1, x2, y2, cx, cy)\n\ndef _ellipsepoints(coords, objtype):\n    ''\n\n    if objtype == \"circle\":\n        (cx, cy) = coords[:2]\n        rx = ry = hypot(coords[2]-cx, coords[3]-cy)\n    else:\n        (cx, cy, rx, ry) = ((coords[0]+coords[2])/2, (coords[1]+coords[3])/2, abs(coords[2]-coords[0])/2, abs(coords[3]-coords[1])/2)\n    k = 0.5522847498\n    points = []\n    for (ux, uy) in ((0, -1), (1, 0), (0, 1), (-1, 0)):\n        (vx, vy) = (cx+rx*ux, cy+ry*uy)\n        points += [vx+k*rx*uy, vy-k*ry*ux, vx, vy, vx-k*rx*uy, vy+k*ry*ux]\n    return points\n\ndef _parsetransform(transform):\n    ''\n    matrix = IDENTITY\n    for (name, argstring) in TRANSFORM.findall(transform):\n        args = [float(x) for x in NUMBER.findall(argstring)]\n        if name == \"matrix\" and len(args) == 6:\n            m = tuple(args)\n        elif name == \"translate\" and args:\n            m = (1, 0, 0, 1, args[0], args[1] if len(args) > 1 else 0)\n        elif name == \"scale\" and args:\n            m = (args[0], 0, 0, args[1] if len(args) > 1 else args[0], 0, 0)\n        elif name == \"rotate\" and args:\n            (s, c) = (sin(args[0]*pi/180), cos(args[0]*pi/180))\n            (x, y) = args[1:3] if len(args) == 3 else (0, 0)\n            m = (c, s, -s, c, x - c*x + s*y, y - s*x - c*y)\n        elif name == \"skewX\" and args:\n            m = (1, 0, tan(args[0]*pi/180), 1, 0, 0)\n        elif name == \"skewY\" and args:\n            m = (1, tan(args[0]*pi/180), 0, 1, 0, 0)\n        else:\n            continue\n        matrix = _multiply(matrix, m)\n    return matrix\n\ndef _multiply(m1, m2):\n    ''\n    if m2 == IDENTITY: return m1\n    if m1 == IDENTITY: return m2\n    (a1, b1, c1, d1, e1, f1) = m1\n    (a2, b2, c2, d2, e2, f2) = m2\n    return (a1*a2 + c1*b2, b1*a2 + d1*b2, a1*c2 + c1*d2, b1*c2 + d1*d2, a1*e2 + c1*f2 + e1, b1*e2 + d1*f2 + f1)\n\ndef _localname(name):\n    ''\n    return name.rsplit(\"}\", 1)[-1]\n", ["brySVG.pathdata", "io", "math", "re", "xml.etree.ElementTree"]], "brySVG.textlayout": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\nimport brySVG.textmetrics as textmetrics\n\nclass TextLayout(object):\n    ''\n\n\n\n\n\n\n\n\n\n\n\n    def __init__(self, lines, anchorpoint=(0,0), anchorposition=1, fontsize=12, lineheight=None):\n        (x, y) = anchorpoint\n        if lineheight is None: lineheight = fontsize*1.2\n        self.lines = list(lines)\n        (self.fontsize, self.lineheight) = (fontsize, lineheight)\n        if anchorposition in [3, 6, 9]:\n            self.textanchor = \"end\"\n        elif anchorposition in [2, 5, 8]:\n            self.textanchor = \"middle\"\n        else:\n            self.textanchor = \"start\"\n        rowcount = len(self.lines)\n        if anchorposition in [1, 2, 3]:\n            yoffset = fontsize\n        elif anchorposition in [4, 5, 6]:\n            yoffset = fontsize - lineheight*rowcount/2\n        else:\n            yoffset = fontsize - lineheight*rowcount\n        (self.x, self.y) = (x, y+yoffset)\n        self.baselines = [self.y + i*lineheight for i in range(rowcount)]\n\n    def lineBoxes(self, metrics):\n        ''\n        boxes = []\n        for (line, baseline) in zip(self.lines, self.baselines):\n            width = metrics.textWidth(line, self.fontsize)\n            if self.textanchor == \"end\":\n                left = self.x - width\n            elif self.textanchor == \"middle\":\n                left = self.x - width/2\n            else:\n                left = self.x\n            top = baseline - self.fontsize\n            boxes.append(((left, top), (left+width, top+self.lineheight)))\n        return boxes\n\n    def bbox(self, metrics):\n        ''\n        boxes = self.lineBoxes(metrics)\n        if not boxes: return ((self.x, self.y-self.fontsize), (self.x, self.y-self.fontsize))\n        left = min(box[0][0] for box in boxes)\n        right = max(box[1][0] for box in boxes)\n        return ((left, boxes[0][0][1]), (right, boxes[-1][1][1]))\n\ndef layout(string, anchorpoint=(0,0), anchorposition=1, fontsize=12, lineheight=None, width=None, metrics=None):\n    ''\n\n\n    lines = string.split(\"\\n\")\n    if width is not None:\n        if metrics is None: metrics = textmetrics.getMetrics()\n        lines = [wrapped for line in lines for wrapped in (textmetrics.wrap(line, width, fontsize, metrics) or [\"\"])]\n    return TextLayout(lines, anchorpoint, anchorposition, fontsize, lineheight)\n", ["brySVG.textmetrics"]], "brySVG.textmetrics": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\nfrom bisect import bisect_right\n\nREFERENCESIZE = 100\nDEFAULTADVANCE = 0.556\n\n\nHEADLESSADVANCES = dict(zip(\" !\\\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\\\]^_`abcdefghijklmnopqrstuvwxyz{|}~\",\n    [0.278, 0.278, 0.355, 0.556, 0.556, 0.889, 0.667, 0.191, 0.333, 0.333, 0.389, 0.584, 0.278, 0.333, 0.278, 0.278,\n    0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.278, 0.278, 0.584, 0.584, 0.584, 0.556,\n    1.015, 0.667, 0.667, 0.722, 0.722, 0.667, 0.611, 0.778, 0.722, 0.278, 0.5, 0.667, 0.556, 0.833, 0.722, 0.778,\n    0.667, 0.778, 0.722, 0.667, 0.611, 0.722, 0.667, 0.944, 0.667, 0.667, 0.611, 0.278, 0.278, 0.278, 0.469, 0.556,\n    0.333, 0.556, 0.556, 0.5, 0.556, 0.556, 0.278, 0.556, 0.556, 0.222, 0.222, 0.5, 0.222, 0.833, 0.556, 0.556,\n    0.556, 0.556, 0.333, 0.5, 0.278, 0.556, 0.5, 0.722, 0.5, 0.5, 0.5, 0.334, 0.26, 0.334, 0.584]))\n\n_metrics = {}\n\nclass FontMetrics(object):\n    ''\n\n\n    def __init__(self, measure=None):\n        self.measure = measure\n        self.advances = {}\n\n    def advance(self, char):\n        ''\n        try:\n            return self.advances[char]\n        except KeyError:\n            self._measurechars(char)\n            return self.advances.get(char, HEADLESSADVANCES.get(char, DEFAULTADVANCE))\n\n    def textWidth(self, string, fontsize):\n        ''\n        self._measurechars(string)\n        advances = self.advances\n        return fontsize*sum(advances.get(char, HEADLESSADVANCES.get(char, DEFAULTADVANCE)) for char in string)\n\n    def _measurechars(self, string):\n        ''\n\n        advances = self.advances\n        newchars = \"\".join(set(string).difference(advances))\n        if not newchars: return\n        if self.measure is None:\n            for char in newchars: advances[char] = HEADLESSADVANCES.get(char, DEFAULTADVANCE)\n            return\n        widths = self.measure(newchars)\n        if widths is None: return\n        for (char, width) in zip(newchars, widths): advances[char] = width/REFERENCESIZE\n\ndef getMetrics(font=\"\", measure=None):\n    ''\n    try:\n        return _metrics[font]\n    except KeyError:\n        metrics = _metrics[font] = FontMetrics(measure)\n        return metrics\n\ndef wrap(string, width, fontsize, metrics):\n    ''\n\n\n    words = string.split()\n    if not words: return []\n    space = metrics.advance(\" \")*fontsize\n    ends = [0]\n    for word in words:\n        ends.append(ends[-1] + metrics.textWidth(word, fontsize) + space)\n    lines = []\n    start = 0\n    while start < len(words):\n\n        end = max(start+1, bisect_right(ends, ends[start] + width + space, start+1) - 1)\n        lines.append(\" \".join(words[start:end]))\n        start = end\n    return lines\n", ["bisect"]], "brySVG.timings": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\nfrom math import log, ceil, inf\nimport json\nimport time\n\nGROWTH = 1.1\nLOGGROWTH = log(GROWTH)\ncurrent = None\n\nclass Histogram(object):\n    ''\n\n    def __init__(self):\n        self.count = 0\n        self.total = 0\n        self.max = 0\n        self.buckets = {}\n\n    def add(self, seconds):\n        ''\n        ms = seconds*1000\n        self.count += 1\n        self.total += ms\n        if ms > self.max: self.max = ms\n        i = ceil(log(ms)/LOGGROWTH) if ms > 0 else None\n        self.buckets[i] = self.buckets.get(i, 0) + 1\n\n    def percentile(self, p):\n        ''\n        if not self.count: return None\n        target = p*self.count\n        cumulative = 0\n        for i in sorted(self.buckets, key=lambda i: -inf if i is None else i):\n            cumulative += self.buckets[i]\n            if cumulative >= target: return 0 if i is None else min(GROWTH**i, self.max)\n        return self.max\n\n    def summary(self):\n        ''\n        return {\"count\":self.count, \"p50\":self.percentile(0.5), \"p95\":self.percentile(0.95), \"max\":self.max, \"total\":self.total}\n\nclass Timings(object):\n    ''\n    def __init__(self):\n        self.histograms = {}\n\n    def record(self, name, seconds):\n        ''\n        histogram = self.histograms.get(name)\n        if histogram is None: histogram = self.histograms[name] = Histogram()\n        histogram.add(seconds)\n\n    def span(self, name):\n        ''\n\n        return _Span(self, name)\n\n    def summary(self):\n        ''\n        return {name:histogram.summary() for (name, histogram) in self.histograms.items()}\n\n    def dumps(self):\n        ''\n\n        spans = {}\n        for (name, histogram) in self.histograms.items():\n            spans[name] = dict(histogram.summary(), buckets={(\"zero\" if i is None else str(i)):n for (i, n) in histogram.buckets.items()})\n        return json.dumps({\"units\":\"ms\", \"growth\":GROWTH, \"spans\":spans})\n\n    def clear(self):\n        ''\n        self.histograms = {}\n\nclass _Span(object):\n    ''\n    def __init__(self, timings, name):\n        self.timings = timings\n        self.name = name\n\n    def __enter__(self):\n        global current\n        (self.previous, current) = (current, self.timings)\n        self.starttime = time.perf_counter()\n        return self\n\n    def __exit__(self, exctype, value, traceback):\n        global current\n        self.timings.record(self.name, time.perf_counter() - self.starttime)\n        current = self.previous\n        return False\n\ndef start():\n    ''\n    return None if current is None else time.perf_counter()\n\ndef lap(name, starttime):\n    ''\n\n    if starttime is None or current is None: return None\n    now = time.perf_counter()\n    current.record(name, now - starttime)\n    return now\n\ndef timed(name):\n    ''\n    def decorator(method):\n        def wrapper(self, *args, **kwargs):\n            recorder = self.timings\n            if recorder is None: return method(self, *args, **kwargs)\n            with recorder.span(name):\n                return method(self, *args, **kwargs)\n        wrapper.__name__ = method.__name__\n        wrapper.__doc__ = method.__doc__\n        return wrapper\n    return decorator\n", ["json", "math", "time"]], "brySVG.jobs": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\n\n\n\n\n\nimport brySVG.geometry as geometry\n\ndef pack(poly):\n    ''\n    return [coord for point in getattr(poly, \"pointList\", poly) for coord in point]\n\ndef unpack(coords, polyid=\"\"):\n    ''\n    return geometry.Polygon([(coords[i], coords[i+1]) for i in range(0, len(coords), 2)], polyid)\n\ndef makeJob(jobid, op, polygons, **params):\n    ''\n\n    job = {\"id\":jobid, \"op\":op, \"polygons\":[pack(poly) for poly in polygons]}\n    job.update(params)\n    return job\n\ndef runJob(job):\n    ''\n\n\n\n\n\n\n\n\n\n    reply = {\"id\":job.get(\"id\"), \"op\":job.get(\"op\")}\n    try:\n        reply[\"result\"] = _operations[job[\"op\"]](job, [unpack(coords, i) for (i, coords) in enumerate(job[\"polygons\"])])\n    except Exception as error:\n        reply[\"error\"] = f\"{type(error).__name__}: {error}\"\n    return reply\n\ndef _relativeposition(job, polygons):\n    ''\n    return geometry.relativeposition(polygons[0], polygons[1])\n\ndef _findintersections(job, polygons):\n    ''\n    result = []\n    for ix in geometry.findintersections(polygons):\n        refs = [[poly.id, index] if isinstance(index, int) else [poly.id, index[0], index[1]] for (poly, index) in ix.polyrefs.items()]\n        result.append([ix.point[0], ix.point[1], refs])\n    return result\n\ndef _boundary(job, polygons):\n    ''\n    result = geometry.boundary(polygons)\n    return pack(result) if result else result\n\ndef _edgesnap(job, polygons):\n    ''\n    openpolys = set(job.get(\"open\", []))\n    segmentlists = [poly.segments[1:] if poly.id in openpolys else poly.segments for poly in polygons]\n    checksegments = [seg for segments in segmentlists[1:] for seg in segments]\n    snap = geometry.findedgesnap(segmentlists[0], checksegments, job[\"snapangle\"], job[\"snapdistance\"])\n    if snap is None: return None\n    (angle, centre, vector) = snap\n    return [angle, centre[0], centre[1], vector[0], vector[1]]\n\ndef _vertexsnap(job, polygons):\n    ''\n    checkpoints = [point for poly in polygons[1:] for point in poly.pointList]\n    vector = geometry.findvertexsnap(polygons[0].pointList, checkpoints, job[\"snapdistance\"])\n    return None if vector is None else list(vector)\n\n_operations = {\"relativeposition\":_relativeposition, \"findintersections\":_findintersections, \"boundary\":_boundary,\n               \"edgesnap\":_edgesnap, \"vertexsnap\":_vertexsnap}\n\nclass JobRunner(object):\n    ''\n\n\n\n\n    def __init__(self):\n        self.nextid = 1\n        self.pending = {}\n        self.latest = {}\n        self.dropped = 0\n\n    def submit(self, op, polygons, callback=None, key=None, errorcallback=None, **params):\n        ''\n\n        jobid = self.nextid\n        self.nextid += 1\n        job = makeJob(jobid, op, polygons, **params)\n        if key is not None:\n            previous = self.latest.get(key)\n            if previous is not None: self.cancel(previous)\n            self.latest[key] = jobid\n        self.pending[jobid] = (key, callback, errorcallback)\n        self._send(job)\n        return jobid\n\n    def cancel(self, jobid):\n        ''\n        if self.pending.pop(jobid, None) is not None: self.dropped += 1\n\n    def receive(self, reply):\n        ''\n        entry = self.pending.pop(reply[\"id\"], None)\n        if entry is None: return\n        (key, callback, errorcallback) = entry\n        if key is not None and self.latest.get(key) == reply[\"id\"]: del self.latest[key]\n        if \"error\" in reply:\n            if errorcallback: errorcallback(reply[\"error\"])\n        elif callback:\n            callback(reply[\"result\"])\n\n    def _send(self, job):\n        ''\n        raise NotImplementedError\n\nclass LocalJobRunner(JobRunner):\n    ''\n\n\n    def __init__(self, executor=None):\n        from concurrent.futures import ThreadPoolExecutor\n        import queue\n        super().__init__()\n        self.executor = ThreadPoolExecutor(1) if executor is None else executor\n        self.futures = {}\n        self.replies = queue.Queue()\n\n    def poll(self):\n        ''\n        import queue\n        while True:\n            try:\n                reply = self.replies.get_nowait()\n            except queue.Empty:\n                return\n            self.receive(reply)\n\n    def wait(self, timeout=None):\n        ''\n        while self.pending:\n            self.receive(self.replies.get(timeout=timeout))\n\n    def cancel(self, jobid):\n        future = self.futures.pop(jobid, None)\n        if future is not None: future.cancel()\n        super().cancel(jobid)\n\n    def receive(self, reply):\n        self.futures.pop(reply[\"id\"], None)\n        super().receive(reply)\n\n    def _send(self, job):\n        ''\n        future = self.executor.submit(runJob, job)\n        self.futures[job[\"id\"]] = future\n        future.add_done_callback(lambda future: None if future.cancelled() else self.replies.put(future.result()))\n", ["brySVG.geometry", "concurrent.futures", "queue"]], "brySVG.pathdata": [".py", "#!/usr/bin/python\n\n\n\n\n\n\n''\n\n\n\n\n\n\n\n\n\nimport re\nfrom math import sin, cos, tan, atan2, pi, sqrt, ceil, radians\n\nNUMBER = r\"[-+]?(?:\\d+\\.?\\d*|\\.\\d+)(?:[eE][-+]?\\d+)?\"\nSEPARATOR = r\"[\\s,]*\"\nCOMMANDS = re.compile(r\"[MmZzLlHhVvCcSsQqTtAa]\")\nNUMBERS = re.compile(NUMBER)\n\nARCARGS = re.compile(SEPARATOR.join([f\"({NUMBER})\"]*3 + [\"([01])\"]*2 + [f\"({NUMBER})\"]*2))\nARGCOUNTS = {\"M\":2, \"L\":2, \"H\":1, \"V\":1, \"C\":6, \"S\":4, \"Q\":4, \"T\":2, \"A\":7, \"Z\":0}\n\ndef subpaths(d, tolerance=0.1):\n    ''\n\n\n\n    result = []\n    vertices = controls = None\n    (cx, cy) = (sx, sy) = (0.0, 0.0)\n    (lastcubic, lastquad) = (None, None)\n    matches = list(COMMANDS.finditer(d))\n    for (index, match) in enumerate(matches):\n        command = match.group()\n        upper = command.upper()\n        relative = command != upper\n        start = match.end()\n        end = matches[index+1].start() if index+1 < len(matches) else len(d)\n        if upper == \"Z\":\n            if vertices is not None and len(vertices) > 1:\n                if vertices[-1] == vertices[0]:\n                    vertices.pop()\n                else:\n                    controls.append(None)\n                result.append((vertices, controls, True))\n            vertices = None\n            (cx, cy) = (sx, sy)\n            (lastcubic, lastquad) = (None, None)\n            continue\n        if upper == \"A\":\n            argsets = [[float(x) for x in argset] for argset in ARCARGS.findall(d, start, end)]\n        else:\n            args = [float(x) for x in NUMBERS.findall(d, start, end)]\n            step = ARGCOUNTS[upper]\n            argsets = [args[i:i+step] for i in range(0, len(args) - step + 1, step)]\n        for (i, a) in enumerate(argsets):\n            (dx, dy) = (cx, cy) if relative else (0.0, 0.0)\n            if upper == \"M\" and i == 0:\n                if vertices is not None: result.append((vertices, controls, False))\n                (cx, cy) = (sx, sy) = (a[0]+dx, a[1]+dy)\n                (vertices, controls) = ([(cx, cy)], [])\n                (lastcubic, lastquad) = (None, None)\n                continue\n            if vertices is None: (vertices, controls) = ([(cx, cy)], [])\n            (newcubic, newquad) = (None, None)\n            if upper in (\"L\", \"M\"):\n                (x, y) = (a[0]+dx, a[1]+dy)\n                controls.append(None)\n            elif upper == \"H\":\n                (x, y) = (a[0]+dx, cy)\n                controls.append(None)\n            elif upper == \"V\":\n                (x, y) = (cx, a[0]+dy)\n                controls.append(None)\n            elif upper == \"C\" or upper == \"S\":\n                if upper == \"C\":\n                    c1 = (a[0]+dx, a[1]+dy)\n                else:\n                    c1 = (2*cx - lastcubic[0], 2*cy - lastcubic[1]) if lastcubic else (cx, cy)\n                newcubic = (a[-4]+dx, a[-3]+dy)\n                (x, y) = (a[-2]+dx, a[-1]+dy)\n                controls.append((c1, newcubic))\n            elif upper == \"Q\" or upper == \"T\":\n                if upper == \"Q\":\n                    newquad = (a[0]+dx, a[1]+dy)\n                else:\n                    newquad = (2*cx - lastquad[0], 2*cy - lastquad[1]) if lastquad else (cx, cy)\n                (x, y) = (a[-2]+dx, a[-1]+dy)\n                (qx, qy) = newquad\n                controls.append(((cx + 2*(qx-cx)/3, cy + 2*(qy-cy)/3), (x + 2*(qx-x)/3, y + 2*(qy-y)/3)))\n            else:\n                (x, y) = (a[5]+dx, a[6]+dy)\n                if a[0] == 0 or a[1] == 0:\n                    controls.append(None)\n                else:\n                    curves = arcToCubics((cx, cy), a[0], a[1], a[2], a[3], a[4], (x, y), tolerance)\n                    if not curves:\n                        (lastcubic, lastquad) = (None, None)\n                        continue\n                    for (c1, c2, p) in curves[:-1]:\n                        controls.append((c1, c2))\n                        vertices.append(p)\n                    controls.append(curves[-1][:2])\n            vertices.append((x, y))\n            (cx, cy) = (x, y)\n            (lastcubic, lastquad) = (newcubic, newquad)\n    if vertices is not None: result.append((vertices, controls, False))\n    return result\n\ndef arcToCubics(start, rx, ry, rotation, largearc, sweep, end, tolerance=0.1):\n    ''\n\n\n\n    ((x1, y1), (x2, y2)) = (start, end)\n    (rx, ry) = (abs(rx), abs(ry))\n    if (x1, y1) == (x2, y2) or rx == 0 or ry == 0: return []\n    phi = radians(rotation)\n    (cosphi, sinphi) = (cos(phi), sin(phi))\n\n    (hx, hy) = ((x1-x2)/2, (y1-y2)/2)\n    (x1p, y1p) = (cosphi*hx + sinphi*hy, -sinphi*hx + cosphi*hy)\n    scale = (x1p/rx)**2 + (y1p/ry)**2\n    if scale > 1: (rx, ry) = (rx*sqrt(scale), ry*sqrt(scale))\n    numerator = rx*rx*ry*ry - rx*rx*y1p*y1p - ry*ry*x1p*x1p\n    denominator = rx*rx*y1p*y1p + ry*ry*x1p*x1p\n    k = sqrt(max(0, numerator/denominator)) if denominator else 0\n    if largearc == sweep: k = -k\n    (cxp, cyp) = (k*rx*y1p/ry, -k*ry*x1p/rx)\n    (cx, cy) = (cosphi*cxp - sinphi*cyp + (x1+x2)/2, sinphi*cxp + cosphi*cyp + (y1+y2)/2)\n    theta1 = atan2((y1p-cyp)/ry, (x1p-cxp)/rx)\n    dtheta = atan2((-y1p-cyp)/ry, (-x1p-cxp)/rx) - theta1\n    if sweep and dtheta < 0: dtheta += 2*pi\n    elif not sweep and dtheta > 0: dtheta -= 2*pi\n\n    segmentcount = max(1, int(ceil(abs(dtheta)/(pi/2) - 1e-9)))\n    while _arcerror(max(rx, ry), abs(dtheta)/segmentcount) > tolerance and segmentcount < 1024:\n        segmentcount += 1\n    delta = dtheta/segmentcount\n    t = 4/3*tan(delta/4)\n    def onellipse(u, v):\n        return (cx + rx*cosphi*u - ry*sinphi*v, cy + rx*sinphi*u + ry*cosphi*v)\n    curves = []\n    angle = theta1\n    for i in range(segmentcount):\n        (cos1, sin1, cos2, sin2) = (cos(angle), sin(angle), cos(angle+delta), sin(angle+delta))\n        c1 = onellipse(cos1 - t*sin1, sin1 + t*cos1)\n        c2 = onellipse(cos2 + t*sin2, sin2 - t*cos2)\n        p = (x2, y2) if i == segmentcount-1 else onellipse(cos2, sin2)\n        curves.append((c1, c2, p))\n        angle += delta\n    return curves\n\ndef _arcerror(radius, angle):\n    ''\n    return radius*4/27*sin(angle/4)**6/cos(angle/4)**2\n\ndef toPointsetList(vertices, controls, closed):\n    ''\n\n    count = len(vertices)\n    pairs = []\n    for (i, control) in enumerate(controls):\n        if control is None:\n            (p, q) = (vertices[i], vertices[(i+1)%count])\n            midpoint = ((p[0]+q[0])/2, (p[1]+q[1])/2)\n            control = (midpoint, midpoint)\n        pairs.append(control)\n    controls = pairs\n    if closed:\n        return [[controls[i-1][1], vertex, controls[i][0]] for (i, vertex) in enumerate(vertices)]\n    pointsetlist = [[None, vertices[0], controls[0][0]]]\n    pointsetlist += [[controls[i-1][1], vertices[i], controls[i][0]] for i in range(1, count-1)]\n    pointsetlist.append([controls[-1][1], vertices[-1], None])\n    return pointsetlist\n\ndef pointsetLists(d, tolerance=0.1):\n    ''\n\n    return [(toPointsetList(vertices, controls, closed), closed) for (vertices, controls, closed) in subpaths(d, tolerance) if len(vertices) > 1]\n", ["math", "re"]]}
 __BRYTHON__.update_VFS(scripts)
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Running the polygon algorithms of `brySVG.geometry` on large batches of polygons, using several processes.
+This module is for ordinary Python programs (eg checking submitted diagrams on a server); it cannot be used in the browser.
+    positions = batch.relativePositions([(poly1, poly2), (poly3, poly4)], workers=4)
+    outlines = batch.boundaries([[tile1, tile2, tile3], [tile4, tile5]])
+
+Each polygon can be given as a list of coordinates, or as anything with a `pointList` (eg a `geometry.Polygon`).
+It is sent to the worker processes as a compact array of 64-bit floats, and the results come back as plain tuples and lists,
+in the same order as the input. The jobs are sent in chunks of `chunksize`, so that each worker is sent many small jobs at once.
+If `workers` is 1, the jobs are run in the calling process. To avoid starting new processes for each batch,
+pass a `concurrent.futures.ProcessPoolExecutor` as `executor`.
+
+Running this module (`python -m brySVG.batch [jobcount]`) times a batch of merges with different numbers of workers.'''
+
+from array import array
+from math import sin, cos
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+import sys
+import time
+import brySVG.geometry as geometry
+
+CHUNKSIZE = 16 #Default number of jobs sent to a worker at once
+
+def pack(poly):
+    '''Returns the coordinates of `poly` (a list of coordinates, or anything with a `pointList`) as a flat array of floats.'''
+    return array("d", [coord for point in getattr(poly, "pointList", poly) for coord in point])
+
+def unpack(coords, polyid=""):
+    '''Returns the `geometry.Polygon` whose coordinates are `coords` (as returned by `pack()`).'''
+    return geometry.Polygon([(coords[i], coords[i+1]) for i in range(0, len(coords), 2)], polyid)
+
+def relativePositions(pairs, workers=None, chunksize=CHUNKSIZE, executor=None):
+    '''For each pair of polygons `(poly1, poly2)` in `pairs`, finds the position of `poly1` relative to `poly2`.
+    Returns a list of `Position` values (see `geometry.relativeposition()`).'''
+    tasks = [(pack(poly1), pack(poly2)) for (poly1, poly2) in pairs]
+    return _run(_relativeposition, tasks, workers, chunksize, executor)
+
+def findIntersections(polylists, workers=None, chunksize=CHUNKSIZE, executor=None):
+    '''For each list of polygons in `polylists`, finds the intersections between them (see `geometry.findintersections()`).
+    Returns a list which has, for each list of polygons, a list of intersections. Each intersection is a tuple `(point, polyrefs)`,
+    where `point` is a pair of coordinates, and `polyrefs` is a dict whose keys are the positions in the list of the polygons
+    which meet at that point, and whose values are vertex indices or pairs of vertex indices.'''
+    tasks = [[pack(poly) for poly in polylist] for polylist in polylists]
+    return _run(_findintersections, tasks, workers, chunksize, executor)
+
+def boundaries(polylists, workers=None, chunksize=CHUNKSIZE, executor=None):
+    '''For each list of polygons in `polylists`, finds their outer boundary (see `geometry.boundary()`).
+    Returns a list which has, for each list of polygons, a list of the coordinates of the vertices of the boundary,
+    or `None` if the polygons do not all touch or overlap (or `False` if the boundary could not be traced).'''
+    tasks = [[pack(poly) for poly in polylist] for polylist in polylists]
+    return _run(_boundary, tasks, workers, chunksize, executor)
+
+def _run(function, tasks, workers, chunksize, executor):
+    '''Not intended to be called by end users. Returns the results of applying `function` to each task, in order.'''
+    if executor is not None: return list(executor.map(function, tasks, chunksize=chunksize))
+    if workers == 1 or len(tasks) <= 1: return [function(task) for task in tasks]
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(function, tasks, chunksize=chunksize))
+
+def _relativeposition(task):
+    '''Not intended to be called by end users. Runs in a worker process.'''
+    (coords1, coords2) = task
+    return geometry.relativeposition(unpack(coords1), unpack(coords2))
+
+def _findintersections(task):
+    '''Not intended to be called by end users. Runs in a worker process.'''
+    polylist = [unpack(coords) for coords in task]
+    positions = {poly:i for (i, poly) in enumerate(polylist)}
+    return [(tuple(ix.point), {positions[poly]:index for (poly, index) in ix.polyrefs.items()})
+            for ix in geometry.findintersections(polylist)]
+
+def _boundary(task):
+    '''Not intended to be called by end users. Runs in a worker process.'''
+    result = geometry.boundary([unpack(coords) for coords in task])
+    return [tuple(point) for point in result.pointList] if result else result
+
+def _randomtiles(count, size=10):
+    '''Not intended to be called by end users. Returns a row of `count` overlapping, slightly rotated squares.'''
+    tiles = []
+    for i in range(count):
+        (cx, cy) = (i*size*0.9, random.uniform(-1, 1))
+        angle = random.uniform(-0.2, 0.2)
+        (c, s) = (size/2*cos(angle), size/2*sin(angle))
+        tiles.append([(round(cx+x*c-y*s, 2), round(cy+x*s+y*c, 2)) for (x, y) in [(-1, -1), (1, -1), (1, 1), (-1, 1)]])
+    return tiles
+
+if __name__ == "__main__":
+    jobcount = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    random.seed(1)
+    jobs = [_randomtiles(8) for i in range(jobcount)]
+    cpus = os.cpu_count() or 1
+    workercounts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus+1)))
+    print(f"Merging {jobcount} sets of 8 tiles on {cpus} cores")
+    reference = None
+    for workers in workercounts:
+        with ProcessPoolExecutor(workers) as executor:
+            executor.submit(int).result() #Start a worker, so that the time to start the pool is not included
+            t = time.time()
+            results = boundaries(jobs, chunksize=max(1, jobcount//(4*workers)), executor=executor)
+            elapsed = time.time()-t
+        if reference is None: reference = (elapsed, results)
+        assert results == reference[1]
+        print(f"{workers:3d} workers: {elapsed:7.3f}s  {jobcount/elapsed:8.1f} jobs/s  speedup {reference[0]/elapsed:5.2f}")
@@ -0,0 +1,267 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Timing the calculations which brySVG does most often, on synthetic scenes of increasing size, to show how each one
+scales and to catch regressions. The scenes (random polygons, tilings, tangram sets, long Bezier curves and deeply nested
+groups) are generated from a fixed seed, so the same work is timed on every run.
+
+The calculations which do not need the browser (see `headlessCases()`) can be timed from the command line:
+    python -m brySVG.benchmark [--sizes 10,100,1000] [--cases boundary,edgesnap] [--save FILE] [--baseline FILE]
+which prints the time for each case at each size, and the scaling exponent of each case (the power of the size which the
+time is proportional to). `--save` stores the results as JSON, and `--baseline` compares them with stored results,
+listing the cases which have become more than `--threshold` times slower, or whose exponent has grown.
+The same cases, and the canvas methods in `canvasCases(canvas)`, can be timed in a page with `runBenchmarks()`:
+    results = benchmark.runBenchmarks(benchmark.canvasCases(canvas))
+    print(benchmark.formatResults(results))'''
+
+from math import sin, cos, pi, ceil, log
+import json
+import random
+import sys
+import time
+import brySVG.geometry as geometry
+import brySVG.flatten as flatten
+import brySVG.svgexport as svgexport
+
+SIZES = (10, 100, 1000, 10000, 100000)
+SEED = 1
+REPEATS = 5 #Each case is run up to this many times at each size, and the fastest time is kept
+MAXSECONDS = 1 #Larger sizes of a case are skipped if it would take longer than this (even if it scaled linearly)
+THRESHOLD = 1.5 #A case is a regression if it is this many times slower than the baseline
+EXPONENTSLACK = 0.2 #or if its scaling exponent is this much greater
+
+class Case(object):
+    '''A calculation to be timed. `setup(size, rng)` returns the data for one run (it is not timed), `run(data)` is timed,
+    and `teardown(data)` (if given) tidies up afterwards. The case is not run for sizes greater than `maxsize`.'''
+    def __init__(self, name, setup, run, teardown=None, maxsize=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.teardown = teardown
+        self.maxsize = maxsize
+
+def randomPolygons(count, rng, vertices=6):
+    '''Returns a list of `count` random star-shaped polygons (lists of coordinates), scattered so that each overlaps a few others.'''
+    side = 20*count**0.5
+    return [_starpolygon(vertices, rng, (rng.uniform(0, side), rng.uniform(0, side)), rng.uniform(5, 10)) for i in range(count)]
+
+def tiling(count, side=10):
+    '''Returns a list of `count` squares, filling the rows of a square grid in turn, so that they all share edges.'''
+    columns = ceil(count**0.5)
+    squares = []
+    for i in range(count):
+        (x, y) = (side*(i%columns), side*(i//columns))
+        squares.append([(x, y), (x+side, y), (x+side, y+side), (x, y+side)])
+    return squares
+
+TANGRAM = [[(0, 0), (10, 0), (5, 5)], [(0, 0), (5, 5), (0, 10)], [(10, 5), (10, 10), (5, 10)], [(5, 5), (7.5, 7.5), (2.5, 7.5)],
+           [(10, 0), (10, 5), (7.5, 2.5)], [(5, 5), (7.5, 2.5), (10, 5), (7.5, 7.5)], [(2.5, 7.5), (7.5, 7.5), (5, 10), (0, 10)]]
+
+def tangrams(count):
+    '''Returns a list of `count` tangram pieces, making up a row of 10x10 squares.'''
+    return [[(x+10*(i//7), y) for (x, y) in TANGRAM[i%7]] for i in range(count)]
+
+def longBezier(count, rng):
+    '''Returns a pointsetlist (in the form used by `BezierObject`) for a wavy curve made of `count` cubic curves.'''
+    points = [(10*i, rng.uniform(-20, 20)) for i in range(count+1)]
+    pointsetlist = []
+    for (i, (x, y)) in enumerate(points):
+        slope = rng.uniform(-2, 2)
+        pointsetlist.append([None if i == 0 else (x-3, y-3*slope), (x, y), None if i == count else (x+3, y+3*slope)])
+    return pointsetlist
+
+def deepGroup(depth, rng):
+    '''Returns the records (in the form used by `brySVG.scene`) for a group nested `depth` deep, with a polygon at each level.'''
+    record = None
+    for level in range(depth):
+        polygon = _starpolygon(6, rng, (rng.uniform(0, 100), rng.uniform(0, 100)), 10)
+        members = [{"type":"polygon", "points":[coord for point in polygon for coord in point]}]
+        if record: members.append(record)
+        record = {"type":"group", "objects":members}
+    return [record]
+
+def headlessCases():
+    '''Returns the list of `Cases` which do not need the browser.'''
+    def polygons(size, rng):
+        return [geometry.Polygon(coords, i) for (i, coords) in enumerate(randomPolygons(size, rng))]
+    def twopolygons(size, rng):
+        return (geometry.Polygon(_starpolygon(size, rng, (0, 0), 100)), geometry.Polygon(_starpolygon(size, rng, (50, 0), 100)))
+    def snaptarget(size, rng):
+        tiles = [geometry.Polygon(coords) for coords in tiling(size)]
+        moved = geometry.Polygon([(x+1.5, y+1.5) for (x, y) in tiling(1)[0]])
+        return (moved, tiles)
+    def pointlist(size, rng):
+        return [geometry.Point(coords) for coords in _starpolygon(size, rng, (0, 0), 100)]
+    def transformpoints(points): #As done to the pointList of an object by matrixTransform (with an SVG matrix a, b, c, d, e, f)
+        (a, b, c, d, e, f) = (cos(0.1), sin(0.1), -sin(0.1), cos(0.1), 5, 5)
+        return [geometry.Point((a*x+c*y+e, b*x+d*y+f)) for (x, y) in points]
+    return [
+        Case("findintersections", polygons, geometry.findintersections),
+        Case("boundary", lambda size, rng: [geometry.Polygon(coords) for coords in tiling(size)], geometry.boundary),
+        Case("boundary-tangrams", lambda size, rng: [geometry.Polygon(coords) for coords in tangrams(size)], geometry.boundary),
+        Case("relativeposition", twopolygons, lambda polys: geometry.relativeposition(*polys)),
+        Case("vertexsnap", snaptarget, lambda data: geometry.findvertexsnap(data[0].pointList, [p for tile in data[1] for p in tile.pointList], 10)),
+        Case("edgesnap", snaptarget, lambda data: geometry.findedgesnap(data[0].segments, [s for tile in data[1] for s in tile.segments], 10*pi/180, 10)),
+        Case("translatepoints", pointlist, lambda points: [point+(1, 1) for point in points]),
+        Case("transformpoints", pointlist, transformpoints),
+        Case("flattenbezier", longBezier, flatten.flattenPointsetList),
+        Case("fitviewbox-deepgroups", deepGroup, svgexport.fitViewBox, maxsize=100), #Nesting is limited by the recursion limit
+    ]
+
+def canvasCases(canvas):
+    '''Returns the list of `Cases` which time the methods of `canvas` (which must be a CanvasObject in the page, using
+    `brySVG.polygoncanvas` and `brySVG.drawcanvas`). All objects are deleted from the canvas after each run.'''
+    from brySVG.polygoncanvas import PolygonObject, BezierObject, GroupObject
+    def clear(data):
+        if getattr(canvas, "handles", None): canvas.deleteHandles()
+        canvas.deleteAll()
+    def onepolygon(size, rng):
+        obj = PolygonObject(_starpolygon(size, rng, (0, 0), 100))
+        canvas.addObject(obj)
+        return obj
+    def onebezier(size, rng):
+        obj = BezierObject(longBezier(size, rng))
+        canvas.addObject(obj)
+        return obj
+    def nestedgroups(size, rng):
+        group = None
+        for level in range(size):
+            members = [PolygonObject(_starpolygon(6, rng, (rng.uniform(0, 100), rng.uniform(0, 100)), 10))]
+            if group: members.append(group)
+            group = GroupObject(members)
+        return group
+    def scattered(size, rng):
+        canvas.addObjects([PolygonObject(coords) for coords in randomPolygons(size, rng)])
+        return onepolygon(6, rng)
+    def tiled(size, rng):
+        canvas.addObjects([PolygonObject(coords) for coords in tiling(size)])
+        obj = PolygonObject([(x+1.5, y+1.5) for (x, y) in tiling(1)[0]])
+        canvas.addObject(obj)
+        return obj
+    def transformed(obj):
+        obj.matrixTransform(canvas.createSVGMatrix().translate(5, 5).rotate(10))
+        return obj.pointList #The transform is only applied to the geometry when it is needed
+    return [
+        Case("addObjects", lambda size, rng: [PolygonObject(coords) for coords in randomPolygons(size, rng)], canvas.addObjects, clear),
+        Case("addObjects-deepgroups", nestedgroups, lambda group: canvas.addObjects([group]), clear, maxsize=1000),
+        Case("cloneObject", onepolygon, lambda obj: obj.cloneObject(), clear),
+        Case("cloneObject-bezier", onebezier, lambda obj: obj.cloneObject(), clear),
+        Case("translateObject", onepolygon, lambda obj: canvas.translateObject(obj, (1, 1)), clear),
+        Case("matrixTransform", onepolygon, transformed, clear),
+        Case("createHandles", onepolygon, canvas.createHandles, clear),
+        Case("_doVertexSnap", scattered, canvas._doVertexSnap, clear),
+        Case("_doEdgeSnap", tiled, canvas._doEdgeSnap, clear),
+    ]
+
+def runBenchmarks(cases, sizes=SIZES, repeats=REPEATS, maxseconds=MAXSECONDS, seed=SEED, report=None):
+    '''Times each of the `cases` at each of the `sizes`, and returns the results as a dict which can be saved as JSON:
+    for each case name, `{"times":{size:seconds, ...}, "exponent":exponent}` (the sizes are strings, as in JSON).
+    `report(name, size, seconds)` is called (if given) after each size of each case.'''
+    results = {}
+    for case in cases:
+        times = {}
+        previous = None
+        for size in sorted(sizes):
+            if case.maxsize and size > case.maxsize: continue
+            if previous and previous[1]*size/previous[0] > maxseconds: break
+            best = None
+            for i in range(repeats):
+                data = case.setup(size, random.Random(seed))
+                starttime = time.perf_counter()
+                case.run(data)
+                elapsed = time.perf_counter() - starttime
+                if case.teardown: case.teardown(data)
+                best = elapsed if best is None else min(best, elapsed)
+                if elapsed > maxseconds/repeats: break #No need for more runs of a slow case
+            times[str(size)] = best
+            previous = (size, best)
+            if report: report(case.name, size, best)
+        results[case.name] = {"times":times, "exponent":scalingExponent(times)}
+    return results
+
+def scalingExponent(times):
+    '''Returns the gradient of the best straight line through the points (log size, log time), ie the power `k` for which
+    the time is most nearly proportional to size**k, or `None` if there are fewer than two sizes.'''
+    points = [(log(int(size)), log(max(seconds, 1e-9))) for (size, seconds) in times.items()]
+    if len(points) < 2: return None
+    meanx = sum(x for (x, y) in points)/len(points)
+    meany = sum(y for (x, y) in points)/len(points)
+    sxx = sum((x-meanx)**2 for (x, y) in points)
+    return sum((x-meanx)*(y-meany) for (x, y) in points)/sxx if sxx else None
+
+def compare(results, baseline, threshold=THRESHOLD, exponentslack=EXPONENTSLACK):
+    '''Compares `results` with `baseline` (both as returned by `runBenchmarks()`), and returns a list of messages,
+    one for each size of a case which is more than `threshold` times slower, and one for each case whose scaling exponent
+    is more than `exponentslack` greater. Cases and sizes which are not in both are ignored.'''
+    regressions = []
+    for (name, result) in results.items():
+        if name not in baseline: continue
+        old = baseline[name]
+        for (size, seconds) in result["times"].items():
+            oldseconds = old["times"].get(size)
+            if oldseconds and seconds > threshold*oldseconds:
+                regressions.append(f"{name} at size {size}: {_ms(seconds)} (was {_ms(oldseconds)}, {seconds/oldseconds:.1f}x slower)")
+        (exponent, oldexponent) = (result.get("exponent"), old.get("exponent"))
+        if exponent is not None and oldexponent is not None and exponent > oldexponent + exponentslack:
+            regressions.append(f"{name}: scaling exponent {exponent:.2f} (was {oldexponent:.2f})")
+    return regressions
+
+def formatResults(results):
+    '''Returns the results as a table, with a row for each case and a column for each size.'''
+    sizes = sorted({int(size) for result in results.values() for size in result["times"]})
+    width = max([len(name) for name in results] + [4])
+    lines = ["case".ljust(width) + "".join(f"{size:>12}" for size in sizes) + "    exponent"]
+    for (name, result) in results.items():
+        cells = [_ms(result["times"][str(size)]) if str(size) in result["times"] else "-" for size in sizes]
+        exponent = "-" if result["exponent"] is None else f"{result['exponent']:.2f}"
+        lines.append(name.ljust(width) + "".join(f"{cell:>12}" for cell in cells) + f"{exponent:>12}")
+    return "\n".join(lines)
+
+def _starpolygon(vertices, rng, centre, radius):
+    '''Not intended to be called by end users. Returns the coordinates of a random star-shaped polygon.'''
+    (cx, cy) = centre
+    angles = sorted(rng.uniform(0, 2*pi) for i in range(vertices))
+    radii = [radius*rng.uniform(0.6, 1) for i in range(vertices)]
+    return [(round(cx+r*cos(a), 2), round(cy+r*sin(a), 2)) for (a, r) in zip(angles, radii)]
+
+def _ms(seconds):
+    '''Not intended to be called by end users.'''
+    return f"{seconds*1000:.3f}ms"
+
+def main(argv=None):
+    '''Runs the command-line interface (see the module docstring). Returns 1 if there are regressions, otherwise 0.'''
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m brySVG.benchmark", description="Time brySVG calculations at increasing sizes.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="comma-separated sizes")
+    parser.add_argument("--cases", default=None, help="comma-separated names of the cases to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="maximum runs of each case at each size")
+    parser.add_argument("--maxseconds", type=float, default=MAXSECONDS, help="skip sizes which would take longer than this")
+    parser.add_argument("--save", default=None, help="save the results as JSON in this file")
+    parser.add_argument("--baseline", default=None, help="compare the results with those saved in this file")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="slowdown which counts as a regression")
+    args = parser.parse_args(argv)
+
+    cases = headlessCases()
+    if args.cases:
+        names = args.cases.split(",")
+        unknown = set(names) - {case.name for case in cases}
+        if unknown: parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        cases = [case for case in cases if case.name in names]
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = lambda name, size, seconds: print(f"{name} {size}: {_ms(seconds)}", file=sys.stderr)
+    results = runBenchmarks(cases, sizes, args.repeats, args.maxseconds, report=report)
+    print(formatResults(results))
+    if args.save:
+        with open(args.save, "w") as outfile: json.dump(results, outfile, indent=1)
+    if not args.baseline: return 0
+    with open(args.baseline) as infile: baseline = json.load(infile)
+    regressions = compare(results, baseline, args.threshold)
+    print("\n".join(["Regressions:"] + regressions) if regressions else "No regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
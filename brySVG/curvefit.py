@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Turning the points sampled along a freehand stroke into a smooth Bezier curve. This module does not use the browser,
+so recorded strokes can be processed without one:
+    pointsetlist = curvefit.fitStroke(samples, tolerance=1)
+    curve = BezierObject(pointsetlist)
+
+While the stroke is being drawn, a `StrokeSimplifier` discards the samples which lie (within `tolerance`) on a straight line
+between the points it keeps. This takes a constant time for each sample, so it can keep up with fast pen input.
+When the stroke ends, `fitPolyline()` fits a sequence of cubic Bezier curves to the kept points, splitting the stroke wherever
+one curve cannot pass within `tolerance` of all of them (the method of P. J. Schneider, "An Algorithm for Automatically
+Fitting Digitized Curves", Graphics Gems, 1990).'''
+
+from math import hypot
+
+MAXPOINTS = 1000 #Default limit on the number of points a StrokeSimplifier keeps
+MAXITERATIONS = 4 #Attempts to improve the fit of a curve before it is split
+
+class StrokeSimplifier(object):
+    '''Keeps the points of a stroke which are needed to follow it within `tolerance`, as they are added one at a time.
+    If more than `maxpoints` would be kept, the tolerance is doubled and the kept points are simplified again,
+    so the memory used by a stroke is bounded however long it is.
+    Attributes:
+    `points`: the points kept so far (not including the latest sample; see `finish()`)
+    `latest`: the latest sample, or `None`
+    `reduced`: set to `True` whenever earlier points are discarded because of `maxpoints` (it can be reset by the caller)'''
+    def __init__(self, tolerance=1, maxpoints=MAXPOINTS):
+        self.tolerance = tolerance
+        self.maxpoints = maxpoints
+        self.points = []
+        self.latest = None
+        self.direction = None #Unit vector along the line from the last kept point, once the stroke has left its neighbourhood
+        self.reach = 0 #The furthest distance along that line reached by the stroke
+        self.reduced = False
+
+    def addPoint(self, point):
+        '''Adds the next sample (a pair of coordinates) to the stroke.'''
+        (x, y) = point
+        if not self.points:
+            self.points.append((x, y))
+            return
+        (ax, ay) = self.points[-1]
+        (dx, dy) = (x-ax, y-ay)
+        tolerance = self.tolerance
+        if self.direction is None:
+            d = hypot(dx, dy)
+            if d > tolerance: (self.direction, self.reach) = ((dx/d, dy/d), d)
+            self.latest = (x, y)
+            return
+        (ux, uy) = self.direction
+        along = dx*ux + dy*uy
+        if abs(dx*uy - dy*ux) <= tolerance and along >= self.reach - tolerance: #Still on the line, and not turning back
+            self.reach = max(self.reach, along)
+            self.latest = (x, y)
+            return
+        self._keep(self.latest)
+        (ax, ay) = self.latest
+        (dx, dy) = (x-ax, y-ay)
+        d = hypot(dx, dy)
+        (self.direction, self.reach) = ((dx/d, dy/d), d) if d > tolerance else (None, 0)
+        self.latest = (x, y)
+
+    def finish(self):
+        '''Keeps the latest sample, and returns the list of kept points.'''
+        if self.latest is not None and self.latest != self.points[-1]: self._keep(self.latest)
+        self.latest = None
+        return self.points
+
+    def _keep(self, point):
+        '''Not intended to be called by end users.'''
+        self.points.append(point)
+        if len(self.points) > self.maxpoints:
+            points = self.points
+            while len(points) > self.maxpoints//2:
+                self.tolerance *= 2
+                points = simplify(points, self.tolerance)
+            self.points = points
+            self.reduced = True
+
+def simplify(points, tolerance=1):
+    '''Returns the points of `points` which are kept by a `StrokeSimplifier` (with no limit on their number).'''
+    simplifier = StrokeSimplifier(tolerance, maxpoints=len(points)+1)
+    for point in points: simplifier.addPoint(point)
+    return simplifier.finish()
+
+def fitCurve(points, tolerance=1, maxiterations=MAXITERATIONS):
+    '''Returns a pointsetlist (in the form used by `BezierObject`) for a curve which passes through the first and last
+    of `points`, and within `tolerance` of all the others. Returns an empty list if there are fewer than 2 distinct points.'''
+    points = [tuple(point) for (i, point) in enumerate(points) if i == 0 or tuple(point) != tuple(points[i-1])]
+    n = len(points)
+    if n < 2: return []
+    curves = []
+    stack = [(0, n-1, _unit(points[0], points[1]), _unit(points[-1], points[-2]))]
+    while stack:
+        (first, last, tangent1, tangent2) = stack.pop()
+        (curve, split) = _fitcubic(points, first, last, tangent1, tangent2, tolerance, maxiterations)
+        if curve is not None:
+            curves.append(curve)
+            continue
+        centretangent = _unit(points[split+1], points[split-1])
+        stack.append((split, last, (-centretangent[0], -centretangent[1]), tangent2)) #The first part is taken off the stack first
+        stack.append((first, split, tangent1, centretangent))
+    pointsetlist = [[None, curves[0][0], curves[0][1]]]
+    for (previous, curve) in zip(curves, curves[1:]): pointsetlist.append([previous[2], curve[0], curve[1]])
+    pointsetlist.append([curves[-1][2], curves[-1][3], None])
+    return pointsetlist
+
+def fitPolyline(points, tolerance=1):
+    '''Returns a pointsetlist for a curve which is within `tolerance` of the polyline through `points`
+    (for example, the points kept by a `StrokeSimplifier`), rather than only of the points themselves.'''
+    spacing = 4*tolerance
+    dense = []
+    for i in range(len(points)-1): #Long edges are divided, so that the curve cannot bulge away from them
+        ((x1, y1), (x2, y2)) = (points[i], points[i+1])
+        count = int(hypot(x2-x1, y2-y1)/spacing) + 1
+        dense.extend((x1 + (x2-x1)*j/count, y1 + (y2-y1)*j/count) for j in range(count))
+    dense.extend(points[-1:])
+    return fitCurve(dense, tolerance)
+
+def fitStroke(samples, tolerance=1, maxpoints=MAXPOINTS):
+    '''Simplifies a recorded stroke (a sequence of pairs of coordinates) as it would be while being drawn, and returns the
+    pointsetlist of the curve fitted to it. The curve is within `2*tolerance` of the samples (unless `maxpoints` was reached).'''
+    simplifier = StrokeSimplifier(tolerance, maxpoints)
+    for sample in samples: simplifier.addPoint(sample)
+    return fitPolyline(simplifier.finish(), tolerance)
+
+def _fitcubic(points, first, last, tangent1, tangent2, tolerance, maxiterations):
+    '''Not intended to be called by end users. Returns `(curve, None)` if a single cubic curve fits points[first:last+1],
+    otherwise `(None, split)`, where `split` is the index of the point furthest from the best curve found.'''
+    (p0, p3) = (points[first], points[last])
+    if last - first == 1:
+        d = hypot(p3[0]-p0[0], p3[1]-p0[1])/3
+        return ([p0, _along(p0, tangent1, d), _along(p3, tangent2, d), p3], None)
+    params = _chordlengths(points, first, last)
+    curve = _generatecurve(points, first, last, params, tangent1, tangent2)
+    (error, split) = _maxerror(points, first, last, curve, params)
+    limit = tolerance*tolerance
+    if error <= limit: return (curve, None)
+    if error <= 4*limit: #Close enough to be worth improving the parameters rather than splitting
+        for i in range(maxiterations):
+            params = [_newtonstep(curve, points[first+j], u) for (j, u) in enumerate(params)]
+            curve = _generatecurve(points, first, last, params, tangent1, tangent2)
+            (error, split) = _maxerror(points, first, last, curve, params)
+            if error <= limit: return (curve, None)
+    return (None, split)
+
+def _generatecurve(points, first, last, params, tangent1, tangent2):
+    '''Not intended to be called by end users. Returns the control points of the cubic curve with the given end tangents
+    which fits the points most closely (by least squares) at the parameters `params`.'''
+    (p0, p3) = (points[first], points[last])
+    (t1x, t1y), (t2x, t2y) = tangent1, tangent2
+    c00 = c01 = c11 = x0 = x1 = 0
+    for (j, u) in enumerate(params):
+        v = 1-u
+        (b0, b1, b2, b3) = (v*v*v, 3*u*v*v, 3*u*u*v, u*u*u)
+        (a1x, a1y, a2x, a2y) = (t1x*b1, t1y*b1, t2x*b2, t2y*b2)
+        c00 += a1x*a1x + a1y*a1y
+        c01 += a1x*a2x + a1y*a2y
+        c11 += a2x*a2x + a2y*a2y
+        (px, py) = points[first+j]
+        rx = px - (p0[0]*(b0+b1) + p3[0]*(b2+b3))
+        ry = py - (p0[1]*(b0+b1) + p3[1]*(b2+b3))
+        x0 += a1x*rx + a1y*ry
+        x1 += a2x*rx + a2y*ry
+    det = c00*c11 - c01*c01
+    chord = hypot(p3[0]-p0[0], p3[1]-p0[1])
+    (alpha1, alpha2) = (0, 0) if det == 0 else ((x0*c11 - x1*c01)/det, (c00*x1 - c01*x0)/det)
+    if alpha1 < 1e-6*chord or alpha2 < 1e-6*chord: (alpha1, alpha2) = (chord/3, chord/3) #The least-squares fit is unusable
+    return [p0, _along(p0, tangent1, alpha1), _along(p3, tangent2, alpha2), p3]
+
+def _maxerror(points, first, last, curve, params):
+    '''Not intended to be called by end users. Returns the square of the greatest distance of a point from the curve,
+    and the index of that point (which is never `first` or `last`).'''
+    (maxerror, split) = (0, (first+last)//2)
+    for j in range(1, last-first):
+        (x, y) = _bezier(curve, params[j])
+        (px, py) = points[first+j]
+        error = (x-px)*(x-px) + (y-py)*(y-py)
+        if error > maxerror: (maxerror, split) = (error, first+j)
+    return (maxerror, split)
+
+def _newtonstep(curve, point, u):
+    '''Not intended to be called by end users. Returns a better parameter for the point on the curve nearest to `point`.'''
+    (p0, p1, p2, p3) = curve
+    (qx, qy) = _bezier(curve, u)
+    v = 1-u
+    (d1x, d1y) = (3*(v*v*(p1[0]-p0[0]) + 2*u*v*(p2[0]-p1[0]) + u*u*(p3[0]-p2[0])),
+                  3*(v*v*(p1[1]-p0[1]) + 2*u*v*(p2[1]-p1[1]) + u*u*(p3[1]-p2[1])))
+    (d2x, d2y) = (6*(v*(p2[0]-2*p1[0]+p0[0]) + u*(p3[0]-2*p2[0]+p1[0])),
+                  6*(v*(p2[1]-2*p1[1]+p0[1]) + u*(p3[1]-2*p2[1]+p1[1])))
+    (ex, ey) = (qx-point[0], qy-point[1])
+    denominator = d1x*d1x + d1y*d1y + ex*d2x + ey*d2y
+    if denominator == 0: return u
+    return min(1, max(0, u - (ex*d1x + ey*d1y)/denominator))
+
+def _chordlengths(points, first, last):
+    '''Not intended to be called by end users. Returns parameters for the points, proportional to the distance along the polyline.'''
+    lengths = [0]
+    for i in range(first+1, last+1):
+        (x1, y1), (x2, y2) = points[i-1], points[i]
+        lengths.append(lengths[-1] + hypot(x2-x1, y2-y1))
+    total = lengths[-1]
+    return [length/total for length in lengths]
+
+def _bezier(curve, u):
+    '''Not intended to be called by end users.'''
+    (p0, p1, p2, p3) = curve
+    v = 1-u
+    (b0, b1, b2, b3) = (v*v*v, 3*u*v*v, 3*u*u*v, u*u*u)
+    return (b0*p0[0] + b1*p1[0] + b2*p2[0] + b3*p3[0], b0*p0[1] + b1*p1[1] + b2*p2[1] + b3*p3[1])
+
+def _unit(start, end):
+    '''Not intended to be called by end users. Returns the unit vector from `start` towards `end`.'''
+    (dx, dy) = (end[0]-start[0], end[1]-start[1])
+    d = hypot(dx, dy)
+    return (dx/d, dy/d) if d else (0, 0)
+
+def _along(point, direction, distance):
+    '''Not intended to be called by end users.'''
+    return (point[0] + direction[0]*distance, point[1] + direction[1]*distance)
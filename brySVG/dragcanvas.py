@@ -6,15 +6,34 @@
 # For details, see the LICENSE file in this repository                        #
 
 import time
+from collections import deque
 from browser import document, alert, window
 import browser.svg as svg
 import browser.html as html
 from math import sin, cos, atan2, pi, hypot, floor, log10
+import brySVG.scene as scene
+import brySVG.svgexport as svgexport
+import brySVG.svgimport as svgimport
+import brySVG.oplog as oplog
+import brySVG.textmetrics as textmetrics
+import brySVG.textlayout as textlayout
+import brySVG.flatten as flatten
+import brySVG.timings as timings
+import brySVG.inputlog as inputlog
+from brySVG.geometry import Point, Matrix, roundsf
+import brySVG.geometry as geometry
 svgbase = svg.svg(width=0, height=0)
 basepoint = svgbase.createSVGPoint()
 lasttaptime = 0
 MOUSEEVENTS = ["mousedown", "mousemove", "mouseup", "click"]
 TOUCHEVENTS = ["touchstart", "touchmove", "touchend"]
+HITTARGETWIDTH = "var(--hittargetwidth)" #stroke-width of hit targets, set for the whole canvas by canvas._setHitTargetWidth()
+CANVASSTYLE = ".nonscalingstroke * {vector-effect: non-scaling-stroke;}"
+#Rough sizes in bytes, used by canvas.stats() to estimate the memory taken by geometry
+POINTBYTES = 100 #A Point (an object holding a list of two numbers)
+DOMPOINTBYTES = 8 #A vertex of a polygon which is only held by the DOM (two 32-bit floats)
+SEGMENTBYTES = 60 #A cached Segment of a polygon (which refers to existing Points)
+PATHSEGMENTBYTES = 40 #The cached path command for one segment of a Bezier curve
 
 class Enum(list):
     def __init__(self, name, string):
@@ -29,11 +48,43 @@ Position = Enum ('Position', 'CONTAINS INSIDE OVERLAPS EQUAL DISJOINT')
 
 class ObjectMixin(object):
     '''Methods which are applicable to all (or almost all) XxxObjects defined in this module.'''
+    _pendingMatrix = None #An SVGMatrix which has been rendered, but not yet applied to the object's geometry
+    _sharedGeometry = False #True if the object's geometry lists may also belong to a clone (see cloneObject)
+
+    @property
+    def pointList(self):
+        pointlist = self._pointList #Raises AttributeError for objects which have no pointList
+        if self._hasPending():
+            self._materialise()
+            pointlist = self._pointList
+        return pointlist
+
+    @pointList.setter
+    def pointList(self, pointlist):
+        if self._hasPending(): self._materialise()
+        self._pointList = pointlist
+
+    @property
+    def pointsetList(self):
+        pointsetlist = self._pointsetList #Raises AttributeError for objects which have no pointsetList
+        if self._hasPending():
+            self._materialise()
+            pointsetlist = self._pointsetList
+        return pointsetlist
+
+    @pointsetList.setter
+    def pointsetList(self, pointsetlist):
+        if self._hasPending(): self._materialise()
+        self._pointsetList = pointsetlist
 
     def cloneObject(self):
         '''Returns a clone of an object, including the extra functionality provided by this module.
         If that functionality is not needed, it is better to call the DOM method `canvas.cloneNode(object)`,
-        as that is much faster. Not valid for `UseObjects`, `TextObjects` or `WrappingTextObjects`.'''
+        as that is much faster. Not valid for `UseObjects`, `TextObjects` or `WrappingTextObjects`.
+        (If an `ImageObject` is cloned before its image has loaded, the clone is positioned as the original was when it was created.)
+        The clone shares the lists of points of the original until either of them is edited, so cloning takes the same time
+        however many points the object has.'''
+        self._materialise()
         if isinstance(self, GroupObject):
             newobject = self.__class__()
             for obj in self.objectList:
@@ -42,11 +93,13 @@ class ObjectMixin(object):
                     newobject <= newobj
                     newobj.group = newobject
                     newobject.objectList.append(newobj)
+        elif isinstance(self, ImageObject) and not self.imageloaded: #The clone is positioned in the same way when the image loads
+            newobject = self.__class__(self.attrs.get("href"), *getattr(self, "_imageargs", ()))
         elif isinstance(self, ObjectMixin):
-            if isinstance(self, ImageObject) and not self.imageloaded: raise RuntimeError("ImageObject cannot be cloned until fully loaded")
             #print("Cloning a", self.__class__)
             newobject = self.__class__()
-            for attrname in ["XY", "pointList", "pointsetList", "angle", "fixed", "rotatestring", "centre", "_width", "_height",
+            self._sharegeometry(newobject)
+            for attrname in ["XY", "angle", "fixed", "rotatestring", "centre", "_width", "_height",
                              "currentAspectRatio", "imageWidth", "imageHeight", "imageAspectRatio", "imageloaded",
                              "startangle", "endangle", "radius"]:
                 attr = getattr(self, attrname, "NO_SUCH_ATTRIBUTE")
@@ -63,6 +116,32 @@ class ObjectMixin(object):
         newobject.id = ""
         return newobject
 
+    def _sharegeometry(self, newobject):
+        '''Not intended to be called by end users. Gives `newobject` (a clone) the same lists of points as this object.
+        Points are never changed in place, so the lists only need to be copied (by `_unshare`) before one of the objects edits them.'''
+        shared = False
+        for attrname in ["_pointList", "_pointsetList", "_pathsegments"]:
+            attr = getattr(self, attrname, None)
+            if attr is None: continue
+            setattr(newobject, attrname, attr)
+            shared = True
+        if isinstance(self, BezierObject): #The clone's path is the same, so the cached flattened curve is still valid
+            newobject._geometryversion = self._geometryversion
+            newobject._flattened = getattr(self, "_flattened", None)
+        if shared: self._sharedGeometry = newobject._sharedGeometry = True
+
+    def _unshare(self):
+        '''Not intended to be called by end users. Gives the object its own copies of any lists of points it shares with a clone,
+        so that they can be changed in place. Must be called before the lists are changed (not after they have been read).'''
+        if not self._sharedGeometry: return
+        self._sharedGeometry = False
+        pointlist = getattr(self, "_pointList", None)
+        if pointlist is not None: self._pointList = list(pointlist)
+        pointsetlist = getattr(self, "_pointsetList", None)
+        if pointsetlist is not None: self._pointsetList = [list(pointset) for pointset in pointsetlist]
+        segments = getattr(self, "_pathsegments", None)
+        if segments is not None: self._pathsegments = list(segments)
+
     def setPointList(self, pointlist):
         '''Change the shape of an object by replacing its `pointList`. Not valid for `PointObjects`, `UseObjects`, `TextObjects` or `WrappingTextObjects`.'''
         self.pointList = [Point(coords) for coords in pointlist]
@@ -78,10 +157,15 @@ class ObjectMixin(object):
         '''Not intended to be called by end users.'''
         hittarget = getattr(self, "hitTarget", None)
         if hittarget:
+            hittarget.style.transform = "" #Remove any pending transform which was rendered on the hit target
             hittarget.pointList = self.pointList
-            if isinstance(self, BezierObject): hittarget.pointsetList = self.pointsetList
             if isinstance(self, (RectangleObject, EllipseObject, ImageObject, UseObject)): hittarget.angle = self.angle
-            hittarget._update()
+            if isinstance(self, BezierObject):
+                hittarget.pointsetList = self.pointsetList
+                hittarget._pathsegments = self._pathsegments #The path is the same, so its commands are not recalculated
+                hittarget._setpath()
+            else:
+                hittarget._update()
 
     def _transformedpointlist(self, matrix):
         '''Not intended to be called by end users.'''
@@ -92,6 +176,202 @@ class ObjectMixin(object):
             newpointlist.append(Point((newpt.x, newpt.y)))
         return newpointlist
 
+    def _transformedpoint(self, matrix):
+        '''Not intended to be called by end users.'''
+        (basepoint.x, basepoint.y) = self.XY
+        newpt =  basepoint.matrixTransform(matrix)
+        return Point((newpt.x, newpt.y))
+
+    def _transformedpointsetlist(self, matrix):
+        '''Not intended to be called by end users.'''
+        newpointsetlist = []
+        for pointset in self.pointsetList:
+            newpointset = []
+            for point in pointset:
+                if point is None:
+                    newpointset.append(None)
+                else:
+                    (basepoint.x, basepoint.y) = point
+                    newpt = basepoint.matrixTransform(matrix)
+                    newpointset.append(Point((newpt.x, newpt.y)))
+            newpointsetlist.append(newpointset)
+        return newpointsetlist
+
+    def _applyMatrix(self, matrix):
+        '''Not intended to be called by end users. Transforms the geometry of the object immediately.'''
+        if isinstance(self, PointObject):
+            self.XY = self._transformedpoint(matrix)
+        elif isinstance(self, PolygonObject):
+            self._transformpoints(self.points, matrix)
+            self._pointList = None
+            self._segments = None
+        elif hasattr(self, "pointList"):
+            self.pointList = self._transformedpointlist(matrix)
+            if isinstance(self, BezierObject): self.pointsetList = self._transformedpointsetlist(matrix)
+            self._update()
+        else: #Objects without geometry (eg TextObjects) just keep the transform on the element
+            self._deferMatrix(matrix)
+            return
+        self._updatehittarget()
+
+    def bake(self):
+        '''Applies any transforms which are pending on the object (or on its members if it is a group) to its geometry.
+        This happens automatically whenever the geometry is read, so it is only needed to control when the work is done.'''
+        self._materialise()
+        if isinstance(self, GroupObject):
+            for obj in self.objectList:
+                if isinstance(obj, ObjectMixin): obj.bake()
+
+    def _deferMatrix(self, matrix):
+        '''Not intended to be called by end users. Records a transform which will be applied to the geometry of the object
+        when the geometry is next read; until then it is rendered using the element's CSS transform.'''
+        self._materialiseGroups() #A group's pending transform must be applied before the new transform
+        self._pendingMatrix = matrix if self._pendingMatrix is None else matrix.multiply(self._pendingMatrix)
+        self.style.transform = self._transformstring()
+        canvas = getattr(self, "canvas", None)
+        if canvas is None: return
+        #Hit targets are not inside the object, so they have to be given the transform separately. The hit targets of a group's
+        #members are inside a container which has the group's transform (see canvas._hittargetparent), so this is one DOM write
+        #however many members the group has
+        if isinstance(self, GroupObject):
+            container = getattr(self, "hitTargetGroup", None)
+            if container is not None: container.style.transform = self._pendingstring()
+            return
+        hittarget = canvas.hittargets.get(self.id)
+        if hittarget is not None: hittarget.style.transform = self._pendingstring() + hittarget._transformstring()
+
+    def _hasPending(self):
+        '''Not intended to be called by end users. Returns True if there is a transform pending on the object,
+        or on any group which contains it.'''
+        obj = self
+        while obj is not None:
+            if obj._pendingMatrix is not None: return True
+            obj = getattr(obj, "group", None)
+        return False
+
+    def _totalPending(self):
+        '''Not intended to be called by end users. Returns the combined transform pending on the object and the groups containing it.'''
+        matrix = None
+        obj = self
+        while obj is not None:
+            if obj._pendingMatrix is not None:
+                matrix = obj._pendingMatrix if matrix is None else obj._pendingMatrix.multiply(matrix)
+            obj = getattr(obj, "group", None)
+        return matrix
+
+    def _materialise(self):
+        '''Not intended to be called by end users. Applies any transforms pending on the object,
+        or on the groups which contain it, to the object's geometry.'''
+        self._materialiseGroups()
+        if self._pendingMatrix is None: return
+        tt = timings.start()
+        matrix = self._pendingMatrix
+        self._pendingMatrix = None
+        self.style.transform = self._transformstring()
+        if getattr(self, "hitTargetGroup", None) is not None: self.hitTargetGroup.style.transform = ""
+        self._applyMatrix(matrix)
+        timings.lap("DOM-materialise", tt)
+
+    def _materialiseGroups(self):
+        '''Not intended to be called by end users. Applies any transforms pending on the groups which contain the object.'''
+        group = getattr(self, "group", None)
+        if group is not None and group._hasPending(): group._materialise()
+
+    def _transformstring(self):
+        '''Not intended to be called by end users. Returns the CSS transform which the element should currently have.'''
+        return self._pendingstring() + getattr(self, "rotatestring", "") + getattr(self, "scalestring", "")
+
+    def _pendingstring(self):
+        '''Not intended to be called by end users. Returns the CSS transform for the object's own pending transform (or "").'''
+        m = self._pendingMatrix
+        return "" if m is None else f"matrix({m.a},{m.b},{m.c},{m.d},{m.e},{m.f}) "
+
+    def _transform(self, matrix, angle=0):
+        '''Not intended to be called by end users. Adds `angle` to the angle of shapes which have one, composes `matrix`
+        with any pending transform, and records the change in the canvas's operation log.'''
+        self._materialiseGroups() #So that the angle is not changed before a group's pending transform is applied
+        if angle and isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)): self.angle += angle
+        self._deferMatrix(matrix)
+        self._logOperation({"op":"transform", "id":self.id, "matrix":[matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f], "angle":angle})
+
+    def _operationlog(self):
+        '''Not intended to be called by end users. Returns the operation log which should record changes to the object, or None.'''
+        canvas = getattr(self, "canvas", None)
+        if getattr(canvas, "operationLog", None) is None: return None
+        return canvas._getOperationLog(self)
+
+    def _logOperation(self, op):
+        '''Not intended to be called by end users.'''
+        log = self._operationlog()
+        if log is not None: log.record(op)
+
+    def _vertexdata(self, indices=None):
+        '''Not intended to be called by end users. Returns the vertices (for Bezier objects, the pointsets) as lists of coordinates,
+        in the form used by `brySVG.oplog`. If `indices` is given, only the vertices at those indices are returned.'''
+        vertices = self.pointsetList if isinstance(self, BezierObject) else self.pointList
+        if indices is not None: vertices = [vertices[i] for i in indices]
+        if isinstance(self, BezierObject): return [[None if point is None else list(point) for point in pointset] for pointset in vertices]
+        return [list(point) for point in vertices]
+
+    def _setvertexdata(self, vertices):
+        '''Not intended to be called by end users. Replaces the vertices (for Bezier objects, the pointsets) by `vertices`,
+        given in the form returned by `_vertexdata()`.'''
+        if isinstance(self, BezierObject):
+            self.pointsetList = [[None if coords is None else Point(coords) for coords in pointset] for pointset in vertices]
+            self.pointList = [pointset[1] for pointset in self.pointsetList]
+            self._update()
+            self._updatehittarget()
+        else:
+            self.setPointList(vertices)
+            if isinstance(self, PolygonObject): self._updatehittarget()
+
+    def _snappoints(self):
+        '''Not intended to be called by end users. Returns the points which can be snapped to or from,
+        or None if the object cannot take part in vertex snapping.'''
+        return getattr(self, "pointList", None)
+
+    def _boundingbox(self):
+        '''Not intended to be called by end users. Returns the coordinates of the top-left and bottom-right of the object.'''
+        self._materialise() #getBBox does not take account of pending transforms
+        bbox = self.getBBox()
+        return ((bbox.x, bbox.y), (bbox.x+bbox.width, bbox.y+bbox.height))
+
+    def _logDeletion(self, log, before, start, end):
+        '''Not intended to be called by end users. Records the deletion of the vertices `before[start:end]`.'''
+        (start, end, step) = slice(start, end).indices(len(before))
+        log.record(oplog.vertexOp("deletevertices", self.id, before, self._vertexdata(), start, end-start))
+
+    def _getRecord(self, objtype):
+        '''Not intended to be called by end users. Returns a dict describing the object, in the form used by `brySVG.scene`.'''
+        self._materialise()
+        record = {"type":objtype}
+        if self.id: record["id"] = self.id
+        if getattr(self, "fixed", False): record["fixed"] = True
+        style = {}
+        for i in range(self.style.length):
+            name = self.style.item(i)
+            if name != "transform": style[name] = self.style.getPropertyValue(name) #Transforms are recalculated from the geometry
+        if style: record["style"] = style
+
+        if isinstance(self, GroupObject):
+            record["objects"] = [_getrecord(obj) for obj in self.objectList]
+        elif isinstance(self, PointObject):
+            record["points"] = list(self.XY)
+            record["size"] = float(self.attrs["r"])
+        elif isinstance(self, BezierObject):
+            record["points"] = [coord for pointset in self.pointsetList for point in pointset if point is not None for coord in point]
+        elif isinstance(self, UseObject):
+            record.update({"href":self.attrs["href"], "centre":list(self.centre), "width":self._width, "height":self._height, "angle":self.angle})
+            record.update({"origin":list(self.origin), "scale":[self._width/self._origwidth, self._height/self._origheight]}) #Used by svgexport
+        else:
+            if isinstance(self, ImageObject):
+                if not self.imageloaded: raise RuntimeError("ImageObject cannot be saved until fully loaded")
+                record["href"] = self.attrs["href"]
+            record["points"] = [coord for point in self.pointList for coord in point]
+            if isinstance(self, (RectangleObject, EllipseObject, ImageObject)): record["angle"] = self.angle
+            if isinstance(self, SectorObject): record.update({"radius":self.radius, "startangle":self.startangle, "endangle":self.endangle})
+        return record
+
     def __repr__(self):
         return f"{self.__class__}{self.id}"
 
@@ -114,6 +394,28 @@ class SmoothBezierMixin(object):
         c2 = ((c2x+x2)/2, (c2y+y2)/2)
         return (Point(c1), Point(c2))
 
+    def _controlwindow(self, indices):
+        '''Not intended to be called by end users. Returns the indices of the pointsets whose control points depend on
+        the vertices at `indices`.'''
+        L = len(self.pointList)
+        if isinstance(self, ClosedBezierObject): return sorted({j%L for i in indices for j in range(i-1, i+2)})
+        return sorted({j for i in indices for j in range(i-2, i+3) if 0 <= j < L}) #The end control points depend on 3 vertices
+
+    def _updatecontrolpoints(self, indices):
+        '''Not intended to be called by end users. Recalculates only the control points which depend on the vertices at
+        `indices` (which have been moved, or are next to vertices which have been inserted or deleted), and updates the path.
+        `pointsetList` must already have the same length as `pointList`.'''
+        self._unshare()
+        pointlist = self.pointList
+        if len(pointlist) < 3:
+            self.pointsetList = self._getpointsetlist(pointlist)
+            self._update()
+            return
+        pointsetlist = self.pointsetList
+        window = self._controlwindow(indices)
+        for j in window: pointsetlist[j] = self._pointset(pointlist, j)
+        self._updatepath(window)
+
     '''The following XxxObject classes share various common parameters and attributes.
     ###Common Parameters
     When created, as well as the paramters listed for each type of Object, they all share the following optional parameters:
@@ -159,7 +461,32 @@ class LineObject(svg.line, ObjectMixin):
         self.attrs["x2"] = x2
         self.attrs["y2"] = y2
 
-class TextObject(svg.text, ObjectMixin):
+class TextMixin(object):
+    '''Methods for TextObject and WrappingTextObject. Their size is worked out from font metrics (see `brySVG.textlayout`),
+    so they can be snapped to without the text being measured in the page.'''
+    def getBoundingBox(self):
+        '''Returns the coordinates of the top-left and bottom-right of the text (which need not yet be on the canvas).'''
+        corners = self._snappoints()
+        xcoords = [x for (x, y) in corners]
+        ycoords = [y for (x, y) in corners]
+        return ((min(xcoords), min(ycoords)), (max(xcoords), max(ycoords)))
+
+    def _snappoints(self):
+        '''Not intended to be called by end users. Returns the corners of the box containing the text,
+        including the effect of any pending transform.'''
+        canvas = getattr(self, "canvas", None)
+        metrics = canvas.getFontMetrics() if canvas is not None else textmetrics.getMetrics()
+        ((x1, y1), (x2, y2)) = self.textLayout.bbox(metrics)
+        corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+        m = self._totalPending()
+        if m is not None: corners = [(m.a*x+m.c*y+m.e, m.b*x+m.d*y+m.f) for (x, y) in corners]
+        return [Point(corner) for corner in corners]
+
+    def _boundingbox(self):
+        '''Not intended to be called by end users.'''
+        return self.getBoundingBox()
+
+class TextObject(svg.text, TextMixin, ObjectMixin):
     '''A multiline textbox.  Use "\n" within string to separate lines. To make sure the font-size is not affected by the scaling of the
     canvas, set ignorescaling to True, and specify the canvas on which the object will be placed.
     The box is placed at the coordinates given by anchorpoint; the anchorposition can be from 1 to 9:
@@ -167,68 +494,31 @@ class TextObject(svg.text, ObjectMixin):
     4  5  6
     7  8  9'''
     def __init__(self, string="", anchorpoint=(0,0), anchorposition=1, fontsize=12, linecolour="none", linewidth=1, textcolour="black", ignorescaling=False, canvas=None, objid=None):
-        (x, y) = anchorpoint
-        stringlist = string.split("\n")
-        rowcount = len(stringlist)
-        if anchorposition in [3, 6, 9]:
-            horizpos = "end"
-        elif anchorposition in [2, 5, 8]:
-            horizpos = "middle"
-        else:
-            horizpos = "start"
         lineheight = fontsize*1.2
         if ignorescaling and canvas:
             fontsize *= canvas.scaleFactor
             lineheight *= canvas.scaleFactor
-        if anchorposition in [1, 2, 3]:
-            yoffset = fontsize
-        elif anchorposition in [4, 5, 6]:
-            yoffset = fontsize - lineheight*rowcount/2
-        else:
-            yoffset = fontsize - lineheight*rowcount
-
-        svg.text.__init__(self, stringlist[0], x=x, y=y+yoffset, font_size=fontsize, text_anchor=horizpos, style={"stroke":linecolour, "stroke-width":linewidth, "fill":textcolour})
-        for s in stringlist[1:]:
-            self <= svg.tspan(s, x=x, dy=lineheight)
+        layout = self.textLayout = textlayout.layout(string, anchorpoint, anchorposition, fontsize, lineheight)
+        svg.text.__init__(self, layout.lines[0], x=layout.x, y=layout.y, font_size=fontsize, text_anchor=layout.textanchor, style={"stroke":linecolour, "stroke-width":linewidth, "fill":textcolour})
+        for s in layout.lines[1:]:
+            self <= svg.tspan(s, x=layout.x, dy=lineheight)
         if objid: self.id = objid
 
-class WrappingTextObject(svg.text):
+class WrappingTextObject(svg.text, TextMixin, ObjectMixin):
     '''See TextObject above for explanation of most of the parameters; however, note that canvas must be specified.
-    A width in SVG units is also specified, and text will be wrapped at word boundaries to fit that width.'''
+    A width in SVG units is also specified, and text will be wrapped at word boundaries to fit that width.
+    (Use "\n" to start a new paragraph. The lines are worked out from the canvas's cached font metrics,
+    so the text does not have to be measured in the page.)'''
     def __init__(self, canvas, string, anchorpoint, width, anchorposition=1, fontsize=12, linecolour="none", linewidth=1, textcolour="black", style="normal", ignorescaling=False, objid=None):
-        (x, y) = anchorpoint
         lineheight = fontsize*1.2
         if ignorescaling:
             fontsize *= canvas.scaleFactor
             lineheight *= canvas.scaleFactor
-        words = string.split()
-        svg.text.__init__(self, "", x=x, font_size=fontsize, style={"stroke":linecolour, "stroke-width":linewidth, "fill":textcolour})
+        layout = self.textLayout = textlayout.layout(string, anchorpoint, anchorposition, fontsize, lineheight, width, canvas.getFontMetrics())
+        svg.text.__init__(self, "", x=layout.x, y=layout.y, font_size=fontsize, text_anchor=layout.textanchor, style={"stroke":linecolour, "stroke-width":linewidth, "fill":textcolour})
         canvas <= self
-        tspan = svg.tspan(words.pop(0), x=x, dy=0)
-        self <= tspan
-        rowcount = 1
-        for word in words:
-            tspan.text += " "+word
-            if tspan.getComputedTextLength() > width:
-                tspan.text = tspan.text[:-len(word)-1]
-                tspan = svg.tspan(word, x=x, dy=lineheight)
-                self <= tspan
-                rowcount += 1
-
-        if anchorposition in [3, 6, 9]:
-            horizpos = "end"
-        elif anchorposition in [2, 5, 8]:
-            horizpos = "middle"
-        else:
-            horizpos = "start"
-        self.attrs["text-anchor"] = horizpos
-        if anchorposition in [1, 2, 3]:
-            yoffset = fontsize
-        elif anchorposition in [4, 5, 6]:
-            yoffset = fontsize*(1-rowcount/2)
-        else:
-            yoffset = fontsize*(1-rowcount)
-        self.attrs["y"] = y+yoffset
+        for (i, line) in enumerate(layout.lines):
+            self <= svg.tspan(line, x=layout.x, dy=0 if i == 0 else lineheight)
         if objid: self.id = objid
 
 class PolylineObject(svg.polyline, ObjectMixin):
@@ -262,6 +552,7 @@ class PolygonObject(svg.polygon, ObjectMixin):
 
     @property
     def pointList(self):
+        if self._hasPending(): self._materialise()
         if getattr(self, "_pointList", None) is None:
             #print(f"calculating pointList for {self}")
             P = self.points
@@ -271,28 +562,23 @@ class PolygonObject(svg.polygon, ObjectMixin):
 
     @pointList.setter
     def pointList(self, pointlist):
+        if self._hasPending(): self._materialise()
         self._pointList = [Point(coords) for coords in pointlist]
         self._update()
 
     def setPointList(self, pointlist):
+        if self._hasPending(): self._materialise()
         self._pointList = [Point(coords) for coords in pointlist]
         self._update()
 
     def cloneObject(self):
+        self._materialise()
         newobject = self.__class__()
-        for key in self.attrs:
+        for key in self.attrs: #Includes the points attribute, so the SVG points do not need to be copied one by one
             value = self.attrs[key]
             newobject.attrs[key] = value
         newobject.id = ""
-
-        P = self.points
-        P2 = newobject.points
-        L = P.numberOfItems
-        P2.clear()
-        for i in range(L):
-            pt = P.getItem(i)
-            P2.appendItem(pt)
-
+        self._sharegeometry(newobject)
         return newobject
 
     def _transformpoints(self, points, matrix):
@@ -331,6 +617,7 @@ class RectangleObject(svg.rect, ObjectMixin):
         '''Change the position, size, and/or angle of the rectangle.
         If only one of `width` and `height` is specified, and `preserveaspectratio` is set to `True`,
         the other will be set so that the rectangle keeps its current aspect ratio.'''
+        self._materialise()
         if centre: self.centre = Point(centre)
         if width:
             self._width = width
@@ -396,6 +683,7 @@ class EllipseObject(svg.ellipse, ObjectMixin):
         '''Change the position, size, and/or angle of the ellipse.
         If only one of `width` and `height` is specified, and `preserveaspectratio` is set to `True`,
         the other will be set so that the ellipse keeps its current aspect ratio.'''
+        self._materialise()
         if centre: self.centre = Point(centre)
         if width:
             self._width = width
@@ -490,22 +778,20 @@ class UseObject(svg.use, ObjectMixin):
     `height` required height of the object(before any rotation)
     (If only one of `width` and `height` is specified, the other will be set so that the object keeps its actual aspect ratio.
     If neither is specified, the object will be displayed at its actual size.)
-    `angle`: an optional angle of rotation (clockwise, in degrees).'''
+    `angle`: an optional angle of rotation (clockwise, in degrees).
+    `scale`: if neither `width` nor `height` is specified, a scale factor (or a pair of factors `(xscale, yscale)`)
+    for the actual size of the object.
+    The size of the object being cloned is measured only once for each `href` (see `clearUseGeometry()`).'''
     def __init__(self, href=None, origin=None, centre=(0,0), width=None, height=None, angle=0, scale=None, objid=None):
         svg.use.__init__(self, href=href)
-        document <= svgbase
-        tempgroup = svg.g() #Needed to overcome bug in iPad getBBox implementation
-        tempgroup <= self
-        svgbase <= tempgroup
-        bbox = tempgroup.getBBox()
-        svgbase.removeChild(tempgroup)
-        document.body.removeChild(svgbase)
-        self._origwidth = bbox.width
-        self._origheight = bbox.height
+        (x, y, self._origwidth, self._origheight) = _usegeometry(href, self)
         self._origaspectratio = self._origheight/self._origwidth
-        (cx, cy) = (bbox.x+bbox.width/2, bbox.y+bbox.height/2)
+        (cx, cy) = (x+self._origwidth/2, y+self._origheight/2)
         self.originoffset = Point((-cx, -cy))
 
+        if scale and not (width or height):
+            (xscale, yscale) = scale if isinstance(scale, (list, tuple)) else (scale, scale)
+            (width, height) = (self._origwidth*xscale, self._origheight*yscale)
         if width and height:
             (self._width, self._height) = (width, height)
         elif width:
@@ -530,6 +816,7 @@ class UseObject(svg.use, ObjectMixin):
         If both `origin` and `centre`are specified, the `origin` is used.
         If only one of `width` and `height` is specified, and `preserveaspectratio` is set to `True`,
         the other will be set so that the object keeps its current aspect ratio.'''
+        self._materialise()
         if width:
             self._width = width
             if preserveaspectratio and not height: self._height = width*self.currentAspectRatio
@@ -564,6 +851,92 @@ class UseObject(svg.use, ObjectMixin):
         self.origin = self.centre + self.originoffset
         (self.attrs["x"], self.attrs["y"]) = self.origin
 
+_usegeometries = {} #(x, y, width, height) of the objects cloned by UseObjects, keyed by href
+
+def _usegeometry(href, useobject):
+    '''Not intended to be called by end users. Returns the bounding box of the object referred to by `href`,
+    measuring it (using `useobject`, which is not yet on the canvas) only if it has not been measured before.'''
+    geometry = _usegeometries.get(href)
+    if geometry is not None: return geometry
+    document <= svgbase
+    tempgroup = svg.g() #Needed to overcome bug in iPad getBBox implementation
+    tempgroup <= useobject
+    svgbase <= tempgroup
+    bbox = tempgroup.getBBox()
+    svgbase.removeChild(tempgroup)
+    document.body.removeChild(svgbase)
+    geometry = (bbox.x, bbox.y, bbox.width, bbox.height)
+    if bbox.width and bbox.height: _usegeometries[href] = geometry #An object which is not yet in the document is measured again
+    return geometry
+
+def clearUseGeometry(href=None):
+    '''Forget the measured size of the object referred to by `href` (or of all objects, if `href` is `None`),
+    so that new `UseObjects` will measure it again. This is done automatically when an object in a `Definitions` is changed.'''
+    if href is None:
+        _usegeometries.clear()
+    else:
+        _usegeometries.pop(href, None)
+
+class ImageCache(object):
+    '''Loads the images used by `ImageObjects`, and remembers their actual sizes, so that each file is loaded and measured
+    only once however many `ImageObjects` use it. There is one `ImageCache`, `imageCache`, for all canvases.
+    `maxConcurrent`: the number of files which may be loading at the same time (the others wait their turn).'''
+    def __init__(self, maxconcurrent=6):
+        self.maxConcurrent = maxconcurrent
+        self.sizes = {} #(width, height) of each image which has been loaded, keyed by href
+        self.callbacks = {} #Functions waiting for each image which is loading (or queued), keyed by href
+        self.queue = deque()
+        self.loading = 0
+
+    def getSize(self, href):
+        '''Returns the actual `(width, height)` of the image at `href`, or `None` if it has not been loaded.'''
+        return self.sizes.get(href)
+
+    def load(self, href, callback=None):
+        '''Loads the image at `href` if it has not already been loaded (or requested), then calls `callback(size)`,
+        where `size` is the `(width, height)` of the image, or `None` if it could not be loaded.
+        If the image has already been loaded, `callback` is called immediately.'''
+        size = self.sizes.get(href)
+        if size is not None:
+            if callback: callback(size)
+            return
+        if href not in self.callbacks:
+            self.callbacks[href] = []
+            self.queue.append(href)
+        if callback: self.callbacks[href].append(callback)
+        self._loadnext()
+
+    def preload(self, hrefs, callback=None):
+        '''Loads all the images in `hrefs` (eg at startup, so that `ImageObjects` using them can be positioned immediately),
+        then calls `callback()` once they have all loaded (or failed).'''
+        hrefs = list(set(hrefs))
+        remaining = len(hrefs)
+        def loaded(size):
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0 and callback: callback()
+        if not hrefs and callback: callback()
+        for href in hrefs: self.load(href, loaded)
+
+    def _loadnext(self):
+        '''Not intended to be called by end users.'''
+        while self.queue and self.loading < self.maxConcurrent:
+            href = self.queue.popleft()
+            self.loading += 1
+            img = html.IMG()
+            img.bind("load", lambda event, href=href, img=img: self._loaded(href, (img.naturalWidth, img.naturalHeight)))
+            img.bind("error", lambda event, href=href: self._loaded(href, None))
+            img.attrs["src"] = href
+
+    def _loaded(self, href, size):
+        '''Not intended to be called by end users.'''
+        self.loading -= 1
+        if size is not None: self.sizes[href] = size #Failures are not remembered, so that a later request tries again
+        for callback in self.callbacks.pop(href, []): callback(size)
+        self._loadnext()
+
+imageCache = ImageCache()
+
 class ImageObject(svg.image, ObjectMixin):
     '''Wrapper for SVG `image` element.  Parameters:
     `href`: the path to the file containing the image
@@ -575,12 +948,14 @@ class ImageObject(svg.image, ObjectMixin):
         `height` required height of the image (before any rotation)
     (If only one of `width` and `height` is specified, the other will be set so that the image keeps its actual aspect ratio.
     If neither is specified, the image will be displayed at its actual size.)
-    `angle`: an optional angle of rotation (clockwise, in degrees). '''
+    `angle`: an optional angle of rotation (clockwise, in degrees).
+    The actual size of the image is found using `imageCache`, so if the file has already been loaded (for example by
+    another `ImageObject`, or by `imageCache.preload()`), the image is positioned immediately.'''
     def __init__(self, href=None, pointlist=None, centre=(0,0), width=0, height=None, angle=0, objid=None):
-        def initialise(event):
+        def initialise(size):
             nonlocal width, height
-            self.imageWidth = img.naturalWidth
-            self.imageHeight = img.naturalHeight
+            if size is None: return #The file could not be loaded
+            (self.imageWidth, self.imageHeight) = size
             #print("Image size", self.imageWidth, self.imageHeight)
             self.imageAspectRatio = self.imageHeight/self.imageWidth
 
@@ -611,9 +986,8 @@ class ImageObject(svg.image, ObjectMixin):
         self.style.visibility = "hidden"
         if not href: return
         self.attrs["href"] = href
-        img = html.IMG()
-        img.bind("load", initialise)
-        img.attrs["src"] = href
+        self._imageargs = (pointlist, centre, width, height, angle) #Used to clone the object before it is loaded
+        imageCache.load(href, initialise)
 
     def setPosition(self, centre=None, width=None, height=None, angle=None, preserveaspectratio=False):
         '''Change the position, size, and/or angle of the image.
@@ -621,6 +995,7 @@ class ImageObject(svg.image, ObjectMixin):
         the other will be set so that the image keeps its current aspect ratio.'''
         def set_position(event=None):
             #print("Starting set_position")
+            self._materialise()
             if centre: self.centre = Point(centre)
             if width:
                 self._width = width
@@ -670,6 +1045,8 @@ class BezierObject(svg.path, ObjectMixin):
     (previous-control-point, vertex, next-control-point).
     For the first vertex, the previous-control-point must be None,
     and for the last vertex, the next-control-point must be None.'''
+    _geometryversion = 0 #Increased whenever the shape changes, so that calculations based on it can be cached
+
     def __init__(self, pointsetlist=None, pointlist=[(0,0), (0,0)], linecolour="black", linewidth=1, fillcolour="none", objid=None):
         def toPoint(coords):
             return None if coords is None else Point(coords)
@@ -699,10 +1076,63 @@ class BezierObject(svg.path, ObjectMixin):
             self.pointsetList[-2][2] = cpoint
 
     def _update(self):
-        (dummy, (x1, y1), (c1x, c1y)) = self.pointsetList[0]
-        ((c2x, c2y), (x2, y2), dummy) = self.pointsetList[-1]
-        self.plist = ["M", x1, y1, "C", c1x, c1y]+[x for p in self.pointsetList[1:-1] for c in p for x in c]+[c2x, c2y, x2, y2]
-        self.attrs["d"] = " ".join(str(x) for x in self.plist)
+        pointsetlist = self.pointsetList
+        L = len(pointsetlist)
+        self._pathsegments = [self._pathsegment(pointsetlist, i) for i in range(L if isinstance(self, ClosedBezierObject) else L-1)]
+        self._setpath()
+
+    def _updatepath(self, indices):
+        '''Not intended to be called by end users. Updates the path after the pointsets at `indices` have been changed,
+        recalculating only the commands for the curves which start or end at those vertices.
+        (If vertices have been inserted or deleted, `_pathsegments` must first have been changed to match.)'''
+        self._unshare()
+        pointsetlist = self.pointsetList
+        L = len(pointsetlist)
+        segments = self._pathsegments
+        for i in {j%L for index in indices for j in (index-1, index)}:
+            if i < len(segments): segments[i] = self._pathsegment(pointsetlist, i)
+        self._setpath()
+
+    def _deletepathsegments(self, start, end, count):
+        '''Not intended to be called by end users. Removes the path commands for the curves to and from vertices
+        start to end-1 (of `count`), which have been deleted, leaving one command to be recalculated by `_updatepath`.'''
+        self._unshare()
+        if end < count or isinstance(self, ClosedBezierObject):
+            del self._pathsegments[start:end]
+        else:
+            del self._pathsegments[start-1:end-1]
+
+    def _pathsegment(self, pointsetlist, i):
+        '''Not intended to be called by end users. Returns the path command for the curve from vertex i to vertex i+1.'''
+        (c1x, c1y) = pointsetlist[i][2]
+        ((c2x, c2y), (x, y), dummy) = pointsetlist[(i+1)%len(pointsetlist)]
+        return f"C {c1x} {c1y} {c2x} {c2y} {x} {y}"
+
+    def _setpath(self):
+        '''Not intended to be called by end users.'''
+        (x, y) = self.pointsetList[0][1]
+        self.attrs["d"] = f"M {x} {y} " + " ".join(self._pathsegments)
+        self._geometryversion += 1
+
+    def getFlattened(self, tolerance=flatten.TOLERANCE):
+        '''Returns a list of points along the curve, such that the polyline through them (for closed curves, the polygon)
+        is never more than `tolerance` away from the curve. The list is cached until the shape of the curve changes.'''
+        pointsetlist = self.pointsetList #Applies any pending transform, which changes the shape
+        key = (self._geometryversion, tolerance)
+        cached = getattr(self, "_flattened", None)
+        if cached is None or cached[0] != key:
+            points = [Point(coords) for coords in flatten.flattenPointsetList(pointsetlist, isinstance(self, ClosedBezierObject), tolerance)]
+            cached = self._flattened = (key, points)
+        return cached[1]
+
+    def getBoundingBox(self):
+        '''Returns the coordinates of the top-left and bottom-right of the curve (not including its control points),
+        calculated from `getFlattened()`, so it can be used before the curve is on the canvas (unlike built-in getBBox).'''
+        return flatten.boundingBox(self.getFlattened())
+
+    def _boundingbox(self):
+        '''Not intended to be called by end users.'''
+        return self.getBoundingBox()
 
 class ClosedBezierObject(BezierObject):
     '''Wrapper for svg path element.  Parameter:
@@ -737,11 +1167,6 @@ class ClosedBezierObject(BezierObject):
             self.pointsetList[-2][2] = cpoint1
             self.pointsetList[0][0] = cpoint2
 
-    def _update(self):
-        ((c1x, c1y), (x, y), (c2x, c2y)) = self.pointsetList[0]
-        self.plist = ["M", x, y, "C", c2x, c2y] + [x for p in self.pointsetList[1:] for c in p for x in c] + [c1x, c1y, x, y]
-        self.attrs["d"] = " ".join(str(x) for x in self.plist)
-
 class SmoothBezierObject(SmoothBezierMixin, BezierObject):
     '''Wrapper for svg path element.  Parameter:
     pointlist: a list of vertices.
@@ -753,13 +1178,18 @@ class SmoothBezierObject(SmoothBezierMixin, BezierObject):
 
     def _getpointsetlist(self, pointlist):
         if len(pointlist) == 2: return [[None]+pointlist, pointlist+[None]]
-        for i in range(1, len(pointlist)-1):
-            (c1, c2) = self._calculatecontrolpoints(pointlist[i-1:i+2])
-            if i == 1:
-                pointsetlist = [[None, pointlist[0], (pointlist[0]+c1)/2]]
-            pointsetlist.append([c1, pointlist[i], c2])
-        pointsetlist.append([(pointlist[-1]+c2)/2, pointlist[-1], None])
-        return pointsetlist
+        return [self._pointset(pointlist, i) for i in range(len(pointlist))]
+
+    def _pointset(self, pointlist, i):
+        '''Not intended to be called by end users. Returns the pointset for vertex i (of at least 3).'''
+        if i == 0:
+            (c1, c2) = self._calculatecontrolpoints(pointlist[:3])
+            return [None, pointlist[0], (pointlist[0]+c1)/2]
+        if i == len(pointlist)-1:
+            (c1, c2) = self._calculatecontrolpoints(pointlist[-3:])
+            return [(pointlist[-1]+c2)/2, pointlist[-1], None]
+        (c1, c2) = self._calculatecontrolpoints(pointlist[i-1:i+2])
+        return [c1, pointlist[i], c2]
 
     def _updatepointsetlist(self):
         if len(self.pointList) == 2:
@@ -780,12 +1210,12 @@ class SmoothClosedBezierObject(SmoothBezierMixin, ClosedBezierObject):
         ClosedBezierObject.__init__(self, pointsetlist, linecolour=linecolour, linewidth=linewidth, fillcolour=fillcolour, objid=objid)
 
     def _getpointsetlist(self, pointlist):
-        pointlist = [pointlist[-1]]+pointlist[:]+[pointlist[0]]
-        pointsetlist = []
-        for i in range(1, len(pointlist)-1):
-            (c1, c2) = self._calculatecontrolpoints(pointlist[i-1:i+2])
-            pointsetlist.append([c1, pointlist[i], c2])
-        return pointsetlist
+        return [self._pointset(pointlist, i) for i in range(len(pointlist))]
+
+    def _pointset(self, pointlist, i):
+        '''Not intended to be called by end users. Returns the pointset for vertex i.'''
+        (c1, c2) = self._calculatecontrolpoints([pointlist[i-1], pointlist[i], pointlist[(i+1)%len(pointlist)]])
+        return [c1, pointlist[i], c2]
 
     def _updatepointsetlist(self):
         if len(self.pointList) == 2:
@@ -814,10 +1244,12 @@ class PointObject(svg.circle, ObjectMixin):
 
     @property
     def XY(self):
+        if self._hasPending(): self._materialise()
         return self._XY
 
     @XY.setter
     def XY(self, XY):
+        if self._hasPending(): self._materialise()
         self._XY = Point(XY)
         self.attrs["cx"] = self._XY[0]
         self.attrs["cy"] = self._XY[1]
@@ -844,6 +1276,70 @@ class RegularPolygon(PolygonObject):
         PolygonObject.__init__(self, pointlist, linecolour, linewidth, fillcolour, objid)
         if objid: self.id = objid
 
+class ObjectList(object):
+    '''Ordered collection of the objects in a `GroupObject`. It can be iterated over and indexed like a list,
+    but membership tests and removals take constant time rather than time proportional to the size of the group.
+    Objects are keyed by the objects themselves, ie by their SVG elements (which are hashed by identity).
+    The objects are also kept in a list, in order, which is rebuilt (in time proportional to the size of the group)
+    the first time it is needed after a removal, or after an append which follows an iteration. So indexing takes
+    constant time except just after such changes, and iteration does not copy the group.'''
+    __hash__ = None #Mutable, like a list
+
+    def __init__(self, objlist=()):
+        self._objects = {}
+        self._ordered = [] #The objects in order, or None if it needs rebuilding
+        self._iterating = False #True if the list has been handed to an iterator, so must not be changed in place
+        for obj in objlist: self.append(obj)
+
+    def append(self, obj):
+        if obj in self._objects: return
+        self._objects[obj] = obj
+        if self._ordered is None: return
+        if self._iterating: (self._ordered, self._iterating) = (None, False)
+        else: self._ordered.append(obj)
+
+    def extend(self, objlist):
+        for obj in objlist: self.append(obj)
+
+    def remove(self, obj):
+        try:
+            del self._objects[obj]
+        except KeyError:
+            raise ValueError(f"{obj} is not in the ObjectList")
+        self._ordered = None
+
+    def discard(self, obj):
+        if self._objects.pop(obj, None) is not None: self._ordered = None
+
+    def clear(self):
+        self._objects = {}
+        (self._ordered, self._iterating) = ([], False)
+
+    def _list(self):
+        '''Not intended to be called by end users. Returns the objects in order, rebuilding the list if necessary.'''
+        if self._ordered is None: (self._ordered, self._iterating) = (list(self._objects.values()), False)
+        return self._ordered
+
+    def __contains__(self, obj):
+        return obj in self._objects
+
+    def __iter__(self):
+        ordered = self._list()
+        self._iterating = True #Changes made during the iteration then go into a new list
+        return iter(ordered)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, i):
+        return self._list()[i]
+
+    def __eq__(self, other):
+        return self._list() == list(other)
+
+    def __repr__(self):
+        return f"ObjectList({self._list()})"
+
 class GroupObject(svg.g, ObjectMixin):
     '''Wrapper for SVG `g` element. Parameter:
     `objlist`: list of the objects to include in the group.
@@ -857,50 +1353,69 @@ class GroupObject(svg.g, ObjectMixin):
     def __init__(self, objlist=[], objid=None):
         svg.g.__init__(self)
         if not isinstance(objlist, list): objlist = [objlist]
-        self.objectList = []
+        self.objectList = ObjectList()
         self._canvas = None
         for obj in objlist:
             self.addObject(obj)
         if objid: self.id = objid
 
     def addObject(self, svgobject):
+        self._materialise()
         canvas = self.canvas
+        svgobject.group = self #Set first, so that the canvas's operation log records which group the object was added to
         if canvas is not None: canvas.addObject(svgobject)
         self <= svgobject
-        svgobject.group = self
         self.objectList.append(svgobject)
 
     def addObjects(self, objectlist):
+        self._materialise()
         canvas = self.canvas
+        log = getattr(canvas, "operationLog", None)
+        if log is not None: log.begin()
         for obj in objectlist:
+            obj.group = self
             if canvas is not None: canvas.addObject(obj)
             self <= obj
-            obj.group = self
             self.objectList.append(obj)
+        if log is not None: log.end()
 
     def _update(self):
         pass
 
+    def _applyMatrix(self, matrix):
+        '''Not intended to be called by end users. Transforms the members of the group; those which are groups
+        themselves just compose the transform with their own pending transform.'''
+        for obj in self.objectList:
+            if isinstance(obj, GroupObject):
+                obj._deferMatrix(matrix)
+            elif isinstance(obj, ObjectMixin):
+                if obj._pendingMatrix is not None: obj._materialise() #The member's own transform comes first
+                obj._applyMatrix(matrix)
+            else:
+                obj.style.transform = f"matrix({matrix.a},{matrix.b},{matrix.c},{matrix.d},{matrix.e},{matrix.f}) " + obj.style.transform
+
     def removeObject(self, svgobject):
-        if not self.contains(svgobject): return
+        if svgobject not in self.objectList: return
         self.removeChild(svgobject)
         self.objectList.remove(svgobject)
         svgobject.group = None
-        try: #If the group is on the canvas, the object needs removing from the canvas's objectDict
-            del self.canvas.objectDict[svgobject.id]
-        except (AttributeError, KeyError):
-            pass
+        #If the group is on the canvas, the object needs removing from the canvas's objectDict
+        if self.canvas is not None: self.canvas._deleteFromDict(svgobject)
 
     def deleteAll(self):
-        if self.canvas:
-            for obj in self.objectList: del self.canvas.objectDict[obj.id]
-        while self.firstChild: self.removeChild(self.firstChild)
-        self.objectList = []
+        if self.canvas is not None:
+            for obj in self.objectList: self.canvas._deleteFromDict(obj)
+        self.textContent = "" #Removes all the children in one DOM operation
+        self.objectList = ObjectList()
 
     def setStyle(self, attribute, value):
         for obj in self.objectList:
             obj.setStyle(attribute, value)
 
+    def _addMembersFromRecord(self, members, record):
+        '''Not intended to be called by end users. Adds the objects created from the member records when a scene is loaded.'''
+        self.addObjects(members)
+
     @property
     def canvas(self):
         return self._canvas
@@ -926,9 +1441,9 @@ class Button(GroupObject):
     size: (width, height) of the button
     text: text on the button. Use "\n" to insert a new line.
     onclick: function to be called when the button is clicked
-    fontsize: If this is not specified, the text will be scaled to fit the height (but not width) of the button.
+    fontsize: If this is not specified, the text will be scaled to fit the button.
     fillcolour: background colour of the button. Can be changed after creation using the setFillColour method.
-    canvas: Not used at present'''
+    canvas: If this is specified, its font metrics are used to fit the text (otherwise those of a typical sans-serif font are used).'''
     def __init__(self, position, size, text, onclick, fontsize=None, fillcolour="lightgrey", canvas=None, objid=None):
         GroupObject.__init__(self)
         if objid: self.id = objid
@@ -936,7 +1451,11 @@ class Button(GroupObject):
         self.button = RectangleObject([(x,y),(x+width, y+height)], fillcolour=fillcolour)
         self.button.attrs["rx"] = height/3
         rowcount = text.count("\n") + 1
-        if not fontsize: fontsize = height*0.75/rowcount
+        if not fontsize:
+            metrics = canvas.getFontMetrics() if canvas else textmetrics.getMetrics()
+            widest = max(metrics.textWidth(line, 1) for line in text.split("\n")) #Width of the longest line at a font size of 1
+            fontsize = height*0.75/rowcount
+            if widest: fontsize = min(fontsize, width*0.9/widest)
         self.label = TextObject(text,(x+width/2,y+height/2-fontsize/8),anchorposition=5, fontsize=fontsize)
         self.addObjects([self.button, self.label])
         self.fixed = True
@@ -999,6 +1518,18 @@ class Definitions(svg.defs):
         if filename:
             self.innerHTML = open(filename).read()
         for obj in objlist: self <= obj
+        self.observer = window.MutationObserver.new(self._onMutation)
+        self.observer.observe(self, {"childList":True, "subtree":True, "attributes":True, "characterData":True})
+
+    def _onMutation(self, mutations, observer):
+        '''Not intended to be called by end users. Forgets the sizes of the objects which have changed (see `clearUseGeometry()`).'''
+        for mutation in mutations:
+            nodes = list(mutation.addedNodes) + list(mutation.removedNodes) + [mutation.target]
+            for node in nodes:
+                while node is not None and node != self: #An object is changed by changes to its descendants
+                    nodeid = getattr(node, "id", None)
+                    if nodeid: clearUseGeometry("#"+nodeid)
+                    node = node.parentNode
 
 class CanvasObject(svg.svg):
     '''Wrapper for SVG svg element.  Parameters:
@@ -1038,9 +1569,11 @@ class CanvasObject(svg.svg):
         ***Before enabling one of these modes, use `import drawcanvas` or `import fullcanvas` instead of `import dragcanvas`***
         These two modes work together.
         To switch from `MouseMode.EDIT` to `MouseMode.DRAW`, use `canvas.setTool(tool)`, where `tool` can be:
-        `line, polygon, polyline, rectangle, ellipse, circle, bezier, closedbezier, smoothbezier, smoothclosedbezier`
+        `line, polygon, polyline, rectangle, ellipse, circle, bezier, closedbezier, smoothbezier, smoothclosedbezier, freehand`
         In `DRAW mode`, shapes can be drawn on the canvas by clicking, moving, clicking again...
         A shape is completed by double-clicking, which also switches the canvas to `EDIT` mode (see below).
+        With the `freehand` tool, each stroke (from pressing the button to releasing it) becomes a `BezierObject`
+        which follows the pointer to within `canvas.freehandTolerance` CSS pixels.
         Alternatively, on a touch screen, a shape is completed by tapping on a button (see Demo 5 in the brySVG Demo).
         The shape which will be drawn is chosen using `canvas.setTool(tool)`, as above.
         The `stroke`, `stroke-width` and `fill` of the shape are set by `canvas.penColour`, `canvas.penWidth`, and `canvas.fillColour`.
@@ -1070,6 +1603,7 @@ class CanvasObject(svg.svg):
         `canvas.penColour`
         `canvas.penWidth`
         `canvas.fillColour`
+        `canvas.freehandTolerance`
 
     Other attributes of canvas are intended to be read-only:
         `canvas.scaleFactor`  Multiply by this to convert CSS pixels to SVG units
@@ -1097,6 +1631,9 @@ class CanvasObject(svg.svg):
         self.vertexSnap = False
         self.snapDistance = 10
         self.lineWidthScaling = True #If False, line thicknesses do not change when zooming in
+        self.operationLog = None #Set to a brySVG.oplog.OperationLog to record changes, so that they can be undone
+        self.timings = None #Set to a brySVG.timings.Timings to record how long event handlers, snapping etc take
+        self.inputRecorder = None #While recording (see startInputRecording), the brySVG.inputlog.InputRecorder
 
         self.edgeSnap = False # Only available if polygoncanvas has been imported
         self.snapAngle = 10 # Only available if polygoncanvas has been imported
@@ -1104,6 +1641,7 @@ class CanvasObject(svg.svg):
         self.penColour = "black" # Only available in MouseMode.DRAW
         self.fillColour  = "yellow" # Only available in MouseMode.DRAW
         self.penWidth = 3 # Only available in MouseMode.DRAW
+        self.freehandTolerance = 1.5 # Only available in MouseMode.DRAW: in CSS pixels, how closely freehand curves follow the pointer
 
         #Attributes intended to be read-only for users
         self.scaleFactor = 1 #Multiply by this to convert CSS pixels to SVG units
@@ -1116,10 +1654,16 @@ class CanvasObject(svg.svg):
 
         #Attributes not intended to be used by end-users
         self.panning = False
+        self.inGesture = False #True while the mouse button is down, if there is an operation log
+        self.stroke = None #The curvefit.StrokeSimplifier for a freehand stroke which is being drawn
+        self.strokeFrame = None #The animation frame requested to show the latest part of the stroke
+        self.fontFamily = None #The computed font-family of the canvas, found when text is first measured
         self.centre = None
         self.nextid = 0
         self.objectDict = {}
-        self.hittargets = []
+        self.hittargets = {} #Hit targets, keyed by the id of the object they belong to
+        self.inputlisteners = False #True once the listeners which record input have been added
+        self.replaying = False #True while input is being replayed by dispatching events, so that it is not recorded again
         self.handles = None
         self.controlhandles  = None
         self.transformHandles = []
@@ -1130,6 +1674,9 @@ class CanvasObject(svg.svg):
         self.rotateLine = LineObject(linecolour="blue")
         self.rotateLine.style.vectorEffect = "non-scaling-stroke"
         self.attrs["preserveAspectRatio"] = "xMidYMid meet"
+        self.styleSheet = svg.style(CANVASSTYLE) #Canvas-wide modes are switched using classes and CSS properties on the canvas
+        self <= self.styleSheet
+        self._setHitTargetWidth()
 
         self.bind("mousedown", self._onMouseDown)
         self.bind("mousemove", self._onMouseMove)
@@ -1155,6 +1702,7 @@ class CanvasObject(svg.svg):
         self.centre = Point(((x1+x2)/2, (y1+y2)/2))
         self.xScaleFactor, self.yScaleFactor = self._getScaleFactors()
         self.scaleFactor  = max(self.xScaleFactor, self.yScaleFactor)
+        self._setHitTargetWidth()
         bcr = self.getBoundingClientRect()
         pt = self.createSVGPoint()
         (pt.x, pt.y) = (bcr.left, bcr.top)
@@ -1184,6 +1732,21 @@ class CanvasObject(svg.svg):
         self.viewWindow = self.setViewBox(((bbox.x-wmargin, bbox.y-hmargin), (bbox.x+bbox.width+wmargin, bbox.y+bbox.height+hmargin)))
         return self.viewWindow
 
+    def getFontMetrics(self, font=None):
+        '''Returns the `FontMetrics` (see `brySVG.textmetrics`) for the font-family `font` (by default, the canvas's own font).
+        Characters are measured in the page the first time they are needed, and the measurements are cached for all sizes.'''
+        if font is None:
+            if self.fontFamily is None: self.fontFamily = window.getComputedStyle(self).fontFamily
+            font = self.fontFamily
+        def measure(chars):
+            sample = svg.text(chars, x=0, y=0, font_size=textmetrics.REFERENCESIZE,
+                              style={"fontFamily":font, "fontKerning":"none", "whiteSpace":"pre", "visibility":"hidden"})
+            self <= sample #All the characters are measured after a single layout
+            widths = [sample.getSubStringLength(i, 1) for i in range(len(chars))]
+            self.removeChild(sample)
+            return widths if any(widths) else None #Nothing can be measured until the canvas is in the page
+        return textmetrics.getMetrics(font, measure)
+
     def getSVGcoords(self, event):
         '''Returns the SVG coordinates if the point where a mouse or touch event occurred, as a `Point` object.'''
         x = event.changedTouches[0].clientX if "touch" in event.type else event.clientX
@@ -1201,69 +1764,121 @@ class CanvasObject(svg.svg):
         If it is not desired that an object should be in the `objectDict`, just add it to the canvas using Brython's <= method.)
         Set `fixed` to `True` (default `False`) if the object should not be capable of being dragged or transformed with mouse actions.
         '''
-        def AddToDict(svgobj):
-            if not svgobj.id:
-                svgobj.id = f"{self.id}_id{self.nextid}"
-                self.nextid += 1
-            self.objectDict[svgobj.id] = svgobj
-            if not getattr(svgobj.style, "vectorEffect", None): #If object already has vectorEffect set, leave it alone
-                if self.lineWidthScaling is False: svgobj.style.vectorEffect = "non-scaling-stroke" #Only set property if necessary
-            if isinstance(svgobj, GroupObject):
-                for obj in svgobj.objectList:
-                    AddToDict(obj)
         if not hasattr(svgobject, "fixed"): svgobject.fixed = fixed
         self <= svgobject
-        AddToDict(svgobject)
+        self._addToDict(svgobject)
         svgobject.canvas = self
+        if self.operationLog is not None: self._logObjectOperation("addobject", svgobject)
         return svgobject
 
+    def addUseObjects(self, href, placements, fixed=False):
+        '''Creates a `UseObject` cloning `href` for each dict in `placements` (eg `{"centre":(x, y), "angle":30, "scale":2}`,
+        with any of the parameters of `UseObject` except `href`), adds them all to the canvas in one operation,
+        and returns the list of them. The object being cloned is only measured once.'''
+        objlist = [UseObject(href, **placement) for placement in placements]
+        self.addObjects(objlist, fixed)
+        return objlist
+
+    @timings.timed("addObjects")
     def addObjects(self, objectlist, fixed=False):
-        '''Add a (possibly nested) list of objects to the canvas.'''
+        '''Add a (possibly nested) list of objects to the canvas.
+        The objects are inserted into the page in a single DOM operation, so this is much faster than adding them one by one.'''
+        def flatten(objlist):
+            for obj in objlist:
+                if isinstance(obj, (list, tuple)):
+                    yield from flatten(obj)
+                else:
+                    yield obj
+        fragment = document.createDocumentFragment()
+        objlist = list(flatten(objectlist))
+        for obj in objlist:
+            if not hasattr(obj, "fixed"): obj.fixed = fixed
+            fragment <= obj
+            self._addToDict(obj)
+            obj.canvas = self
+        tt = timings.start()
+        self <= fragment
+        timings.lap("DOM-insert", tt)
+        log = self.operationLog
+        if log is not None:
+            log.begin() #Undone as a single step
+            for obj in objlist: self._logObjectOperation("addobject", obj)
+            log.end()
+
+    def dumps(self, binary=False):
+        '''Returns a description of all the objects on the canvas, which can be restored using `canvas.loads()`.
+        This is a `str` containing JSON, or if `binary` is `True`, `bytes` in a more compact binary format.
+        (For details of the formats, see `brySVG.scene`.)'''
+        return scene.dumps(self._getRecords(), binary)
+
+    def dump(self, fp, binary=False):
+        '''As `canvas.dumps()`, but writes the description to the file object `fp`, one object at a time.'''
+        scene.dump(self._getRecords(), fp, binary)
+
+    def writeSVG(self, fp):
+        '''Writes the objects on the canvas to the text stream `fp` as a standalone SVG document, one object at a time.
+        (To do this without a browser, see `brySVG.svgexport`.)'''
+        viewbox = getattr(self, "viewBoxRect", None)
+        svgexport.write(self._getRecords(), fp, viewbox)
+
+    def loads(self, data):
+        '''Adds the objects described by `data` (produced by `canvas.dumps()`) to the canvas, and returns a list of them.
+        (Use `canvas.deleteAll()` first to replace the current contents of the canvas.) Objects whose ids are already used
+        by other objects on the canvas are given new ids. Raises `ValueError` if `data` is not a complete scene.'''
+        return self._addRecords(scene.loads(data))
+
+    def load(self, fp):
+        '''As `canvas.loads()`, but reads the description from the file object `fp` (produced by `canvas.dump()`).'''
+        return self._addRecords(scene.load(fp))
+
+    def deleteObject(self, svgobject):
+        '''Delete an object from the canvas, and from `canvas.objectDict`.
+        If the object is a member of a `GroupObject`, it is also removed from the group (if the group refuses to remove it,
+        eg a `PolygonGroup` which would no longer have a single boundary, the object is not deleted).'''
+        if svgobject is None or not self.contains(svgobject): return
+        op = None if self.operationLog is None else self._objectOperation("deleteobject", svgobject)
+        group = getattr(svgobject, "group", None)
+        if group is not None and svgobject in group.objectList:
+            group.removeObject(svgobject)
+            if svgobject in group.objectList: return #The group refused (eg a PolygonGroup whose remaining tiles would not join up)
+        if svgobject.parentNode is not None:
+            svgobject.parentNode.removeChild(svgobject)
+            self._deleteFromDict(svgobject)
+        if op is not None: self.operationLog.record(op)
+
+    def deleteObjects(self, objectlist):
+        '''Delete a (possibly nested) list of objects from the canvas, and from `canvas.objectDict`.'''
         for obj in objectlist:
             if isinstance(obj, (list, tuple)):
-                self.addObjects(obj, fixed=fixed)
+                self.deleteObjects(obj)
             else:
-                self.addObject(obj, fixed=fixed)
-
-    def deleteObject(self, svgobject):
-        '''Delete an object from the canvas, and from `canvas.objectDict`'''
-        def deletefromdict(svgobj):
-            if isinstance(svgobj, GroupObject):
-                for obj in svgobj.objectList:
-                    deletefromdict(obj)
-            hittarget = getattr(svgobj, "hitTarget", None)
-            if hittarget: self.deleteObject(hittarget)
-            if svgobj.id in self.objectDict: del self.objectDict[svgobj.id]
-
-        if not self.contains(svgobject): return
-        self.removeChild(svgobject)
-        deletefromdict(svgobject)
+                self.deleteObject(obj)
 
     def deleteAll(self, event=None):
-        '''Clear all elements from the canvas, and from `canvas.objectDict`'''
-        while self.firstChild:
-            self.removeChild(self.firstChild)
+        '''Clear all elements from the canvas, and from `canvas.objectDict`.
+        This is not recorded in `canvas.operationLog`, so any changes made before it can no longer be undone.'''
+        self.textContent = "" #Removes all the children in one DOM operation
+        self <= self.styleSheet
         self.objectDict = {}
+        self.hittargets = {}
+        if self.operationLog is not None: self.operationLog.clear()
 
     def deleteSelection(self):
         '''Delete the currently selected object from the canvas, and from `canvas.objectDict`'''
         if self.selectedObject:
             if self.handles: self.deleteObject(self.handles)
             if self.controlhandles: self.deleteObject(self.controlhandles)
-            hittarget = getattr(self.selectedObject, "hitTarget", None)
-            if hittarget: self.deleteObject(hittarget)
             self.deleteObject(self.selectedObject)
             self.selectedObject = self.handles = self.controlhandles = None
 
+    @timings.timed("translateObject")
     def translateObject(self, svgobject, offset):
         '''Translate an `svgobject` by `offset`.  Unlike `translateElement` (below), this will also preserve the extra
         functionality provided by this module - ie the shape will still be able to be selected, dragged, etc.'''
         offset = Point(offset)
-        if isinstance(svgobject, GroupObject):
-            for obj in svgobject.objectList:
-                self.translateObject(obj, offset)
-            boundary = getattr(svgobject, "boundary", None)
-            if boundary: self.translateObject(boundary, offset)
+        if isinstance(svgobject, (GroupObject, TextMixin)): #The members are only moved when their geometry is next needed
+            svgobject._transform(svgbase.createSVGMatrix().translate(*offset))
+            return
         elif isinstance(svgobject, PointObject):
             svgobject.XY += offset
         else:
@@ -1273,6 +1888,331 @@ class CanvasObject(svg.svg):
             svgobject._update()
             svgobject._updatehittarget()
             if isinstance(svgobject, PolygonObject): svgobject._segments = None
+        (dx, dy) = offset
+        svgobject._logOperation({"op":"transform", "id":svgobject.id, "matrix":[1, 0, 0, 1, dx, dy], "angle":0})
+
+    def undo(self):
+        '''Reverses the latest change recorded in `canvas.operationLog` (see `brySVG.oplog`).
+        Returns `False` if there is nothing to undo.'''
+        operations = None if self.operationLog is None else self.operationLog.undo()
+        if operations is None: return False
+        self.applyOperations(operations)
+        return True
+
+    def redo(self):
+        '''Repeats the latest change to have been reversed by `canvas.undo()`. Returns `False` if there is nothing to redo.'''
+        operations = None if self.operationLog is None else self.operationLog.redo()
+        if operations is None: return False
+        self.applyOperations(operations)
+        return True
+
+    def applyOperations(self, operations):
+        '''Performs a list of operations (see `brySVG.oplog`), such as an entry received from the operation log of another canvas
+        showing the same scene. The operations are not recorded in this canvas's own operation log.'''
+        if self.handles: self.deselectObject() #The handles would not follow the changes
+        if self.mouseMode == MouseMode.TRANSFORM: self.hideTransformHandles()
+        (log, self.operationLog) = (self.operationLog, None)
+        try:
+            for op in operations: self._applyOperation(op)
+        finally:
+            self.operationLog = log
+        if self.mouseMode in [MouseMode.DRAG, MouseMode.EDIT, MouseMode.TRANSFORM]: self.createHitTargets()
+
+    def importSVG(self, fp, flatten=True, keepgroups=True):
+        '''Reads the standard SVG document in the file object `fp` (eg `open(filename)`) a chunk at a time, adds the shapes
+        in it to the canvas as brySVG objects, and returns a list of them. (For details, see `brySVG.svgimport`.)
+        If `flatten` is `False`, transforms in the document are not applied to the shapes' `pointLists` until they are needed.
+        If `keepgroups` is `False`, the shapes are not put into `GroupObjects`.'''
+        return self._addRecords(svgimport.records(fp, flatten, keepgroups))
+
+    def stats(self):
+        '''Returns a dict describing what the canvas is holding, cheaply enough to be called every second (eg to look for leaks):
+        `objects`: the number of objects in `objectDict`
+        `classes`: the number of live objects (including hit targets and handles) of each class, by class name
+        `domnodes`: the number of elements inside the canvas
+        `detached`: the number of objects in `objectDict` which are no longer on the page
+        `hittargets`, `handles`: the numbers of hit targets (in `canvas.hittargets`), and of handles (including transform handles)
+        `vertices`: the number of points held in the objects' lists (lists shared by clones are only counted once)
+        `domvertices`: the number of vertices of polygons which are only held by the DOM (until their `pointList` is read)
+        `bytes`: a rough estimate of the memory taken by the geometry, including cached segments and flattened curves
+        `orphanedhittargets`: hit targets (or their segments) whose object is no longer in `objectDict`, or which are not on the page
+        `orphanedhandles`: handles whose object is no longer in `objectDict`, or which remain when no object is selected'''
+        objectdict = self.objectDict
+        classes = {}
+        (detached, vertices, domvertices, nbytes) = (0, 0, 0, 0)
+        seen = set() #ids of lists already counted, as clones share their lists of points
+        orphans = set()
+        for obj in objectdict.values():
+            name = type(obj).__name__
+            classes[name] = classes.get(name, 0) + 1
+            if obj.parentNode is None: detached += 1
+            reference = getattr(obj, "reference", None)
+            if reference is not None and objectdict.get(reference.id) is not reference: orphans.add(id(obj))
+            pointlist = getattr(obj, "_pointList", None)
+            if pointlist is not None and id(pointlist) not in seen:
+                seen.add(id(pointlist))
+                vertices += len(pointlist)
+                nbytes += len(pointlist)*POINTBYTES
+            elif pointlist is None and isinstance(obj, PolygonObject):
+                domvertices += obj.points.numberOfItems
+                nbytes += obj.points.numberOfItems*DOMPOINTBYTES
+            pointsetlist = getattr(obj, "_pointsetList", None)
+            if pointsetlist is not None and id(pointsetlist) not in seen:
+                seen.add(id(pointsetlist))
+                vertices += 2*len(pointsetlist) #Each vertex has up to two control points (the vertex itself is in the pointList)
+                nbytes += 2*len(pointsetlist)*POINTBYTES
+            pathsegments = getattr(obj, "_pathsegments", None)
+            if pathsegments is not None and id(pathsegments) not in seen:
+                seen.add(id(pathsegments))
+                nbytes += len(pathsegments)*PATHSEGMENTBYTES
+            segments = getattr(obj, "_segments", None)
+            if segments: nbytes += len(segments)*SEGMENTBYTES
+            flattened = getattr(obj, "_flattened", None)
+            if flattened is not None and id(flattened) not in seen:
+                seen.add(id(flattened))
+                nbytes += len(flattened[1])*POINTBYTES
+        for (objid, hittarget) in self.hittargets.items():
+            reference = getattr(hittarget, "reference", None)
+            if objectdict.get(objid) is not reference or hittarget.parentNode is None: orphans.add(id(hittarget))
+        handles = [handle for group in (self.handles, self.controlhandles) if group is not None for handle in group.objectList]
+        orphanedhandles = 0
+        for handle in handles:
+            name = type(handle).__name__
+            classes[name] = classes.get(name, 0) + 1
+            owner = getattr(handle, "owner", None)
+            if self.selectedObject is None or owner is None or objectdict.get(owner.id) is not owner: orphanedhandles += 1
+        for obj in self.transformHandles + ([self.rotateLine] if self.transformHandles else []): #transformHandles[0] is transformBBox
+            name = type(obj).__name__
+            classes[name] = classes.get(name, 0) + 1
+        return {"objects":len(objectdict), "classes":classes, "domnodes":self.getElementsByTagName("*").length, "detached":detached,
+                "hittargets":len(self.hittargets), "handles":len(handles)+len(self.transformHandles[1:]),
+                "vertices":vertices, "domvertices":domvertices, "bytes":nbytes,
+                "orphanedhittargets":len(orphans), "orphanedhandles":orphanedhandles}
+
+    def startInputRecording(self, maxevents=None):
+        '''Starts recording the mouse, touch, wheel and key events which the canvas (including its objects and handles) receives.
+        Returns the `brySVG.inputlog.InputRecorder` (also stored in `canvas.inputRecorder`), whose `events` can be saved
+        with `inputlog.dumps()`. If `maxevents` is given, only the latest `maxevents` events are kept.'''
+        if not self.inputlisteners: #Listening in the capture phase, so events are recorded before handles stop their propagation
+            for eventtype in inputlog.EVENTTYPES:
+                (document if eventtype == "keydown" else self).addEventListener(eventtype, self._recordInput, True)
+            self.inputlisteners = True
+        self.inputRecorder = inputlog.InputRecorder(maxevents)
+        return self.inputRecorder
+
+    def stopInputRecording(self):
+        '''Stops recording input, and returns the `InputRecorder` (or `None` if input was not being recorded).'''
+        (recorder, self.inputRecorder) = (self.inputRecorder, None)
+        return recorder
+
+    def replayInput(self, events, dispatch=False):
+        '''Replays a list of recorded `events` (see `brySVG.inputlog`) as quickly as possible, and returns the list of the times
+        (in milliseconds) taken to handle each event, and a `brySVG.timings.Timings` with a histogram for each type of event.
+        The canvas should be in the same state (mode, viewBox, objects etc) as when the events were recorded.
+        By default, each event is passed straight to the canvas's handler for it. If `dispatch` is `True`, a DOM event is
+        created and dispatched at the original target (or at the element under the pointer), so that handles and hit targets
+        also receive it, as they did when it was recorded. (Key events are always passed straight to the handler.)
+        Set `canvas.timings` first to record the spans and phases within each handler as well.'''
+        if not dispatch: return inputlog.replay(events, self)
+        (latencies, summary) = ([], timings.Timings())
+        self.replaying = True
+        try:
+            for entry in events:
+                if entry[1] == "keydown":
+                    (target, event) = (None, inputlog.ReplayEvent(entry))
+                else:
+                    (target, event) = self._replayevent(entry)
+                starttime = time.perf_counter()
+                if target is None: getattr(self, inputlog.HANDLERS[entry[1]])(event)
+                else: target.dispatchEvent(event)
+                elapsed = time.perf_counter() - starttime
+                latencies.append(elapsed*1000)
+                summary.record(entry[1], elapsed)
+        finally:
+            self.replaying = False
+        return (latencies, summary)
+
+    def _recordInput(self, event):
+        '''Not intended to be called by end users. Events dispatched by the canvas itself (by hit targets, or while replaying) are not recorded.'''
+        if self.inputRecorder is not None and event.isTrusted and not self.replaying: self.inputRecorder.record(event)
+
+    def _replayevent(self, entry):
+        '''Not intended to be called by end users. Returns the element at which a recorded event should be dispatched,
+        and the DOM event to dispatch.'''
+        event = inputlog.ReplayEvent(entry)
+        target = document.getElementById(event.target.id) if event.target.id else None
+        if target is None: target = document.elementFromPoint(event.clientX, event.clientY)
+        if target is None or not self.contains(target): target = self
+        eventdict = {"bubbles":True, "cancelable":True, "clientX":event.clientX, "clientY":event.clientY}
+        if event.type in inputlog.TOUCHEVENTS:
+            del eventdict["clientX"], eventdict["clientY"]
+            for attr in ("touches", "targetTouches", "changedTouches"):
+                eventdict[attr] = [window.Touch.new({"identifier":touch.identifier, "target":target, "clientX":touch.clientX,
+                                    "clientY":touch.clientY}) for touch in getattr(event, attr)]
+            return (target, window.TouchEvent.new(event.type, eventdict))
+        if event.type == "wheel":
+            eventdict["deltaY"] = event.deltaY
+            return (target, window.WheelEvent.new(event.type, eventdict))
+        (eventdict["button"], eventdict["buttons"]) = (event.button, event.buttons)
+        return (target, window.MouseEvent.new(event.type, eventdict))
+
+    def _applyOperation(self, op):
+        '''Not intended to be called by end users. Performs a single operation (see `brySVG.oplog`).'''
+        kind = op["op"]
+        if kind == "addobject":
+            obj = self._objectFromRecord(op["record"])
+            group = self.objectDict.get(op.get("group"))
+            if group is not None:
+                group.addObject(obj)
+            else:
+                self.addObject(obj)
+                nextobj = self.objectDict.get(op.get("before"))
+                if nextobj is not None and nextobj.parentNode == self: self.insertBefore(obj, nextobj)
+            return
+        obj = self.objectDict[op["id"]]
+        if kind == "deleteobject":
+            self.deleteObject(obj)
+        elif kind == "transform":
+            matrix = svgbase.createSVGMatrix()
+            (matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f) = op["matrix"]
+            obj._transform(matrix, op.get("angle", 0))
+        else:
+            vertices = obj._vertexdata()
+            oplog.applyToVertices(vertices, op)
+            obj._setvertexdata(vertices)
+
+    def _getOperationLog(self, svgobject):
+        '''Not intended to be called by end users. Returns the operation log which should record a change to `svgobject`, or None.
+        Changes to hit targets, handles and other objects which are not in `objectDict` are not recorded.'''
+        if hasattr(svgobject, "reference") or self.objectDict.get(svgobject.id) is not svgobject: return None
+        if self.mouseMode == MouseMode.DRAW and svgobject is self.mouseOwner: return None #Recorded when the drawing is finished
+        return self.operationLog
+
+    def _objectOperation(self, kind, svgobject):
+        '''Not intended to be called by end users. Returns the "addobject" or "deleteobject" operation (see `brySVG.oplog`)
+        for `svgobject`, or None if changes to it are not recorded.'''
+        if self._getOperationLog(svgobject) is None: return None
+        if isinstance(svgobject, ImageObject) and not svgobject.imageloaded: return None #Its size is not known yet
+        op = {"op":kind, "id":svgobject.id, "record":_getrecord(svgobject)}
+        group = getattr(svgobject, "group", None)
+        if group is not None:
+            op["group"] = group.id
+        else: #So that the object can be put back in the same place if the deletion is undone
+            sibling = svgobject.nextSibling
+            while sibling is not None:
+                obj = self.objectDict.get(getattr(sibling, "id", None))
+                if obj is not None and not hasattr(obj, "reference"):
+                    op["before"] = obj.id
+                    break
+                sibling = sibling.nextSibling
+        return op
+
+    def _logObjectOperation(self, kind, svgobject):
+        '''Not intended to be called by end users.'''
+        op = self._objectOperation(kind, svgobject)
+        if op is not None: self.operationLog.record(op)
+
+    def _addToDict(self, svgobject):
+        '''Not intended to be called by end users. Adds `svgobject` (and the members of a group) to `objectDict`,
+        making up ids for any which do not have one, or whose id belongs to another object (eg when a scene is loaded twice).'''
+        prefix = f"{self.id}_id"
+        stack = [svgobject]
+        while stack:
+            svgobj = stack.pop()
+            if not svgobj.id or self.objectDict.get(svgobj.id, svgobj) is not svgobj:
+                svgobj.id = f"{prefix}{self.nextid}"
+                self.nextid += 1
+            elif svgobj.id.startswith(prefix) and svgobj.id[len(prefix):].isdigit(): #eg a loaded object, so made-up ids must not clash with it
+                self.nextid = max(self.nextid, int(svgobj.id[len(prefix):])+1)
+            self.objectDict[svgobj.id] = svgobj
+            if isinstance(svgobj, GroupObject): stack.extend(svgobj.objectList)
+
+    def _getRecords(self):
+        '''Not intended to be called by end users. Generator yielding a record (see `brySVG.scene`)
+        for each object added to the canvas which is not in a group, in drawing order.'''
+        for element in self.children:
+            obj = self.objectDict.get(element.id)
+            if obj is None or hasattr(obj, "reference"): continue #Hit targets are recreated when needed
+            yield _getrecord(obj)
+
+    def _addRecords(self, records):
+        '''Not intended to be called by end users. Creates the objects described by `records` and adds them to the canvas.'''
+        objlist = [self._objectFromRecord(record) for record in records]
+        self.addObjects(objlist)
+        if self.mouseMode in [MouseMode.DRAG, MouseMode.EDIT, MouseMode.TRANSFORM]: self.createHitTargets()
+        return objlist
+
+    def _objectFromRecord(self, record, matrix=None):
+        '''Not intended to be called by end users. Returns a new object described by `record` (in the form used by `brySVG.scene`).
+        `matrix` is the transform `(a, b, c, d, e, f)` inherited from the groups containing the object (if any).
+        The transform of a group is passed on to its members, so that each shape's type and angle can be made to match it.'''
+        if "transform" in record: matrix = tuple(record["transform"]) if matrix is None else svgimport._multiply(matrix, tuple(record["transform"]))
+        if matrix is not None and "objects" not in record and record["type"] != "element": (record, matrix) = svgimport.shapeForTransform(record, matrix)
+        objtype = record["type"]
+        coords = record.get("points", [])
+        pointlist = [Point((coords[i], coords[i+1])) for i in range(0, len(coords), 2)]
+        angle = record.get("angle", 0)
+        if objtype == "element":
+            obj = document.createElementNS("http://www.w3.org/2000/svg", record["tag"])
+            for (key, value) in record["attrs"].items(): obj.attrs[key] = value
+            obj.innerHTML = record["content"]
+            if matrix is not None: obj.attrs["transform"] = "matrix({},{},{},{},{},{}) ".format(*matrix) + obj.attrs.get("transform", "")
+        else:
+            cls = scenetypes[objtype]
+            if issubclass(cls, GroupObject):
+                obj = cls()
+                obj._addMembersFromRecord([self._objectFromRecord(member, matrix) for member in record["objects"]], record)
+            elif issubclass(cls, PointObject):
+                obj = cls(pointlist[0], pointsize=record["size"])
+            elif issubclass(cls, BezierObject):
+                if not issubclass(cls, ClosedBezierObject): pointlist = [None]+pointlist+[None]
+                pointsetlist = [pointlist[i:i+3] for i in range(0, len(pointlist), 3)]
+                if issubclass(cls, SmoothBezierMixin): #Control points may have been edited, so are restored as saved
+                    obj = cls([pointset[1] for pointset in pointsetlist])
+                    obj.pointsetList = pointsetlist
+                    obj._update()
+                else:
+                    obj = cls(pointsetlist)
+            elif issubclass(cls, UseObject):
+                obj = cls(record["href"], centre=record["centre"], width=record["width"], height=record["height"], angle=angle)
+            elif issubclass(cls, ImageObject):
+                obj = cls(record["href"], pointlist, angle=angle)
+            elif issubclass(cls, (RectangleObject, EllipseObject)):
+                obj = cls(pointlist, angle=angle)
+            elif issubclass(cls, SectorObject):
+                obj = cls(radius=record["radius"], startangle=record["startangle"], endangle=record["endangle"], pointlist=pointlist)
+            else:
+                obj = cls(pointlist=pointlist)
+            for (name, value) in record.get("style", {}).items(): obj.style.setProperty(name, value)
+            if matrix is not None and not isinstance(obj, GroupObject): #Applied to the geometry when it is next needed
+                (a, b, c, d, e, f) = matrix
+                svgmatrix = svgbase.createSVGMatrix()
+                (svgmatrix.a, svgmatrix.b, svgmatrix.c, svgmatrix.d, svgmatrix.e, svgmatrix.f) = matrix
+                obj._transform(svgmatrix, atan2(b, a)*180/pi)
+        if "id" in record: obj.id = record["id"]
+        if isinstance(obj, GroupObject):
+            obj._fixed = record.get("fixed", False) #Not passed on to the members, which were saved with their own setting
+        else:
+            obj.fixed = record.get("fixed", False)
+        return obj
+
+    def _deleteFromDict(self, svgobject):
+        '''Not intended to be called by end users. Removes `svgobject` (and the members of a group) from `objectDict`,
+        and removes the hit targets belonging to them from the canvas.'''
+        stack = [svgobject]
+        while stack:
+            svgobj = stack.pop()
+            if isinstance(svgobj, GroupObject):
+                stack.extend(svgobj.objectList)
+                container = getattr(svgobj, "hitTargetGroup", None)
+                if container is not None:
+                    if container.parentNode is not None: container.parentNode.removeChild(container)
+                    svgobj.hitTargetGroup = None
+            hittarget = self.hittargets.pop(svgobj.id, None)
+            if hittarget is not None:
+                if hittarget.parentNode is not None: hittarget.parentNode.removeChild(hittarget)
+                stack.append(hittarget)
+            self.objectDict.pop(svgobj.id, None)
 
     #The following three methods are not compatible with dragging, snapping etc
     def rotateElement(self, element, angle, centre=None):
@@ -1336,8 +2276,17 @@ class CanvasObject(svg.svg):
         currentlws = getattr(self, "_lineWidthScaling", None)
         if currentlws == lws: return
         self._lineWidthScaling = lws
-        for objid in self.objectDict:
-            self.objectDict[objid].style.vectorEffect = "none" if lws else "non-scaling-stroke"
+        #The stylesheet applies non-scaling-stroke to every element on the canvas which does not set its own vectorEffect
+        if lws:
+            self.classList.remove("nonscalingstroke")
+        else:
+            self.classList.add("nonscalingstroke")
+
+    def _setHitTargetWidth(self):
+        '''Hit targets take their stroke-width from a CSS custom property on the canvas,
+        so only this needs updating when the scale of the canvas or the type of input device changes.'''
+        width = 10*self.scaleFactor if self.mouseDetected else 25*self.scaleFactor
+        self.style.setProperty("--hittargetwidth", f"{width}px")
 
     def _getScaleFactors(self):
         '''Recalculates self.scaleFactor. This is called automatically by setViewBox or fitContents().'''
@@ -1366,14 +2315,34 @@ class CanvasObject(svg.svg):
                 continue
             else:
                 newobj = obj.cloneObject()
-                newobj.style.strokeWidth = 10*self.scaleFactor if self.mouseDetected else 25*self.scaleFactor
+                newobj.style.strokeWidth = HITTARGETWIDTH
             newobj.style.opacity = 0
             for event in MOUSEEVENTS: newobj.bind(event, self._onHitTargetMouseEvent)
             for event in TOUCHEVENTS: newobj.bind(event, self._onHitTargetTouchEvent)
             newobj.reference = obj
-            obj.hitTarget = newobj
-            self.hittargets.append(newobj)
-            self.addObject(newobj)
+            self._addHitTarget(obj, newobj)
+
+    def _addHitTarget(self, obj, hittarget):
+        '''Not intended to be called by end users. Adds `hittarget` to the canvas as the hit target of `obj`.'''
+        obj.hitTarget = hittarget
+        self.hittargets[obj.id] = hittarget
+        self.addObject(hittarget)
+        parent = self._hittargetparent(obj)
+        if parent is not self: parent <= hittarget
+
+    def _hittargetparent(self, obj):
+        '''Not intended to be called by end users. Returns the element which should contain the hit target of `obj`:
+        the canvas, or for a member of a group, a container (`group.hitTargetGroup`) which is given the group's pending
+        transform, so that moving a group moves the hit targets of all its members at once. The containers are nested
+        in the same way as the groups.'''
+        group = getattr(obj, "group", None)
+        if group is None: return self
+        container = getattr(group, "hitTargetGroup", None)
+        if container is None or container.parentNode is None: #Not created yet, or removed by canvas.deleteAll()
+            container = group.hitTargetGroup = svg.g()
+            container.style.transform = group._pendingstring()
+            self._hittargetparent(group) <= container
+        return container
 
     def _onWheel(self, event):
         if self.mouseMode == MouseMode.PAN:
@@ -1389,6 +2358,7 @@ class CanvasObject(svg.svg):
     def _onDragStart(self, event):
         event.preventDefault()
 
+    @timings.timed("_onTouchStart")
     def _onTouchStart(self, event):
         event.preventDefault()
         global lasttaptime
@@ -1400,18 +2370,21 @@ class CanvasObject(svg.svg):
             self._onLeftDown(event)
         lasttaptime = latesttaptime
 
+    @timings.timed("_onMouseDown")
     def _onMouseDown(self, event):
         event.preventDefault()
         if not self.mouseDetected:
             self.mouseDetected = True
-            for obj in self.objectDict.values():
-                if hasattr(obj, "reference"):
-                    if isinstance(obj.reference, UseObject): continue
-                    obj.style.strokeWidth = 10*self.scaleFactor
+            self._setHitTargetWidth()
         if event.button > 0: return
         self._onLeftDown(event)
 
     def _onLeftDown(self, event):
+        log = self.operationLog
+        if log is not None: #The changes made before the button is released are undone as one step
+            if self.inGesture: log.end() #The previous release was not seen
+            log.begin()
+            self.inGesture = True
         if self.mouseMode == MouseMode.DRAG:
             self._prepareDrag(event)
         elif self.mouseMode == MouseMode.TRANSFORM:
@@ -1423,6 +2396,7 @@ class CanvasObject(svg.svg):
         elif self.mouseMode == MouseMode.PAN:
             self._preparePan(event)
 
+    @timings.timed("_onMouseMove")
     def _onMouseMove(self, event):
         event.preventDefault()
         if self.mouseMode == MouseMode.PAN:
@@ -1434,19 +2408,25 @@ class CanvasObject(svg.svg):
         else:
             self._movePoint(event)
 
+    @timings.timed("_onLeftUp")
     def _onLeftUp(self, event):
         if event.type == "mouseup" and event.button > 0: return
         if self.mouseMode == MouseMode.PAN:
             self._endPan(event)
-            return
-        if not self.mouseOwner: return
-        if self.mouseMode == MouseMode.DRAG:
+        elif not self.mouseOwner:
+            pass
+        elif self.mouseMode == MouseMode.DRAG:
             self._endDrag(event)
         elif self.mouseMode == MouseMode.TRANSFORM:
             self._endTransform(event)
             self.mouseOwner = None
         elif self.mouseMode == MouseMode.EDIT:
             self._endEdit(event)
+        elif self.mouseMode == MouseMode.DRAW and self.tool == "freehand":
+            self._endStroke()
+        if self.inGesture:
+            self.inGesture = False
+            if self.operationLog is not None: self.operationLog.end()
 
     def _onHitTargetMouseEvent(self, event):
         eventdict = {attr: getattr(event, attr) for attr in dir(event)}
@@ -1483,7 +2463,8 @@ class CanvasObject(svg.svg):
         if self.selectedObject and not self.selectedObject.fixed:
             self.mouseOwner = self.selectedObject
             self <= self.mouseOwner
-            if (hittarget := getattr(self.mouseOwner, "hitTarget", None)): self <= hittarget
+            hittarget = getattr(self.mouseOwner, "hitTarget", None)
+            if hittarget is not None and hittarget.parentNode is not None: hittarget.parentNode <= hittarget #Stays in its container
             self.startx = event.targetTouches[0].clientX if "touch" in event.type else event.clientX
             self.starty = event.targetTouches[0].clientY if "touch" in event.type else event.clientY
 
@@ -1491,11 +2472,11 @@ class CanvasObject(svg.svg):
         x = event.targetTouches[0].clientX if "touch" in event.type else event.clientX
         y = event.targetTouches[0].clientY if "touch" in event.type else event.clientY
         dx, dy = (x-self.startx)*self.scaleFactor, (y-self.starty)*self.scaleFactor
-        self.mouseOwner.style.transform = f"translate({dx}px,{dy}px)"
-        if isinstance(self.mouseOwner, [EllipseObject, RectangleObject, UseObject, ImageObject]):
-            self.mouseOwner.style.transform += self.mouseOwner.rotatestring
-            if isinstance(self.mouseOwner, UseObject): self.mouseOwner.style.transform += self.mouseOwner.scalestring
+        transformstring = f"translate({dx}px,{dy}px)"
+        if isinstance(self.mouseOwner, ObjectMixin): transformstring += self.mouseOwner._transformstring()
+        self.mouseOwner.style.transform = transformstring
 
+    @timings.timed("_endDrag")
     def _endDrag(self, event):
         self.mouseOwner.style.transform = "translate(0px,0px)"
         currentcoords = self.getSVGcoords(event)
@@ -1561,179 +2542,46 @@ class CanvasObject(svg.svg):
                 svgobj = svgobj.group
         return svgobj
 
+    @timings.timed("_doVertexSnap")
     def _doVertexSnap(self, svgobject, checkpoints=None):
-        if not hasattr(svgobject, "pointList"): return
+        objpoints = svgobject._snappoints() if isinstance(svgobject, ObjectMixin) else None #(This also applies any pending transform)
+        if objpoints is None: return
         snapd = self.snapDistance
-        bestdx = bestdy = bestd = None
-        bbox = svgobject.getBBox()
-        L, R, T, B = bbox.x, bbox.x+bbox.width, bbox.y, bbox.y+bbox.height
+        ((L, T), (R, B)) = svgobject._boundingbox()
 
         if checkpoints is None:
             checkpoints = []
             for objid in self.objectDict:
                 if objid == svgobject.id: continue
                 obj = self.objectDict[objid]
-                if not hasattr(obj, "pointList"): continue
+                if not isinstance(obj, ObjectMixin): continue
                 if hasattr(obj, "reference"): continue
                 if obj.style.visibility == "hidden": continue
                 if objgroup := getattr(obj, "group", None) and hasattr(objgroup, "pointList") : continue
-                bbox = obj.getBBox()
-                L1, R1, T1, B1 = bbox.x, bbox.x+bbox.width, bbox.y, bbox.y+bbox.height
+                points = obj._snappoints()
+                if points is None: continue
+                ((L1, T1), (R1, B1)) = obj._boundingbox()
                 if L1-R > snapd or R1-L < -snapd or T1-B > snapd or B1-T < -snapd: continue
-                checkpoints.extend(obj.pointList)
+                checkpoints.extend(points)
         if not checkpoints: return
-        checkpoints.sort(key=lambda p:p.coords) #all points which could possibly be snapped to
-        objpoints = sorted(svgobject.pointList, key=lambda p:p.coords)
-
-        checkstart = 0
-        for i, point1 in enumerate(objpoints): #vertical sweepline stops at each x-coord of object to be snapped
-            checkpoints = checkpoints[checkstart:] #remove points too far to the left of sweepline
-            if not checkpoints: break
-            try:
-                (tonextx, y) = objpoints[i+1] - point1 #find distance between current and next position of sweepline
-            except IndexError:
-                tonextx = 0
-            checkstart = 0
-            for point2 in checkpoints: #start checking
-                (dx, dy) = point2 - point1
-                if abs(dx) < snapd and abs(dy) < snapd:
-                    d = hypot(dx, dy)
-                    if bestd is None or d < bestd: (bestd, bestdx, bestdy) = (d, dx, dy)
-                if tonextx - dx > snapd: checkstart += 1 #point just checked will be too far to the left when sweepline moves on
-                if dx > snapd: break #point just checked is too far to the right of sweepline - time to move sweepline on
-        if bestd: self.translateObject(svgobject, (bestdx, bestdy))
-
-class Point(object):
-    '''Class to represent coordinates and also give some vector functionality'''
-    def __init__(self, coords):
-        self.coords = list(coords.coords) if isinstance(coords, Point) else list(coords)
-
-    def __repr__(self):
-        return str(tuple(self.coords))
-
-    def __eq__(self, other):
-        if isinstance(other, Point):
-            return (self.coords == other.coords)
-        elif isinstance(other, list):
-            return (self.coords == other)
-        elif isinstance(other, tuple):
-            return (tuple(self.coords) == other)
-        else:
-            return False
-
-    def __lt__(self, other):
-        return self.coords < other.coords
-
-    def __add__(self, other):
-        if isinstance(other, Point):
-            return Point([xi+yi for (xi, yi) in zip(self.coords, other.coords)])
-        elif isinstance(other, (list, tuple)):
-            return Point([xi+yi for (xi, yi) in zip(self.coords, other)])
-        elif other is None:
-            return None
-        else:
-            return NotImplemented
-
-    def __radd__(self, other):
-        return self + other
-
-    def __iadd__(self, other):
-        if isinstance(other, (list, tuple)):
-            for i in range(len(self.coords)):
-                self.coords[i] += other[i]
-        else:
-            for i in range(len(self.coords)):
-                self.coords[i] += other.coords[i]
-        return self
-
-    def __sub__(self, other):
-        return Point([xi-yi for (xi, yi) in zip(self.coords, other.coords)])
-
-    def __rsub__(self, other):
-        return Point([xi-yi for (xi, yi) in zip(other.coords, self.coords)])
-
-    def __neg__(self):
-        return Point([-xi for xi in self.coords])
-
-    def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            return Point([other*xi for xi in self.coords])
-        elif isinstance(other, (list, tuple)):
-            return Point([xi*yi for (xi, yi) in zip(self.coords, other)])
-        elif isinstance(other, Point):
-            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])
-        elif isinstance(other, Matrix):
-            return Point([self*col for col in other.cols])
-        else:
-            return NotImplemented
-
-    def __rmul__(self, other):
-        if isinstance(other, (int, float)):
-            return Point([other*xi for xi in self.coords])
-        elif isinstance(other, (list, tuple)):
-           return Point([xi*yi for (xi, yi) in zip(self.coords, other)])
-        elif isinstance(other, Point):
-            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])
-        else:
-            return NotImplemented
-
-    def __truediv__(self, other):
-        return Point([xi/other for xi in self.coords])
-
-    def __getitem__(self, i):
-        return self.coords[i]
-
-    def __hash__(self):
-        return hash(tuple(self.coords))
-
-    def __round__(self, n):
-        (x, y) = self.coords
-        return Point((round(float(x), n), round(float(y), n)))
-
-    def __len__(self):
-        return len(self.coords)
-
-    def length(self):
-        (x, y) = self.coords
-        return hypot(x, y)
-
-    def angle(self):
-        return atan2(self.coords[1], self.coords[0])
-
-    def anglefrom(self, other):
-        dot = other*self
-        cross = other.cross(self)
-        if cross == 0: cross = -0.0
-        angle = atan2(cross, dot)
-        return angle
-
-    def cross(self, other):
-        x1, y1 = self.coords
-        x2, y2 = other.coords
-        return x1*y2 - y1*x2
-
-    def roundsf(self, sf):
-        x, y = self.coords
-        return Point((roundsf(x, sf), roundsf(y, sf)))
-
-class Matrix(object):
-    def __init__(self, rows):
-        self.rows = rows
-        self.cols = [Point([self.rows[i][j] for i in range(len(self.rows))]) for j in range(len(self.rows[0]))]
-
-    def __str__(self):
-        return str("\n".join(str(row) for row in self.rows))
-
-    def __rmul__(self, other):
-        if isinstance(other, (list, tuple)):
-            return [Point([p*col for col in self.cols]) for p in other]
-        else:
-            return Point([other*col for col in self.cols])
-
-def roundsf(x, sf=3):
-    if x == 0: return 0
-    return round(x, sf-int(floor(log10(abs(x))))-1)
+        vector = geometry.findvertexsnap(objpoints, checkpoints, snapd)
+        if vector: self.translateObject(svgobject, vector)
 
 shapetypes = {"line":LineObject, "polygon":PolygonObject, "polyline":PolylineObject,
 "rectangle":RectangleObject, "ellipse":EllipseObject, "circle":CircleObject, "sector":SectorObject,
 "bezier":BezierObject, "closedbezier":ClosedBezierObject, "smoothbezier":SmoothBezierObject, "smoothclosedbezier":SmoothClosedBezierObject}
+
+#The types of object which can be saved by canvas.dumps(); other elements are saved as SVG markup
+scenetypes = dict(shapetypes, point=PointObject, use=UseObject, image=ImageObject, group=GroupObject)
+
+def _getrecord(element):
+    '''Not intended to be called by end users. Returns a dict describing `element`, in the form used by `brySVG.scene`.'''
+    for cls in type(element).__mro__: #The most specific type listed in scenetypes
+        for (objtype, scenetype) in scenetypes.items():
+            if cls is scenetype: return element._getRecord(objtype)
+    record = {"type":"element", "tag":element.tagName}
+    if element.id: record["id"] = element.id
+    if getattr(element, "fixed", False): record["fixed"] = True
+    record["attrs"] = {key:element.attrs[key] for key in element.attrs if key != "id"}
+    record["content"] = element.innerHTML
+    return record
@@ -6,13 +6,18 @@
 # For details, see the LICENSE file in this repository                        #
 
 from brySVG.dragcanvas import *
+import brySVG.curvefit as curvefit
 
 class NonBezierMixin(object):
     '''Methods for LineObject, PolylineObject, PolygonObject, CircleObject, EllipseObject and RectangleObject'''
     def setPoint(self, i, point):
+        self._unshare()
+        log = self._operationlog()
+        if log is not None: old = list(self.pointList[i])
         self.pointList[i] = point
         self._update()
         self._updatehittarget()
+        if log is not None: log.record({"op":"setvertices", "id":self.id, "changes":[[i%len(self.pointList), old, list(point)]]})
     """
     def setPoints(self, pointlist):
         self.pointList = pointlist
@@ -25,29 +30,44 @@ class NonBezierMixin(object):
 class PolyshapeMixin(object):
     '''Methods for PolylineObject and PolygonObject.'''
     def _appendPoint(self, point):
+        self._unshare()
         self.pointList.append(point)
         self._update()
 
     def insertPoint(self, index, point):
+        self._unshare()
+        log = self._operationlog()
+        before = None if log is None else self._vertexdata()
         self.pointList.insert(index, point)
         self._update()
         self._updatehittarget()
+        if log is not None: log.record(oplog.vertexOp("insertvertices", self.id, before, self._vertexdata(), index if index >= 0 else index+len(before), 1))
 
     def deletePoint(self, index):
         self.deletePoints(index, index+1)
 
     def deletePoints(self, start, end):
+        self._unshare()
+        log = self._operationlog()
+        before = None if log is None else self._vertexdata()
         del self.pointList[slice(start, end)]
         self._update()
         self._updatehittarget()
+        if log is not None: self._logDeletion(log, before, start, end)
 
 class BezierMixin(object):
     '''Methods for all types of BezierObject. The parameters point, pointlist, pointset etc should be (lists of) Point object(s).'''
     def setPointset(self, i, pointset):
+        self._unshare()
+        log = self._operationlog()
+        if log is not None: old = [None if point is None else list(point) for point in self.pointsetList[i]]
         self.pointList[i] = pointset[1]
         self.pointsetList[i] = pointset
         self._update()
         self._updatehittarget()
+        if log is not None:
+            new = [None if point is None else list(point) for point in pointset]
+            log.record({"op":"setvertices", "id":self.id, "changes":[[i%len(self.pointsetList), old, new]]})
 
     def setPointsetList(self, pointsetlist):
         self.pointList = [pointset[1] for pointset in pointsetlist]
@@ -56,10 +76,25 @@ class BezierMixin(object):
         self._updatehittarget()
 
     def setPoint(self, i, point):
+        self._unshare()
+        log = self._operationlog()
+        if isinstance(self, SmoothBezierMixin) and len(self.pointList) > 2: #Only the nearby control points change
+            i %= len(self.pointList)
+            window = self._controlwindow([i])
+            if log is not None: old = self._vertexdata(window)
+            self.pointList[i] = point
+            self._updatecontrolpoints([i])
+            self._updatehittarget()
+            if log is not None:
+                changes = [[j, oldvalue, newvalue] for (j, oldvalue, newvalue) in zip(window, old, self._vertexdata(window)) if oldvalue != newvalue]
+                log.record({"op":"setvertices", "id":self.id, "changes":changes})
+            return
+        before = None if log is None else self._vertexdata()
         self.pointList[i] = point
         self.pointsetList = self._getpointsetlist(self.pointList)
         self._update()
         self._updatehittarget()
+        if log is not None: log.record(oplog.vertexOp("setvertices", self.id, before, self._vertexdata()))
     """
     def setPoints(self, pointlist):
         self.pointList = pointlist
@@ -68,38 +103,69 @@ class BezierMixin(object):
         self._updatehittarget()
     """
     def _appendPoint(self, point):
+        self._unshare()
         self.pointList.append(point)
-        self.pointsetList = self._getpointsetlist(self.pointList)
-        self._update()
+        if isinstance(self, SmoothBezierMixin):
+            self.pointsetList.append(None)
+            self._pathsegments.append(None)
+            self._updatecontrolpoints([len(self.pointList)-1])
+        else:
+            self.pointsetList = self._getpointsetlist(self.pointList)
+            self._update()
 
     def deletePoints(self, start, end):
-        del self.pointList[slice(start, end)]
-        self.pointsetList = self._getpointsetlist(self.pointList)
-        self._update()
+        self._unshare()
+        log = self._operationlog()
+        before = None if log is None else self._vertexdata()
+        if isinstance(self, SmoothBezierMixin):
+            L = len(self.pointList)
+            (start, end, step) = slice(start, end).indices(L)
+            del self.pointList[start:end]
+            del self.pointsetList[start:end]
+            self._deletepathsegments(start, end, L)
+            self._updatecontrolpoints([start-1, start])
+        else:
+            del self.pointList[slice(start, end)]
+            self.pointsetList = self._getpointsetlist(self.pointList)
+            self._update()
         self._updatehittarget()
+        if log is not None: self._logDeletion(log, before, start, end)
 
     def insertPoint(self, index, point):
+        self._unshare()
+        log = self._operationlog()
+        before = None if log is None else self._vertexdata()
+        L = len(self.pointList)+1
+        index = min(index, L-1) if index >= 0 else max(0, index+L-1) #The position which the new vertex will have
         self.pointList.insert(index, point)
+        self._pathsegments.insert(index, None) #Replaced by _updatepath
         if isinstance(self, SmoothBezierMixin):
-            self.pointsetList = self._getpointsetlist(self.pointList)
+            self.pointsetList.insert(index, None)
+            self._updatecontrolpoints([index])
         else:
-            L = len(self.pointList)
             triple = [self.pointList[index-1], point, self.pointList[(index+1)%L]]
             cpoint1, cpoint2 = SmoothBezierMixin._calculatecontrolpoints(self, triple)
             #cpoint1, cpoint2 = (self.pointList[index-1]+point)/2, (self.pointList[(index+1)%L]+point)/2
             self.pointsetList.insert(index, [cpoint1, point, cpoint2])
             self.pointsetList[index-1][2] = cpoint1
             self.pointsetList[(index+1)%L][0] = cpoint2
-        self._update()
+            self._updatepath([index-1, index, index+1])
         self._updatehittarget()
+        if log is not None: log.record(oplog.vertexOp("insertvertices", self.id, before, self._vertexdata(), index, 1))
 
     def deletePoint(self, index):
+        self._unshare()
+        log = self._operationlog()
+        before = None if log is None else self._vertexdata()
+        L = len(self.pointsetList)
+        index %= L
         point = self.pointList[index]
         del self.pointList[index]
+        self._deletepathsegments(index, index+1, L)
         if isinstance(self, SmoothBezierMixin):
-            self.pointsetList = self._getpointsetlist(self.pointList)
+            del self.pointsetList[index]
+            self._updatecontrolpoints([index-1, index])
         else:
-            L = len(self.pointsetList)
             #triple = [self.pointList[index-1], point, self.pointList[(index+1)%L]]
             #cpoint1, cpoint2 = SmoothBezierMixin.calculatecontrolpoints(self, triple)
             #cpoint1, cpoint2 = (self.pointList[index-1]+point)/2, (self.pointList[(index+1)%L]+point)/2
@@ -112,26 +178,19 @@ class BezierMixin(object):
                 self.pointsetList[(index-1)%L][2] = point
                 self.pointsetList[(index+1)%L][0] = point
             del self.pointsetList[index]
-        self._update()
+            self._updatepath([index-1, index])
         self._updatehittarget()
+        if log is not None: log.record(oplog.vertexOp("deletevertices", self.id, before, self._vertexdata(), index, 1))
 
     def _movePoint(self, point):
+        self._unshare()
         self.pointList[-1] = point
         self._updatepointsetlist()
         if len(self.pointList) == 2:
             self._update()
-        elif isinstance(self, (ClosedBezierObject, SmoothClosedBezierObject)):
-            ((x1,x2),(x3,x4),(x5,x6)) = self.pointsetList[-2]
-            ((x7,x8),(x9,x10),(x11,x12)) = self.pointsetList[-1]
-            ((x13,x14),(x15,x16),(x17,x18)) = self.pointsetList[0]
-            self.plist = self.plist[:-16]+[x1,x2,x3,x4,x5,x6,x7,x8,x9,x10,x11,x12,x13,x14,x15,x16]
-            self.plist[4:6] = [x17, x18]
-            self.attrs["d"] = " ".join(str(x) for x in self.plist)
-        else:
-            ((x1,x2),(x3,x4),(x5,x6)) = self.pointsetList[-2]
-            ((x7,x8),(x9,x10),dummy) = self.pointsetList[-1]
-            self.plist = self.plist[:-10]+[x1,x2,x3,x4,x5,x6,x7,x8,x9,x10]
-            self.attrs["d"] = " ".join(str(x) for x in self.plist)
+        else: #Only the last two curves (and for closed shapes, the closing curve) have changed
+            L = len(self.pointList)
+            self._updatepath([L-2, L-1, 0] if isinstance(self, ClosedBezierObject) else [L-2, L-1])
 
 class DrawCanvasMixin(object):
     def setTool(self, tool):
@@ -147,6 +206,10 @@ class DrawCanvasMixin(object):
 
     def _drawPoint(self, event):
         if self.tool == "select": return
+        if self.tool == "freehand":
+            self._endStroke() #In case the previous release was not seen
+            self._startStroke(event)
+            return
         if self.mouseOwner:
             if isinstance(self.mouseOwner, (PolyshapeMixin, BezierMixin)):
                 coords = self.getSVGcoords(event)
@@ -158,6 +221,7 @@ class DrawCanvasMixin(object):
             self._createObject(coords)
 
     def _endDraw(self, event=None):
+        if self.tool == "freehand": return self._endStroke()
         if not self.mouseOwner: return
         svgobj = self.mouseOwner
         if isinstance(svgobj, (PolyshapeMixin, BezierMixin)):
@@ -179,6 +243,61 @@ class DrawCanvasMixin(object):
             if svgobj.pointList[0] == svgobj.pointList[1]: self.deleteObject(svgobj)
         self.mouseOwner = None
         self.mouseMode = MouseMode.EDIT
+        if self.operationLog is not None: self._logObjectOperation("addobject", svgobj) #Changes made while drawing were not recorded
+        return svgobj
+
+    def _startStroke(self, event):
+        '''Not intended to be called by end users. Starts a freehand stroke. Until it is finished, the stroke is shown by
+        a polyline through the points kept by a `curvefit.StrokeSimplifier`, which is not in the canvas's `objectDict`.'''
+        self.stroke = curvefit.StrokeSimplifier(self.freehandTolerance*self.scaleFactor/2) #Half for simplifying, half for fitting
+        self.stroke.addPoint(self.getSVGcoords(event))
+        self.strokeString = "" #The "points" attribute for the points which have been kept
+        self.strokeDrawn = 0 #The number of kept points which are in strokeString
+        self.mouseOwner = svg.polyline(style={"stroke":self.penColour, "stroke-width":self.penWidth, "fill":"none"})
+        self <= self.mouseOwner
+
+    def _continueStroke(self, event):
+        '''Not intended to be called by end users. Adds all the positions reported by `event` to the stroke
+        (pointer events may combine several, which are available as "coalesced events"),
+        and arranges for the display to be updated before the next frame.'''
+        try:
+            events = event.getCoalescedEvents() or [event]
+        except AttributeError:
+            events = [event]
+        m = self.getScreenCTM().inverse()
+        addpoint = self.stroke.addPoint
+        for ev in events:
+            (x, y) = (ev.changedTouches[0].clientX, ev.changedTouches[0].clientY) if "touch" in ev.type else (ev.clientX, ev.clientY)
+            addpoint((m.a*x + m.c*y + m.e, m.b*x + m.d*y + m.f))
+        if self.strokeFrame is None: self.strokeFrame = window.requestAnimationFrame(self._drawStroke)
+
+    @timings.timed("DOM-drawStroke")
+    def _drawStroke(self, timestamp=None):
+        '''Not intended to be called by end users. Shows the points added to the stroke since the last frame.'''
+        self.strokeFrame = None
+        stroke = self.stroke
+        if stroke is None: return
+        if stroke.reduced: #Earlier points have been discarded, so the whole polyline is replaced
+            (self.strokeString, self.strokeDrawn, stroke.reduced) = ("", 0, False)
+        self.strokeString += "".join(f"{x},{y} " for (x, y) in stroke.points[self.strokeDrawn:])
+        self.strokeDrawn = len(stroke.points)
+        latest = "" if stroke.latest is None else f"{stroke.latest[0]},{stroke.latest[1]}"
+        self.mouseOwner.attrs["points"] = self.strokeString + latest
+
+    def _endStroke(self):
+        '''Not intended to be called by end users. Replaces the freehand stroke by a `BezierObject` fitted to it,
+        and returns the new object (or `None` if the stroke was too short).'''
+        if self.stroke is None: return None
+        if self.strokeFrame is not None: window.cancelAnimationFrame(self.strokeFrame)
+        points = self.stroke.finish()
+        tolerance = self.stroke.tolerance
+        self.removeChild(self.mouseOwner)
+        self.mouseOwner = self.stroke = self.strokeFrame = None
+        pointsetlist = curvefit.fitPolyline(points, tolerance)
+        if not pointsetlist: return None
+        svgobj = BezierObject(pointsetlist, linecolour=self.penColour, linewidth=self.penWidth)
+        svgobj.shapeType = "freehand"
+        self.addObject(svgobj)
         return svgobj
 
     def _createEditHitTargets(self):
@@ -196,15 +315,13 @@ class DrawCanvasMixin(object):
             else:
                 if obj.style.fill != "none": continue
                 newobj = obj.cloneObject()
-                newobj.style.strokeWidth = 10*self.scaleFactor if self.mouseDetected else 25*self.scaleFactor
+                newobj.style.strokeWidth = HITTARGETWIDTH
             newobj.reference = obj
             newobj.style.opacity = 0
             if not isinstance(newobj, HitTarget):
                 for event in MOUSEEVENTS: newobj.bind(event, self._onHitTargetMouseEvent)
                 for event in TOUCHEVENTS: newobj.bind(event, self._onHitTargetTouchEvent)
-            obj.hitTarget = newobj
-            self.hittargets.append(newobj)
-            self.addObject(newobj)
+            self._addHitTarget(obj, newobj)
 
     def _prepareEdit(self, event):
         if self.selectedObject: self.deselectObject()
@@ -240,6 +357,9 @@ class DrawCanvasMixin(object):
             self <= self.handles
 
     def _movePoint(self, event):
+        if self.stroke is not None:
+            self._continueStroke(event)
+            return
         x = event.targetTouches[0].clientX if "touch" in event.type else event.clientX
         y = event.targetTouches[0].clientY if "touch" in event.type else event.clientY
         dx, dy = x-self.currentx, y-self.currenty
@@ -323,7 +443,7 @@ class HitTarget(GroupObject):
 
     def _update(self):
         self.deleteAll()
-        width = 10*self.canvas.scaleFactor if self.canvas.mouseDetected else 25*self.canvas.scaleFactor
+        width = HITTARGETWIDTH
         if isinstance(self.reference, PolyshapeMixin):
             pointlist = self.reference.pointList[:]
             if isinstance(self.reference, PolygonObject): pointlist.append(pointlist[0])
@@ -340,6 +460,8 @@ class HitTarget(GroupObject):
                 self.addObject(segment)
         self.canvas.deleteObject(self)
         self.canvas.addObject(self)
+        parent = self.canvas._hittargetparent(self.reference)
+        if parent is not self.canvas: parent <= self
 
 class Handle(PointObject):
     def __init__(self, owner, index, coords, colour, canvas):
@@ -372,11 +494,11 @@ class Handle(PointObject):
         self.canvas.selectedhandle = self
 
     def _movePoint(self, offset):
-        self.XY += offset
+        self.XY = self.XY + offset #A new Point, as the old one may be in the pointList of the owner (and its clones)
         if isinstance(self.owner, BezierMixin):
             pointset = [None, self.XY, None]
             for ch in self.controlHandles:
-                ch.XY += offset
+                ch.XY = ch.XY + offset
                 pointset[ch.subindex] = ch.XY
             self.owner.setPointset(self.pointIndex, pointset)
         else:
@@ -405,8 +527,8 @@ class ControlHandle(PointObject):
         self.canvas.mouseOwner = self
 
     def _movePoint(self, offset):
-        self.XY += offset
-        pointset = self.owner.pointsetList[self.pointIndex]
+        self.XY = self.XY + offset
+        pointset = list(self.owner.pointsetList[self.pointIndex]) #A copy, so that the operation log can record the old pointset
         pointset[self.subindex] = self.XY
         if self.linkedHandle:
             point = pointset[1]
@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Approximating Bezier curves by polylines, so that curved shapes can be used in the same calculations as polygons
+(bounding boxes, intersections, snapping etc). This module does not use the browser.
+
+Each cubic curve is divided in half repeatedly (by de Casteljau's method) until each piece is within `tolerance`
+of the straight line joining its ends, so nearly straight parts of a curve give few points and tight bends give more.'''
+
+TOLERANCE = 0.25 #Default maximum distance (in SVG units) between a curve and its polyline
+MAXDEPTH = 16 #Limits the number of subdivisions of each curve to 2**MAXDEPTH
+
+def flattenCubic(p0, p1, p2, p3, tolerance=TOLERANCE):
+    '''Returns a list of points approximating the cubic curve with end points `p0`, `p3` and control points `p1`, `p2`.
+    The list starts after `p0` and ends with `p3`.'''
+    limit = (tolerance*4/3)**2 #The curve is within 3/4 of the greatest distance of the control points from the chord
+    points = []
+    stack = [(tuple(p0), tuple(p1), tuple(p2), tuple(p3), 0)]
+    while stack:
+        (a, b, c, d, depth) = stack.pop()
+        if depth >= MAXDEPTH or (_segmentdistance2(b, a, d) <= limit and _segmentdistance2(c, a, d) <= limit):
+            points.append(d)
+            continue
+        ab = ((a[0]+b[0])/2, (a[1]+b[1])/2)
+        bc = ((b[0]+c[0])/2, (b[1]+c[1])/2)
+        cd = ((c[0]+d[0])/2, (c[1]+d[1])/2)
+        abc = ((ab[0]+bc[0])/2, (ab[1]+bc[1])/2)
+        bcd = ((bc[0]+cd[0])/2, (bc[1]+cd[1])/2)
+        m = ((abc[0]+bcd[0])/2, (abc[1]+bcd[1])/2)
+        stack.append((m, bcd, cd, d, depth+1)) #The first half is taken off the stack first
+        stack.append((a, ab, abc, m, depth+1))
+    return points
+
+def flattenPointsetList(pointsetlist, closed=False, tolerance=TOLERANCE):
+    '''Returns a list of points approximating the curve given by `pointsetlist` (in the form used by `BezierObject`).
+    If `closed` is `True`, the curve returns to its start, and the start point is not repeated at the end of the list.'''
+    count = len(pointsetlist)
+    if count == 0: return []
+    points = [tuple(pointsetlist[0][1])]
+    for i in range(count if closed else count-1):
+        (pointset, nextset) = (pointsetlist[i], pointsetlist[(i+1)%count])
+        points.extend(flattenCubic(pointset[1], pointset[2], nextset[0], nextset[1], tolerance))
+    if closed: points.pop()
+    return points
+
+def boundingBox(points):
+    '''Returns the coordinates of the top-left and bottom-right of the box containing `points`.'''
+    xcoords = [x for (x, y) in points]
+    ycoords = [y for (x, y) in points]
+    return ((min(xcoords), min(ycoords)), (max(xcoords), max(ycoords)))
+
+def _segmentdistance2(p, a, b):
+    '''Not intended to be called by end users. Returns the square of the distance from `p` to the line segment `ab`.'''
+    (dx, dy) = (b[0]-a[0], b[1]-a[1])
+    (px, py) = (p[0]-a[0], p[1]-a[1])
+    length2 = dx*dx + dy*dy
+    t = 0 if length2 == 0 else max(0, min(1, (px*dx + py*dy)/length2))
+    (ex, ey) = (px - t*dx, py - t*dy)
+    return ex*ex + ey*ey
@@ -0,0 +1,890 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Points, and the polygon algorithms used by `brySVG.polygoncanvas` (relative position, intersections and boundaries).
+This module does not use the browser, so the algorithms can also be run by ordinary Python programs
+(see `brySVG.batch` for running large numbers of them in parallel):
+    square = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    triangle = Polygon([(10, 0), (20, 0), (10, 10)])
+    merged = boundary([square, triangle])
+
+The functions accept `Polygons` or any other objects with `pointList` and `segments` attributes, such as `PolygonObjects`.
+Intersections refer to the polygons which were passed in, so callers can find out which vertices or edges are involved.'''
+
+from math import sin, cos, atan2, pi, hypot, floor, log10, inf
+import time
+import brySVG.timings as timings
+
+class Enum(list):
+    def __init__(self, name, string):
+        values = string.split()
+        for i, value in enumerate(values):
+            setattr(self, value, i)
+            self.append(i)
+
+Position = Enum ('Position', 'CONTAINS INSIDE OVERLAPS EQUAL DISJOINT TOUCHING')
+dp = 2
+dp1 = dp-1
+dp2 = dp-2
+
+class Point(object):
+    '''Class to represent coordinates and also give some vector functionality'''
+    def __init__(self, coords):
+        self.coords = list(coords.coords) if isinstance(coords, Point) else list(coords)
+
+    def __repr__(self):
+        return str(tuple(self.coords))
+
+    def __eq__(self, other):
+        if isinstance(other, Point):
+            return (self.coords == other.coords)
+        elif isinstance(other, list):
+            return (self.coords == other)
+        elif isinstance(other, tuple):
+            return (tuple(self.coords) == other)
+        else:
+            return False
+
+    def __lt__(self, other):
+        return self.coords < other.coords
+
+    def __add__(self, other):
+        if isinstance(other, Point):
+            return Point([xi+yi for (xi, yi) in zip(self.coords, other.coords)])
+        elif isinstance(other, (list, tuple)):
+            return Point([xi+yi for (xi, yi) in zip(self.coords, other)])
+        elif other is None:
+            return None
+        else:
+            return NotImplemented
+
+    def __radd__(self, other):
+        return self + other
+
+    def __iadd__(self, other):
+        if isinstance(other, (list, tuple)):
+            for i in range(len(self.coords)):
+                self.coords[i] += other[i]
+        else:
+            for i in range(len(self.coords)):
+                self.coords[i] += other.coords[i]
+        return self
+
+    def __sub__(self, other):
+        return Point([xi-yi for (xi, yi) in zip(self.coords, other.coords)])
+
+    def __rsub__(self, other):
+        return Point([xi-yi for (xi, yi) in zip(other.coords, self.coords)])
+
+    def __neg__(self):
+        return Point([-xi for xi in self.coords])
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Point([other*xi for xi in self.coords])
+        elif isinstance(other, (list, tuple)):
+            return Point([xi*yi for (xi, yi) in zip(self.coords, other)])
+        elif isinstance(other, Point):
+            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])
+        elif isinstance(other, Matrix):
+            return Point([self*col for col in other.cols])
+        else:
+            return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return Point([other*xi for xi in self.coords])
+        elif isinstance(other, (list, tuple)):
+           return Point([xi*yi for (xi, yi) in zip(self.coords, other)])
+        elif isinstance(other, Point):
+            return sum([xi*yi for (xi, yi) in zip(self.coords, other.coords)])
+        else:
+            return NotImplemented
+
+    def __truediv__(self, other):
+        return Point([xi/other for xi in self.coords])
+
+    def __getitem__(self, i):
+        return self.coords[i]
+
+    def __hash__(self):
+        return hash(tuple(self.coords))
+
+    def __round__(self, n):
+        (x, y) = self.coords
+        return Point((round(float(x), n), round(float(y), n)))
+
+    def __len__(self):
+        return len(self.coords)
+
+    def length(self):
+        (x, y) = self.coords
+        return hypot(x, y)
+
+    def angle(self):
+        return atan2(self.coords[1], self.coords[0])
+
+    def anglefrom(self, other):
+        dot = other*self
+        cross = other.cross(self)
+        if cross == 0: cross = -0.0
+        angle = atan2(cross, dot)
+        return angle
+
+    def cross(self, other):
+        x1, y1 = self.coords
+        x2, y2 = other.coords
+        return x1*y2 - y1*x2
+
+    def roundsf(self, sf):
+        x, y = self.coords
+        return Point((roundsf(x, sf), roundsf(y, sf)))
+
+class Matrix(object):
+    def __init__(self, rows):
+        self.rows = rows
+        self.cols = [Point([self.rows[i][j] for i in range(len(self.rows))]) for j in range(len(self.rows[0]))]
+
+    def __str__(self):
+        return str("\n".join(str(row) for row in self.rows))
+
+    def __rmul__(self, other):
+        if isinstance(other, (list, tuple)):
+            return [Point([p*col for col in self.cols]) for p in other]
+        else:
+            return Point([other*col for col in self.cols])
+
+def roundsf(x, sf=3):
+    if x == 0: return 0
+    return round(x, sf-int(floor(log10(abs(x))))-1)
+
+class ListDict(dict):
+    def __getitem__(self, key):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            self[key] = []
+            return self[key]
+
+class SetDict(dict):
+    def __getitem__(self, key):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            self[key] = set()
+            return self[key]
+
+class Segment(object):
+    def __init__(self, startpoint, endpoint, poly, index):
+        if endpoint < startpoint:
+            self.leftpoint, self.rightpoint = endpoint, startpoint
+            self.leftindex, self.rightindex = reversed(index)
+        else:
+            self.leftpoint, self.rightpoint = startpoint, endpoint
+            self.leftindex, self.rightindex = index
+
+        self.leftx, self.lefty = self.leftpoint
+        self.rightx, self.righty = self.rightpoint
+        (self.top, self.bottom) = (self.righty, self.lefty) if self.righty<self.lefty else (self.lefty, self.righty)
+        self.poly = poly
+        self.index = index
+        self.dx, self.dy = self.rightx-self.leftx, self.righty-self.lefty
+        self.gradient = inf if self.dx == 0 else self.dy/self.dx
+        self.angle = atan2(self.dy, self.dx)-pi/2+pi*(self.dy<0)
+        self.y = self.lefty
+        self.xpos = "L"
+
+    def __repr__(self):
+        return f"{self.poly}{self.index}: [{self.leftpoint}, {self.rightpoint}]; currenty: {self.y}, xpos: {self.xpos}, gradient: {self.gradient}, angle: {self.angle}"
+
+class Intersection(object):
+    def __init__(self, polyrefs, point=None):
+        (poly1, index1), (poly2, index2) = polyrefs
+        self.polyrefs = {poly1:index1, poly2:index2}
+        self.point = point if point is not None else Point((0, 0))
+
+    def __repr__(self):
+        s = f"{self.point} \n"
+        polys = sorted(self.polyrefs, key = lambda poly: poly.id)
+        for poly in polys:
+            index = self.polyrefs[poly]
+            if isinstance(index, int):
+                s += f"at vertex {index} on polygon {poly}\n"
+            else:
+                i1, i2 = index
+                s += f"between vertices {i1} and {i2} on polygon {poly}\n"
+        return s
+
+class Polygon(object):
+    '''A polygon for use with the functions in this module, without an element in the page. Parameters:
+    `pointlist`: a list of coordinates for the vertices
+    `polyid`: an optional id, used when printing intersections'''
+    def __init__(self, pointlist, polyid=""):
+        self.pointList = [Point(coords) for coords in pointlist]
+        self.id = polyid
+        self._segments = None
+
+    def __repr__(self):
+        return f"polygon {self.id}" if self.id else f"polygon {id(self)}"
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            L = len(self.pointList)
+            self._segments = [Segment(self.pointList[i-1], self.pointList[i], self, ((i-1)%L, i)) for i in range(L)]
+        return self._segments
+
+    def area(self):
+        '''Returns the area of the polygon'''
+        return area(self.pointList)
+
+def boundingBox(poly, xdp=None, ydp=None):
+    xcoords = [round(x, xdp) for (x,y) in poly] if xdp else [x for (x,y) in poly]
+    left = min(xcoords)
+    right = max(xcoords)
+    ycoords = [round(y, ydp) for (x,y) in poly] if ydp else [y for (x,y) in poly]
+    top = min(ycoords)
+    bottom = max(ycoords)
+    return (left, top), (right, bottom)
+
+def _compareboundingboxes(poly1, poly2, xdp=None, ydp=None):
+    if xdp and not ydp: ydp = xdp
+    ((left1, top1), (right1, bottom1)) = boundingBox(poly1, xdp, ydp)
+    ((left2, top2), (right2, bottom2)) = boundingBox(poly2, xdp, ydp)
+    if right1 < left2 or right2 < left1 or bottom1 < top2 or bottom2 < top1: return Position.DISJOINT
+    if right1 == left2 or right2 == left1 or bottom1 == top2 or bottom2 == top1: return Position.TOUCHING
+    if left1 < left2:
+        if right1 < right2: return Position.OVERLAPS
+        else: xresult = Position.CONTAINS
+    elif left1 == left2:
+        xresult = Position.INSIDE if right1 < right2 else Position.EQUAL if right1 == right2 else Position.CONTAINS
+    else: #left1 > left2
+        if right1 > right2: return Position.OVERLAPS
+        else: xresult = Position.INSIDE
+
+    if top1 < top2:
+        if bottom1 < bottom2: return Position.OVERLAPS
+        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS
+    elif top1 == top2:
+        if bottom1 < bottom2: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE
+        elif bottom1 == bottom2: return xresult
+        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS
+    else: #top1 > top2
+        if bottom1 > bottom2: return Position.OVERLAPS
+        else: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE
+
+def area(poly):
+    '''Returns the area of a polygon given as a list of coordinates'''
+    area = 0
+    (x0, y0) = poly[-1]
+    for (x1, y1) in poly:
+        area += x1*y0 - x0*y1
+        (x0, y0) = (x1, y1)
+    return abs(area/2)
+
+def equalPolygons(poly1, poly2):
+    '''Returns True if poly1 is identical to poly2, False otherwise.
+    poly1 and poly2 are lists of vertex coordinates.'''
+    start1 = poly1.index(min(poly1))
+    poly1 =  poly1[start1+1:]+poly1[:start1]
+    start2 = poly2.index(min(poly2))
+    poly2 =  poly2[start2+1:]+poly2[:start2]
+    return poly1 == poly2 or poly1 == poly2[::-1]
+
+def _getrotatedcoords(polylist, xdp):
+    def getbestangle(polylist):
+        anglesfromvertical = []
+        for poly in polylist:
+            segs = poly.segments
+            anglesfromvertical.extend([round(abs(seg.angle), 3) for seg in segs])
+        #print("angles", [a*180/pi for a in anglesfromvertical])
+        if 0 not in anglesfromvertical: return 0
+        positiveangles = [a for a in anglesfromvertical if a>0.1]
+        return round(min(positiveangles)/2, 1)
+
+    a = getbestangle(polylist)
+    cosa, sina = cos(a), sin(a)
+    #print("Best angle", a*180/pi)
+    coordslists = []
+    for poly in polylist:
+        #print(f"{poly} Before rounding:{poly.pointList}")
+        if a == 0:
+            polyrotated = poly.pointList
+        else: #Rotated by a about (5500, 5500)
+            polyrotated = [(5500 + (x-5500)*cosa - (y-5500)*sina, 5500 + (x-5500)*sina + (y-5500)*cosa) for (x, y) in poly.pointList]
+
+        coords = [(round(x, xdp), y) for (x, y) in polyrotated]
+        coordslists.append(coords)
+        #print(f"{poly} after rotation and rounding:\n{coords}")
+    return coordslists
+
+def _getsortedsegments(polylist, coordslists):
+    segments = []
+    for poly, coordslist in zip(polylist, coordslists):
+        L = len(coordslist)
+        segments.extend([Segment(coordslist[i-1], coordslist[i], poly, ((i-1)%L, i)) for i in range(L)])
+    segments.sort(key = lambda seg: (seg.leftx, round(seg.lefty, dp1), seg.gradient))
+    return segments
+
+def mergelists(list1,list2):
+    if not list1:  return list(list2)
+    if not list2:  return list(list1)
+
+    list1iter, list2iter = iter(list1), iter(list2)
+    item1 = next(list1iter)
+    item2 = next(list2iter)
+    result = []
+
+    while item1:
+        while item2 and (item2.y < item1.y or (item2.y == item1.y and item1.xpos != "R" and item2.gradient < item1.gradient)):
+            result.append(item2)
+            item2 = next(list2iter, None)
+        result.append(item1)
+        item1 = next(list1iter, None)
+    if item2:
+        result.append(item2)
+        result.extend(list2iter)
+    return result
+
+def findedgesnap(objsegments, checksegments, snapangle, snapd):
+    '''Finds the best way of snapping an edge of an object (whose edges are `objsegments`) onto one of `checksegments`
+    (see `canvas.edgeSnap`). The edges must be within `snapangle` (in radians) and `snapd` of each other.
+    Returns `(angle, centre, vector)`: the object should be rotated by `angle` (in radians) about `centre`
+    and then translated by `vector`; or returns None if no edges are close enough.'''
+    tt = timings.start()
+    bestangle = None
+    checksegs = sorted(checksegments, key = lambda seg: seg.angle) #all segments which could possibly be snapped to, sorted by angle from vertical
+    for seg in checksegs: #if any segments have an angle within snapangle of -pi/2, create a copy with equaivalent angle close to +pi/2
+        if seg.angle > snapangle - pi/2: break
+        newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)
+        newseg.angle = seg.angle + pi
+        checksegs.append(newseg)
+
+    objsegs = sorted(objsegments, key = lambda seg: seg.angle)
+    for seg in objsegs: #do the same for the object being snapped
+        if seg.angle > snapangle - pi/2: break
+        newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)
+        newseg.angle = seg.angle + pi
+        objsegs.append(newseg)
+
+    tt = timings.lap("ES-createsegments", tt)
+    #print("objsegs")
+    #for seg in objsegs: print(seg)
+    #print("checksegs")
+    #for seg in checksegs: print(seg)
+    checkstart = 0
+    piby4 = pi/4
+    found = False
+    for i, seg1 in enumerate(objsegs): #sweep stops at the angle of each segment of object to be snapped
+        angle1 = seg1.angle
+        #print("\nChecking:", angle1)
+        checksegs = checksegs[checkstart:] #remove segments with angle << angle of object segments
+        if not checksegs: break
+        #print("check angles", [seg.angle for seg  in checksegs])
+        try:
+            tonextangle = objsegs[i+1].angle - angle1 #find amount between current and next angle in the sweep
+        except IndexError:
+            tonextangle = 0
+        #print("tonextangle", tonextangle)
+        checkstart = 0
+        for seg2 in checksegs: #start checking segments within snapangle of the current object segment
+            angle2 = seg2.angle
+            #print("Against:", angle2)
+            angled = angle2 - angle1
+            #print("Current best angle", bestangle)
+            #print("angled", angled)
+            absangle = abs(angled)
+            if (bestangle is None and absangle < snapangle) or (bestangle is not None and absangle < bestangle):
+                #print("Angles close enough")
+                (objleft, objright) = (seg1.leftx, seg1.rightx) #First check bounding boxes - if disjoint, ignore segment
+                (objtop, objbottom) = (seg1.top, seg1.bottom)
+                (checkleft, checkright) = (seg2.leftx-snapd, seg2.rightx+snapd)
+                (checktop, checkbottom) = (seg2.top-snapd, seg2.bottom+snapd)
+                if not (objleft > checkright or objright < checkleft or objtop > checkbottom or objbottom < checktop):
+                    objp, objq = seg1.leftpoint, seg1.rightpoint #Next check whether segments intersect ...
+                    checkp, checkq = seg2.leftpoint, seg2.rightpoint
+                    #print("Not disjoint segments")
+                    #print("obj:", seg1)
+                    #print("check:", seg2)
+                    objv, checkv = objq-objp, checkq-checkp
+                    diff, product = checkp - objp, objv.cross(checkv)
+                    (t, u) = (diff.cross(objv)/product, diff.cross(checkv)/product) if product != 0 else (inf, inf)
+                    #print("t and u", t, u)
+                    if 0<=t<=1 and 0<=u<=1: #... if so, distance between them is 0
+                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, objp + u*objv, (0, 0), seg1, seg2)
+                    else: #... if not, check how close each endpoint of segment is to the other segment,
+                        bestd = None #vertically or horizontally depending on the angle of the segment
+                        (objx1, objy1), (objx2, objy2) = objp, objq
+                        (checkx1, checky1), (checkx2, checky2) = checkp, checkq
+                        if abs(angle2) < piby4:
+                            if checktop <= objy1 <= checkbottom:
+                                checkx = checkx1 + (objy1-checky1)/(checky2-checky1)*(checkx2-checkx1)
+                                diff = checkx-objx1
+                                #print("Checking objx1", objx1, checkx, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (diff, 0), seg1, seg2)
+                            if checktop <= objy2 <= checkbottom:
+                                checkx = checkx1 + (objy2-checky1)/(checky2-checky1)*(checkx2-checkx1)
+                                diff = checkx-objx2
+                                #print("Checking objx2", objx2, checkx, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (diff, 0), seg1, seg2)
+                        else:
+                            if checkleft <= objx1 <= checkright:
+                                checky = checky1 + (objx1-checkx1)/(checkx2-checkx1)*(checky2-checky1)
+                                diff = checky-objy1
+                                #print("Checking objy1", objy1, checky, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (0, diff), seg1, seg2)
+                            if checkleft <= objx2 <= checkright:
+                                checky = checky1 + (objx2-checkx1)/(checkx2-checkx1)*(checky2-checky1)
+                                diff = checky-objy2
+                                #print("Checking objy2", objy2, checky, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (0, diff), seg1, seg2)
+                        if abs(angle1) < piby4:
+                            if objtop <= checky1 <= objbottom:
+                                objx = objx1 + (checky1-objy1)/(objy2-objy1)*(objx2-objx1)
+                                diff = checkx1-objx
+                                #print("Checking checkx1", checkx1, objx, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky1), (diff, 0), seg1, seg2)
+                            if objtop <= checky2 <= objbottom:
+                                objx = objx1 + (checky2-objy1)/(objy2-objy1)*(objx2-objx1)
+                                diff = checkx2-objx
+                                #print("Checking checkx2", checkx2, objx, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky2), (diff, 0), seg1, seg2)
+                        else:
+                            if objleft <= checkx1 <= objright:
+                                objy = objy1 + (checkx1-objx1)/(objx2-objx1)*(objy2-objy1)
+                                diff = checky1-objy
+                                #print("Checking checky1", checky1, objy, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx1, objy), (0, diff), seg1, seg2)
+                            if objleft <= checkx2 <= objright:
+                                objy = objy1 + (checkx2-objx1)/(objx2-objx1)*(objy2-objy1)
+                                diff = checky2-objy
+                                #print("Checking checky2", checky2, objy, diff)
+                                if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
+                                    (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx2, objy), (0, diff), seg1, seg2)
+            #if bestangle: print("Current best angle and vector", angled, vector)
+            if tonextangle - angled > snapangle:
+                checkstart += 1 #angle just checked will be too small when sweep moves on
+                #print("New checkstart", checkstart)
+            if angled > snapangle:
+                #print("Finished checking", angle1)
+                break #angle just checked is too great - time to move sweep on
+            if bestangle == 0:
+                found = True #Angle of 0 can't be beaten, so abort search at this sweep point...
+                break
+        if found: break #... and abort sweep completely
+    timings.lap("ES-findbestsnap", tt)
+    return None if bestangle is None else (angle, centre, vector)
+
+def findvertexsnap(objpoints, checkpoints, snapd):
+    '''Finds the nearest of `checkpoints` to any of `objpoints` (see `canvas.vertexSnap`), if it is within `snapd`
+    horizontally and vertically. Returns the vector `(dx, dy)` by which the object should be moved, or None.'''
+    bestdx = bestdy = bestd = None
+    checkpoints = sorted(checkpoints, key=lambda p:p.coords) #all points which could possibly be snapped to
+    objpoints = sorted(objpoints, key=lambda p:p.coords)
+
+    checkstart = 0
+    for i, point1 in enumerate(objpoints): #vertical sweepline stops at each x-coord of object to be snapped
+        checkpoints = checkpoints[checkstart:] #remove points too far to the left of sweepline
+        if not checkpoints: break
+        try:
+            (tonextx, y) = objpoints[i+1] - point1 #find distance between current and next position of sweepline
+        except IndexError:
+            tonextx = 0
+        checkstart = 0
+        for point2 in checkpoints: #start checking
+            (dx, dy) = point2 - point1
+            if abs(dx) < snapd and abs(dy) < snapd:
+                d = hypot(dx, dy)
+                if bestd is None or d < bestd: (bestd, bestdx, bestdy) = (d, dx, dy)
+            if tonextx - dx > snapd: checkstart += 1 #point just checked will be too far to the left when sweepline moves on
+            if dx > snapd: break #point just checked is too far to the right of sweepline - time to move sweepline on
+    return (bestdx, bestdy) if bestd else None
+
+class Cancelled(Exception):
+    '''Raised by `sliced()` when a calculation is cancelled.'''
+    pass
+
+def complete(steps):
+    '''Runs the generator `steps` (eg `boundarysteps(polylist)`) to the end, and returns its result.'''
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def sliced(steps, budget=0.01, progress=None, cancelled=None):
+    '''A generator which runs the generator `steps` (eg `boundarysteps(polylist)`) in slices of about `budget` seconds,
+    yielding after each slice (so that, in the browser, other events can be handled before the next slice is run),
+    and returning the result of `steps`. The result is exactly the same as that of the corresponding function.
+    After each slice, `progress(fraction)` is called (if given), and if `cancelled()` returns `True`, `Cancelled` is raised.'''
+    fraction = 0
+    while True:
+        end = time.time() + budget
+        try:
+            fraction = next(steps)
+            while time.time() < end: fraction = next(steps) #At least one step is taken in each slice
+        except StopIteration as stop:
+            if progress: progress(1)
+            return stop.value
+        if progress: progress(fraction)
+        if cancelled and cancelled():
+            steps.close()
+            raise Cancelled()
+        yield fraction
+
+def _scaled(steps, start, end):
+    '''Not intended to be called by end users. Runs the generator `steps`, yielding its fractions scaled to lie between
+    `start` and `end`, and returns its result.'''
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield start + fraction*(end-start)
+
+def relativeposition(self, other):
+    '''Returns an Enum value: Position.CONTAINS, Position.INSIDE, Position.OVERLAPS, Position.DISJOINT or Position.EQUAL.
+    self and other are polygons.'''
+    def sweeppast(x, latestoutcome, livesegments):
+        #print("\n\nXvalue", x, "\nLive segments:\n", "\n".join(str(seg) for seg in livesegments), "\nCurrent Outcome", latestoutcome)
+        for seg in livesegments:
+            if seg.rightx == x:
+                seg.y = round(seg.righty, dp2)
+            else:
+                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)
+
+        for i, seg in enumerate(livesegments):
+            for seg2 in livesegments[i+1:]:
+                #print("\nComparing\n", seg, "\nwith\n", seg2)
+                if seg.y == inf or seg2.y == inf: continue
+                if seg.y > seg2.y and seg.poly != seg2.poly:
+                    #print("Found Intersection:", seg, seg.y, seg2, seg2.y)
+                    return Position.OVERLAPS, None
+        livesegments = [seg for seg in livesegments if round(seg.rightx, dp1) > round(x, dp1)]
+
+        while unusedsegments and round(unusedsegments[0].leftx, dp1) == round(x, dp1):
+            newseg = unusedsegments.pop(0)
+            newseg.y = round(newseg.lefty, dp2)
+            livesegments.append(newseg)
+        livesegments.sort(key=lambda seg: (seg.y, seg.gradient))
+        #print("\nUpdated live segments:\n", "\n".join(str(seg) for seg in livesegments))
+
+        yvaluesA = [seg.y for seg in livesegments if seg.poly == polyA]
+        intervalsA = list(zip(yvaluesA[::2], yvaluesA[1::2]))
+        yvaluesB = [seg.y for seg in livesegments if seg.poly == polyB]
+        intervalsB = list(zip(yvaluesB[::2], yvaluesB[1::2]))
+
+        #print("\nIntervals A", intervalsA, "\nIntervalsB", intervalsB)
+        for (startB, endB) in intervalsB: #For each "inner?" interval
+            for (startA, endA) in intervalsA: #Check each "outer?" interval
+                if startB == endB and (startA == startB or endA == endB): break
+                if startA <= startB and endA >= endB:
+                    if latestoutcome == Position.DISJOINT: return Position.OVERLAPS, None
+                    latestoutcome = Position.CONTAINS
+                    break
+                elif startB < startA < endB or startB < endA < endB:
+                    return Position.OVERLAPS, None
+            else:
+                if latestoutcome == Position.CONTAINS: return Position.OVERLAPS, None
+                latestoutcome = Position.DISJOINT
+        return latestoutcome, livesegments
+
+    tt = timings.start()
+    polyA, polyB = self, other
+    coordslist1, coordslist2 = _getrotatedcoords([polyA, polyB], xdp=dp)
+
+    transposed = False
+    bboxresult = _compareboundingboxes(coordslist1, coordslist2, ydp=dp)
+    #print("Bboxresult:", bboxresult)
+    if bboxresult in {Position.DISJOINT, Position.TOUCHING}: return Position.DISJOINT
+    if bboxresult == Position.EQUAL:
+        if equalPolygons(coordslist1, coordslist2): return Position.EQUAL
+        elif area(coordslist2) > area(coordslist1):
+            coordslist1, coordslist2 = coordslist2, coordslist1
+            polyA, polyB = polyB, polyA
+            transposed = True
+    if bboxresult == Position.INSIDE:
+        coordslist1, coordslist2 = coordslist2, coordslist1
+        polyA, polyB = polyB, polyA
+        transposed = True
+
+    #print("Transposed", transposed)
+    unusedsegments = _getsortedsegments([polyA, polyB], [coordslist1, coordslist2])
+    tt = timings.lap("RP-getsortedsegments", tt)
+    #print("\nSegments at start:\n", "\n".join(str(seg) for seg in unusedsegments))
+    livesegments = []
+    currentoutcome = None
+    xvalues = sorted(set(x for (x, y) in coordslist1+coordslist2))
+    #print("\nxValues", xvalues)
+    for x in xvalues: #Vertical sweepline stops at each vertex of either polygon
+        #print ("\nx =", x)
+        currentoutcome, livesegments = sweeppast(x, currentoutcome, livesegments)
+        #print ("currentoutcome", currentoutcome, "\n")
+        if currentoutcome == Position.OVERLAPS: break
+    timings.lap("RP-sweeppast", tt)
+    if currentoutcome == Position.CONTAINS and transposed: currentoutcome = Position.INSIDE
+    return currentoutcome
+
+def findintersections(polylist):
+    '''Returns a list of all the intersections between polygons in polylist.
+    Each intersection is represented by an Intersection object which has 2 attributes:
+    .point: a Point whose coordinates are the intersection
+    .polyrefs: a dictionary whose keys are the polygons which intersect at the that point.  For each key, the value is the index.
+    If this is an integer i, the intersection is at key.pointList[i]
+    If this is a tuple (i-1, i), the intersection is between key.pointList[i-1] and key.pointList[i]
+    '''
+    return complete(findintersectionsteps(polylist))
+
+def findintersectionsteps(polylist):
+    '''A generator which does the same calculation as `findintersections()` in small steps, yielding the fraction
+    of the work done (from 0 to 1) after each step, and returning the list of intersections (see `sliced()`).'''
+    def calculatepoint(polyrefs):
+        (poly1, index1), (poly2, index2) = polyrefs
+        (i1a, i1b), (i2a, i2b) = index1, index2
+        p1, p2 = poly1.pointList[i1a], poly2.pointList[i2a]
+        v1, v2 = poly1.pointList[i1b] - p1, poly2.pointList[i2b] - p2
+        #print("Poly1", p1, v1, "Poly2", p2, v2)
+        #print("indexes", ix.index1, ix.index2)
+        #print("cross of vectors", v1.cross(v2))
+        if v1.cross(v2) == 0: return Point((0,0))
+        t = (p2-p1).cross(v2)/v1.cross(v2)
+        point = p1+t*v1
+        return point
+
+    def addtoixdict(point, polyrefs):
+        ixkey = round(point, dp2)
+        if ixkey in ixpoints:
+            #print("combining with", ixpoints[ixkey])
+            existingrefs = ixpoints[ixkey].polyrefs
+            for poly, index in polyrefs:
+                if (poly not in existingrefs) or isinstance(index, int):
+                    existingrefs[poly] = index
+                else:
+                    oldindex = existingrefs[poly]
+                    if isinstance(oldindex, tuple) and index != oldindex:
+                        (a,b), (c,d) = index, oldindex
+                        existingrefs[poly] = b if b==c else a
+        else:
+            #print("creating new")
+            ixpoints[ixkey] = Intersection(polyrefs, point)
+            #print(ixpoints[ixkey])
+
+    def sweeppast(x, livesegments): #move to next value of x
+        for seg in livesegments: #For all live segments, work out the current y coord
+            if seg.rightx == x:
+                seg.y = round(seg.righty, dp2)
+                seg.xpos = "R"
+                seg.currentindex = seg.rightindex
+            else:
+                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)
+                seg.xpos = "M"
+                seg.currentindex = seg.index
+        #print("\nXvalue", x)
+        #print("\nLive segments (start of sweeppast):\n", "\n".join(str(seg) for seg in livesegments))
+
+        for i, seg in enumerate(livesegments): #for each live segment,
+            for seg2 in livesegments[i+1:]: #look at all segments whose y-coord was previously >= this segment's y-coord
+                #print(f"Comparing:\n{seg}\nwith\n{seg2}")
+                if seg.y == inf or seg2.y == inf: continue
+                if seg.y > seg2.y and seg.poly != seg2.poly: #if this segment's y-coord  is now greater, they must have crossed
+                    #print("Found intersection")
+                    polyrefs = [(seg.poly, seg.index), (seg2.poly, seg2.index)]
+                    point = calculatepoint(polyrefs)
+                    addtoixdict(point, polyrefs)
+
+        newsegments = []
+        while unusedsegments and unusedsegments[0].leftx == x: #get any segments which start at this value of x
+            newseg = unusedsegments.pop(0)
+            newseg.y = round(newseg.lefty, dp2)
+            newseg.xpos = "L"
+            newseg.currentindex = newseg.leftindex
+            newsegments.append(newseg)
+
+        livesegments.sort(key=lambda seg: seg.y) #sort live segments based on y-coord (but not gradient; may be about to cross)
+        livesegments = mergelists(livesegments, newsegments) #merge the new segments based on y-coord and gradient
+        #print("\nLive segments (with new added):\n", "\n".join(str(seg) for seg in livesegments))
+
+        segiter = iter(livesegments)
+        seg = next(segiter, None)
+        while seg is not None: #look for segments whose current y-coord is the same
+            prevseg = seg
+            seg = next(segiter, None)
+            if seg is None: break
+            #print("\nPrevseg:", prevseg, "\nSeg:", seg)
+            if seg.y == prevseg.y and seg.poly != prevseg.poly:
+                if seg.xpos in {"L","R"} or prevseg.xpos in {"L","R"}: #but if the current position is in the middle of both segments, they could just be collinear
+                    #print("found intersection")
+                    point = seg.poly.pointList[seg.currentindex] if seg.xpos in {"L","R"} else prevseg.poly.pointList[prevseg.currentindex]
+                    addtoixdict(point, [(seg.poly, seg.currentindex), (prevseg.poly, prevseg.currentindex)])
+
+        livesegments = [seg for seg in livesegments if seg.xpos != "R"] #remove segments which are finished with
+        return livesegments
+
+    #print("polylist:")
+    #for poly in polylist: print(poly, poly.pointList)
+    tt = timings.start()
+    coordslists = _getrotatedcoords(polylist, xdp=dp)
+    tt = timings.lap("FI-getrotatedcoords", tt)
+
+    unusedsegments = _getsortedsegments(polylist, coordslists)
+    tt = timings.lap("FI-getsortedsegments", tt)
+    #print("\nSegments at start:\n", "\n".join(str(seg) for seg in unusedsegments))
+    ixpoints = {}
+    livesegments = []
+    xvalues = sorted(set(x for coordslist in coordslists for (x, y) in coordslist))
+    #print("\nxValues", xvalues)
+    for (i, x) in enumerate(xvalues): #Vertical sweepline stops at each vertex of either polygon
+        livesegments = sweeppast(x, livesegments)
+        yield (i+1)/len(xvalues)
+    timings.lap("FI-sweeppast", tt)
+
+    return list(ixpoints.values())
+
+def boundary(polylist):
+    '''If all the polygons in the polylist touch or overlap, this returns a Polygon which is their outer boundary.
+    Otherwise returns None (or False if the boundary could not be traced).'''
+    return complete(boundarysteps(polylist))
+
+def boundarysteps(polylist):
+    '''A generator which does the same calculation as `boundary()` in small steps, yielding the fraction
+    of the work done (from 0 to 1) after each step, and returning the result (see `sliced()`).'''
+    tt = timings.start()
+    ixlist = yield from _scaled(findintersectionsteps(polylist), 0, 0.5) #Finding the intersections is most of the work
+    tt = timings.lap("B-findintersections", tt)
+    L = len(polylist)
+    if ixlist == []:
+        maxarea = 0
+        for poly in polylist:
+            polyarea = area(poly.pointList)
+            if polyarea > maxarea: (maxarea, maxpoly) = (polyarea, poly)
+        for (k, poly) in enumerate(polylist):
+            if poly is maxpoly: continue
+            if relativeposition(maxpoly, poly) != Position.CONTAINS: return None
+            yield 0.5 + 0.5*(k+1)/L
+        return Polygon(maxpoly.pointList)
+
+    ixlist.sort(key = lambda ix:ix.point)
+    pointlists = []
+    for i, poly in enumerate(polylist):
+        poly.listindex = i
+        pointlists.append(poly.pointList)
+    pointlists.append([ix.point for ix in ixlist])
+
+    reflists = [[(j, i) for i in range(len(pointlists[j]))] for j in range(L)]
+
+    ixdicts = [ListDict() for j in range(L)]
+    regions = []
+    for i, ix in enumerate(ixlist):
+        #print("intersection", i, "at", ix.point, "has polyrefs", ix.polyrefs)
+        for (poly, index) in ix.polyrefs.items():
+            #print(poly, "has listindex", poly.listindex)
+            j = poly.listindex
+            if isinstance(index, tuple):
+                #print("Adding point to ixdict for", poly)
+                ixdicts[j][index].append((L,i))
+            else:
+                #print("Replacing point", index, "in poly", poly)
+                reflists[j][index] = (L, i)
+        polyset = set(ix.polyrefs)
+        for region in regions:
+            if polyset & region:
+                region.update(polyset)
+                break
+        else:
+            regions.append(polyset)
+
+    polyregions = []
+    while regions:
+        #print("regions", regions)
+        mainregion = regions.pop(0)
+        for region in regions[:]:
+            if region & mainregion:
+                mainregion.update(region)
+                regions.remove(region)
+        polyregions.append(mainregion)
+    #print("polyregions", polyregions)
+
+    #print("ixdicts", ixdicts)
+
+    for j in range(L):
+        offset = 1
+        for index in sorted(ixdicts[j]):
+            (i, k) = index
+            insert = ixdicts[j][index]
+            pl = pointlists[j]
+            if pl[k] < pl[i]: insert.reverse()
+            reflists[j][i+offset:i+offset] = insert
+            offset += len(insert)
+
+    vertexdict = SetDict()
+    for j in range(L):
+        last = len(reflists[j]) - 1
+        for i in range(last+1): vertexdict[reflists[j][i]].update({reflists[j][i-1], reflists[j][(i+1) if i<last else 0]})
+    tt = timings.lap("B-makevertexdict", tt)
+    #print("vertexdict")
+    #for point in vertexdict:
+    #    (j, i) = point
+    #    print(point, pointlists[j][i], vertexdict[point])
+
+    minp = Point((inf, inf))
+    for (j, i) in vertexdict:
+        p = pointlists[j][i]
+        if p < minp: minp, minref = p, (j, i)
+    currentref = minref
+    currentp = start = minp
+    newpointlist = [currentp]
+    v1 = Point((0,1))
+    usedrefs ={(minref, v1)}
+    (j, i) = minref
+    startpoly = next(iter(ixlist[i].polyrefs)) if j == L else polylist[j]
+    for region in polyregions:
+        if startpoly in region:
+            boundaryregion = region
+            break
+    else:
+        boundaryregion = {startpoly}
+
+    #print("currentref, currentp, v1", currentref, currentp, v1)
+    while True:
+        maxangle = -pi
+        for (j, i) in vertexdict[currentref]:
+            p = pointlists[j][i]
+            v2 = p-currentp
+            angle = v2.anglefrom(v1)
+            #print("ref", (j, i),"point",p, "pvec", v2, "angle", angle*180/pi)
+            if angle > maxangle: (maxangle, bestp, bestref) = (angle, p, (j, i))
+        if [currentp, bestp] == newpointlist[:2]: break
+        currentref = bestref
+        newpointlist.append(bestp)
+        v1 = bestp - currentp
+        currentp = bestp
+        #print("New currentref, currentp, v1", currentref, currentp, v1)
+        if (currentref, v1) in usedrefs: break
+        usedrefs.add((currentref, v1))
+        (j, i) = currentref
+        yield 0.5 + 0.5*min(1, len(newpointlist)/len(vertexdict))
+    #print("New pointlist", newpointlist)
+    tt = timings.lap("B-constructboundary", tt)
+
+    if currentp != start: return False
+    boundary = Polygon(newpointlist[:-1])
+    if not (len(polyregions) == 1 and len(boundaryregion) == L):
+        for poly in polylist:
+            if poly not in boundaryregion:
+                #print(f"{poly} not in boundaryregion")
+                if relativeposition(boundary, poly) != Position.CONTAINS: return None
+                yield 1
+    timings.lap("B-checkunusedpolys", tt)
+
+    return boundary
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Recording the mouse, touch, wheel and key events handled by a canvas, and replaying them to measure how long
+each one takes to handle. This module does not use the browser, so logs can be stored and examined by ordinary
+Python programs (see `canvas.startInputRecording()` and `canvas.replayInput()` for recording and replaying in the page).
+
+Each event is recorded as a short list, starting with its time in milliseconds since the first event, its type,
+and the id of its target element:
+    mouse events and "dblclick": [time, type, target, clientX, clientY, button, buttons]
+    "wheel": [time, type, target, clientX, clientY, deltaY]
+    "keydown": [time, type, target, keyCode, key]
+    touch events: [time, type, target, touches, targetTouches, changedTouches]
+        where each list of touches is flat: [identifier, clientX, clientY, identifier, clientX, clientY, ...]
+`dumps()` writes a log as a header line followed by one line of JSON for each event, and `loads()` reads it back.'''
+
+from collections import deque
+import json
+import time
+import brySVG.timings as timings
+
+VERSION = 1
+HEADER = {"format":"brySVG-input", "version":VERSION}
+MOUSEEVENTS = ("mousedown", "mousemove", "mouseup", "dblclick")
+TOUCHEVENTS = ("touchstart", "touchmove", "touchend")
+EVENTTYPES = MOUSEEVENTS + TOUCHEVENTS + ("wheel", "keydown")
+#The canvas methods which handle each type of event (as bound in CanvasObject.__init__)
+HANDLERS = {"mousedown":"_onMouseDown", "mousemove":"_onMouseMove", "mouseup":"_onLeftUp", "dblclick":"_onDoubleClick",
+            "touchstart":"_onTouchStart", "touchmove":"_onMouseMove", "touchend":"_onLeftUp",
+            "wheel":"_onWheel", "keydown":"_onKeyDown"}
+
+class InputRecorder(object):
+    '''Records events (see the module docstring for the form of each entry). If `maxevents` is given, only the latest
+    `maxevents` events are kept (dropping the oldest costs the same however many are kept). Attribute:
+    `events`: a deque of the entries recorded so far, which can be passed to `dumps()` or `replay()` as it is'''
+    def __init__(self, maxevents=None):
+        self.maxevents = maxevents
+        self.events = deque(maxlen=maxevents)
+        self.starttime = None
+
+    def record(self, event):
+        '''Adds a DOM event (or any object with the same attributes) to the log.'''
+        if self.starttime is None: self.starttime = event.timeStamp
+        entry = [round(event.timeStamp - self.starttime, 1), event.type, getattr(event.target, "id", "") or ""]
+        if event.type in TOUCHEVENTS:
+            entry.extend([_packtouches(event.touches), _packtouches(event.targetTouches), _packtouches(event.changedTouches)])
+        elif event.type == "wheel":
+            entry.extend([event.clientX, event.clientY, event.deltaY])
+        elif event.type == "keydown":
+            entry.extend([event.keyCode, event.key])
+        else:
+            entry.extend([event.clientX, event.clientY, event.button, event.buttons])
+        self.events.append(entry)
+
+    def clear(self):
+        '''Discards the events recorded so far.'''
+        self.events.clear()
+        self.starttime = None
+
+class ReplayEvent(object):
+    '''An object with the attributes of a DOM event which the canvas's handlers use, made from a log entry.'''
+    def __init__(self, entry):
+        (self.timeStamp, self.type, targetid) = entry[:3]
+        self.target = _Target(targetid)
+        self.clientX = self.clientY = 0
+        self.button = self.buttons = 0
+        if self.type in TOUCHEVENTS:
+            (self.touches, self.targetTouches, self.changedTouches) = [_unpacktouches(touches) for touches in entry[3:6]]
+            if self.changedTouches: (self.clientX, self.clientY) = (self.changedTouches[0].clientX, self.changedTouches[0].clientY)
+        elif self.type == "wheel":
+            (self.clientX, self.clientY, self.deltaY) = entry[3:6]
+        elif self.type == "keydown":
+            (self.keyCode, self.key) = entry[3:5]
+        else:
+            (self.clientX, self.clientY, self.button, self.buttons) = entry[3:7]
+
+    def preventDefault(self):
+        pass
+
+    def stopPropagation(self):
+        pass
+
+def replay(events, canvas):
+    '''Feeds each of the logged `events` (any iterable, eg a list or `InputRecorder.events`) in turn to the canvas method
+    which handles its type (see HANDLERS), as quickly as possible. `canvas` can be a CanvasObject, or any other object with the same methods.
+    Returns the list of the times (in milliseconds) taken to handle each event, and a `timings.Timings`
+    with a histogram of the times for each type of event.'''
+    (latencies, summary) = ([], timings.Timings())
+    for entry in events:
+        handler = getattr(canvas, HANDLERS[entry[1]])
+        event = ReplayEvent(entry)
+        starttime = time.perf_counter()
+        handler(event)
+        elapsed = time.perf_counter() - starttime
+        latencies.append(elapsed*1000)
+        summary.record(entry[1], elapsed)
+    return (latencies, summary)
+
+def dumps(events):
+    '''Returns the log (any iterable of events) as a `str`: a header line, followed by one line of JSON for each event.'''
+    return "\n".join([json.dumps(HEADER)] + [json.dumps(entry, separators=(",", ":")) for entry in events]) + "\n"
+
+def loads(data):
+    '''Returns the list of events in a log produced by `dumps()`.'''
+    lines = data.splitlines()
+    header = json.loads(lines[0]) if lines else None
+    if not isinstance(header, dict) or header.get("format") != HEADER["format"]: raise ValueError("Not a brySVG input log")
+    if header.get("version") != VERSION: raise ValueError(f"Unsupported brySVG input log version: {header.get('version')}")
+    return [json.loads(line) for line in lines[1:] if line.strip()]
+
+class _Target(object):
+    '''Not intended to be used by end users.'''
+    def __init__(self, targetid):
+        self.id = targetid
+
+class _Touch(object):
+    '''Not intended to be used by end users.'''
+    def __init__(self, identifier, clientX, clientY):
+        (self.identifier, self.clientX, self.clientY) = (identifier, clientX, clientY)
+
+class _TouchList(list):
+    '''Not intended to be used by end users. A list with the `length` attribute of a DOM TouchList.'''
+    @property
+    def length(self):
+        return len(self)
+
+def _packtouches(touchlist):
+    '''Not intended to be called by end users.'''
+    packed = []
+    for i in range(touchlist.length):
+        touch = touchlist[i]
+        packed.extend([touch.identifier, touch.clientX, touch.clientY])
+    return packed
+
+def _unpacktouches(packed):
+    '''Not intended to be called by end users.'''
+    return _TouchList(_Touch(*packed[i:i+3]) for i in range(0, len(packed), 3))
@@ -0,0 +1,179 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''A message protocol for running the calculations of `brySVG.geometry` in the background (in a web worker,
+or in another thread or process), and job runners which send the jobs and deliver their results.
+This module does not use the browser.
+
+A job is a dict which can be sent as a JSON message, with each polygon packed as a flat list of coordinates:
+    {"id":1, "op":"boundary", "polygons":[[x0, y0, x1, y1, ...], ...]}
+and the reply is
+    {"id":1, "op":"boundary", "result":[x0, y0, x1, y1, ...]}   or   {"id":1, "op":"boundary", "error":"..."}
+The operations (see `runJob()`) are "relativeposition", "findintersections", "boundary", "edgesnap" and "vertexsnap".
+
+A `JobRunner` numbers the jobs, sends them, and calls the callback for each result when it arrives.
+If a job is given a `key`, submitting another job with the same key makes the first one stale: it is not run
+if it has not started, and its result is dropped, so a long series of requests (eg while dragging) only produces
+the latest answer. `LocalJobRunner` runs jobs in a thread or process pool; `brySVG.polygoncanvas` has runners for the browser.'''
+
+import brySVG.geometry as geometry
+
+def pack(poly):
+    '''Returns the coordinates of `poly` (a list of coordinates, or anything with a `pointList`) as a flat list.'''
+    return [coord for point in getattr(poly, "pointList", poly) for coord in point]
+
+def unpack(coords, polyid=""):
+    '''Returns the `geometry.Polygon` whose coordinates are the flat list `coords`.'''
+    return geometry.Polygon([(coords[i], coords[i+1]) for i in range(0, len(coords), 2)], polyid)
+
+def makeJob(jobid, op, polygons, **params):
+    '''Returns the message for a job. `polygons` is a list of polygons (see `pack()`), and `params` are any other
+    values needed by the operation (eg `snapangle` and `snapdistance` for "edgesnap").'''
+    job = {"id":jobid, "op":op, "polygons":[pack(poly) for poly in polygons]}
+    job.update(params)
+    return job
+
+def runJob(job):
+    '''Carries out a job, and returns the reply message. This is what runs in the background. The results are:
+    "relativeposition": the `Position` of the first polygon relative to the second
+    "findintersections": a list of `[x, y, refs]`, one for each intersection, where refs is a list of
+        `[k, i]` (at vertex `i` of polygon `k`) or `[k, i1, i2]` (between vertices `i1` and `i2` of polygon `k`)
+    "boundary": the flat list of coordinates of the outer boundary of the polygons, or `None` (or `False`)
+    "edgesnap": `[angle, cx, cy, dx, dy]`, to snap the first polygon onto the others by rotating it by `angle` (radians)
+        about `(cx, cy)` and translating it by `(dx, dy)`, or `None`. Needs `snapangle` (radians) and `snapdistance`,
+        and optionally `open`, a list of the positions of polygons which are open polylines rather than polygons.
+    "vertexsnap": `[dx, dy]`, to snap one of the points of the first polygon onto one of the points of the others,
+        or `None`. Needs `snapdistance`.'''
+    reply = {"id":job.get("id"), "op":job.get("op")}
+    try:
+        reply["result"] = _operations[job["op"]](job, [unpack(coords, i) for (i, coords) in enumerate(job["polygons"])])
+    except Exception as error:
+        reply["error"] = f"{type(error).__name__}: {error}"
+    return reply
+
+def _relativeposition(job, polygons):
+    '''Not intended to be called by end users.'''
+    return geometry.relativeposition(polygons[0], polygons[1])
+
+def _findintersections(job, polygons):
+    '''Not intended to be called by end users.'''
+    result = []
+    for ix in geometry.findintersections(polygons):
+        refs = [[poly.id, index] if isinstance(index, int) else [poly.id, index[0], index[1]] for (poly, index) in ix.polyrefs.items()]
+        result.append([ix.point[0], ix.point[1], refs])
+    return result
+
+def _boundary(job, polygons):
+    '''Not intended to be called by end users.'''
+    result = geometry.boundary(polygons)
+    return pack(result) if result else result
+
+def _edgesnap(job, polygons):
+    '''Not intended to be called by end users.'''
+    openpolys = set(job.get("open", []))
+    segmentlists = [poly.segments[1:] if poly.id in openpolys else poly.segments for poly in polygons] #The first segment closes the polygon
+    checksegments = [seg for segments in segmentlists[1:] for seg in segments]
+    snap = geometry.findedgesnap(segmentlists[0], checksegments, job["snapangle"], job["snapdistance"])
+    if snap is None: return None
+    (angle, centre, vector) = snap
+    return [angle, centre[0], centre[1], vector[0], vector[1]]
+
+def _vertexsnap(job, polygons):
+    '''Not intended to be called by end users.'''
+    checkpoints = [point for poly in polygons[1:] for point in poly.pointList]
+    vector = geometry.findvertexsnap(polygons[0].pointList, checkpoints, job["snapdistance"])
+    return None if vector is None else list(vector)
+
+_operations = {"relativeposition":_relativeposition, "findintersections":_findintersections, "boundary":_boundary,
+               "edgesnap":_edgesnap, "vertexsnap":_vertexsnap}
+
+class JobRunner(object):
+    '''Sends jobs and delivers their results. Subclasses provide `_send(job)`, which must arrange for `receive(reply)`
+    to be called with the reply to the job (eg when a message arrives from a worker).
+    Attributes:
+    `pending`: the jobs which have been sent and are still wanted, keyed by id
+    `dropped`: the number of jobs which have been cancelled, or made stale by later jobs with the same key'''
+    def __init__(self):
+        self.nextid = 1
+        self.pending = {}
+        self.latest = {} #The id of the latest job for each key
+        self.dropped = 0
+
+    def submit(self, op, polygons, callback=None, key=None, errorcallback=None, **params):
+        '''Sends a job (see `makeJob()`), and returns its id. When the result arrives, `callback(result)` is called,
+        or if the job failed, `errorcallback(message)`. If `key` is given, any earlier job with the same key is cancelled.'''
+        jobid = self.nextid
+        self.nextid += 1
+        job = makeJob(jobid, op, polygons, **params)
+        if key is not None:
+            previous = self.latest.get(key)
+            if previous is not None: self.cancel(previous)
+            self.latest[key] = jobid
+        self.pending[jobid] = (key, callback, errorcallback)
+        self._send(job)
+        return jobid
+
+    def cancel(self, jobid):
+        '''Cancels a job: its result will not be delivered.'''
+        if self.pending.pop(jobid, None) is not None: self.dropped += 1
+
+    def receive(self, reply):
+        '''Delivers the result of a job to its callback (unless the job has been cancelled).'''
+        entry = self.pending.pop(reply["id"], None)
+        if entry is None: return
+        (key, callback, errorcallback) = entry
+        if key is not None and self.latest.get(key) == reply["id"]: del self.latest[key]
+        if "error" in reply:
+            if errorcallback: errorcallback(reply["error"])
+        elif callback:
+            callback(reply["result"])
+
+    def _send(self, job):
+        '''Not intended to be called by end users.'''
+        raise NotImplementedError
+
+class LocalJobRunner(JobRunner):
+    '''Runs jobs using a `concurrent.futures` executor (by default, a single background thread); it is intended for
+    ordinary Python programs and testing, not the browser. Pass a `ProcessPoolExecutor` as `executor` to use other processes.
+    Results are delivered when `poll()` or `wait()` is called, in the thread which calls them.'''
+    def __init__(self, executor=None):
+        from concurrent.futures import ThreadPoolExecutor
+        import queue
+        super().__init__()
+        self.executor = ThreadPoolExecutor(1) if executor is None else executor
+        self.futures = {}
+        self.replies = queue.Queue()
+
+    def poll(self):
+        '''Delivers the results which have arrived, without waiting.'''
+        import queue
+        while True:
+            try:
+                reply = self.replies.get_nowait()
+            except queue.Empty:
+                return
+            self.receive(reply)
+
+    def wait(self, timeout=None):
+        '''Waits for all the pending jobs to finish, and delivers their results.'''
+        while self.pending:
+            self.receive(self.replies.get(timeout=timeout))
+
+    def cancel(self, jobid):
+        future = self.futures.pop(jobid, None)
+        if future is not None: future.cancel() #A job which has not started is not run
+        super().cancel(jobid)
+
+    def receive(self, reply):
+        self.futures.pop(reply["id"], None)
+        super().receive(reply)
+
+    def _send(self, job):
+        '''Not intended to be called by end users.'''
+        future = self.executor.submit(runJob, job)
+        self.futures[job["id"]] = future
+        future.add_done_callback(lambda future: None if future.cancelled() else self.replies.put(future.result()))
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Recording the changes made to a canvas as small operations, which can be undone and redone,
+or sent to another canvas which is showing the same scene. This module does not use the browser.
+
+    canvas.operationLog = oplog.OperationLog(maxentries=200)
+    canvas.operationLog.addListener(lambda entry: websocket.send(oplog.dumps(entry)))
+    ...
+    canvas.undo()
+    othercanvas.applyOperations(oplog.loads(message))
+
+An operation is a dict which can be converted to JSON. Objects are identified by their ids, and vertices are given
+as `[x, y]` (for Bezier objects, a vertex is a pointset: `[[x, y] or None, [x, y], [x, y] or None]`):
+    {"op":"setvertices", "id":id, "changes":[[index, old, new], ...]}
+    {"op":"insertvertices", "id":id, "index":index, "values":[vertex, ...], "changes":[[index, without, with], ...]}
+    {"op":"deletevertices", (as insertvertices)}
+        `changes` gives the neighbouring vertices (eg the control points of Bezier objects) which were changed
+        by the insertion or deletion, with their indices in the list which includes the inserted or deleted vertices.
+    {"op":"transform", "id":id, "matrix":[a, b, c, d, e, f], "angle":angle}
+        `angle` is the change in the `angle` attribute of rectangles, ellipses, images and `<use>` elements.
+    {"op":"addobject", "id":id, "record":record, "group":groupid, "before":id}
+    {"op":"deleteobject", (as addobject)}
+        `record` is as used by `brySVG.scene`. `group` (if present) is the id of the group containing the object,
+        and `before` (if present) is the id of the object which follows it on the canvas.
+An entry is a list of operations which are undone together, such as all the changes made during one drag.'''
+
+import json
+from collections import deque
+
+VERTEXOPS = ("setvertices", "insertvertices", "deletevertices")
+INVERSES = {"insertvertices":"deletevertices", "deletevertices":"insertvertices", "addobject":"deleteobject", "deleteobject":"addobject"}
+
+class OperationLog(object):
+    '''Records the operations performed on a canvas, once it has been set as `canvas.operationLog`.
+    `maxentries`: the number of entries which can be undone (older entries are discarded).
+    Operations which are recorded while the log is between `begin()` and `end()` (for example, everything done
+    between pressing and releasing the mouse button) form a single entry, in which successive changes to the same
+    vertices, or successive transforms of the same object, are merged into one operation.'''
+    def __init__(self, maxentries=100):
+        self.undoStack = deque(maxlen=maxentries)
+        self.redoStack = deque(maxlen=maxentries)
+        self.listeners = []
+        self.depth = 0
+        self.pending = []
+
+    def addListener(self, callback):
+        '''`callback(entry)` will be called with each new entry, and with the operations performed by `undo()` and `redo()`,
+        so that another canvas can be kept in step by passing them to its `applyOperations()` method.'''
+        self.listeners.append(callback)
+
+    def removeListener(self, callback):
+        self.listeners.remove(callback)
+
+    def begin(self):
+        '''Start an entry. Calls may be nested; the entry is complete when `end()` has been called as many times.'''
+        self.depth += 1
+
+    def end(self):
+        self.depth = max(0, self.depth-1)
+        if self.depth == 0: self._commit()
+
+    def record(self, op):
+        '''Not normally called by end users: the canvas records its own operations.'''
+        merged = merge(self.pending[-1], op) if self.pending else None
+        if merged is None:
+            self.pending.append(op)
+        else:
+            self.pending[-1] = merged
+        if self.depth == 0: self._commit()
+
+    def undo(self):
+        '''Returns the operations which reverse the latest entry (or `None` if there is nothing to undo),
+        and makes the entry available to `redo()`. Use `canvas.undo()` to perform them.'''
+        self._commit()
+        if not self.undoStack: return None
+        entry = self.undoStack.pop()
+        self.redoStack.append(entry)
+        inverse = [invert(op) for op in reversed(entry)]
+        self._notify(inverse)
+        return inverse
+
+    def redo(self):
+        '''Returns the operations of the latest entry to have been undone (or `None` if there is nothing to redo).
+        Use `canvas.redo()` to perform them.'''
+        self._commit()
+        if not self.redoStack: return None
+        entry = self.redoStack.pop()
+        self.undoStack.append(entry)
+        self._notify(entry)
+        return entry
+
+    def clear(self):
+        '''Discard all the entries which could be undone or redone.'''
+        self.undoStack.clear()
+        self.redoStack.clear()
+        self.pending = []
+
+    def _commit(self):
+        '''Not intended to be called by end users. Completes the current entry.'''
+        if not self.pending: return
+        entry = self.pending
+        self.pending = []
+        self.redoStack.clear()
+        try:
+            for op in entry: invert(op)
+        except ValueError: #Eg a stretch by a factor of 0 - the earlier entries cannot be undone either
+            self.undoStack.clear()
+        else:
+            self.undoStack.append(entry)
+        self._notify(entry)
+
+    def _notify(self, entry):
+        '''Not intended to be called by end users.'''
+        for callback in self.listeners: callback(entry)
+
+def dumps(entry):
+    '''Returns an entry (or any list of operations) as a single line of JSON.'''
+    return json.dumps(entry, separators=(",", ":"))
+
+def loads(line):
+    '''Returns the list of operations in a line produced by `dumps()`.'''
+    return json.loads(line)
+
+def invert(op):
+    '''Returns the operation which reverses `op`. Raises `ValueError` for a transform which cannot be reversed.'''
+    kind = op["op"]
+    if kind == "setvertices":
+        return dict(op, changes=[[i, new, old] for (i, old, new) in op["changes"]])
+    elif kind == "transform":
+        return dict(op, matrix=_invertmatrix(op["matrix"]), angle=-op.get("angle", 0))
+    return dict(op, op=INVERSES[kind])
+
+def merge(first, second):
+    '''Returns a single operation with the same effect as `first` followed by `second`, or `None` if they cannot be merged.'''
+    if first["id"] != second["id"] or first["op"] != second["op"]: return None
+    if first["op"] == "setvertices":
+        changes = {i:[old, new] for (i, old, new) in first["changes"]}
+        for (i, old, new) in second["changes"]:
+            if i in changes:
+                changes[i][1] = new
+            else:
+                changes[i] = [old, new]
+        return dict(first, changes=[[i, old, new] for (i, (old, new)) in changes.items()])
+    elif first["op"] == "transform":
+        return dict(first, matrix=_multiply(second["matrix"], first["matrix"]), angle=first.get("angle", 0)+second.get("angle", 0))
+    return None
+
+def vertexOp(kind, objid, before, after, start=0, count=0):
+    '''Returns the operation which changes the list of vertices `before` into `after`.
+    For "insertvertices" and "deletevertices", `count` vertices are inserted or deleted at index `start`.'''
+    if kind == "setvertices":
+        return {"op":kind, "id":objid, "changes":[[i, old, new] for (i, (old, new)) in enumerate(zip(before, after)) if old != new]}
+    (without, withvalues) = (before, after) if kind == "insertvertices" else (after, before)
+    changes = []
+    for (i, value) in enumerate(without):
+        j = i if i < start else i+count
+        if value != withvalues[j]: changes.append([j, value, withvalues[j]])
+    return {"op":kind, "id":objid, "index":start, "values":withvalues[start:start+count], "changes":changes}
+
+def applyToVertices(vertices, op):
+    '''Performs a "setvertices", "insertvertices" or "deletevertices" operation on the list `vertices`.'''
+    kind = op["op"]
+    if kind == "setvertices":
+        for (i, old, new) in op["changes"]: vertices[i] = new
+    elif kind == "insertvertices":
+        vertices[op["index"]:op["index"]] = op["values"]
+        for (i, without, withvalue) in op["changes"]: vertices[i] = withvalue
+    else:
+        for (i, without, withvalue) in op["changes"]: vertices[i] = without
+        del vertices[op["index"]:op["index"]+len(op["values"])]
+
+def _multiply(m1, m2):
+    '''Not intended to be called by end users. Returns the product of two matrices given as [a, b, c, d, e, f].'''
+    (a1, b1, c1, d1, e1, f1) = m1
+    (a2, b2, c2, d2, e2, f2) = m2
+    return [a1*a2+c1*b2, b1*a2+d1*b2, a1*c2+c1*d2, b1*c2+d1*d2, a1*e2+c1*f2+e1, b1*e2+d1*f2+f1]
+
+def _invertmatrix(m):
+    '''Not intended to be called by end users.'''
+    (a, b, c, d, e, f) = m
+    det = a*d - b*c
+    if det == 0: raise ValueError("Transform cannot be undone")
+    return [d/det, -b/det, -c/det, a/det, (c*f-d*e)/det, (b*e-a*f)/det]
@@ -0,0 +1,186 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Converting SVG path data (the `d` attribute of a `<path>`) into the form used by brySVG's Bezier objects.
+This module does not use the browser.
+
+    for (pointsetlist, closed) in pathdata.pointsetLists(d):
+        canvas.addObject(ClosedBezierObject(pointsetlist) if closed else BezierObject(pointsetlist))
+
+All the path commands are supported, in absolute and relative form. Quadratic curves (`Q`, `T`) are converted
+exactly to cubic curves, and elliptical arcs (`A`) are approximated by cubic curves which are within `tolerance`
+of the true arc. The path data is scanned in place, without being split into substrings.'''
+
+import re
+from math import sin, cos, tan, atan2, pi, sqrt, ceil, radians
+
+NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+SEPARATOR = r"[\s,]*"
+COMMANDS = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]")
+NUMBERS = re.compile(NUMBER)
+#Arc flags are single digits, which need not be separated from the next number (eg "a5 5 0 015 5")
+ARCARGS = re.compile(SEPARATOR.join([f"({NUMBER})"]*3 + ["([01])"]*2 + [f"({NUMBER})"]*2))
+ARGCOUNTS = {"M":2, "L":2, "H":1, "V":1, "C":6, "S":4, "Q":4, "T":2, "A":7, "Z":0}
+
+def subpaths(d, tolerance=0.1):
+    '''Returns a list of the subpaths in the path data `d`. Each subpath is a tuple `(vertices, controls, closed)`,
+    where `vertices` is a list of coordinates, and `controls[i]` is the pair of control points of the cubic curve
+    from `vertices[i]` to the next vertex, or `None` if that segment is a straight line.
+    If `closed` is `True`, there is a final segment (in `controls[-1]`) from the last vertex back to the first.'''
+    result = []
+    vertices = controls = None
+    (cx, cy) = (sx, sy) = (0.0, 0.0) #Current point and start of the current subpath
+    (lastcubic, lastquad) = (None, None) #The last control points, for S and T
+    matches = list(COMMANDS.finditer(d))
+    for (index, match) in enumerate(matches):
+        command = match.group()
+        upper = command.upper()
+        relative = command != upper
+        start = match.end()
+        end = matches[index+1].start() if index+1 < len(matches) else len(d)
+        if upper == "Z":
+            if vertices is not None and len(vertices) > 1:
+                if vertices[-1] == vertices[0]:
+                    vertices.pop()
+                else:
+                    controls.append(None)
+                result.append((vertices, controls, True))
+            vertices = None
+            (cx, cy) = (sx, sy)
+            (lastcubic, lastquad) = (None, None)
+            continue
+        if upper == "A":
+            argsets = [[float(x) for x in argset] for argset in ARCARGS.findall(d, start, end)]
+        else:
+            args = [float(x) for x in NUMBERS.findall(d, start, end)]
+            step = ARGCOUNTS[upper]
+            argsets = [args[i:i+step] for i in range(0, len(args) - step + 1, step)]
+        for (i, a) in enumerate(argsets):
+            (dx, dy) = (cx, cy) if relative else (0.0, 0.0)
+            if upper == "M" and i == 0:
+                if vertices is not None: result.append((vertices, controls, False))
+                (cx, cy) = (sx, sy) = (a[0]+dx, a[1]+dy)
+                (vertices, controls) = ([(cx, cy)], [])
+                (lastcubic, lastquad) = (None, None)
+                continue
+            if vertices is None: (vertices, controls) = ([(cx, cy)], [])
+            (newcubic, newquad) = (None, None)
+            if upper in ("L", "M"):
+                (x, y) = (a[0]+dx, a[1]+dy)
+                controls.append(None)
+            elif upper == "H":
+                (x, y) = (a[0]+dx, cy)
+                controls.append(None)
+            elif upper == "V":
+                (x, y) = (cx, a[0]+dy)
+                controls.append(None)
+            elif upper == "C" or upper == "S":
+                if upper == "C":
+                    c1 = (a[0]+dx, a[1]+dy)
+                else:
+                    c1 = (2*cx - lastcubic[0], 2*cy - lastcubic[1]) if lastcubic else (cx, cy)
+                newcubic = (a[-4]+dx, a[-3]+dy)
+                (x, y) = (a[-2]+dx, a[-1]+dy)
+                controls.append((c1, newcubic))
+            elif upper == "Q" or upper == "T":
+                if upper == "Q":
+                    newquad = (a[0]+dx, a[1]+dy)
+                else:
+                    newquad = (2*cx - lastquad[0], 2*cy - lastquad[1]) if lastquad else (cx, cy)
+                (x, y) = (a[-2]+dx, a[-1]+dy)
+                (qx, qy) = newquad
+                controls.append(((cx + 2*(qx-cx)/3, cy + 2*(qy-cy)/3), (x + 2*(qx-x)/3, y + 2*(qy-y)/3)))
+            else: #A
+                (x, y) = (a[5]+dx, a[6]+dy)
+                if a[0] == 0 or a[1] == 0:
+                    controls.append(None) #An arc with a zero radius is a straight line
+                else:
+                    curves = arcToCubics((cx, cy), a[0], a[1], a[2], a[3], a[4], (x, y), tolerance)
+                    if not curves: #An arc which ends where it starts is omitted
+                        (lastcubic, lastquad) = (None, None)
+                        continue
+                    for (c1, c2, p) in curves[:-1]:
+                        controls.append((c1, c2))
+                        vertices.append(p)
+                    controls.append(curves[-1][:2]) #The end point of the arc is added below
+            vertices.append((x, y))
+            (cx, cy) = (x, y)
+            (lastcubic, lastquad) = (newcubic, newquad)
+    if vertices is not None: result.append((vertices, controls, False))
+    return result
+
+def arcToCubics(start, rx, ry, rotation, largearc, sweep, end, tolerance=0.1):
+    '''Returns a list of cubic curves approximating the elliptical arc given by the parameters of the SVG `A` command.
+    Each curve is given as `(control1, control2, endpoint)`; the first curve starts at `start`.
+    (If either radius is zero, or `start` and `end` are the same, the list is empty.)
+    Enough curves are used for the approximation to be within `tolerance` of the true arc.'''
+    ((x1, y1), (x2, y2)) = (start, end)
+    (rx, ry) = (abs(rx), abs(ry))
+    if (x1, y1) == (x2, y2) or rx == 0 or ry == 0: return []
+    phi = radians(rotation)
+    (cosphi, sinphi) = (cos(phi), sin(phi))
+    #Conversion from endpoint to centre parameterisation, as in the SVG specification (appendix B.2.4)
+    (hx, hy) = ((x1-x2)/2, (y1-y2)/2)
+    (x1p, y1p) = (cosphi*hx + sinphi*hy, -sinphi*hx + cosphi*hy)
+    scale = (x1p/rx)**2 + (y1p/ry)**2
+    if scale > 1: (rx, ry) = (rx*sqrt(scale), ry*sqrt(scale))
+    numerator = rx*rx*ry*ry - rx*rx*y1p*y1p - ry*ry*x1p*x1p
+    denominator = rx*rx*y1p*y1p + ry*ry*x1p*x1p
+    k = sqrt(max(0, numerator/denominator)) if denominator else 0
+    if largearc == sweep: k = -k
+    (cxp, cyp) = (k*rx*y1p/ry, -k*ry*x1p/rx)
+    (cx, cy) = (cosphi*cxp - sinphi*cyp + (x1+x2)/2, sinphi*cxp + cosphi*cyp + (y1+y2)/2)
+    theta1 = atan2((y1p-cyp)/ry, (x1p-cxp)/rx)
+    dtheta = atan2((-y1p-cyp)/ry, (-x1p-cxp)/rx) - theta1
+    if sweep and dtheta < 0: dtheta += 2*pi
+    elif not sweep and dtheta > 0: dtheta -= 2*pi
+
+    segmentcount = max(1, int(ceil(abs(dtheta)/(pi/2) - 1e-9)))
+    while _arcerror(max(rx, ry), abs(dtheta)/segmentcount) > tolerance and segmentcount < 1024:
+        segmentcount += 1
+    delta = dtheta/segmentcount
+    t = 4/3*tan(delta/4)
+    def onellipse(u, v):
+        return (cx + rx*cosphi*u - ry*sinphi*v, cy + rx*sinphi*u + ry*cosphi*v)
+    curves = []
+    angle = theta1
+    for i in range(segmentcount):
+        (cos1, sin1, cos2, sin2) = (cos(angle), sin(angle), cos(angle+delta), sin(angle+delta))
+        c1 = onellipse(cos1 - t*sin1, sin1 + t*cos1)
+        c2 = onellipse(cos2 + t*sin2, sin2 - t*cos2)
+        p = (x2, y2) if i == segmentcount-1 else onellipse(cos2, sin2)
+        curves.append((c1, c2, p))
+        angle += delta
+    return curves
+
+def _arcerror(radius, angle):
+    '''Not intended to be called by end users. The greatest distance between a circular arc and its cubic approximation.'''
+    return radius*4/27*sin(angle/4)**6/cos(angle/4)**2
+
+def toPointsetList(vertices, controls, closed):
+    '''Returns the pointsetList (see `BezierObject`) for a subpath returned by `subpaths()`.
+    Straight segments are given control points at their midpoints, as brySVG does.'''
+    count = len(vertices)
+    pairs = []
+    for (i, control) in enumerate(controls):
+        if control is None:
+            (p, q) = (vertices[i], vertices[(i+1)%count])
+            midpoint = ((p[0]+q[0])/2, (p[1]+q[1])/2)
+            control = (midpoint, midpoint)
+        pairs.append(control)
+    controls = pairs
+    if closed:
+        return [[controls[i-1][1], vertex, controls[i][0]] for (i, vertex) in enumerate(vertices)]
+    pointsetlist = [[None, vertices[0], controls[0][0]]]
+    pointsetlist += [[controls[i-1][1], vertices[i], controls[i][0]] for i in range(1, count-1)]
+    pointsetlist.append([controls[-1][1], vertices[-1], None])
+    return pointsetlist
+
+def pointsetLists(d, tolerance=0.1):
+    '''Returns a list of `(pointsetlist, closed)` for the subpaths of the path data `d` which have more than one vertex.
+    Each `pointsetlist` can be used to create a `ClosedBezierObject` (if `closed` is `True`) or a `BezierObject`.'''
+    return [(toPointsetList(vertices, controls, closed), closed) for (vertices, controls, closed) in subpaths(d, tolerance) if len(vertices) > 1]
@@ -7,77 +7,13 @@
 
 from math import sin, cos, atan2, pi, log10, floor, inf
 from .transformcanvas import *
+from brySVG.geometry import Position, Segment, Intersection, area, boundingBox, equalPolygons
+import brySVG.geometry as geometry
+import brySVG.jobs as jobs
+from browser import aio, worker
+import json
 import time
 
-class Enum(list):
-    def __init__(self, name, string):
-        values = string.split()
-        for i, value in enumerate(values):
-            setattr(self, value, i)
-            self.append(i)
-
-Position = Enum ('Position', 'CONTAINS INSIDE OVERLAPS EQUAL DISJOINT TOUCHING')
-dp = 2
-dp1 = dp-1
-dp2 = dp-2
-
-class ListDict(dict):
-    def __getitem__(self, key):
-        try:
-            return super().__getitem__(key)
-        except KeyError:
-            self[key] = []
-            return self[key]
-
-class SetDict(dict):
-    def __getitem__(self, key):
-        try:
-            return super().__getitem__(key)
-        except KeyError:
-            self[key] = set()
-            return self[key]
-
-class Segment(object):
-    def __init__(self, startpoint, endpoint, poly, index):
-        if endpoint < startpoint:
-            self.leftpoint, self.rightpoint = endpoint, startpoint
-            self.leftindex, self.rightindex = reversed(index)
-        else:
-            self.leftpoint, self.rightpoint = startpoint, endpoint
-            self.leftindex, self.rightindex = index
-
-        self.leftx, self.lefty = self.leftpoint
-        self.rightx, self.righty = self.rightpoint
-        (self.top, self.bottom) = (self.righty, self.lefty) if self.righty<self.lefty else (self.lefty, self.righty)
-        self.poly = poly
-        self.index = index
-        self.dx, self.dy = self.rightx-self.leftx, self.righty-self.lefty
-        self.gradient = inf if self.dx == 0 else self.dy/self.dx
-        self.angle = atan2(self.dy, self.dx)-pi/2+pi*(self.dy<0)
-        self.y = self.lefty
-        self.xpos = "L"
-
-    def __repr__(self):
-        return f"{self.poly}{self.index}: [{self.leftpoint}, {self.rightpoint}]; currenty: {self.y}, xpos: {self.xpos}, gradient: {self.gradient}, angle: {self.angle}"
-
-class Intersection(object):
-    def __init__(self, polyrefs, point=None):
-        (poly1, index1), (poly2, index2) = polyrefs
-        self.polyrefs = {poly1:index1, poly2:index2}
-        self.point = point if point is not None else Point((0, 0))
-
-    def __repr__(self):
-        s = f"{self.point} \n"
-        polys = sorted(self.polyrefs, key = lambda poly: poly.id)
-        for poly in polys:
-            index = self.polyrefs[poly]
-            if isinstance(index, int):
-                s += f"at vertex {index} on polygon {poly}\n"
-            else:
-                i1, i2 = index
-                s += f"between vertices {i1} and {i2} on polygon {poly}\n"
-        return s
-
 class PolygonMixin(object):
     @property
     def segments(self):
@@ -115,20 +51,20 @@ class PolygonMixin(object):
 
     def area(self):
         '''Returns the area of the PolygonObject'''
-        return _area(self.pointList)
+        return area(self.pointList)
 
     def getBoundingBox(self):
         '''Returns bounding box based strictly on coords.
         And can be used before polygon is on the canvas (unlike built-in getBBox).'''
-        return _getboundingbox(self.pointList)
+        return boundingBox(self.pointList)
 
     def getCentre(self):
-        (left, top), (right, bottom) = _getboundingbox(self.pointList)
+        (left, top), (right, bottom) = boundingBox(self.pointList)
         return ((left+right)/2, (top+bottom)/2)
 
     def isEqual(self, other):
         '''Returns True if the polygon is identical to other, False otherwise.'''
-        return _equalpolygons(self.pointList, other.pointList)
+        return equalPolygons(self.pointList, other.pointList)
 
     def positionRelativeTo(self, other):
         '''Returns an Enum value: Position.CONTAINS, Position.INSIDE, Position.OVERLAPS, Position.DISJOINT or Position.EQUAL.
@@ -144,9 +80,10 @@ class PolygonMixin(object):
         .otherindex: same as selfindex but describes the location of the intersection on the other polygon.
         '''
         ixlist = findintersections([self, other])
+        (selfpoly, otherpoly) = (_aspolygon(self), _aspolygon(other))
         for ix in ixlist:
             polyrefs = ix.polyrefs
-            ix.selfindex, ix.otherindex = polyrefs[self], polyrefs[other]
+            ix.selfindex, ix.otherindex = polyrefs[selfpoly], polyrefs[otherpoly]
         return ixlist
 
     def merge(self, other):
@@ -154,6 +91,43 @@ class PolygonMixin(object):
         Otherwise returns None.'''
         return boundary([self, other])
 
+class CurveMixin(object):
+    '''Allows Bezier objects to take part in edge snapping, and closed Bezier objects to be used in the same ways as
+    PolygonObjects (eg `positionRelativeTo`, `getIntersections` and `merge`). The calculations use the polygon given by
+    `obj.getFlattened()`, so vertex indices (eg in Intersections) refer to `obj.polygon.pointList`.'''
+    @property
+    def polygon(self):
+        '''A PolygonObject (for open curves, a PolylineObject) following the curve. It is not on the canvas,
+        and is only recalculated when the shape of the curve changes.'''
+        points = self.getFlattened()
+        cached = getattr(self, "_polygon", None)
+        if cached is None or cached[0] is not points:
+            poly = PolygonObject(points) if isinstance(self, ClosedBezierObject) else PolylineObject(points)
+            poly.id = self.id
+            cached = self._polygon = (points, poly)
+        return cached[1]
+
+    @property
+    def segments(self):
+        poly = self.polygon
+        if isinstance(poly, PolygonObject): return poly.segments
+        if getattr(poly, "_segments", None) is None:
+            points = poly.pointList
+            poly._segments = [Segment(points[i-1], points[i], poly, (i-1, i)) for i in range(1, len(points))]
+        return poly._segments
+
+    def area(self):
+        '''Returns the area enclosed by the curve'''
+        return area(self.polygon.pointList)
+
+    def getCentre(self):
+        (left, top), (right, bottom) = self.getBoundingBox()
+        return ((left+right)/2, (top+bottom)/2)
+
+    def isEqual(self, other):
+        '''Returns True if the curve has the same shape as other, False otherwise.'''
+        return equalPolygons(self.polygon.pointList, _aspolygon(other).pointList)
+
 class PolygonGroup(GroupObject, PolygonMixin):
     def __init__(self, objlist=[], objid=None):
         self.boundary = None
@@ -163,12 +137,21 @@ class PolygonGroup(GroupObject, PolygonMixin):
     def __repr__(self):
         return f"group {self.id}" if self.id else f"group {id(self)}"
 
+    @property
+    def boundary(self):
+        if self._hasPending(): self._materialise()
+        return self._boundary
+
+    @boundary.setter
+    def boundary(self, boundary):
+        self._boundary = boundary
+
     def __str__(self):
         return self.__repr__()
 
     def addObject(self, svgobject):
         if not isinstance(svgobject, (PolygonObject, PolygonGroup)): return False
-        if self.objectList == []:
+        if not self.objectList:
             self.boundary = PolygonObject(svgobject.pointList)
         else:
             newboundary = self.boundary.merge(svgobject)
@@ -183,6 +166,24 @@ class PolygonGroup(GroupObject, PolygonMixin):
         #self.update()
         return True
 
+    async def addObjectAsync(self, svgobject, budget=0.01, progress=None, cancelled=None):
+        '''Does the same as `addObject`, but the new boundary is calculated by `boundaryAsync`, so that the page remains
+        responsive while a large group is merged. The parameters `budget`, `progress` and `cancelled` are as for `boundaryAsync`.'''
+        if not isinstance(svgobject, (PolygonObject, PolygonGroup)): return False
+        if not self.objectList:
+            self.boundary = PolygonObject(svgobject.pointList)
+        else:
+            newboundary = await boundaryAsync([self.boundary, svgobject], budget, progress, cancelled)
+            if newboundary is False:
+                return False
+            elif newboundary is None:
+                return None
+            else:
+                self.boundary = newboundary
+
+        super().addObject(svgobject)
+        return True
+
     def addObjects(self, polylist, listboundary=None):
         if polylist == []: return None
         blist = [self.boundary] if self.boundary else []
@@ -202,7 +203,7 @@ class PolygonGroup(GroupObject, PolygonMixin):
         return True
 
     def removeObject(self, svgobject):
-        if not self.contains(svgobject): return
+        if svgobject not in self.objectList: return
         groupcopy = self.objectList[:]
         groupcopy.remove(svgobject)
         newboundary = boundary(groupcopy)
@@ -233,31 +234,9 @@ class PolygonGroup(GroupObject, PolygonMixin):
     def points(self):
         return None if self.boundary is None else self.boundary.points
 
-    def matrixTransform(self, matrix):
-        def addalltopointslist(group):
-            for obj in group.objectList:
-                if isinstance(obj, PolygonGroup):
-                    addalltopointslist(obj)
-                else:
-                    pointslist.append(obj.points)
-                    obj._pointList = None
-                    obj._segments = None
-            pointslist.append(group.boundary.points)
-            group.boundary._pointList = None
-            group.boundary._segments = None
-
-        pointslist = []
-        addalltopointslist(self)
-        #window.transformpoints(pointslist, matrix)
-        self._transformpoints(pointslist, matrix)
-
-    def _transformpoints(self, pointslist, matrix):
-        for points in pointslist:
-            L = points.numberOfItems
-            for i in range(L):
-                pt = points.getItem(i)
-                newpt =  pt.matrixTransform(matrix)
-                points.replaceItem(newpt, i)
+    def _applyMatrix(self, matrix):
+        super()._applyMatrix(matrix)
+        if self._boundary is not None: self._boundary._applyMatrix(matrix)
 
     def cloneObject(self):
         newobject = super().cloneObject()
@@ -265,368 +244,152 @@ class PolygonGroup(GroupObject, PolygonMixin):
         #newobject.update()
         return newobject
 
+    def _getRecord(self, objtype):
+        record = super()._getRecord(objtype)
+        if self.boundary is not None: record["boundary"] = [coord for point in self.boundary.pointList for coord in point]
+        return record
+
+    def _addMembersFromRecord(self, members, record):
+        #The saved boundary is used, so that it does not have to be recalculated
+        coords = record.get("boundary")
+        listboundary = None if coords is None else PolygonObject([(coords[i], coords[i+1]) for i in range(0, len(coords), 2)])
+        self.addObjects(members, listboundary)
+
 class PolygonCanvasMixin(object):
-    '''This adds canvas.edgeSnap and canvas.snapAngle (for PolygonObjects and PolygonGroups only):
+    '''This adds canvas.edgeSnap and canvas.snapAngle (for PolygonObjects, PolygonGroups and Bezier objects only):
     If edgeSnap is set to True, then after a drag or rotate, if an edge of the moved object is within snapAngle degrees
     (default is 10) and snapDistance SVG units (default 10) of an edge of another object in the canvas's objectDict,
-    the moved object is snapped so that the edges coincide.'''
+    the moved object is snapped so that the edges coincide.
+    It also adds canvas.requestRelativePosition, canvas.requestIntersections, canvas.requestBoundary and canvas.requestEdgeSnap,
+    which do the calculations in the background using canvas.jobRunner (by default a DeferredJobRunner, which runs them
+    in the page between other events; set it to a WorkerJobRunner to use a web worker).'''
+    @timings.timed("_doEdgeSnap")
     def _doEdgeSnap(self, svgobject):
-        tt = time.time()
-        if not isinstance(svgobject, (PolygonObject, PolygonGroup)): return
+        tt = timings.start()
+        if not isinstance(svgobject, (PolygonObject, PolygonGroup, CurveMixin)): return
         snapangle = self.snapAngle*pi/180
         snapd = self.snapDistance
-        bestangle = None
-        bbox = svgobject.getBBox()
-        L1, R1, T1, B1 = bbox.x, bbox.x+bbox.width, bbox.y, bbox.y+bbox.height
+        checkobjs = self._edgesnapcandidates(svgobject)
+        checksegs = [seg for obj in checkobjs for seg in obj.segments]
+        tt = timings.lap("ES-findcandidates", tt)
+        if not checksegs: return
+        snap = geometry.findedgesnap(svgobject.segments, checksegs, snapangle, snapd)
+        tt = timings.start()
+
+        if snap is not None: #First snap the edges together
+            (angle, centre, vector) = snap
+            #print("Angle, centre, vector", angle*180/pi, centre, vector)
+            if not (angle ==0 and vector == (0, 0)): svgobject.rotateAndTranslate(angle*180/pi, centre, vector)
+        if self.vertexSnap: #Even if we can't snap the edges, can still try to snap the vertices
+            self._doVertexSnap(svgobject, [p for obj in checkobjs for p in obj.pointList])
+        timings.lap("ES-dosnap", tt)
 
-        checksegs = []
+    def _edgesnapcandidates(self, svgobject):
+        '''Not intended to be called by end users. Returns the objects which svgobject could be snapped to.'''
+        snapd = self.snapDistance
+        ((L1, T1), (R1, B1)) = svgobject._boundingbox() #For curves, calculated from the flattened curve
         checkobjs = []
         for objid in self.objectDict:
             if objid == svgobject.id: continue
             obj = self.objectDict[objid]
             if getattr(obj, "group", None): continue
-            if not isinstance(obj, (PolygonObject, PolygonGroup)): continue
-            bbox = obj.getBBox()
-            L2, R2, T2, B2 = bbox.x, bbox.x+bbox.width, bbox.y, bbox.y+bbox.height
+            if not isinstance(obj, (PolygonObject, PolygonGroup, CurveMixin)): continue
+            ((L2, T2), (R2, B2)) = obj._boundingbox()
             if L2-R1 > snapd or R2-L1 < -snapd or T2-B1 > snapd or B2-T1 < -snapd: continue
-            checksegs.extend(obj.segments)
             checkobjs.append(obj)
-        if not checksegs:
-            #print("ES-disjoint", time.time()-tt)
-            return
-        checksegs.sort(key = lambda seg: seg.angle) #all segments which could possibly be snapped to, sorted by angle from vertical
-        for seg in checksegs: #if any segments have an angle within snapangle of -pi/2, create a copy with equaivalent angle close to +pi/2
-            if seg.angle > snapangle - pi/2: break
-            newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)
-            newseg.angle = seg.angle + pi
-            checksegs.append(newseg)
-
-        objsegs = sorted(svgobject.segments, key = lambda seg: seg.angle)
-        for seg in objsegs: #do the same for the object being snapped
-            if seg.angle > snapangle - pi/2: break
-            newseg = Segment(seg.leftpoint, seg.rightpoint, seg.poly, seg.index)
-            newseg.angle = seg.angle + pi
-            objsegs.append(newseg)
-
-        #print("ES-createsegments", time.time()-tt)
-        #print("objsegs")
-        #for seg in objsegs: print(seg)
-        #print("checksegs")
-        #for seg in checksegs: print(seg)
-        checkstart = 0
-        piby4 = pi/4
-        found = False
-        for i, seg1 in enumerate(objsegs): #sweep stops at the angle of each segment of object to be snapped
-            angle1 = seg1.angle
-            #print("\nChecking:", angle1)
-            checksegs = checksegs[checkstart:] #remove segments with angle << angle of object segments
-            if not checksegs: break
-            #print("check angles", [seg.angle for seg  in checksegs])
-            try:
-                tonextangle = objsegs[i+1].angle - angle1 #find amount between current and next angle in the sweep
-            except IndexError:
-                tonextangle = 0
-            #print("tonextangle", tonextangle)
-            checkstart = 0
-            for seg2 in checksegs: #start checking segments within snapangle of the current object segment
-                angle2 = seg2.angle
-                #print("Against:", angle2)
-                angled = angle2 - angle1
-                #print("Current best angle", bestangle)
-                #print("angled", angled)
-                absangle = abs(angled)
-                if (bestangle is None and absangle < snapangle) or (bestangle is not None and absangle < bestangle):
-                    #print("Angles close enough")
-                    (objleft, objright) = (seg1.leftx, seg1.rightx) #First check bounding boxes - if disjoint, ignore segment
-                    (objtop, objbottom) = (seg1.top, seg1.bottom)
-                    (checkleft, checkright) = (seg2.leftx-snapd, seg2.rightx+snapd)
-                    (checktop, checkbottom) = (seg2.top-snapd, seg2.bottom+snapd)
-                    if not (objleft > checkright or objright < checkleft or objtop > checkbottom or objbottom < checktop):
-                        objp, objq = seg1.leftpoint, seg1.rightpoint #Next check whether segments intersect ...
-                        checkp, checkq = seg2.leftpoint, seg2.rightpoint
-                        #print("Not disjoint segments")
-                        #print("obj:", seg1)
-                        #print("check:", seg2)
-                        objv, checkv = objq-objp, checkq-checkp
-                        diff, product = checkp - objp, objv.cross(checkv)
-                        (t, u) = (diff.cross(objv)/product, diff.cross(checkv)/product) if product != 0 else (inf, inf)
-                        #print("t and u", t, u)
-                        if 0<=t<=1 and 0<=u<=1: #... if so, distance between them is 0
-                            (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, objp + u*objv, (0, 0), seg1, seg2)
-                        else: #... if not, check how close each endpoint of segment is to the other segment,
-                            bestd = None #vertically or horizontally depending on the angle of the segment
-                            (objx1, objy1), (objx2, objy2) = objp, objq
-                            (checkx1, checky1), (checkx2, checky2) = checkp, checkq
-                            if abs(angle2) < piby4:
-                                if checktop <= objy1 <= checkbottom:
-                                    checkx = checkx1 + (objy1-checky1)/(checky2-checky1)*(checkx2-checkx1)
-                                    diff = checkx-objx1
-                                    #print("Checking objx1", objx1, checkx, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (diff, 0), seg1, seg2)
-                                if checktop <= objy2 <= checkbottom:
-                                    checkx = checkx1 + (objy2-checky1)/(checky2-checky1)*(checkx2-checkx1)
-                                    diff = checkx-objx2
-                                    #print("Checking objx2", objx2, checkx, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (diff, 0), seg1, seg2)
-                            else:
-                                if checkleft <= objx1 <= checkright:
-                                    checky = checky1 + (objx1-checkx1)/(checkx2-checkx1)*(checky2-checky1)
-                                    diff = checky-objy1
-                                    #print("Checking objy1", objy1, checky, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx1, objy1), (0, diff), seg1, seg2)
-                                if checkleft <= objx2 <= checkright:
-                                    checky = checky1 + (objx2-checkx1)/(checkx2-checkx1)*(checky2-checky1)
-                                    diff = checky-objy2
-                                    #print("Checking objy2", objy2, checky, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx2, objy2), (0, diff), seg1, seg2)
-                            if abs(angle1) < piby4:
-                                if objtop <= checky1 <= objbottom:
-                                    objx = objx1 + (checky1-objy1)/(objy2-objy1)*(objx2-objx1)
-                                    diff = checkx1-objx
-                                    #print("Checking checkx1", checkx1, objx, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky1), (diff, 0), seg1, seg2)
-                                if objtop <= checky2 <= objbottom:
-                                    objx = objx1 + (checky2-objy1)/(objy2-objy1)*(objx2-objx1)
-                                    diff = checkx2-objx
-                                    #print("Checking checkx2", checkx2, objx, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (objx, checky2), (diff, 0), seg1, seg2)
-                            else:
-                                if objleft <= checkx1 <= objright:
-                                    objy = objy1 + (checkx1-objx1)/(objx2-objx1)*(objy2-objy1)
-                                    diff = checky1-objy
-                                    #print("Checking checky1", checky1, objy, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx1, objy), (0, diff), seg1, seg2)
-                                if objleft <= checkx2 <= objright:
-                                    objy = objy1 + (checkx2-objx1)/(objx2-objx1)*(objy2-objy1)
-                                    diff = checky2-objy
-                                    #print("Checking checky2", checky2, objy, diff)
-                                    if (bestd is None and abs(diff) <= snapd) or (bestd is not None and abs(diff) < bestd):
-                                        (bestangle, angle, centre, vector, objseg, checkseg) = (absangle, angled, (checkx2, objy), (0, diff), seg1, seg2)
-                #if bestangle: print("Current best angle and vector", angled, vector)
-                if tonextangle - angled > snapangle:
-                    checkstart += 1 #angle just checked will be too small when sweep moves on
-                    #print("New checkstart", checkstart)
-                if angled > snapangle:
-                    #print("Finished checking", angle1)
-                    break #angle just checked is too great - time to move sweep on
-                if bestangle == 0:
-                    found = True #Angle of 0 can't be beaten, so abort search at this sweep point...
-                    break
-            if found: break #... and abort sweep completely
-        #print("ES-findbestsnap", time.time()-tt)
-
-        if bestangle is not None: #First snap the edges together
-            #print("Angle, centre, vector", angle*180/pi, centre, vector)
-            if not (angle ==0 and vector == (0, 0)): svgobject.rotateAndTranslate(angle*180/pi, centre, vector)
-        if self.vertexSnap: #Even if we can't snap the edges, can still try to snap the vertices
-            self._doVertexSnap(svgobject, [p for obj in checkobjs for p in obj.pointList])
-        #print("ES-dosnap", time.time()-tt)
-
-def _getboundingbox(poly, xdp=None, ydp=None):
-    xcoords = [round(x, xdp) for (x,y) in poly] if xdp else [x for (x,y) in poly]
-    left = min(xcoords)
-    right = max(xcoords)
-    ycoords = [round(y, ydp) for (x,y) in poly] if ydp else [y for (x,y) in poly]
-    top = min(ycoords)
-    bottom = max(ycoords)
-    return (left, top), (right, bottom)
-
-def _compareboundingboxes(poly1, poly2, xdp=None, ydp=None):
-    if xdp and not ydp: ydp = xdp
-    ((left1, top1), (right1, bottom1)) = _getboundingbox(poly1, xdp, ydp)
-    ((left2, top2), (right2, bottom2)) = _getboundingbox(poly2, xdp, ydp)
-    if right1 < left2 or right2 < left1 or bottom1 < top2 or bottom2 < top1: return Position.DISJOINT
-    if right1 == left2 or right2 == left1 or bottom1 == top2 or bottom2 == top1: return Position.TOUCHING
-    if left1 < left2:
-        if right1 < right2: return Position.OVERLAPS
-        else: xresult = Position.CONTAINS
-    elif left1 == left2:
-        xresult = Position.INSIDE if right1 < right2 else Position.EQUAL if right1 == right2 else Position.CONTAINS
-    else: #left1 > left2
-        if right1 > right2: return Position.OVERLAPS
-        else: xresult = Position.INSIDE
-
-    if top1 < top2:
-        if bottom1 < bottom2: return Position.OVERLAPS
-        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS
-    elif top1 == top2:
-        if bottom1 < bottom2: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE
-        elif bottom1 == bottom2: return xresult
-        else: return Position.OVERLAPS if xresult == Position.INSIDE else Position.CONTAINS
-    else: #top1 > top2
-        if bottom1 > bottom2: return Position.OVERLAPS
-        else: return Position.OVERLAPS if xresult == Position.CONTAINS else Position.INSIDE
-
-def _area(poly):
-    '''Returns the area of a polygon given as a list of coordinates'''
-    area = 0
-    (x0, y0) = poly[-1]
-    for (x1, y1) in poly:
-        area += x1*y0 - x0*y1
-        (x0, y0) = (x1, y1)
-    return abs(area/2)
-
-def _equalpolygons(poly1, poly2):
-    '''Returns True if poly1 is identical to poly2, False otherwise.
-    poly1 and poly2 are lists of vertex coordinates.'''
-    start1 = poly1.index(min(poly1))
-    poly1 =  poly1[start1+1:]+poly1[:start1]
-    start2 = poly2.index(min(poly2))
-    poly2 =  poly2[start2+1:]+poly2[:start2]
-    return poly1 == poly2 or poly1 == poly2[::-1]
-
-def _getrotatedcoords(polylist, xdp):
-    def getbestangle(polylist):
-        anglesfromvertical = []
-        for poly in polylist:
-            segs = poly.segments
-            anglesfromvertical.extend([round(abs(seg.angle), 3) for seg in segs])
-        #print("angles", [a*180/pi for a in anglesfromvertical])
-        if 0 not in anglesfromvertical: return 0
-        positiveangles = [a for a in anglesfromvertical if a>0.1]
-        return round(min(positiveangles)/2, 1)
-
-    a = getbestangle(polylist)
-    cosa, sina = cos(a), sin(a)
-    #print("Best angle", a*180/pi)
-    coordslists = []
-    for poly in polylist:
-        #print(f"{poly} Before rounding:{poly.pointList}")
-        if a == 0:
-            polyrotated = poly.pointList
-        else:
-            polyrotated = []
-            t = svgbase.createSVGTransform()
-            t.setRotate(a*180/pi, 5500, 5500)
-            M = t.matrix
-            P = poly.points
-            L = P.numberOfItems
-            for i in range(L):
-                pt = P.getItem(i)
-                newpt =  pt.matrixTransform(M)
-                polyrotated.append((newpt.x, newpt.y))
-
-        coords = [(round(x, xdp), y) for (x, y) in polyrotated]
-        coordslists.append(coords)
-        #print(f"{poly} after rotation and rounding:\n{coords}")
-    return coordslists
-
-def _getsortedsegments(polylist, coordslists):
-    segments = []
-    for poly, coordslist in zip(polylist, coordslists):
-        L = len(coordslist)
-        segments.extend([Segment(coordslist[i-1], coordslist[i], poly, ((i-1)%L, i)) for i in range(L)])
-    segments.sort(key = lambda seg: (seg.leftx, round(seg.lefty, dp1), seg.gradient))
-    return segments
-
-def mergelists(list1,list2):
-    if not list1:  return list(list2)
-    if not list2:  return list(list1)
-
-    list1iter, list2iter = iter(list1), iter(list2)
-    item1 = next(list1iter)
-    item2 = next(list2iter)
-    result = []
-
-    while item1:
-        while item2 and (item2.y < item1.y or (item2.y == item1.y and item1.xpos != "R" and item2.gradient < item1.gradient)):
-            result.append(item2)
-            item2 = next(list2iter, None)
-        result.append(item1)
-        item1 = next(list1iter, None)
-    if item2:
-        result.append(item2)
-        result.extend(list2iter)
-    return result
+        return checkobjs
+
+    def _getjobrunner(self):
+        '''Not intended to be called by end users. Returns canvas.jobRunner, creating a DeferredJobRunner if it is not set.'''
+        if getattr(self, "jobRunner", None) is None: self.jobRunner = DeferredJobRunner()
+        return self.jobRunner
+
+    def requestRelativePosition(self, poly1, poly2, callback, key=None, errorcallback=None):
+        '''Finds the position of poly1 relative to poly2 in the background, and then calls `callback(position)`
+        with a Position value (see `relativeposition()`). If a later request is made with the same `key`, this one is dropped.
+        If the calculation fails, `errorcallback(message)` is called instead. Returns the id of the job.'''
+        return self._getjobrunner().submit("relativeposition", [_aspolygon(poly1), _aspolygon(poly2)], callback, key, errorcallback)
+
+    def requestIntersections(self, polylist, callback, key=None, errorcallback=None):
+        '''Finds the intersections between the polygons in polylist in the background (see `requestRelativePosition`),
+        and then calls `callback(intersections)` with a list of Intersection objects (see `findintersections()`).'''
+        polygons = [_aspolygon(poly) for poly in polylist]
+        def decode(result):
+            intersections = []
+            for (x, y, refs) in result:
+                ix = Intersection([(polygons[k], tuple(index) if len(index) > 1 else index[0]) for (k, *index) in refs[:2]], Point((x, y)))
+                for (k, *index) in refs[2:]: ix.polyrefs[polygons[k]] = tuple(index) if len(index) > 1 else index[0]
+                intersections.append(ix)
+            callback(intersections)
+        return self._getjobrunner().submit("findintersections", polygons, decode, key, errorcallback)
+
+    def requestBoundary(self, polylist, callback, key=None, errorcallback=None):
+        '''Finds the outer boundary of the polygons in polylist in the background (see `requestRelativePosition`),
+        and then calls `callback(boundary)` with a PolygonObject, or None (see `boundary()`).'''
+        def decode(result):
+            callback(PolygonObject([(result[i], result[i+1]) for i in range(0, len(result), 2)]) if result else result)
+        return self._getjobrunner().submit("boundary", [_aspolygon(poly) for poly in polylist], decode, key, errorcallback)
+
+    def requestEdgeSnap(self, svgobject, callback=None, key=None, errorcallback=None):
+        '''Does the same as edge snapping after a drag (and then vertex snapping, if canvas.vertexSnap is True),
+        but the search for the best snap is done in the background. When the object has been snapped, `callback(svgobject)`
+        is called (if given). A later request for the same object replaces this one, unless a different `key` is given.'''
+        if not isinstance(svgobject, (PolygonObject, PolygonGroup, CurveMixin)): return None
+        if key is None: key = ("snap", svgobject.id)
+        checkobjs = self._edgesnapcandidates(svgobject)
+        if not checkobjs: return None
+        polygons = [_aspolygon(obj) for obj in [svgobject]+checkobjs]
+        openpolys = [i for (i, poly) in enumerate(polygons) if not isinstance(poly, PolygonObject)]
+        def onedgesnap(result):
+            if result:
+                (angle, cx, cy, dx, dy) = result
+                if not (angle == 0 and (dx, dy) == (0, 0)): svgobject.rotateAndTranslate(angle*180/pi, (cx, cy), (dx, dy))
+            if self.vertexSnap:
+                points = [point for obj in checkobjs for point in obj.pointList]
+                self._getjobrunner().submit("vertexsnap", [svgobject._snappoints(), points], onvertexsnap, key, errorcallback, snapdistance=self.snapDistance)
+            elif callback:
+                callback(svgobject)
+        def onvertexsnap(result):
+            if result: self.translateObject(svgobject, result)
+            if callback: callback(svgobject)
+        return self._getjobrunner().submit("edgesnap", polygons, onedgesnap, key, errorcallback,
+                                     snapangle=self.snapAngle*pi/180, snapdistance=self.snapDistance, open=openpolys)
+
+class WorkerJobRunner(jobs.JobRunner):
+    '''Runs jobs in a web worker. `workerid` is the id of a script element of type "text/python" and class "webworker",
+    which runs the jobs it is sent (see the README). The messages are sent as JSON strings.'''
+    def __init__(self, workerid):
+        super().__init__()
+        self.worker = worker.Worker(workerid)
+        self.worker.bind("message", lambda event: self.receive(json.loads(event.data)))
+
+    def _send(self, job):
+        '''Not intended to be called by end users.'''
+        self.worker.send(json.dumps(job))
+
+class DeferredJobRunner(jobs.JobRunner):
+    '''Runs jobs in the page, one at a time after the current event has been handled, so that a job which has been
+    replaced by a later one with the same key is never run. Used by the canvas when there is no web worker.'''
+    def _send(self, job):
+        '''Not intended to be called by end users.'''
+        aio.run(self._run(job))
+
+    async def _run(self, job):
+        '''Not intended to be called by end users.'''
+        await aio.sleep(0)
+        if job["id"] in self.pending: self.receive(jobs.runJob(job))
+
+def _aspolygon(poly):
+    '''Not intended to be called by end users. Returns the PolygonObject used in calculations for a PolygonObject,
+    PolygonGroup or closed Bezier object.'''
+    if isinstance(poly, PolygonGroup): return poly.boundary
+    if isinstance(poly, CurveMixin): return poly.polygon
+    return poly
 
 def relativeposition(self, other):
     '''Returns an Enum value: Position.CONTAINS, Position.INSIDE, Position.OVERLAPS, Position.DISJOINT or Position.EQUAL.
     other is another PolygonObject.'''
-    def sweeppast(x, latestoutcome, livesegments):
-        #print("\n\nXvalue", x, "\nLive segments:\n", "\n".join(str(seg) for seg in livesegments), "\nCurrent Outcome", latestoutcome)
-        for seg in livesegments:
-            if seg.rightx == x:
-                seg.y = round(seg.righty, dp2)
-            else:
-                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)
-
-        for i, seg in enumerate(livesegments):
-            for seg2 in livesegments[i+1:]:
-                #print("\nComparing\n", seg, "\nwith\n", seg2)
-                if seg.y == inf or seg2.y == inf: continue
-                if seg.y > seg2.y and seg.poly != seg2.poly:
-                    #print("Found Intersection:", seg, seg.y, seg2, seg2.y)
-                    return Position.OVERLAPS, None
-        livesegments = [seg for seg in livesegments if round(seg.rightx, dp1) > round(x, dp1)]
-
-        while unusedsegments and round(unusedsegments[0].leftx, dp1) == round(x, dp1):
-            newseg = unusedsegments.pop(0)
-            newseg.y = round(newseg.lefty, dp2)
-            livesegments.append(newseg)
-        livesegments.sort(key=lambda seg: (seg.y, seg.gradient))
-        #print("\nUpdated live segments:\n", "\n".join(str(seg) for seg in livesegments))
-
-        yvaluesA = [seg.y for seg in livesegments if seg.poly == polyA]
-        intervalsA = list(zip(yvaluesA[::2], yvaluesA[1::2]))
-        yvaluesB = [seg.y for seg in livesegments if seg.poly == polyB]
-        intervalsB = list(zip(yvaluesB[::2], yvaluesB[1::2]))
-
-        #print("\nIntervals A", intervalsA, "\nIntervalsB", intervalsB)
-        for (startB, endB) in intervalsB: #For each "inner?" interval
-            for (startA, endA) in intervalsA: #Check each "outer?" interval
-                if startB == endB and (startA == startB or endA == endB): break
-                if startA <= startB and endA >= endB:
-                    if latestoutcome == Position.DISJOINT: return Position.OVERLAPS, None
-                    latestoutcome = Position.CONTAINS
-                    break
-                elif startB < startA < endB or startB < endA < endB:
-                    return Position.OVERLAPS, None
-            else:
-                if latestoutcome == Position.CONTAINS: return Position.OVERLAPS, None
-                latestoutcome = Position.DISJOINT
-        return latestoutcome, livesegments
-
-    polyA, polyB = getattr(self, "boundary", self), getattr(other, "boundary", other)
-    coordslist1, coordslist2 = _getrotatedcoords([polyA, polyB], xdp=dp)
-
-    transposed = False
-    bboxresult = _compareboundingboxes(coordslist1, coordslist2, ydp=dp)
-    #print("Bboxresult:", bboxresult)
-    if bboxresult in {Position.DISJOINT, Position.TOUCHING}: return Position.DISJOINT
-    if bboxresult == Position.EQUAL:
-        if _equalpolygons(coordslist1, coordslist2): return Position.EQUAL
-        elif _area(coordslist2) > _area(coordslist1):
-            coordslist1, coordslist2 = coordslist2, coordslist1
-            polyA, polyB = polyB, polyA
-            transposed = True
-    if bboxresult == Position.INSIDE:
-        coordslist1, coordslist2 = coordslist2, coordslist1
-        polyA, polyB = polyB, polyA
-        transposed = True
-
-    #print("Transposed", transposed)
-    unusedsegments = _getsortedsegments([polyA, polyB], [coordslist1, coordslist2])
-    #print("segments", time.time()-tt)
-    #print("\nSegments at start:\n", "\n".join(str(seg) for seg in unusedsegments))
-    livesegments = []
-    currentoutcome = None
-    xvalues = sorted(set(x for (x, y) in coordslist1+coordslist2))
-    #print("\nxValues", xvalues)
-    for x in xvalues: #Vertical sweepline stops at each vertex of either polygon
-        #print ("\nx =", x)
-        currentoutcome, livesegments = sweeppast(x, currentoutcome, livesegments)
-        #print ("currentoutcome", currentoutcome, "\n")
-        if currentoutcome == Position.OVERLAPS: return currentoutcome
-    #print("sweeping", time.time()-tt)
-    if currentoutcome == Position.CONTAINS and transposed: currentoutcome = Position.INSIDE
-    return currentoutcome
+    return geometry.relativeposition(_aspolygon(self), _aspolygon(other))
 
 def findintersections(polylist):
     '''Returns a list of all the intersections between polygons in polylist.
@@ -636,240 +399,40 @@ def findintersections(polylist):
     If this is an integer i, the intersection is at key.pointList[i]
     If this is a tuple (i-1, i), the intersection is between key.pointList[i-1] and key.pointList[i]
     '''
-    def calculatepoint(polyrefs):
-        (poly1, index1), (poly2, index2) = polyrefs
-        (i1a, i1b), (i2a, i2b) = index1, index2
-        p1, p2 = poly1.pointList[i1a], poly2.pointList[i2a]
-        v1, v2 = poly1.pointList[i1b] - p1, poly2.pointList[i2b] - p2
-        #print("Poly1", p1, v1, "Poly2", p2, v2)
-        #print("indexes", ix.index1, ix.index2)
-        #print("cross of vectors", v1.cross(v2))
-        if v1.cross(v2) == 0: return Point((0,0))
-        t = (p2-p1).cross(v2)/v1.cross(v2)
-        point = p1+t*v1
-        return point
-
-    def addtoixdict(point, polyrefs):
-        ixkey = round(point, dp2)
-        if ixkey in ixpoints:
-            #print("combining with", ixpoints[ixkey])
-            existingrefs = ixpoints[ixkey].polyrefs
-            for poly, index in polyrefs:
-                if (poly not in existingrefs) or isinstance(index, int):
-                    existingrefs[poly] = index
-                else:
-                    oldindex = existingrefs[poly]
-                    if isinstance(oldindex, tuple) and index != oldindex:
-                        (a,b), (c,d) = index, oldindex
-                        existingrefs[poly] = b if b==c else a
-        else:
-            #print("creating new")
-            ixpoints[ixkey] = Intersection(polyrefs, point)
-            #print(ixpoints[ixkey])
-
-    def sweeppast(x, livesegments): #move to next value of x
-        for seg in livesegments: #For all live segments, work out the current y coord
-            if seg.rightx == x:
-                seg.y = round(seg.righty, dp2)
-                seg.xpos = "R"
-                seg.currentindex = seg.rightindex
-            else:
-                seg.y = round(seg.lefty + (x-seg.leftx)*seg.gradient, dp2)
-                seg.xpos = "M"
-                seg.currentindex = seg.index
-        #print("\nXvalue", x)
-        #print("\nLive segments (start of sweeppast):\n", "\n".join(str(seg) for seg in livesegments))
-
-        for i, seg in enumerate(livesegments): #for each live segment,
-            for seg2 in livesegments[i+1:]: #look at all segments whose y-coord was previously >= this segment's y-coord
-                #print(f"Comparing:\n{seg}\nwith\n{seg2}")
-                if seg.y == inf or seg2.y == inf: continue
-                if seg.y > seg2.y and seg.poly != seg2.poly: #if this segment's y-coord  is now greater, they must have crossed
-                    #print("Found intersection")
-                    polyrefs = [(seg.poly, seg.index), (seg2.poly, seg2.index)]
-                    point = calculatepoint(polyrefs)
-                    addtoixdict(point, polyrefs)
-
-        newsegments = []
-        while unusedsegments and unusedsegments[0].leftx == x: #get any segments which start at this value of x
-            newseg = unusedsegments.pop(0)
-            newseg.y = round(newseg.lefty, dp2)
-            newseg.xpos = "L"
-            newseg.currentindex = newseg.leftindex
-            newsegments.append(newseg)
-
-        livesegments.sort(key=lambda seg: seg.y) #sort live segments based on y-coord (but not gradient; may be about to cross)
-        livesegments = mergelists(livesegments, newsegments) #merge the new segments based on y-coord and gradient
-        #print("\nLive segments (with new added):\n", "\n".join(str(seg) for seg in livesegments))
-
-        segiter = iter(livesegments)
-        seg = next(segiter, None)
-        while seg is not None: #look for segments whose current y-coord is the same
-            prevseg = seg
-            seg = next(segiter, None)
-            if seg is None: break
-            #print("\nPrevseg:", prevseg, "\nSeg:", seg)
-            if seg.y == prevseg.y and seg.poly != prevseg.poly:
-                if seg.xpos in {"L","R"} or prevseg.xpos in {"L","R"}: #but if the current position is in the middle of both segments, they could just be collinear
-                    #print("found intersection")
-                    point = seg.poly.pointList[seg.currentindex] if seg.xpos in {"L","R"} else prevseg.poly.pointList[prevseg.currentindex]
-                    addtoixdict(point, [(seg.poly, seg.currentindex), (prevseg.poly, prevseg.currentindex)])
-
-        livesegments = [seg for seg in livesegments if seg.xpos != "R"] #remove segments which are finished with
-        return livesegments
-
-    #print("polylist:")
-    #for poly in polylist: print(poly, poly.pointList)
-    tt = time.time()
-    polylist = [getattr(poly, "boundary", poly) for poly in polylist]
-    coordslists = _getrotatedcoords(polylist, xdp=dp)
-    #print("FI-getrotatedcoords", time.time()-tt)
-
-    unusedsegments = _getsortedsegments(polylist, coordslists)
-    #print("FI-getsortedsegments", time.time()-tt)
-    #print("\nSegments at start:\n", "\n".join(str(seg) for seg in unusedsegments))
-    ixpoints = {}
-    livesegments = []
-    xvalues = sorted(set(x for coordslist in coordslists for (x, y) in coordslist))
-    #print("\nxValues", xvalues)
-    for x in xvalues: #Vertical sweepline stops at each vertex of either polygon
-        livesegments = sweeppast(x, livesegments)
-    #print("FI-sweeppast", time.time()-tt)
-
-    return list(ixpoints.values())
+    return geometry.findintersections([_aspolygon(poly) for poly in polylist])
 
 def boundary(polylist):
     '''If all the PolygonObjects in the polylist touch or overlap, this returns a PolygonObject which is their outer boundary.
     Otherwise returns None.'''
-    tt = time.time()
-    polylist = [getattr(poly, "boundary", poly) for poly in polylist]
-    ixlist = findintersections(polylist)
-    #print("B-findintersections", time.time()-tt)
-    if ixlist == []:
-        maxarea = 0
-        for poly in polylist:
-            polyarea = poly.area()
-            if polyarea > maxarea: (maxarea, maxpoly) = (polyarea, poly)
-        for poly in polylist:
-            if poly is maxpoly: continue
-            if maxpoly.positionRelativeTo(poly) != Position.CONTAINS: return None
-        return PolygonObject(maxpoly.pointList)
-
-    ixlist.sort(key = lambda ix:ix.point)
-    pointlists = []
-    for i, poly in enumerate(polylist):
-        poly.listindex = i
-        pointlists.append(poly.pointList)
-    pointlists.append([ix.point for ix in ixlist])
-
-    L = len(polylist)
-    reflists = [[(j, i) for i in range(len(pointlists[j]))] for j in range(L)]
-
-    ixdicts = [ListDict() for j in range(L)]
-    regions = []
-    for i, ix in enumerate(ixlist):
-        #print("intersection", i, "at", ix.point, "has polyrefs", ix.polyrefs)
-        for (poly, index) in ix.polyrefs.items():
-            #print(poly, "has listindex", poly.listindex)
-            j = poly.listindex
-            if isinstance(index, tuple):
-                #print("Adding point to ixdict for", poly)
-                ixdicts[j][index].append((L,i))
-            else:
-                #print("Replacing point", index, "in poly", poly)
-                reflists[j][index] = (L, i)
-        polyset = set(ix.polyrefs)
-        for region in regions:
-            if polyset & region:
-                region.update(polyset)
-                break
-        else:
-            regions.append(polyset)
-
-    polyregions = []
-    while regions:
-        #print("regions", regions)
-        mainregion = regions.pop(0)
-        for region in regions[:]:
-            if region & mainregion:
-                mainregion.update(region)
-                regions.remove(region)
-        polyregions.append(mainregion)
-    #print("polyregions", polyregions)
-
-    #print("ixdicts", ixdicts)
-
-    for j in range(L):
-        offset = 1
-        for index in sorted(ixdicts[j]):
-            (i, k) = index
-            insert = ixdicts[j][index]
-            pl = pointlists[j]
-            if pl[k] < pl[i]: insert.reverse()
-            reflists[j][i+offset:i+offset] = insert
-            offset += len(insert)
-
-    vertexdict = SetDict()
-    for j in range(L):
-        last = len(reflists[j]) - 1
-        for i in range(last+1): vertexdict[reflists[j][i]].update({reflists[j][i-1], reflists[j][(i+1) if i<last else 0]})
-    #print("B-makevertexdict", time.time()-tt)
-    #print("vertexdict")
-    #for point in vertexdict:
-    #    (j, i) = point
-    #    print(point, pointlists[j][i], vertexdict[point])
-
-    minp = Point((inf, inf))
-    for (j, i) in vertexdict:
-        p = pointlists[j][i]
-        if p < minp: minp, minref = p, (j, i)
-    currentref = minref
-    currentp = start = minp
-    newpointlist = [currentp]
-    v1 = Point((0,1))
-    usedrefs ={(minref, v1)}
-    (j, i) = minref
-    startpoly = next(iter(ixlist[i].polyrefs)) if j == L else polylist[j]
-    for region in polyregions:
-        if startpoly in region:
-            boundaryregion = region
-            break
-    else:
-        boundaryregion = {startpoly}
-
-    #print("currentref, currentp, v1", currentref, currentp, v1)
+    result = geometry.boundary([_aspolygon(poly) for poly in polylist])
+    return PolygonObject(result.pointList) if result else result
+
+async def findintersectionsAsync(polylist, budget=0.01, progress=None, cancelled=None):
+    '''Returns the same as `findintersections(polylist)`, but the calculation is done in slices of about `budget` seconds,
+    with other events being handled in between. After each slice, `progress(fraction)` is called (if given), where `fraction`
+    is the proportion of the work done; if `cancelled()` returns `True`, `geometry.Cancelled` is raised.'''
+    return await _runsliced(geometry.findintersectionsteps([_aspolygon(poly) for poly in polylist]), budget, progress, cancelled)
+
+async def boundaryAsync(polylist, budget=0.01, progress=None, cancelled=None):
+    '''Returns the same as `boundary(polylist)`, but the calculation is done in slices (see `findintersectionsAsync`).'''
+    result = await _runsliced(geometry.boundarysteps([_aspolygon(poly) for poly in polylist]), budget, progress, cancelled)
+    return PolygonObject(result.pointList) if result else result
+
+async def _runsliced(steps, budget, progress, cancelled):
+    '''Not intended to be called by end users. Runs the generator `steps` using `geometry.sliced`, letting the browser
+    handle events between slices, and returns its result.'''
+    slices = geometry.sliced(steps, budget, progress, cancelled)
     while True:
-        maxangle = -pi
-        for (j, i) in vertexdict[currentref]:
-            p = pointlists[j][i]
-            v2 = p-currentp
-            angle = v2.anglefrom(v1)
-            #print("ref", (j, i),"point",p, "pvec", v2, "angle", angle*180/pi)
-            if angle > maxangle: (maxangle, bestp, bestref) = (angle, p, (j, i))
-        if [currentp, bestp] == newpointlist[:2]: break
-        currentref = bestref
-        newpointlist.append(bestp)
-        v1 = bestp - currentp
-        currentp = bestp
-        #print("New currentref, currentp, v1", currentref, currentp, v1)
-        if (currentref, v1) in usedrefs: break
-        usedrefs.add((currentref, v1))
-        (j, i) = currentref
-    #print("New pointlist", newpointlist)
-    #print("B-constructboundary", time.time()-tt)
-
-    if currentp != start: return False
-    boundary = PolygonObject(newpointlist[:-1])
-    if not (len(polyregions) == 1 and len(boundaryregion) == L):
-        for poly in polylist:
-            if poly not in boundaryregion:
-                #print(f"{poly} not in boundaryregion")
-                if boundary.positionRelativeTo(poly) != Position.CONTAINS: return None
-    #print("B-checkunusedpolys", time.time()-tt)
-
-    return boundary
+        try:
+            next(slices)
+        except StopIteration as stop:
+            return stop.value
+        await aio.sleep(0)
 
 PolygonObject.__bases__ = PolygonObject.__bases__ + (PolygonMixin,)
+BezierObject.__bases__ = BezierObject.__bases__ + (CurveMixin,)
+ClosedBezierObject.__bases__ = ClosedBezierObject.__bases__ + (PolygonMixin,)
 CanvasObject.__bases__ = CanvasObject.__bases__ + (PolygonCanvasMixin,)
+scenetypes["polygongroup"] = PolygonGroup
 class RegularPolygon(RegularPolygon, PolygonObject):
     pass
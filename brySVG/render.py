@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Rendering large numbers of stored brySVG scenes as SVG files, using several processes. This module is for ordinary
+Python programs (eg regenerating the images for a website); it cannot be used in the browser. From the command line:
+    python -m brySVG.render SOURCE OUTDIR [--fit] [--workers N] [--pattern GLOB] [--width W] [--height H] [--quiet]
+SOURCE is either a directory of scene files (as written by `canvas.dump()`, in either format), or a JSON-lines file
+with one scene on each line, as `{"name":"board1", "records":[...]}`. Each scene is written to OUTDIR as `name.svg`.
+With `--fit`, the viewBox is fitted to the contents as by `canvas.fitContents()`, using `svgexport.fitViewBox()`.
+
+Scenes are read one at a time and only a few are waiting for a worker at any time, so the memory used does not depend
+on the number of scenes; scene files are also read and written one record at a time (twice, when fitting).
+A line is printed for each scene with its number of objects and the time taken, followed by the overall throughput.'''
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+import brySVG.scene as scene
+import brySVG.svgexport as svgexport
+
+def scenesFromDirectory(directory, pattern="*"):
+    '''Generator which yields `(name, path)` for each file in `directory` whose name matches `pattern`, in order of name.'''
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.join(directory, filename)
+        if fnmatch.fnmatch(filename, pattern) and os.path.isfile(path):
+            yield (os.path.splitext(filename)[0], path)
+
+def scenesFromJSONLines(fp):
+    '''Generator which reads the text stream `fp` one line at a time, and yields `(name, records)` for each scene.
+    Scenes without a "name" are called scene1, scene2 etc, after their line numbers.'''
+    for (i, line) in enumerate(fp, 1):
+        if not line.strip(): continue
+        data = json.loads(line)
+        yield (data.get("name", f"scene{i}"), data["records"])
+
+def renderScene(name, source, outdir, fit=False, width=None, height=None):
+    '''Writes the scene `source` (the path of a scene file, or a list of records) to OUTDIR as an SVG file.
+    Returns a dict with the `name` of the scene, the `output` path, the number of top-level `objects` and the `seconds` taken,
+    or with the `error` instead of the output if the scene could not be rendered.'''
+    starttime = time.perf_counter()
+    output = os.path.join(outdir, os.path.basename(name) + ".svg")
+    result = {"name":name}
+    try:
+        if isinstance(source, str):
+            viewbox = None
+            if fit:
+                with open(source, "rb") as infile:
+                    viewbox = svgexport.fitViewBox(scene.load(infile))
+            with open(source, "rb") as infile:
+                records = _Counter(scene.load(infile))
+                with open(output, "w") as outfile:
+                    svgexport.write(records, outfile, viewbox, width, height)
+            count = records.count
+        else:
+            viewbox = svgexport.fitViewBox(source) if fit else None
+            with open(output, "w") as outfile:
+                svgexport.write(source, outfile, viewbox, width, height)
+            count = len(source)
+        result.update({"output":output, "objects":count})
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["seconds"] = time.perf_counter() - starttime
+    return result
+
+def renderAll(scenes, outdir, fit=False, width=None, height=None, workers=None, maxpending=None, report=None):
+    '''Renders each of the `(name, source)` pairs from the iterable `scenes` (see `renderScene()`), using `workers` processes
+    (by default, the number of processors; if 1, the scenes are rendered in the calling process). No more than `maxpending`
+    scenes (by default, 4 for each worker) are read ahead of the workers. `report(result)` is called (if given) as each scene
+    is finished, in the order in which they finish. Returns a summary dict with the numbers of `scenes`, `objects` and
+    `failed` scenes, and the total `seconds`.'''
+    starttime = time.perf_counter()
+    summary = {"scenes":0, "objects":0, "failed":0}
+    def finished(result):
+        summary["scenes"] += 1
+        if "error" in result: summary["failed"] += 1
+        else: summary["objects"] += result["objects"]
+        if report: report(result)
+    os.makedirs(outdir, exist_ok=True)
+    if workers == 1:
+        for (name, source) in scenes: finished(renderScene(name, source, outdir, fit, width, height))
+    else:
+        workers = workers or os.cpu_count() or 1
+        maxpending = maxpending or 4*workers
+        with ProcessPoolExecutor(workers) as executor:
+            pending = set()
+            for (name, source) in scenes:
+                if len(pending) >= maxpending:
+                    (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done: finished(future.result())
+                pending.add(executor.submit(renderScene, name, source, outdir, fit, width, height))
+            for future in wait(pending)[0]: finished(future.result())
+    summary["seconds"] = time.perf_counter() - starttime
+    return summary
+
+class _Counter(object):
+    '''Not intended to be called by end users. Counts the items of an iterable as they are taken from it.'''
+    def __init__(self, iterable):
+        self.iterable = iterable
+        self.count = 0
+
+    def __iter__(self):
+        for item in self.iterable:
+            self.count += 1
+            yield item
+
+def main(argv=None):
+    '''Runs the command-line interface (see the module docstring).'''
+    parser = argparse.ArgumentParser(prog="python -m brySVG.render", description="Render brySVG scenes as SVG files.")
+    parser.add_argument("source", help="a directory of scene files, or a JSON-lines file of scenes")
+    parser.add_argument("outdir", help="the directory for the SVG files")
+    parser.add_argument("--fit", action="store_true", help="fit the viewBox to the contents of each scene")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: number of processors)")
+    parser.add_argument("--pattern", default="*", help="names of the scene files in a directory (default: *)")
+    parser.add_argument("--width", default=None, help="width attribute of the SVG files")
+    parser.add_argument("--height", default=None, help="height attribute of the SVG files")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    def report(result):
+        if "error" in result:
+            print(f"{result['name']}: FAILED {result['error']}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{result['name']}: {result['objects']} objects in {result['seconds']*1000:.1f}ms")
+    if os.path.isdir(args.source):
+        summary = renderAll(scenesFromDirectory(args.source, args.pattern), args.outdir, args.fit, args.width, args.height, args.workers, report=report)
+    else:
+        with open(args.source) as infile:
+            summary = renderAll(scenesFromJSONLines(infile), args.outdir, args.fit, args.width, args.height, args.workers, report=report)
+    seconds = summary["seconds"]
+    print(f"{summary['scenes']} scenes ({summary['objects']} objects, {summary['failed']} failed) in {seconds:.3f}s: "
+          f"{summary['scenes']/seconds if seconds else 0:.1f} scenes/s")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Reading and writing brySVG scenes. This module does not use the browser, so scene files can also be produced
+or processed by ordinary Python programs.
+
+A scene is a sequence of records, one for each top-level object on a canvas. A record is a dict such as
+    {"type":"polygon", "id":"tile1", "points":[0, 0, 10, 0, 10, 10], "style":{"fill":"yellow"}}
+where "points" (and "boundary" for a PolygonGroup) are flat lists of x and y coordinates,
+and a group has a list of member records under "objects". A record may also have a "transform": a matrix
+[a, b, c, d, e, f] which is applied to the object (after any rotation given by its "angle"), eg as read by
+`svgimport` with `flatten=False`.
+
+Two formats are supported:
+    Text: a header line, followed by one line of JSON for each record.
+    Binary: MAGIC and a version number, followed by one frame for each record. A frame is the record as JSON
+    (with each coordinate list replaced by its length), followed by all its coordinates as packed 64-bit floats.
+Both formats are written and read one record at a time, so `dump()` and `load()` can stream large scenes.'''
+
+import json
+import struct
+
+VERSION = 1
+MAGIC = b"bSVG"
+HEADER = {"format":"brySVG", "version":VERSION}
+COORDKEYS = ("points", "boundary") #The keys whose values are lists of coordinates
+
+def dumps(records, binary=False):
+    '''Returns the scene as a `str` (or as `bytes` if `binary` is `True`).'''
+    if binary:
+        return MAGIC + struct.pack("<H", VERSION) + b"".join(_binaryframe(record) for record in records)
+    return "\n".join([json.dumps(HEADER)] + [_jsonline(record) for record in records]) + "\n"
+
+def dump(records, fp, binary=False):
+    '''Writes the scene to the file object `fp` (which must be opened in binary mode if `binary` is `True`),
+    one record at a time.'''
+    if binary:
+        fp.write(MAGIC + struct.pack("<H", VERSION))
+        for record in records: fp.write(_binaryframe(record))
+    else:
+        fp.write(json.dumps(HEADER) + "\n")
+        for record in records: fp.write(_jsonline(record) + "\n")
+
+def loads(data):
+    '''Returns the list of records in a scene produced by `dumps()`. The format is detected automatically.'''
+    if isinstance(data, (bytes, bytearray)):
+        if data[:4] != MAGIC: return loads(data.decode("utf-8"))
+        _checklength(data, 6)
+        _checkversion(struct.unpack_from("<H", data, 4)[0])
+        records = []
+        offset = 6
+        while offset < len(data):
+            (record, offset) = _readframe(data, offset)
+            records.append(record)
+        return records
+    lines = data.splitlines()
+    if not lines: raise ValueError("Empty scene")
+    _checkheader(lines[0])
+    return [json.loads(line) for line in lines[1:] if line.strip()]
+
+def load(fp):
+    '''Generator which reads a scene produced by `dump()` from the file object `fp`, yielding one record at a time.
+    Raises `ValueError` if a binary scene ends part of the way through a record.'''
+    start = fp.read(len(MAGIC))
+    if start == MAGIC:
+        _checkversion(struct.unpack("<H", _read(fp, 2))[0])
+        while True:
+            lengths = fp.read(4)
+            if not lengths: return
+            if len(lengths) < 4: raise ValueError("Truncated brySVG scene")
+            (jsonlength,) = struct.unpack("<I", lengths)
+            record = json.loads(_read(fp, jsonlength).decode("utf-8"))
+            (floatcount,) = struct.unpack("<I", _read(fp, 4))
+            floats = struct.unpack(f"<{floatcount}d", _read(fp, 8*floatcount))
+            _restorecoords(record, iter(floats))
+            yield record
+    else:
+        rest = fp.readline()
+        if isinstance(start, bytes): (start, rest) = (start.decode("utf-8"), rest.decode("utf-8"))
+        _checkheader(start + rest)
+        for line in fp:
+            if isinstance(line, bytes): line = line.decode("utf-8")
+            if line.strip(): yield json.loads(line)
+
+def _jsonline(record):
+    '''Not intended to be called by end users.'''
+    return json.dumps(record, separators=(",", ":"))
+
+def _binaryframe(record):
+    '''Not intended to be called by end users. Returns a record as a frame of the binary format.'''
+    floats = []
+    header = json.dumps(_extractcoords(record, floats), separators=(",", ":")).encode("utf-8")
+    return struct.pack("<I", len(header)) + header + struct.pack(f"<I{len(floats)}d", len(floats), *floats)
+
+def _readframe(data, offset):
+    '''Not intended to be called by end users. Returns the record in the frame starting at `offset`,
+    and the offset of the next frame.'''
+    _checklength(data, offset+4)
+    (jsonlength,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    _checklength(data, offset+jsonlength+4)
+    record = json.loads(bytes(data[offset:offset+jsonlength]).decode("utf-8"))
+    offset += jsonlength
+    (floatcount,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    _checklength(data, offset+8*floatcount)
+    floats = struct.unpack_from(f"<{floatcount}d", data, offset)
+    _restorecoords(record, iter(floats))
+    return (record, offset + 8*floatcount)
+
+def _extractcoords(record, floats):
+    '''Not intended to be called by end users. Returns a copy of `record` in which the lists of coordinates
+    (including those of any members) are replaced by their lengths, and the coordinates are appended to `floats`.'''
+    newrecord = dict(record)
+    for key in COORDKEYS:
+        if key in record:
+            floats.extend(record[key])
+            newrecord[key] = len(record[key])
+    if "objects" in record:
+        newrecord["objects"] = [_extractcoords(member, floats) for member in record["objects"]]
+    return newrecord
+
+def _restorecoords(record, floats):
+    '''Not intended to be called by end users. Reverses `_extractcoords`, taking the coordinates from the iterator `floats`.'''
+    for key in COORDKEYS:
+        if key in record:
+            record[key] = [next(floats) for i in range(record[key])]
+    for member in record.get("objects", []):
+        _restorecoords(member, floats)
+
+def _read(fp, size):
+    '''Not intended to be called by end users. Reads exactly `size` bytes from `fp`.'''
+    data = fp.read(size)
+    if len(data) < size: raise ValueError("Truncated brySVG scene")
+    return data
+
+def _checklength(data, end):
+    '''Not intended to be called by end users.'''
+    if len(data) < end: raise ValueError("Truncated brySVG scene")
+
+def _checkheader(line):
+    '''Not intended to be called by end users.'''
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != HEADER["format"]:
+        raise ValueError("Not a brySVG scene")
+    _checkversion(header.get("version"))
+
+def _checkversion(version):
+    '''Not intended to be called by end users.'''
+    if version != VERSION: raise ValueError(f"Unsupported brySVG scene version: {version}")
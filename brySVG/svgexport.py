@@ -0,0 +1,214 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Writing brySVG scenes as standalone SVG files. This module does not use the browser, so it can be used on a server,
+for example to produce thumbnails of scenes saved by `canvas.dump()`:
+    with open("board.bsvg", "rb") as infile, open("board.svg", "w") as outfile:
+        svgexport.write(scene.load(infile), outfile)
+
+Each object is written as soon as its record has been read, with the same geometry as the object's `_update()` method
+would give it in the browser. (The rotations of rectangles, ellipses, images and `<use>` elements are written as
+`transform` attributes rather than CSS transforms, so that the files can be read by programs other than browsers.
+A record's "transform" matrix, eg from `svgimport` with `flatten=False`, is written in front of any rotation.)
+`fitViewBox()` calculates the viewbox which `canvas.fitContents()` would give from the geometry in the records.
+See `brySVG.render` for rendering many scenes at once.'''
+
+from math import sin, cos, atan2, pi, hypot, sqrt
+import io
+import brySVG.flatten as flatten
+
+SVGHEADER = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"'
+
+def write(records, fp, viewbox=None, width=None, height=None):
+    '''Writes the objects described by `records` (see `brySVG.scene`) to the text stream `fp` as an SVG document.
+    `viewbox`: coordinates of the top-left and bottom-right of the area to be shown, as for `canvas.setViewBox()`.
+    `width, height`: the size of the image (if not given, it fills the available space).'''
+    header = SVGHEADER
+    if viewbox:
+        ((x1, y1), (x2, y2)) = viewbox
+        header += f' viewBox="{x1} {y1} {x2-x1} {y2-y1}"'
+    if width is not None: header += f' width="{width}"'
+    if height is not None: header += f' height="{height}"'
+    fp.write(header + ">\n")
+    for record in records:
+        _writerecord(record, fp)
+    fp.write("</svg>\n")
+
+def tostring(records, viewbox=None, width=None, height=None):
+    '''As `write()`, but returns the SVG document as a string.'''
+    fp = io.StringIO()
+    write(records, fp, viewbox, width, height)
+    return fp.getvalue()
+
+def boundingBox(records):
+    '''Returns the coordinates of the top-left and bottom-right of the box containing all the objects described by
+    `records`, calculated from their geometry (as `canvas.getBBox()` would measure it in the browser), or `None` if
+    there are no shapes. Elements saved as SVG markup (eg text) are not included, and `<use>` elements are taken to
+    fill the width and height recorded for them.'''
+    box = None
+    for record in records:
+        box = _unionbox(box, _recordbox(record))
+    return box
+
+def fitViewBox(records):
+    '''Returns a viewbox (to be passed to `write()`) showing all the objects described by `records`, with the same margins
+    as `canvas.fitContents()`, or `None` if they have no size. `records` must be a list (or other re-iterable sequence)
+    if it is to be written afterwards.'''
+    box = boundingBox(records)
+    if box is None: return None
+    ((x1, y1), (x2, y2)) = box
+    (width, height) = (x2-x1, y2-y1)
+    if width == 0 or height == 0: return None
+    (wmargin, hmargin) = (width/50, height/50)
+    return ((x1-wmargin, y1-hmargin), (x2+wmargin, y2+hmargin))
+
+def _recordbox(record):
+    '''Not intended to be called by end users. Returns the bounding box of the object described by `record`, or `None`.
+    If the record has a "transform", the box is that of the corners of the untransformed box (as the browser measures it).'''
+    objtype = record["type"]
+    if objtype == "element": return None
+    if "transform" in record:
+        return _transformbox(_recordbox({key:value for (key, value) in record.items() if key != "transform"}), record["transform"])
+    if "objects" in record:
+        return boundingBox(record["objects"])
+    c = record.get("points", [])
+    points = [(c[i], c[i+1]) for i in range(0, len(c)-1, 2)]
+    if objtype in ("line", "polygon", "polyline"):
+        return flatten.boundingBox(points) if points else None
+    elif objtype in ("circle", "point"):
+        r = hypot(c[2]-c[0], c[3]-c[1]) if objtype == "circle" else record["size"]
+        return ((c[0]-r, c[1]-r), (c[0]+r, c[1]+r))
+    elif objtype == "sector":
+        ((cx, cy), start, end) = (points[0], points[1], points[-1])
+        r = hypot(start[0]-cx, start[1]-cy)
+        startangle = atan2(start[1]-cy, start[0]-cx)
+        sweep = (atan2(end[1]-cy, end[0]-cx) - startangle) % (2*pi)
+        extremes = [(cx + r*cos(angle), cy + r*sin(angle)) for angle in (0, pi/2, pi, 3*pi/2) if (angle-startangle) % (2*pi) <= sweep]
+        return flatten.boundingBox([(cx, cy), start, end] + extremes)
+    elif objtype in ("bezier", "smoothbezier", "closedbezier", "smoothclosedbezier"):
+        if objtype in ("closedbezier", "smoothclosedbezier"): points = points[1:] + points[:2] #As in the path written by _geometry
+        curve = [points[0]]
+        for i in range(1, len(points)-2, 3):
+            curve.extend(flatten.flattenCubic(points[i-1], points[i], points[i+1], points[i+2]))
+        return flatten.boundingBox(curve)
+    elif objtype == "use":
+        (cx, cy) = record["centre"]
+        return _rotatedbox(cx, cy, record["width"]/2, record["height"]/2, record["angle"])
+    elif objtype in ("rectangle", "ellipse", "image"):
+        ((x1, y1), (x2, y2), cx, cy) = _unrotatedbox(c, record["angle"])
+        (rx, ry) = (abs(x2-x1)/2, abs(y2-y1)/2)
+        if objtype == "ellipse":
+            (cosa, sina) = (cos(record["angle"]*pi/180), sin(record["angle"]*pi/180))
+            (halfwidth, halfheight) = (sqrt((rx*cosa)**2 + (ry*sina)**2), sqrt((rx*sina)**2 + (ry*cosa)**2))
+            return ((cx-halfwidth, cy-halfheight), (cx+halfwidth, cy+halfheight))
+        return _rotatedbox(cx, cy, rx, ry, record["angle"])
+    raise ValueError(f"Cannot export objects of type {objtype}")
+
+def _rotatedbox(cx, cy, rx, ry, angle):
+    '''Not intended to be called by end users. Returns the bounding box of a rectangle with centre (cx, cy), half-width rx
+    and half-height ry, rotated through `angle` (in degrees) about its centre.'''
+    (c, s) = (abs(cos(angle*pi/180)), abs(sin(angle*pi/180)))
+    (halfwidth, halfheight) = (rx*c + ry*s, rx*s + ry*c)
+    return ((cx-halfwidth, cy-halfheight), (cx+halfwidth, cy+halfheight))
+
+def _transformbox(box, m):
+    '''Not intended to be called by end users. Returns the bounding box of the corners of `box` transformed by the matrix `m`.'''
+    if box is None: return None
+    (a, b, c, d, e, f) = m
+    ((x1, y1), (x2, y2)) = box
+    return flatten.boundingBox([(a*x + c*y + e, b*x + d*y + f) for (x, y) in ((x1, y1), (x2, y1), (x2, y2), (x1, y2))])
+
+def _unionbox(box1, box2):
+    '''Not intended to be called by end users.'''
+    if box1 is None: return box2
+    if box2 is None: return box1
+    (((L1, T1), (R1, B1)), ((L2, T2), (R2, B2))) = (box1, box2)
+    return ((min(L1, L2), min(T1, T2)), (max(R1, R2), max(B1, B2)))
+
+def _writerecord(record, fp):
+    '''Not intended to be called by end users. Writes the element described by `record`, and any members, to `fp`.'''
+    objtype = record["type"]
+    if objtype == "element":
+        attrs = record["attrs"]
+        if "id" in record: attrs = dict(attrs, id=record["id"])
+        fp.write(f'<{record["tag"]}{_attrstring(attrs)}>{record["content"]}</{record["tag"]}>\n')
+        return
+    common = ""
+    if "id" in record: common += f' id="{_escape(record["id"])}"'
+    style = record.get("style")
+    if style: common += ' style="' + _escape(";".join(f"{name}:{value}" for (name, value) in style.items())) + '"'
+    matrix = record.get("transform")
+    matrix = "matrix({},{},{},{},{},{})".format(*matrix) if matrix else ""
+    if "objects" in record:
+        if matrix: common += f' transform="{matrix}"'
+        fp.write(f"<g{common}>\n")
+        for member in record["objects"]:
+            _writerecord(member, fp)
+        fp.write("</g>\n")
+        return
+    (tag, geometry, transform) = _geometry(objtype, record)
+    transform = " ".join(t for t in (matrix, transform) if t)
+    if transform: geometry += f' transform="{transform}"'
+    fp.write(f"<{tag}{common} {geometry}/>\n")
+
+def _geometry(objtype, record):
+    '''Not intended to be called by end users. Returns the tag, the geometry attributes as a string, and the value
+    of the transform attribute (or "") for a shape.'''
+    c = record.get("points", [])
+    if objtype == "line":
+        return ("line", f'x1="{c[0]}" y1="{c[1]}" x2="{c[2]}" y2="{c[3]}"', "")
+    elif objtype in ("polygon", "polyline"):
+        return (objtype, 'points="' + " ".join(f"{c[i]},{c[i+1]}" for i in range(0, len(c), 2)) + '"', "")
+    elif objtype == "circle":
+        return ("circle", f'cx="{c[0]}" cy="{c[1]}" r="{hypot(c[2]-c[0], c[3]-c[1])}"', "")
+    elif objtype == "point":
+        return ("circle", f'cx="{c[0]}" cy="{c[1]}" r="{record["size"]}"', "")
+    elif objtype == "sector":
+        r = hypot(c[2]-c[0], c[3]-c[1])
+        largearcflag = 1 if (record["endangle"] - record["startangle"]) % 360 > 180 else 0
+        return ("path", f'd="M {c[0]} {c[1]} L {c[2]} {c[3]} A {r} {r} 0 {largearcflag} 1 {c[-2]} {c[-1]} Z"', "")
+    elif objtype in ("bezier", "smoothbezier"):
+        return ("path", f'd="M {c[0]} {c[1]} C ' + " ".join(str(x) for x in c[2:]) + '"', "")
+    elif objtype in ("closedbezier", "smoothclosedbezier"):
+        return ("path", f'd="M {c[2]} {c[3]} C {c[4]} {c[5]} ' + " ".join(str(x) for x in c[6:]) + f' {c[0]} {c[1]} {c[2]} {c[3]}"', "")
+    elif objtype == "use":
+        (cx, cy) = record["centre"]
+        (x, y) = record["origin"]
+        (xscale, yscale) = record["scale"]
+        href = _escape(record["href"])
+        return ("use", f'href="{href}" xlink:href="{href}" x="{x}" y="{y}"',
+                f'rotate({record["angle"]},{cx},{cy}) translate({cx},{cy}) scale({xscale},{yscale}) translate({-cx},{-cy})')
+    elif objtype in ("rectangle", "ellipse", "image"):
+        ((x1, y1), (x2, y2), cx, cy) = _unrotatedbox(c, record["angle"])
+        rotate = f'rotate({record["angle"]},{cx},{cy})' if record["angle"] else ""
+        (width, height) = (abs(x2-x1), abs(y2-y1))
+        if objtype == "ellipse":
+            return ("ellipse", f'cx="{cx}" cy="{cy}" rx="{width/2}" ry="{height/2}"', rotate)
+        box = f'x="{min(x1, x2)}" y="{min(y1, y2)}" width="{width}" height="{height}"'
+        if objtype == "image":
+            href = _escape(record["href"])
+            return ("image", f'href="{href}" xlink:href="{href}" preserveAspectRatio="none" ' + box, rotate)
+        return ("rect", box, rotate)
+    raise ValueError(f"Cannot export objects of type {objtype}")
+
+def _unrotatedbox(coords, angle):
+    '''Not intended to be called by end users. Returns two opposite corners of the box given by `coords`
+    after rotating it back through `angle` about its centre, and the coordinates of the centre.'''
+    (x1, y1, x2, y2) = coords[:4]
+    (cx, cy) = ((x1+x2)/2, (y1+y2)/2)
+    if not angle: return ((x1, y1), (x2, y2), cx, cy)
+    (c, s) = (cos(angle*pi/180), sin(angle*pi/180))
+    corners = [(cx + c*(x-cx) + s*(y-cy), cy - s*(x-cx) + c*(y-cy)) for (x, y) in ((x1, y1), (x2, y2))]
+    return (corners[0], corners[1], cx, cy)
+
+def _attrstring(attrs):
+    '''Not intended to be called by end users.'''
+    return "".join(f' {key}="{_escape(str(value))}"' for (key, value) in attrs.items())
+
+def _escape(value):
+    '''Not intended to be called by end users. Escapes a string for use as an attribute value.'''
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;")
@@ -0,0 +1,306 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Reading standard SVG files as brySVG scenes. This module does not use the browser.
+
+`records()` reads an SVG file in chunks, and yields a record (see `brySVG.scene`) for each shape as soon as the shape
+has been read, discarding the parsed XML as it goes, so even very large files can be read using little memory.
+`canvas.importSVG()` uses it to create brySVG objects (with real `pointLists`, which can be snapped, edited etc).
+
+`<polygon>`, `<polyline>`, `<line>`, `<rect>`, `<ellipse>`, `<circle>` and `<image>` become the corresponding brySVG objects.
+Each subpath of a `<path>` becomes a `PolygonObject` or `PolylineObject` if it has only straight edges,
+and otherwise a `ClosedBezierObject` or `BezierObject`. `<g>` becomes a `GroupObject`, and `<text>` is kept as SVG markup.
+Other elements (eg `<use>`), and the contents of `<defs>`, `<symbol>`, `<clipPath>` etc, are skipped.
+Each shape is given its full style (including the properties inherited from its groups), since brySVG objects set
+their own stroke and fill.'''
+
+import re
+from math import sin, cos, tan, atan2, pi, hypot
+import xml.etree.ElementTree as ElementTree
+import brySVG.pathdata as pathdata
+
+CHUNKSIZE = 1 << 16
+IDENTITY = (1, 0, 0, 1, 0, 0)
+SKIPPED = {"defs", "symbol", "clipPath", "mask", "pattern", "marker", "linearGradient", "radialGradient", "filter",
+           "style", "script", "title", "desc", "metadata"}
+GROUPS = {"svg", "g", "a", "switch"}
+SHAPES = {"polygon", "polyline", "line", "rect", "ellipse", "circle", "path", "image"}
+INHERITED = {"fill", "fill-opacity", "fill-rule", "stroke", "stroke-width", "stroke-opacity", "stroke-dasharray",
+             "stroke-dashoffset", "stroke-linecap", "stroke-linejoin", "stroke-miterlimit", "font-family", "font-size",
+             "font-style", "font-weight", "text-anchor", "visibility", "color"}
+PRESENTATION = INHERITED | {"opacity", "display"}
+DEFAULTSTYLE = {"fill":"black", "stroke":"none", "stroke-width":"1"} #The SVG defaults, which brySVG objects would otherwise override
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+class Frame(object):
+    '''The state of an element which has been started but not yet ended. Not intended to be used by end users.'''
+    def __init__(self, element, tag, attrs, matrix=IDENTITY, childmatrix=IDENTITY, style={}, members=None, skip=False, intext=False):
+        self.element = element
+        self.tag = tag
+        self.attrs = attrs
+        self.matrix = matrix #The transform to be applied to the element's own geometry
+        self.childmatrix = childmatrix #The transform inherited by the element's children
+        self.style = style
+        self.members = members #If the element is a group being kept, the records of its members
+        self.skip = skip
+        self.intext = intext #Elements inside a <text> element are kept until the end of the <text>
+
+def records(fp, flatten=True, keepgroups=True, chunksize=CHUNKSIZE):
+    '''Generator which reads the SVG document in the file object `fp` (text or binary) a chunk at a time,
+    yielding a record (see `brySVG.scene`) for each top-level object.
+    `flatten`: If `True`, transforms are applied to the coordinates of the shapes. If `False`, they are kept in the records
+    (and applied to the geometry of the brySVG objects when it is first needed).
+    `keepgroups`: If `False`, groups are not kept, so that every shape is yielded as soon as it has been read.'''
+    parser = ElementTree.XMLPullParser(("start", "end"))
+    stack = []
+    while True:
+        chunk = fp.read(chunksize)
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        for (event, element) in parser.read_events():
+            if event == "start":
+                stack.append(_startframe(element, stack[-1] if stack else None, flatten, keepgroups))
+                continue
+            frame = stack.pop()
+            record = None if frame.skip else _endrecord(frame, element, flatten)
+            if not frame.intext: #Discard the finished element, so that the parsed document does not grow
+                element.clear()
+                if stack: stack[-1].element.remove(element)
+            if record is None: continue
+            parent = next((f for f in reversed(stack) if f.members is not None), None)
+            if parent is None:
+                yield record
+            else:
+                parent.members.append(record)
+        if not chunk: return
+
+def fromstring(text, flatten=True, keepgroups=True):
+    '''Returns a list of the records for the SVG document `text`. For the parameters, see `records()`.'''
+    import io
+    fp = io.BytesIO(text) if isinstance(text, bytes) else io.StringIO(text)
+    return list(records(fp, flatten, keepgroups))
+
+def shapeForTransform(record, m):
+    '''Returns a record for the same shape as `record`, and a matrix, such that the shape given by applying the matrix `m`
+    to `record` (after any rotation given by its "angle") is given by transforming the coordinates of the new record by the
+    new matrix, and adding the rotation of the new matrix to its "angle". This is how `canvas.load()` applies a record's
+    "transform" without changing the type of object. If `m` is a similarity (rotation, translation and uniform scaling only),
+    or the shape is given only by points (eg a polygon), `record` and `m` are returned unchanged. Otherwise a rectangle becomes
+    a polygon, and an ellipse or circle becomes a closed Bezier curve; an image stays an image, and the skew in `m`, which an
+    image cannot show, is dropped (this is exact for images which are not already rotated, if `m` has no skew).'''
+    objtype = record["type"]
+    if _similarity(m) or objtype not in ("rectangle", "ellipse", "circle", "image"): return (record, m)
+    (a, b, c, d, e, f) = m
+    if objtype == "image": #m is a rotation, times a scaling, times a skew which is dropped
+        (xscale, theta) = (hypot(a, b), atan2(b, a))
+        yscale = (a*d - b*c)/xscale
+        return (record, (xscale*cos(theta), xscale*sin(theta), -yscale*sin(theta), yscale*cos(theta), e, f))
+    record = dict(record)
+    angle = record.pop("angle", 0)
+    if objtype == "rectangle":
+        (x1, y1, x2, y2, cx, cy) = _unrotatedbox(record["points"], angle)
+        points = [x1, y1, x2, y1, x2, y2, x1, y2]
+        record["type"] = "polygon"
+    else:
+        if objtype == "circle":
+            points = _ellipsepoints(record["points"], objtype)
+        else:
+            (x1, y1, x2, y2, cx, cy) = _unrotatedbox(record["points"], angle)
+            points = _ellipsepoints([x1, y1, x2, y2], objtype)
+        record["type"] = "closedbezier"
+    if angle and objtype != "circle": #Rotate the points back to where the shape was
+        (cosa, sina) = (cos(angle*pi/180), sin(angle*pi/180))
+        points = [value for i in range(0, len(points), 2)
+                  for value in (cx + cosa*(points[i]-cx) - sina*(points[i+1]-cy), cy + sina*(points[i]-cx) + cosa*(points[i+1]-cy))]
+    record["points"] = points
+    return (record, m)
+
+def _startframe(element, parent, flatten, keepgroups):
+    '''Not intended to be called by end users. Returns the Frame for an element which has just been started.'''
+    tag = _localname(element.tag)
+    attrs = {_localname(key):value for (key, value) in element.attrib.items()}
+    if parent is not None and (parent.tag == "text" or parent.intext):
+        return Frame(element, tag, attrs, skip=True, intext=True)
+    if (parent is not None and parent.skip) or tag in SKIPPED or not (tag in GROUPS or tag in SHAPES or tag == "text"):
+        return Frame(element, tag, attrs, skip=True)
+
+    style = dict(DEFAULTSTYLE) if parent is None else {name:value for (name, value) in parent.style.items() if name in INHERITED}
+    for name in PRESENTATION:
+        if name in attrs: style[name] = attrs[name]
+    for declaration in attrs.get("style", "").split(";"):
+        if ":" in declaration:
+            (name, value) = declaration.split(":", 1)
+            style[name.strip()] = value.strip()
+    inherited = IDENTITY if parent is None else parent.childmatrix
+    matrix = _multiply(inherited, _parsetransform(attrs.get("transform", "")))
+    keep = keepgroups and tag in GROUPS and parent is not None
+    #If a group is kept and transforms are not flattened, the group's transform is applied to the group as a whole
+    childmatrix = IDENTITY if (keep and not flatten) else matrix
+    return Frame(element, tag, attrs, matrix, childmatrix, style, [] if keep else None)
+
+def _endrecord(frame, element, flatten):
+    '''Not intended to be called by end users. Returns the record for an element which has just ended, or None.'''
+    tag, attrs, matrix = frame.tag, frame.attrs, frame.matrix
+    if tag in GROUPS:
+        if frame.members is None or not frame.members: return None
+        record = {"type":"group", "objects":frame.members}
+        ownstyle = {name:frame.style[name] for name in ("opacity", "display") if name in frame.style}
+        if ownstyle: record["style"] = ownstyle
+        if not flatten and matrix != IDENTITY: record["transform"] = list(matrix)
+    elif tag == "text":
+        textattrs = {key:value for (key, value) in attrs.items() if key not in PRESENTATION and key not in ("id", "style", "transform")}
+        textattrs["style"] = ";".join(f"{name}:{value}" for (name, value) in frame.style.items())
+        if matrix != IDENTITY: textattrs["transform"] = "matrix({},{},{},{},{},{})".format(*matrix)
+        content = "".join(element.itertext()).replace("&", "&amp;").replace("<", "&lt;")
+        record = {"type":"element", "tag":"text", "attrs":textattrs, "content":content}
+    else:
+        records = _shaperecords(tag, attrs)
+        if not records: return None
+        for record in records:
+            record["style"] = dict(frame.style)
+            if matrix != IDENTITY:
+                if flatten:
+                    _transformrecord(record, matrix)
+                else:
+                    record["transform"] = list(matrix)
+        record = records[0] if len(records) == 1 else {"type":"group", "objects":records}
+    if "id" in attrs: record["id"] = attrs["id"]
+    return record
+
+def _shaperecords(tag, attrs):
+    '''Not intended to be called by end users. Returns a list of records (without styles) for a shape element.'''
+    def number(name, default=0):
+        match = NUMBER.match(attrs.get(name, "").strip())
+        return float(match.group()) if match else default
+    if tag in ("polygon", "polyline"):
+        coords = [float(x) for x in NUMBER.findall(attrs.get("points", ""))]
+        if len(coords) < 4: return []
+        return [{"type":tag, "points":coords[:len(coords)//2*2]}]
+    elif tag == "line":
+        return [{"type":"line", "points":[number("x1"), number("y1"), number("x2"), number("y2")]}]
+    elif tag in ("rect", "image"):
+        (x, y, width, height) = (number("x"), number("y"), number("width"), number("height"))
+        if tag == "image":
+            href = attrs.get("href")
+            if not href: return []
+            return [{"type":"image", "href":href, "points":[x, y, x+width, y+height], "angle":0}]
+        return [{"type":"rectangle", "points":[x, y, x+width, y+height], "angle":0}]
+    elif tag == "ellipse":
+        (cx, cy, rx, ry) = (number("cx"), number("cy"), number("rx"), number("ry"))
+        return [{"type":"ellipse", "points":[cx-rx, cy-ry, cx+rx, cy+ry], "angle":0}]
+    elif tag == "circle":
+        (cx, cy, r) = (number("cx"), number("cy"), number("r"))
+        return [{"type":"circle", "points":[cx, cy, cx+r, cy]}]
+    elif tag == "path":
+        return _pathrecords(attrs.get("d", ""))
+    return []
+
+def _pathrecords(d):
+    '''Not intended to be called by end users. Returns a record for each subpath of the path data `d`.'''
+    records = []
+    for (vertices, controls, closed) in pathdata.subpaths(d):
+        if len(vertices) < 2: continue
+        if all(control is None for control in controls):
+            records.append({"type":"polygon" if closed else "polyline", "points":[coord for vertex in vertices for coord in vertex]})
+            continue
+        pointsetlist = pathdata.toPointsetList(vertices, controls, closed)
+        coords = [coord for pointset in pointsetlist for point in pointset if point is not None for coord in point]
+        records.append({"type":"closedbezier" if closed else "bezier", "points":coords})
+    return records
+
+def _transformrecord(record, m):
+    '''Not intended to be called by end users. Applies the matrix `m` to the coordinates in `record`,
+    changing the type of shape if the transformed shape cannot be represented by the original type.'''
+    coords = record["points"]
+    objtype = record["type"]
+    (a, b, c, d, e, f) = m
+    if objtype in ("rectangle", "ellipse", "image", "circle") and not _similarity(m):
+        if objtype == "image":
+            record["transform"] = list(m) #Cannot be flattened, so is kept
+            return
+        elif objtype == "rectangle":
+            (x1, y1, x2, y2) = coords
+            record.update({"type":"polygon", "points":[x1, y1, x2, y1, x2, y2, x1, y2]})
+            del record["angle"]
+        else:
+            record.update({"type":"closedbezier", "points":_ellipsepoints(coords, objtype)})
+            record.pop("angle", None)
+        coords = record["points"]
+    elif objtype in ("rectangle", "ellipse", "image"):
+        record["angle"] = record.get("angle", 0) + atan2(b, a)*180/pi
+    record["points"] = [value for i in range(0, len(coords), 2)
+                        for value in (a*coords[i] + c*coords[i+1] + e, b*coords[i] + d*coords[i+1] + f)]
+
+def _similarity(m):
+    '''Not intended to be called by end users. Returns True if the matrix `m` is made of rotation, translation and uniform scaling only.'''
+    (a, b, c, d, e, f) = m
+    return abs(a-d) < 1e-9 and abs(b+c) < 1e-9
+
+def _unrotatedbox(coords, angle):
+    '''Not intended to be called by end users. Returns the opposite corners `x1, y1, x2, y2` of the box given by `coords`
+    (two opposite corners of a rectangle or ellipse which has been rotated through `angle`) before it was rotated,
+    and the coordinates of its centre.'''
+    (x1, y1, x2, y2) = coords[:4]
+    (cx, cy) = ((x1+x2)/2, (y1+y2)/2)
+    if not angle: return (x1, y1, x2, y2, cx, cy)
+    (cosa, sina) = (cos(angle*pi/180), sin(angle*pi/180))
+    (x1, y1, x2, y2) = [value for (x, y) in ((x1, y1), (x2, y2)) for value in (cx + cosa*(x-cx) + sina*(y-cy), cy - sina*(x-cx) + cosa*(y-cy))]
+    return (x1, y1, x2, y2, cx, cy)
+
+def _ellipsepoints(coords, objtype):
+    '''Not intended to be called by end users. Returns the coordinates of a closed Bezier curve approximating
+    an ellipse (given by two corners of its bounding box) or a circle (given by its centre and a point on it).'''
+    if objtype == "circle":
+        (cx, cy) = coords[:2]
+        rx = ry = hypot(coords[2]-cx, coords[3]-cy)
+    else:
+        (cx, cy, rx, ry) = ((coords[0]+coords[2])/2, (coords[1]+coords[3])/2, abs(coords[2]-coords[0])/2, abs(coords[3]-coords[1])/2)
+    k = 0.5522847498 #Distance of the control points from each vertex, for a unit circle
+    points = []
+    for (ux, uy) in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+        (vx, vy) = (cx+rx*ux, cy+ry*uy)
+        points += [vx+k*rx*uy, vy-k*ry*ux, vx, vy, vx-k*rx*uy, vy+k*ry*ux]
+    return points
+
+def _parsetransform(transform):
+    '''Not intended to be called by end users. Returns the matrix `(a, b, c, d, e, f)` given by an SVG transform attribute.'''
+    matrix = IDENTITY
+    for (name, argstring) in TRANSFORM.findall(transform):
+        args = [float(x) for x in NUMBER.findall(argstring)]
+        if name == "matrix" and len(args) == 6:
+            m = tuple(args)
+        elif name == "translate" and args:
+            m = (1, 0, 0, 1, args[0], args[1] if len(args) > 1 else 0)
+        elif name == "scale" and args:
+            m = (args[0], 0, 0, args[1] if len(args) > 1 else args[0], 0, 0)
+        elif name == "rotate" and args:
+            (s, c) = (sin(args[0]*pi/180), cos(args[0]*pi/180))
+            (x, y) = args[1:3] if len(args) == 3 else (0, 0)
+            m = (c, s, -s, c, x - c*x + s*y, y - s*x - c*y)
+        elif name == "skewX" and args:
+            m = (1, 0, tan(args[0]*pi/180), 1, 0, 0)
+        elif name == "skewY" and args:
+            m = (1, tan(args[0]*pi/180), 0, 1, 0, 0)
+        else:
+            continue
+        matrix = _multiply(matrix, m)
+    return matrix
+
+def _multiply(m1, m2):
+    '''Not intended to be called by end users. Returns the matrix for applying `m2` and then `m1`.'''
+    if m2 == IDENTITY: return m1
+    if m1 == IDENTITY: return m2
+    (a1, b1, c1, d1, e1, f1) = m1
+    (a2, b2, c2, d2, e2, f2) = m2
+    return (a1*a2 + c1*b2, b1*a2 + d1*b2, a1*c2 + c1*d2, b1*c2 + d1*d2, a1*e2 + c1*f2 + e1, b1*e2 + d1*f2 + f1)
+
+def _localname(name):
+    '''Not intended to be called by end users. Removes the namespace from a tag or attribute name.'''
+    return name.rsplit("}", 1)[-1]
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Positioning lines of text, and finding the boxes they occupy, from font metrics (see `brySVG.textmetrics`)
+rather than by measuring the text in the page. This module does not use the browser.
+
+    layout = textlayout.layout("Some text\non two lines", (100, 100), anchorposition=5, fontsize=16)
+    ((left, top), (right, bottom)) = layout.bbox(textmetrics.getMetrics())
+
+Each line box is `lineheight` high, starting `fontsize` above the baseline, so the boxes of successive lines
+meet, and the top (or bottom, or centre) of the whole box is at the anchorpoint.'''
+
+import brySVG.textmetrics as textmetrics
+
+class TextLayout(object):
+    '''The positions of some lines of text. Parameters:
+    `lines`: list of strings
+    `anchorpoint`, `anchorposition`: the text is placed at the coordinates given by `anchorpoint`,
+        and `anchorposition` (from 1 to 9) gives the part of the box which is at the `anchorpoint`:
+        1  2  3    ie if anchorposition is 1, the anchorpoint is top-left, if it is 5 it is in the centre of the box, etc
+        4  5  6
+        7  8  9
+    `fontsize`, `lineheight` (by default `1.2*fontsize`)
+    Attributes:
+    `x`, `y`: the start of the first baseline (ie the `x` and `y` attributes of the SVG `text` element)
+    `textanchor`: the value of the `text-anchor` attribute ("start", "middle" or "end")
+    `baselines`: the y-coordinates of the baselines of the lines'''
+    def __init__(self, lines, anchorpoint=(0,0), anchorposition=1, fontsize=12, lineheight=None):
+        (x, y) = anchorpoint
+        if lineheight is None: lineheight = fontsize*1.2
+        self.lines = list(lines)
+        (self.fontsize, self.lineheight) = (fontsize, lineheight)
+        if anchorposition in [3, 6, 9]:
+            self.textanchor = "end"
+        elif anchorposition in [2, 5, 8]:
+            self.textanchor = "middle"
+        else:
+            self.textanchor = "start"
+        rowcount = len(self.lines)
+        if anchorposition in [1, 2, 3]:
+            yoffset = fontsize
+        elif anchorposition in [4, 5, 6]:
+            yoffset = fontsize - lineheight*rowcount/2
+        else:
+            yoffset = fontsize - lineheight*rowcount
+        (self.x, self.y) = (x, y+yoffset)
+        self.baselines = [self.y + i*lineheight for i in range(rowcount)]
+
+    def lineBoxes(self, metrics):
+        '''Returns a list of the top-left and bottom-right coordinates of each line, using the `FontMetrics` given.'''
+        boxes = []
+        for (line, baseline) in zip(self.lines, self.baselines):
+            width = metrics.textWidth(line, self.fontsize)
+            if self.textanchor == "end":
+                left = self.x - width
+            elif self.textanchor == "middle":
+                left = self.x - width/2
+            else:
+                left = self.x
+            top = baseline - self.fontsize
+            boxes.append(((left, top), (left+width, top+self.lineheight)))
+        return boxes
+
+    def bbox(self, metrics):
+        '''Returns the top-left and bottom-right coordinates of the box containing all the lines.'''
+        boxes = self.lineBoxes(metrics)
+        if not boxes: return ((self.x, self.y-self.fontsize), (self.x, self.y-self.fontsize))
+        left = min(box[0][0] for box in boxes)
+        right = max(box[1][0] for box in boxes)
+        return ((left, boxes[0][0][1]), (right, boxes[-1][1][1]))
+
+def layout(string, anchorpoint=(0,0), anchorposition=1, fontsize=12, lineheight=None, width=None, metrics=None):
+    '''Returns the `TextLayout` for `string`, which is split into lines at "\\n".
+    If `width` is given, each line is also wrapped at word boundaries to fit that width, using `metrics`
+    (by default, the metrics for a typical sans-serif font).'''
+    lines = string.split("\n")
+    if width is not None:
+        if metrics is None: metrics = textmetrics.getMetrics()
+        lines = [wrapped for line in lines for wrapped in (textmetrics.wrap(line, width, fontsize, metrics) or [""])]
+    return TextLayout(lines, anchorpoint, anchorposition, fontsize, lineheight)
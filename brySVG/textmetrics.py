@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Measuring and wrapping text without laying it out in the page. This module does not use the browser.
+
+The advance width of each character is measured once for each font (advances are proportional to the font size,
+so one measurement serves every size) and cached. In the browser the measurements are made by the canvas
+(see `canvas.getFontMetrics()`); without a browser, they are taken from `HEADLESSADVANCES`:
+    metrics = textmetrics.getMetrics("sans-serif")
+    lines = textmetrics.wrap("Some long text ...", 200, 16, metrics)'''
+
+from bisect import bisect_right
+
+REFERENCESIZE = 100 #The font size at which characters are measured
+DEFAULTADVANCE = 0.556 #In ems, for characters which are not in the table
+
+#Advance widths in ems of the printable ASCII characters in a typical sans-serif font (Helvetica/Arial)
+HEADLESSADVANCES = dict(zip(" !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~",
+    [0.278, 0.278, 0.355, 0.556, 0.556, 0.889, 0.667, 0.191, 0.333, 0.333, 0.389, 0.584, 0.278, 0.333, 0.278, 0.278,
+    0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.556, 0.278, 0.278, 0.584, 0.584, 0.584, 0.556,
+    1.015, 0.667, 0.667, 0.722, 0.722, 0.667, 0.611, 0.778, 0.722, 0.278, 0.5, 0.667, 0.556, 0.833, 0.722, 0.778,
+    0.667, 0.778, 0.722, 0.667, 0.611, 0.722, 0.667, 0.944, 0.667, 0.667, 0.611, 0.278, 0.278, 0.278, 0.469, 0.556,
+    0.333, 0.556, 0.556, 0.5, 0.556, 0.556, 0.278, 0.556, 0.556, 0.222, 0.222, 0.5, 0.222, 0.833, 0.556, 0.556,
+    0.556, 0.556, 0.333, 0.5, 0.278, 0.556, 0.5, 0.722, 0.5, 0.5, 0.5, 0.334, 0.26, 0.334, 0.584]))
+
+_metrics = {} #FontMetrics objects, keyed by font
+
+class FontMetrics(object):
+    '''The advance widths (in ems) of the characters of a font.
+    `measure`: a function which is given a string of characters and returns a list of their advance widths at
+    `REFERENCESIZE`, or `None` if they cannot be measured. If it is `None`, `HEADLESSADVANCES` is used.'''
+    def __init__(self, measure=None):
+        self.measure = measure
+        self.advances = {}
+
+    def advance(self, char):
+        '''Returns the advance width of `char` in ems.'''
+        try:
+            return self.advances[char]
+        except KeyError:
+            self._measurechars(char)
+            return self.advances.get(char, HEADLESSADVANCES.get(char, DEFAULTADVANCE))
+
+    def textWidth(self, string, fontsize):
+        '''Returns the width of `string` at `fontsize`.'''
+        self._measurechars(string)
+        advances = self.advances
+        return fontsize*sum(advances.get(char, HEADLESSADVANCES.get(char, DEFAULTADVANCE)) for char in string)
+
+    def _measurechars(self, string):
+        '''Not intended to be called by end users. Measures all the characters in `string` which have not been measured,
+        in one call of `measure`.'''
+        advances = self.advances
+        newchars = "".join(set(string).difference(advances))
+        if not newchars: return
+        if self.measure is None:
+            for char in newchars: advances[char] = HEADLESSADVANCES.get(char, DEFAULTADVANCE)
+            return
+        widths = self.measure(newchars)
+        if widths is None: return #Not cached, so that they are measured once measuring is possible
+        for (char, width) in zip(newchars, widths): advances[char] = width/REFERENCESIZE
+
+def getMetrics(font="", measure=None):
+    '''Returns the (cached) `FontMetrics` for `font`. `measure` is used if the font has not been seen before (see `FontMetrics`).'''
+    try:
+        return _metrics[font]
+    except KeyError:
+        metrics = _metrics[font] = FontMetrics(measure)
+        return metrics
+
+def wrap(string, width, fontsize, metrics):
+    '''Returns a list of the lines obtained by wrapping the words of `string` at word boundaries to fit `width`.
+    (A word which is wider than `width` has a line to itself.)
+    The width of each word is calculated once, and the words for each line are found by a binary search.'''
+    words = string.split()
+    if not words: return []
+    space = metrics.advance(" ")*fontsize
+    ends = [0]
+    for word in words: #ends[i] is the width of the first i words, each followed by a space
+        ends.append(ends[-1] + metrics.textWidth(word, fontsize) + space)
+    lines = []
+    start = 0
+    while start < len(words):
+        #The last word on the line is the last one for which ends[end] - ends[start] - space <= width
+        end = max(start+1, bisect_right(ends, ends[start] + width + space, start+1) - 1)
+        lines.append(" ".join(words[start:end]))
+        start = end
+    return lines
@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2014-2021 Andy Lewis                                          #
+# --------------------------------------------------------------------------- #
+# For details, see the LICENSE file in this repository                        #
+
+'''Recording how long the parts of brySVG's work take, as named spans. This module does not use the browser.
+
+To record the spans on a canvas, set `canvas.timings = timings.Timings()`. The canvas's event handlers, snapping and
+DOM updates are then recorded, together with the phases of the polygon algorithms which they call (eg "FI-sweeppast").
+Each name has a `Histogram` of its durations, so the memory used does not grow with the number of spans:
+    print(canvas.timings.summary()["_onMouseMove"])     #{"count":212, "p50":0.41, "p95":1.9, "max":7.3, "total":121.6}
+    data = canvas.timings.dumps()                        #JSON, eg to be sent to a server
+
+Spans of code are recorded with:
+    with recorder.span("name"):                          #Also makes recorder `current` until the span ends
+        ...
+and, more cheaply, the phases of a calculation are recorded in the `current` Timings (if any) with:
+    t = timings.start()                                  #None if nothing is being recorded
+    ...
+    t = timings.lap("phase1", t)                         #Does nothing if t is None
+When nothing is being recorded, this costs one function call and one comparison for each `start()` or `lap()`.'''
+
+from math import log, ceil, inf
+import json
+import time
+
+GROWTH = 1.1 #Each bucket of a Histogram is this many times wider than the one before, so percentiles are within 10%
+LOGGROWTH = log(GROWTH)
+current = None #The Timings in which phases are recorded, or None
+
+class Histogram(object):
+    '''The durations of a span. Each is counted in a bucket (bucket `i` holds durations up to GROWTH**i milliseconds),
+    and the count, total and maximum are kept exactly.'''
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def add(self, seconds):
+        '''Adds a duration (in seconds).'''
+        ms = seconds*1000
+        self.count += 1
+        self.total += ms
+        if ms > self.max: self.max = ms
+        i = ceil(log(ms)/LOGGROWTH) if ms > 0 else None
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+
+    def percentile(self, p):
+        '''Returns (in milliseconds) the duration which a proportion `p` (from 0 to 1) of the spans took no longer than.'''
+        if not self.count: return None
+        target = p*self.count
+        cumulative = 0
+        for i in sorted(self.buckets, key=lambda i: -inf if i is None else i):
+            cumulative += self.buckets[i]
+            if cumulative >= target: return 0 if i is None else min(GROWTH**i, self.max)
+        return self.max
+
+    def summary(self):
+        '''Returns a dict with the count, and the median (p50), 95th percentile (p95), maximum and total in milliseconds.'''
+        return {"count":self.count, "p50":self.percentile(0.5), "p95":self.percentile(0.95), "max":self.max, "total":self.total}
+
+class Timings(object):
+    '''A collection of `Histograms`, one for each name of span.'''
+    def __init__(self):
+        self.histograms = {}
+
+    def record(self, name, seconds):
+        '''Adds a duration (in seconds) to the histogram for `name`.'''
+        histogram = self.histograms.get(name)
+        if histogram is None: histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def span(self, name):
+        '''Returns a context manager which records the time taken by the code inside it, and which makes this
+        the `current` Timings while it is running (so that the phases of calculations are recorded here).'''
+        return _Span(self, name)
+
+    def summary(self):
+        '''Returns a dict which gives the summary of each histogram (see `Histogram.summary()`), by name.'''
+        return {name:histogram.summary() for (name, histogram) in self.histograms.items()}
+
+    def dumps(self):
+        '''Returns the timings as JSON: the summary of each histogram, together with its buckets, so that timings from
+        many sessions can be combined. The bucket for durations of 0 is written with the key "zero".'''
+        spans = {}
+        for (name, histogram) in self.histograms.items():
+            spans[name] = dict(histogram.summary(), buckets={("zero" if i is None else str(i)):n for (i, n) in histogram.buckets.items()})
+        return json.dumps({"units":"ms", "growth":GROWTH, "spans":spans})
+
+    def clear(self):
+        '''Discards all the timings.'''
+        self.histograms = {}
+
+class _Span(object):
+    '''Not intended to be used directly by end users (see `Timings.span()`).'''
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        global current
+        (self.previous, current) = (current, self.timings)
+        self.starttime = time.perf_counter()
+        return self
+
+    def __exit__(self, exctype, value, traceback):
+        global current
+        self.timings.record(self.name, time.perf_counter() - self.starttime)
+        current = self.previous
+        return False
+
+def start():
+    '''Returns the time now if phases are being recorded (ie if there is a `current` Timings), otherwise `None`.'''
+    return None if current is None else time.perf_counter()
+
+def lap(name, starttime):
+    '''Records the time since `starttime` (as returned by `start()` or `lap()`) as the phase `name` in the `current`
+    Timings, and returns the time now. Does nothing and returns `None` if `starttime` is `None`.'''
+    if starttime is None or current is None: return None
+    now = time.perf_counter()
+    current.record(name, now - starttime)
+    return now
+
+def timed(name):
+    '''Decorator for methods of a canvas: each call is recorded as the span `name` in `canvas.timings`, if it is not `None`.'''
+    def decorator(method):
+        def wrapper(self, *args, **kwargs):
+            recorder = self.timings
+            if recorder is None: return method(self, *args, **kwargs)
+            with recorder.span(name):
+                return method(self, *args, **kwargs)
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+    return decorator
@@ -12,46 +12,23 @@ class TransformMixin(object):
     Note that if no mouse interaction is needed with the objects after the transformation, it is better to use the
     translateElement, rotateElement, scaleElement methods provided by the CanvasObject, as they are much faster.'''
 
-    def _transformedpoint(self, matrix):
-        '''Not intended to be called by end users.'''
-        pt = svgbase.createSVGPoint()
-        (pt.x, pt.y) = self.XY
-        pt =  pt.matrixTransform(matrix)
-        return Point((pt.x, pt.y))
-
-    def _transformedpointsetlist(self, matrix):
-        '''Not intended to be called by end users.'''
-        pt = svgbase.createSVGPoint()
-        newpointsetlist = []
-        for pointset in self.pointsetList:
-            newpointset = []
-            for point in pointset:
-                if point is None:
-                    newpointset.append(None)
-                else:
-                    (pt.x, pt.y) = point
-                    pt = pt.matrixTransform(matrix)
-                    newpointset.append(Point((pt.x, pt.y)))
-            newpointsetlist.append(newpointset)
-        return newpointsetlist
-
     def matrixTransform(self, matrix):
-        '''Transform object using a SVGmatrix'''
-        if isinstance(self, GroupObject):
-            for obj in self.objectList:
-                obj.matrixTransform(matrix)
-        elif isinstance(self, PointObject):
-            self.XY = self._transformedpoint(matrix)
-        elif isinstance(self, PolygonObject):
-            #window.transformpoints([self.points], matrix)
-            self._transformpoints(self.points, matrix)
-            self._pointList = None
-            self._segments = None
-        else:
-            self.pointList = self._transformedpointlist(matrix)
-            if isinstance(self, BezierObject): self.pointsetList = self._transformedpointsetlist(matrix)
-            self._update()
-        self._updatehittarget()
+        '''Transform object using a SVGmatrix.
+        The transform is shown immediately, but successive transforms are composed, and only applied to the object's
+        geometry when it is next needed (eg when `pointList` is read), or when `obj.bake()` is called.'''
+        self._transform(matrix)
+
+    def _centre(self):
+        '''Not intended to be called by end users. Returns the centre of the object's bounding box,
+        without applying any pending transform if that can be avoided.'''
+        self._materialiseGroups()
+        if isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)):
+            (cx, cy) = self.centre
+            m = self._pendingMatrix
+            return (cx, cy) if m is None else (m.a*cx+m.c*cy+m.e, m.b*cx+m.d*cy+m.f)
+        self._materialise() #getBBox does not take account of pending transforms
+        bbox = self.getBBox()
+        return (bbox.x+bbox.width/2, bbox.y+bbox.height/2)
 
     def translate(self, vector):
         '''Translate object by vector'''
@@ -62,21 +39,15 @@ class TransformMixin(object):
     def rotate(self, angle, centre=None):
         '''Rotate object clockwise by angle degrees around centre.
         If centre is not given, it is the centre of the object's bounding box.'''
-        if not centre:
-            bbox = self.getBBox()
-            centre = (bbox.x+bbox.width/2, bbox.y+bbox.height/2)
-        if isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)):
-            self.angle += angle
+        if not centre: centre = self._centre()
         t = svgbase.createSVGTransform()
         t.setRotate(angle, *centre)
-        self.matrixTransform(t.matrix)
+        self._transform(t.matrix, angle)
 
     def rotateAndTranslate(self, angle, centre=None, vector=(0,0)):
         '''Rotate object clockwise by `angle` degrees around `centre`, and then translate by `vector`.
         If `centre` is not given, it is the centre of the object's bounding box.'''
-        if not centre:
-            bbox = self.getBBox()
-            centre = (bbox.x+bbox.width/2, bbox.y+bbox.height/2)
+        if not centre: centre = self._centre()
         t = svgbase.createSVGTransform()
         if angle != 0: t.setRotate(angle, *centre)
         M = t.matrix.translate(*vector) if vector != (0,0) else t.matrix
@@ -90,13 +61,11 @@ class TransformMixin(object):
         (x2, y2) = vec2
         (x3, y3) = (x1*x2+y1*y2, x1*y2-x2*y1)
         angle = atan2(y3, x3)*180/pi
-        if isinstance(self, (EllipseObject, RectangleObject, ImageObject, UseObject)):
-            self.angle += angle
         matrix = svgbase.createSVGMatrix()
         matrix = matrix.translate(cx, cy)
         matrix = matrix.rotateFromVector(x3, y3)
         matrix = matrix.translate(-cx, -cy)
-        self.matrixTransform(matrix)
+        self._transform(matrix, angle)
 
     def xstretch(self, xscale, cx=0):
         '''Stretch object in the x-direction by scale factor xscale, with invariant line x = cx.
@@ -149,6 +118,7 @@ class TransformCanvasMixin(object):
         else:
             self.hideTransformHandles()
 
+    @timings.timed("_endTransform")
     def _endTransform(self, event):
         if not isinstance(self.mouseOwner, TransformHandle): return
         currentcoords = self.getSVGcoords(event)
@@ -181,6 +151,8 @@ class TransformCanvasMixin(object):
         self.mouseOwner = None
 
     def showTransformHandles(self, svgobj):
+        #The handles preview transforms using rotatestring, so pending transforms must be applied to these shapes first
+        if isinstance(svgobj, (EllipseObject, RectangleObject, ImageObject, UseObject)): svgobj.bake()
         tempgroup = svg.g() #Needed to overcome bug in browser getBBox implementations
         tempgroup <= svgobj.cloneNode(True)
         self <= tempgroup
@@ -287,12 +259,7 @@ class TransformHandle(PointObject):
         (x, y) = self.startx + dx, self.starty + dy
         self.XY = (x, y)
         if self.transformType == TransformType.TRANSLATE:
-            transformstring = f"translate({dx}px,{dy}px)"
-            if isinstance(self.owner, (EllipseObject, RectangleObject, ImageObject, UseObject)):
-                self.owner.style.transform = transformstring + self.owner.rotatestring
-                if isinstance(self.owner, UseObject): self.owner.style.transform += self.owner.scalestring
-            else:
-                self.owner.style.transform = transformstring
+            self.owner.style.transform = f"translate({dx}px,{dy}px)" + self.owner._transformstring()
             return
 
         (cx, cy) = self.owner.centre
@@ -320,7 +287,7 @@ class TransformHandle(PointObject):
             self.owner.style.transform = self.owner.rotatestring + transformstring
             if isinstance(self.owner, UseObject): self.owner.style.transform += self.owner.scalestring
         else:
-            self.owner.style.transform = transformstring
+            self.owner.style.transform = transformstring + self.owner._transformstring()
 
 classes = [LineObject, RectangleObject, EllipseObject, CircleObject, SectorObject, PolylineObject, PolygonObject, BezierObject,
 ClosedBezierObject, SmoothBezierObject, SmoothClosedBezierObject, PointObject, RegularPolygon, GroupObject, ImageObject, UseObject]